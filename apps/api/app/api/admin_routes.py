@@ -5,7 +5,7 @@ Requires ADMIN role for all endpoints.
 
 from fastapi import APIRouter, HTTPException, Depends, status
 from pydantic import BaseModel, EmailStr
-from app.services.auth import get_current_user, require_admin
+from app.services.auth import get_current_user, invalidate_role, require_admin
 from app.services.supabase_client import get_supabase_admin
 
 router = APIRouter(prefix="/api/admin", tags=["admin"])
@@ -191,3 +191,17 @@ async def update_user_password(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error al actualizar contraseña: {str(e)}"
         )
+
+
+@router.post("/users/{user_id}/role-changed")
+async def user_role_changed(
+    user_id: str,
+    current_user = Depends(require_admin)
+):
+    """Forget the cached role of a user after changing it (admin only)."""
+    await invalidate_role(user_id)
+
+    return {
+        "success": True,
+        "message": "Rol actualizado"
+    }
@@ -0,0 +1,79 @@
+"""API routes for analytics over the local results snapshot."""
+
+import asyncio
+from typing import Any
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from supabase import AsyncClient
+
+from app.services import analytics
+from app.services.analytics_snapshot import analytics_snapshot
+from app.services.supabase_client import get_supabase
+
+router = APIRouter(prefix="/analytics", tags=["analytics"])
+
+
+@router.get("/swimmers/{swimmer_name}/progression")
+async def get_swimmer_progression(
+    swimmer_name: str,
+    distance: int | None = Query(default=None, description="Distance in meters"),
+    stroke: str | None = Query(default=None, description="Stroke (FREE, BACK, BREAST, FLY, IM)"),
+    supabase: AsyncClient = Depends(get_supabase),
+) -> dict[str, Any]:
+    """Get a swimmer's progression curve.
+
+    Returns the best time per season for each event, with the improvement
+    over the previous season. swimmer_name is a swimmer_name_norm value.
+    """
+    seasons = await analytics.swimmer_progression(supabase, swimmer_name, distance, stroke)
+    if not seasons:
+        raise HTTPException(status_code=404, detail=f"No results found for '{swimmer_name}'")
+    return {"swimmer_name": swimmer_name, "seasons": seasons}
+
+
+@router.get("/events/trend")
+async def get_event_trend(
+    distance: int = Query(..., description="Distance in meters"),
+    stroke: str = Query(..., description="Stroke (FREE, BACK, BREAST, FLY, IM)"),
+    gender: str = Query(..., description="Gender (M or F)"),
+    top: int = Query(default=8, ge=1, le=100, description="Swimmers in the top-N mean"),
+    age_min: int | None = Query(default=None, description="Minimum age"),
+    age_max: int | None = Query(default=None, description="Maximum age"),
+    supabase: AsyncClient = Depends(get_supabase),
+) -> dict[str, Any]:
+    """Get the level of an event across every year.
+
+    Per year: swimmers with a result, winning time, mean of the top N
+    best times and median best time.
+    """
+    years = await analytics.event_trend(supabase, distance, stroke, gender, top, age_min, age_max)
+    return {
+        "event": {"distance": distance, "stroke": stroke.upper(), "gender": gender.upper()},
+        "top": top,
+        "years": years,
+    }
+
+
+@router.get("/teams/compare")
+async def compare_teams(
+    team_codes: list[str] = Query(..., description="Team codes to compare"),
+    gender: str | None = Query(default=None, description="Gender (M or F)"),
+    year: int | None = Query(default=None, description="Competition year"),
+    top: int = Query(default=5, ge=1, le=50, description="Swimmers in the top-N mean"),
+    supabase: AsyncClient = Depends(get_supabase),
+) -> dict[str, Any]:
+    """Compare the depth of several teams event by event.
+
+    Per event and team: swimmers, best time and mean of the team's top N
+    best times, teams sorted by that mean.
+    """
+    if len(team_codes) > 50:
+        raise HTTPException(status_code=400, detail="At most 50 team codes")
+    events = await analytics.team_comparison(supabase, team_codes, gender, year, top)
+    return {"team_codes": team_codes, "top": top, "events": events}
+
+
+@router.get("/snapshot")
+async def get_snapshot_status() -> dict[str, Any]:
+    """Get the size and cursor of the local results snapshot."""
+    return await asyncio.to_thread(analytics_snapshot.stats)
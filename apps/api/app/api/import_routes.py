@@ -3,16 +3,16 @@
 from pathlib import Path
 from typing import Any
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel
-from supabase import create_client
+from supabase import AsyncClient
 
-from app.core.config import settings
 from app.services.fecna_import import (
     get_fecna_stats,
     import_to_supabase,
     read_fecna_results,
 )
+from app.services.supabase_client import get_supabase
 
 router = APIRouter(prefix="/import", tags=["import"])
 
@@ -58,6 +58,7 @@ async def get_stats() -> FecnaStats:
 async def import_fecna(
     limit: int = Query(default=1000, ge=1, le=10000, description="Max records to import"),
     offset: int = Query(default=0, ge=0, description="Records to skip"),
+    supabase: AsyncClient = Depends(get_supabase),
 ) -> ImportResult:
     """Import FECNA competition results to Supabase.
 
@@ -76,9 +77,6 @@ async def import_fecna(
                 message="No valid records found to import",
             )
 
-        # Create Supabase client
-        supabase = create_client(settings.supabase_url, settings.supabase_key)
-
         # Import to Supabase
         stats = await import_to_supabase(supabase, results)
 
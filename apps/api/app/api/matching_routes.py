@@ -2,11 +2,13 @@
 
 from typing import Any
 
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel
-from supabase import create_client
+from supabase import AsyncClient
 
 from app.core.config import settings
+from app.services import cache
+from app.services.cache import response_cache
 from app.services.matching import (
     auto_match_high_confidence,
     confirm_match,
@@ -18,9 +20,15 @@ from app.services.matching import (
     reject_match,
     suggest_matches_batch,
 )
+from app.services.pagination import decode_cursor, fetch_all
+from app.services.supabase_client import get_supabase
 
 router = APIRouter(prefix="/matching", tags=["matching"])
 
+# Admins review these lists while confirming and rejecting matches, so they
+# are never served past their ttl
+MATCHING_STALE_TTL = 0
+
 
 class ConfirmMatchRequest(BaseModel):
     """Request body for confirming a match."""
@@ -47,14 +55,20 @@ class BatchMatchRequest(BaseModel):
 
 
 @router.get("/stats")
-async def get_stats() -> dict[str, Any]:
+async def get_stats(supabase: AsyncClient = Depends(get_supabase)) -> dict[str, Any]:
     """Get matching statistics.
 
     Returns counts of pending/confirmed/rejected matches and
     linked/unlinked competition results.
     """
-    supabase = create_client(settings.supabase_url, settings.supabase_key)
-    return await get_match_stats(supabase)
+    return await response_cache.get_or_compute(
+        "matching:stats",
+        {},
+        lambda: get_match_stats(supabase),
+        ttl=settings.cache_ttl_comparisons,
+        stale_ttl=MATCHING_STALE_TTL,
+        tags=[cache.TAG_RESULTS, cache.TAG_LINKS, cache.TAG_ATHLETE_MATCHES],
+    )
 
 
 @router.get("/athletes/unmatched")
@@ -66,6 +80,7 @@ async def get_unmatched_athletes(
         description="Group by: 'team' (club), 'gender', or 'both'"
     ),
     team_code: str | None = Query(default=None, description="Filter by team code"),
+    supabase: AsyncClient = Depends(get_supabase),
 ) -> dict[str, Any]:
     """Get external athlete names that haven't been matched.
 
@@ -75,8 +90,22 @@ async def get_unmatched_athletes(
     Groups are sorted alphabetically. Within each group, swimmers
     are sorted alphabetically by name.
     """
-    supabase = create_client(settings.supabase_url, settings.supabase_key)
-    return await get_unmatched_external_names(supabase, limit, group_by, team_code)
+    return await response_cache.get_or_compute(
+        "matching:unmatched",
+        {"limit": limit, "group_by": group_by, "team_code": team_code},
+        lambda: get_unmatched_external_names(supabase, limit, group_by, team_code),
+        ttl=settings.cache_ttl_comparisons,
+        stale_ttl=MATCHING_STALE_TTL,
+        tags=[cache.TAG_RESULTS, cache.TAG_LINKS],
+    )
+
+
+def _check_cursor(cursor: str | None) -> None:
+    if cursor:
+        try:
+            decode_cursor(cursor, float)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
 
 
 def _normalize_gender(gender: str | None) -> str | None:
@@ -94,35 +123,29 @@ def _normalize_gender(gender: str | None) -> str | None:
 
 
 @router.get("/athletes/unmatched-summary")
-async def get_unmatched_summary() -> dict[str, Any]:
+async def get_unmatched_summary(supabase: AsyncClient = Depends(get_supabase)) -> dict[str, Any]:
     """Get summary of unmatched swimmers grouped by team code.
 
     Returns team codes with counts of unmatched swimmers, useful for
     displaying a collapsed list that can be expanded lazily.
     """
-    supabase = create_client(settings.supabase_url, settings.supabase_key)
+    return await response_cache.get_or_compute(
+        "matching:unmatched-summary",
+        {},
+        lambda: _unmatched_summary(supabase),
+        ttl=settings.cache_ttl_comparisons,
+        stale_ttl=MATCHING_STALE_TTL,
+        tags=[cache.TAG_RESULTS, cache.TAG_LINKS],
+    )
 
+
+async def _unmatched_summary(supabase: AsyncClient) -> dict[str, Any]:
     # Fetch all unlinked results with pagination (Supabase default limit is 1000)
-    all_data = []
-    page_size = 1000
-    offset = 0
-
-    while True:
-        response = (
-            supabase.table("swim_competition_results")
-            .select("team_code, swimmer_name_norm, gender")
-            .is_("athlete_id", "null")
-            .range(offset, offset + page_size - 1)
-            .execute()
-        )
-
-        if not response.data:
-            break
-
-        all_data.extend(response.data)
-        if len(response.data) < page_size:
-            break
-        offset += page_size
+    all_data = await fetch_all(
+        lambda: supabase.table("swim_competition_results")
+        .select("id, team_code, swimmer_name_norm, gender")
+        .is_("athlete_id", "null")
+    )
 
     # Group by team code and count unique swimmers
     team_stats: dict[str, dict] = {}
@@ -170,14 +193,23 @@ async def get_unmatched_summary() -> dict[str, Any]:
 @router.get("/athletes/pending")
 async def get_pending_athlete_matches(
     limit: int = Query(default=50, ge=1, le=200, description="Max matches to return"),
-    offset: int = Query(default=0, ge=0, description="Records to skip"),
+    offset: int = Query(default=0, ge=0, description="Records to skip (deprecated, use cursor)"),
+    cursor: str | None = Query(default=None, description="next_cursor from the previous page"),
+    supabase: AsyncClient = Depends(get_supabase),
 ) -> dict[str, Any]:
     """Get pending athlete matches awaiting review.
 
     Returns matches sorted by confidence score (highest first).
     """
-    supabase = create_client(settings.supabase_url, settings.supabase_key)
-    return await get_pending_matches(supabase, "athlete", limit, offset)
+    _check_cursor(cursor)
+    return await response_cache.get_or_compute(
+        "matching:pending:athlete",
+        {"limit": limit, "offset": offset, "cursor": cursor},
+        lambda: get_pending_matches(supabase, "athlete", limit, offset, cursor),
+        ttl=settings.cache_ttl_comparisons,
+        stale_ttl=MATCHING_STALE_TTL,
+        tags=[cache.TAG_ATHLETE_MATCHES],
+    )
 
 
 @router.get("/athletes/search")
@@ -186,12 +218,12 @@ async def search_athlete_matches(
     club_id: str | None = Query(default=None, description="Filter by club"),
     min_similarity: float = Query(default=0.5, ge=0, le=1, description="Minimum similarity"),
     limit: int = Query(default=10, ge=1, le=50, description="Max matches"),
+    supabase: AsyncClient = Depends(get_supabase),
 ) -> dict[str, Any]:
     """Search for potential athlete matches.
 
     Uses fuzzy matching based on Levenshtein distance.
     """
-    supabase = create_client(settings.supabase_url, settings.supabase_key)
     matches = await find_athlete_matches(
         supabase,
         name,
@@ -210,12 +242,12 @@ async def search_athlete_matches(
 @router.post("/athletes/suggest-batch")
 async def suggest_batch_matches(
     request: BatchMatchRequest,
+    supabase: AsyncClient = Depends(get_supabase),
 ) -> dict[str, Any]:
     """Find potential matches for multiple external names.
 
     Useful for processing many unmatched names at once.
     """
-    supabase = create_client(settings.supabase_url, settings.supabase_key)
     suggestions = await suggest_matches_batch(
         supabase,
         request.external_names,
@@ -231,12 +263,12 @@ async def suggest_batch_matches(
 @router.post("/athletes/create")
 async def create_athlete_match(
     request: CreateMatchRequest,
+    supabase: AsyncClient = Depends(get_supabase),
 ) -> dict[str, Any]:
     """Create a new athlete match suggestion.
 
     Creates a pending match that can be reviewed and confirmed.
     """
-    supabase = create_client(settings.supabase_url, settings.supabase_key)
     match = await create_match_suggestion(
         supabase,
         "athlete",
@@ -246,6 +278,7 @@ async def create_athlete_match(
         request.source,
         request.metadata,
     )
+    await response_cache.invalidate_tags([cache.TAG_ATHLETE_MATCHES])
 
     return {
         "success": True,
@@ -257,13 +290,13 @@ async def create_athlete_match(
 async def confirm_athlete_match(
     mapping_id: str,
     request: ConfirmMatchRequest,
+    supabase: AsyncClient = Depends(get_supabase),
 ) -> dict[str, Any]:
     """Confirm an athlete match.
 
     Links the external name to an internal athlete and
     updates all related competition results.
     """
-    supabase = create_client(settings.supabase_url, settings.supabase_key)
     match = await confirm_match(
         supabase,
         "athlete",
@@ -271,6 +304,7 @@ async def confirm_athlete_match(
         request.internal_id,
         request.reviewed_by,
     )
+    await response_cache.invalidate_tags([cache.TAG_ATHLETE_MATCHES])
 
     return {
         "success": True,
@@ -282,18 +316,19 @@ async def confirm_athlete_match(
 async def reject_athlete_match(
     mapping_id: str,
     reviewed_by: str | None = Query(default=None, description="Reviewer user ID"),
+    supabase: AsyncClient = Depends(get_supabase),
 ) -> dict[str, Any]:
     """Reject an athlete match suggestion.
 
     Marks the match as rejected so it won't be shown again.
     """
-    supabase = create_client(settings.supabase_url, settings.supabase_key)
     match = await reject_match(
         supabase,
         "athlete",
         mapping_id,
         reviewed_by,
     )
+    await response_cache.invalidate_tags([cache.TAG_ATHLETE_MATCHES])
 
     return {
         "success": True,
@@ -309,6 +344,7 @@ async def auto_match_athletes(
     dry_run: bool = Query(
         default=True, description="If true, only show what would be matched"
     ),
+    supabase: AsyncClient = Depends(get_supabase),
 ) -> dict[str, Any]:
     """Automatically confirm high-confidence matches.
 
@@ -316,12 +352,14 @@ async def auto_match_athletes(
     Use dry_run=true first to preview what would be matched.
     Range: 60% (more matches, less precision) to 99% (fewer matches, high precision).
     """
-    supabase = create_client(settings.supabase_url, settings.supabase_key)
-    return await auto_match_high_confidence(
+    result = await auto_match_high_confidence(
         supabase,
         min_confidence,
         dry_run,
     )
+    if not dry_run:
+        await response_cache.invalidate_tags([cache.TAG_ATHLETE_MATCHES])
+    return result
 
 
 # Club matching endpoints (similar pattern)
@@ -329,20 +367,29 @@ async def auto_match_athletes(
 @router.get("/clubs/pending")
 async def get_pending_club_matches(
     limit: int = Query(default=50, ge=1, le=200, description="Max matches to return"),
-    offset: int = Query(default=0, ge=0, description="Records to skip"),
+    offset: int = Query(default=0, ge=0, description="Records to skip (deprecated, use cursor)"),
+    cursor: str | None = Query(default=None, description="next_cursor from the previous page"),
+    supabase: AsyncClient = Depends(get_supabase),
 ) -> dict[str, Any]:
     """Get pending club matches awaiting review."""
-    supabase = create_client(settings.supabase_url, settings.supabase_key)
-    return await get_pending_matches(supabase, "club", limit, offset)
+    _check_cursor(cursor)
+    return await response_cache.get_or_compute(
+        "matching:pending:club",
+        {"limit": limit, "offset": offset, "cursor": cursor},
+        lambda: get_pending_matches(supabase, "club", limit, offset, cursor),
+        ttl=settings.cache_ttl_comparisons,
+        stale_ttl=MATCHING_STALE_TTL,
+        tags=[cache.TAG_CLUB_MATCHES],
+    )
 
 
 @router.post("/clubs/{mapping_id}/confirm")
 async def confirm_club_match(
     mapping_id: str,
     request: ConfirmMatchRequest,
+    supabase: AsyncClient = Depends(get_supabase),
 ) -> dict[str, Any]:
     """Confirm a club match."""
-    supabase = create_client(settings.supabase_url, settings.supabase_key)
     match = await confirm_match(
         supabase,
         "club",
@@ -350,6 +397,7 @@ async def confirm_club_match(
         request.internal_id,
         request.reviewed_by,
     )
+    await response_cache.invalidate_tags([cache.TAG_CLUB_MATCHES])
 
     return {
         "success": True,
@@ -361,15 +409,16 @@ async def confirm_club_match(
 async def reject_club_match(
     mapping_id: str,
     reviewed_by: str | None = Query(default=None, description="Reviewer user ID"),
+    supabase: AsyncClient = Depends(get_supabase),
 ) -> dict[str, Any]:
     """Reject a club match suggestion."""
-    supabase = create_client(settings.supabase_url, settings.supabase_key)
     match = await reject_match(
         supabase,
         "club",
         mapping_id,
         reviewed_by,
     )
+    await response_cache.invalidate_tags([cache.TAG_CLUB_MATCHES])
 
     return {
         "success": True,
@@ -380,13 +429,23 @@ async def reject_club_match(
 # ============ Club Team Code Linking ============
 
 @router.get("/clubs/team-codes")
-async def get_all_team_codes() -> dict[str, Any]:
+async def get_all_team_codes(supabase: AsyncClient = Depends(get_supabase)) -> dict[str, Any]:
     """Get all team codes from FECNA competition results.
 
     Returns list of team codes with result counts and link status.
     """
-    supabase = create_client(settings.supabase_url, settings.supabase_key)
-    response = supabase.rpc("get_all_team_codes").execute()
+    return await response_cache.get_or_compute(
+        "matching:team-codes",
+        {},
+        lambda: _all_team_codes(supabase),
+        ttl=settings.cache_ttl_comparisons,
+        stale_ttl=MATCHING_STALE_TTL,
+        tags=[cache.TAG_RESULTS, cache.TAG_LINKS, cache.TAG_CLUB_MATCHES],
+    )
+
+
+async def _all_team_codes(supabase: AsyncClient) -> dict[str, Any]:
+    response = await supabase.rpc("get_all_team_codes").execute()
 
     return {
         "count": len(response.data) if response.data else 0,
@@ -395,10 +454,23 @@ async def get_all_team_codes() -> dict[str, Any]:
 
 
 @router.get("/clubs/{club_id}/team-codes")
-async def get_club_linked_team_codes(club_id: str) -> dict[str, Any]:
+async def get_club_linked_team_codes(
+    club_id: str,
+    supabase: AsyncClient = Depends(get_supabase),
+) -> dict[str, Any]:
     """Get team codes linked to a specific club."""
-    supabase = create_client(settings.supabase_url, settings.supabase_key)
-    response = supabase.rpc("get_club_team_codes", {"p_club_id": club_id}).execute()
+    return await response_cache.get_or_compute(
+        "matching:club-team-codes",
+        {"club_id": club_id},
+        lambda: _club_team_codes(supabase, club_id),
+        ttl=settings.cache_ttl_comparisons,
+        stale_ttl=MATCHING_STALE_TTL,
+        tags=[cache.TAG_CLUB_MATCHES],
+    )
+
+
+async def _club_team_codes(supabase: AsyncClient, club_id: str) -> dict[str, Any]:
+    response = await supabase.rpc("get_club_team_codes", {"p_club_id": club_id}).execute()
 
     return {
         "club_id": club_id,
@@ -416,12 +488,11 @@ class LinkTeamCodeRequest(BaseModel):
 async def link_team_code_to_club(
     club_id: str,
     request: LinkTeamCodeRequest,
+    supabase: AsyncClient = Depends(get_supabase),
 ) -> dict[str, Any]:
     """Link a FECNA team code to an internal club."""
-    supabase = create_client(settings.supabase_url, settings.supabase_key)
-
     # Check if already linked
-    existing = (
+    existing = await (
         supabase.table("club_external_mappings")
         .select("id")
         .eq("external_code", request.team_code)
@@ -436,7 +507,7 @@ async def link_team_code_to_club(
         }
 
     # Create the mapping
-    response = (
+    response = await (
         supabase.table("club_external_mappings")
         .insert({
             "club_id": club_id,
@@ -447,6 +518,7 @@ async def link_team_code_to_club(
         })
         .execute()
     )
+    await response_cache.invalidate_tags([cache.TAG_CLUB_MATCHES])
 
     return {
         "success": True,
@@ -458,17 +530,17 @@ async def link_team_code_to_club(
 async def unlink_team_code_from_club(
     club_id: str,
     team_code: str,
+    supabase: AsyncClient = Depends(get_supabase),
 ) -> dict[str, Any]:
     """Remove a team code link from a club."""
-    supabase = create_client(settings.supabase_url, settings.supabase_key)
-
-    response = (
+    response = await (
         supabase.table("club_external_mappings")
         .delete()
         .eq("club_id", club_id)
         .eq("external_code", team_code)
         .execute()
     )
+    await response_cache.invalidate_tags([cache.TAG_CLUB_MATCHES])
 
     return {
         "success": True,
@@ -480,12 +552,24 @@ async def unlink_team_code_from_club(
 async def get_club_unmatched_swimmers(
     club_id: str,
     limit: int = Query(default=100, ge=1, le=500),
+    supabase: AsyncClient = Depends(get_supabase),
 ) -> dict[str, Any]:
     """Get unmatched swimmers for a specific club's linked team codes."""
-    supabase = create_client(settings.supabase_url, settings.supabase_key)
+    return await response_cache.get_or_compute(
+        "matching:club-unmatched",
+        {"club_id": club_id, "limit": limit},
+        lambda: _club_unmatched_swimmers(supabase, club_id, limit),
+        ttl=settings.cache_ttl_comparisons,
+        stale_ttl=MATCHING_STALE_TTL,
+        tags=[cache.TAG_RESULTS, cache.TAG_LINKS, cache.TAG_CLUB_MATCHES],
+    )
+
 
+async def _club_unmatched_swimmers(
+    supabase: AsyncClient, club_id: str, limit: int
+) -> dict[str, Any]:
     # Get the club's linked team codes
-    team_codes_response = supabase.rpc(
+    team_codes_response = await supabase.rpc(
         "get_club_team_codes",
         {"p_club_id": club_id}
     ).execute()
@@ -501,7 +585,7 @@ async def get_club_unmatched_swimmers(
     team_codes = [tc["external_code"] for tc in team_codes_response.data]
 
     # Get unmatched swimmers for these team codes
-    response = (
+    response = await (
         supabase.table("swim_competition_results")
         .select("swimmer_name, swimmer_name_norm, gender, team_code")
         .in_("team_code", team_codes)
@@ -1,15 +1,91 @@
 """API routes for searching and querying competition results."""
 
+from datetime import date
 from typing import Any
 
-from fastapi import APIRouter, Query
-from supabase import create_client
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+from supabase import AsyncClient
 
 from app.core.config import settings
+from app.services import cache
+from app.services.auth import AuthUser, require_admin
+from app.services.cache import response_cache
+from app.services.export import ENCODERS, FORMATS, iter_result_pages, parquet_available
+from app.services.name_index import name_index
+from app.services.pagination import decode_cursor, keyset, paginate
+from app.services.personal_bests import group_by_event
+from app.services.rankings import OFFICIAL_EVENTS, age_category, rankings_engine
+from app.services.supabase_client import get_supabase
+from app.services.tournaments import refresh_tournaments
 
 router = APIRouter(prefix="/results", tags=["results"])
 
 
+class EventSpec(BaseModel):
+    """A single event: distance, stroke and gender."""
+
+    distance: int
+    stroke: str
+    gender: str
+
+
+class PlacementSpec(BaseModel):
+    """A time to place in an event and age category."""
+
+    distance: int
+    stroke: str
+    gender: str
+    time_ms: int = Field(gt=0)
+    age: int | None = Field(default=None, ge=0)
+    category: str | None = None
+
+
+class BatchPlacementRequest(BaseModel):
+    """Request body for placing several times at once."""
+
+    items: list[PlacementSpec] = Field(max_length=200)
+    neighbours: int = Field(default=2, ge=0, le=10)
+
+
+class BatchRankingsRequest(BaseModel):
+    """Request body for several rankings at once."""
+
+    events: list[EventSpec] | None = Field(
+        default=None, max_length=100, description="Events to rank; all official events if omitted"
+    )
+    year: int | None = None
+    age_min: int | None = None
+    age_max: int | None = None
+    limit: int = Field(default=10, ge=1, le=200)
+
+# Above this many matching names the IN list gets too long for a URL, so the
+# query falls back to ILIKE (served by the trigram GIN index)
+MAX_NAME_MATCHES = 100
+
+
+async def _resolve_swimmer_names(supabase: AsyncClient, swimmer_name: str) -> list[str] | None:
+    """Exact swimmer_name_norm values containing swimmer_name.
+
+    Returns None when the name should be matched with ILIKE instead: the
+    index is incomplete, too many matches, or none (the index may lag
+    writes made by other workers).
+    """
+    if not await name_index.ensure_loaded(supabase):
+        return None
+    names = name_index.match(swimmer_name, limit=MAX_NAME_MATCHES + 1)
+    if not names or len(names) > MAX_NAME_MATCHES:
+        return None
+    return names
+
+
+def _filter_swimmer_name(query: Any, swimmer_name: str, names: list[str] | None) -> Any:
+    if names is None:
+        return query.ilike("swimmer_name_norm", f"%{swimmer_name.lower()}%")
+    return query.in_("swimmer_name_norm", names)
+
+
 @router.get("/search")
 async def search_results(
     swimmer_name: str | None = Query(default=None, description="Swimmer name (partial match)"),
@@ -20,19 +96,60 @@ async def search_results(
     gender: str | None = Query(default=None, description="Gender (M or F)"),
     year: int | None = Query(default=None, description="Competition year"),
     limit: int = Query(default=50, ge=1, le=200, description="Max results to return"),
-    offset: int = Query(default=0, ge=0, description="Results to skip"),
+    offset: int = Query(default=0, ge=0, description="Results to skip (deprecated, use cursor)"),
+    cursor: str | None = Query(default=None, description="next_cursor from the previous page"),
+    supabase: AsyncClient = Depends(get_supabase),
 ) -> dict[str, Any]:
     """Search competition results with filters.
 
-    Returns matching results sorted by final time (fastest first).
+    Returns matching results sorted by final time (fastest first). Pass
+    next_cursor back as cursor, with the same filters, for the next page.
     """
-    supabase = create_client(settings.supabase_url, settings.supabase_key)
+    if cursor:
+        try:
+            decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    params = {
+        "swimmer_name": swimmer_name,
+        "team_code": team_code,
+        "tournament": tournament,
+        "distance": distance,
+        "stroke": stroke,
+        "gender": gender,
+        "year": year,
+        "limit": limit,
+        "offset": offset,
+        "cursor": cursor,
+    }
+    return await response_cache.get_or_compute(
+        "results:search",
+        params,
+        lambda: _search_results(supabase, **params),
+        ttl=settings.cache_ttl_comparisons,
+        tags=[cache.TAG_RESULTS, cache.TAG_SEARCH],
+    )
 
+
+async def _search_results(
+    supabase: AsyncClient,
+    swimmer_name: str | None,
+    team_code: str | None,
+    tournament: str | None,
+    distance: int | None,
+    stroke: str | None,
+    gender: str | None,
+    year: int | None,
+    limit: int,
+    offset: int,
+    cursor: str | None,
+) -> dict[str, Any]:
     query = supabase.table("swim_competition_results").select("*")
 
     if swimmer_name:
-        # Use normalized name for search
-        query = query.ilike("swimmer_name_norm", f"%{swimmer_name.lower()}%")
+        # Resolve to exact normalized names so the btree index serves the filter
+        names = await _resolve_swimmer_names(supabase, swimmer_name)
+        query = _filter_swimmer_name(query, swimmer_name, names)
 
     if team_code:
         query = query.eq("team_code", team_code.upper())
@@ -53,66 +170,190 @@ async def search_results(
         query = query.eq("year", year)
 
     # Order by fastest time
-    query = query.order("final_time_ms").range(offset, offset + limit - 1)
-
-    response = query.execute()
+    if offset and not cursor:
+        # Legacy offset paging, kept for existing clients
+        response = await (
+            query.order("final_time_ms")
+            .order("id")
+            .range(offset, offset + limit - 1)
+            .execute()
+        )
+        results, next_cursor = response.data, None
+    else:
+        response = await keyset(query, "final_time_ms", cursor, limit).execute()
+        results, next_cursor = paginate(response.data, "final_time_ms", limit)
 
     return {
-        "count": len(response.data),
-        "results": response.data,
+        "count": len(results),
+        "results": results,
+        "next_cursor": next_cursor,
+    }
+
+
+@router.get("/export")
+async def export_results(
+    format: str = Query(
+        default="ndjson", pattern="^(ndjson|csv|parquet)$", description="ndjson, csv or parquet"
+    ),
+    distance: int | None = Query(default=None, description="Distance in meters"),
+    stroke: str | None = Query(default=None, description="Stroke (FREE, BACK, BREAST, FLY, IM)"),
+    gender: str | None = Query(default=None, description="Gender (M or F)"),
+    year: int | None = Query(default=None, description="Competition year"),
+    team_code: str | None = Query(default=None, description="Team code"),
+    athlete_id: str | None = Query(default=None, description="Linked athlete ID"),
+    swimmer_name: str | None = Query(default=None, description="Swimmer name (partial match)"),
+    supabase: AsyncClient = Depends(get_supabase),
+) -> StreamingResponse:
+    """Stream every matching competition result as a file download.
+
+    Rows are read and encoded one page at a time in id order, so a full
+    season exports in a single request with constant memory.
+    """
+    if format == "parquet" and not parquet_available():
+        raise HTTPException(
+            status_code=501,
+            detail="Parquet export requires pyarrow (install the 'export' extra)",
+        )
+
+    filters: dict[str, Any] = {
+        "distance_m": distance,
+        "stroke": stroke.upper() if stroke else None,
+        "gender": gender.upper() if gender else None,
+        "year": year,
+        "team_code": team_code.upper() if team_code else None,
+        "athlete_id": athlete_id,
     }
+    # Same resolution as /search: exact names from the index, ILIKE above
+    # MAX_NAME_MATCHES or while the index is incomplete
+    name_like = None
+    if swimmer_name:
+        names = await _resolve_swimmer_names(supabase, swimmer_name)
+        if names is None:
+            name_like = swimmer_name
+        else:
+            filters["swimmer_name_norm"] = names
+
+    media_type, extension = FORMATS[format]
+    return StreamingResponse(
+        ENCODERS[format](iter_result_pages(supabase, filters, swimmer_name_like=name_like)),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="results.{extension}"'},
+    )
 
 
 @router.get("/swimmer/{swimmer_name}")
 async def get_swimmer_results(
     swimmer_name: str,
     limit: int = Query(default=100, ge=1, le=500, description="Max results to return"),
+    include_history: bool = Query(default=False, description="Include individual results"),
+    include_seasons: bool = Query(default=False, description="Include best time per year"),
+    supabase: AsyncClient = Depends(get_supabase),
 ) -> dict[str, Any]:
     """Get all results for a specific swimmer.
 
-    Returns results grouped by event with best times.
+    Returns best times per event from the personal-bests table. Individual
+    results (up to limit) and season bests are only fetched on request.
     """
-    supabase = create_client(settings.supabase_url, settings.supabase_key)
-
-    # Search by normalized name
-    response = (
-        supabase.table("swim_competition_results")
-        .select("*")
-        .ilike("swimmer_name_norm", f"%{swimmer_name.lower()}%")
-        .order("distance_m")
-        .order("stroke")
-        .order("final_time_ms")
-        .limit(limit)
+    return await response_cache.get_or_compute(
+        "results:swimmer",
+        {
+            "swimmer_name": swimmer_name,
+            "limit": limit if include_history else None,
+            "include_history": include_history,
+            "include_seasons": include_seasons,
+        },
+        lambda: _swimmer_results(
+            supabase, swimmer_name, limit, include_history, include_seasons
+        ),
+        ttl=settings.cache_ttl_comparisons,
+        tags=[cache.TAG_RESULTS, cache.TAG_SWIMMER],
+    )
+
+
+async def _swimmer_results(
+    supabase: AsyncClient,
+    swimmer_name: str,
+    limit: int,
+    include_history: bool,
+    include_seasons: bool,
+) -> dict[str, Any]:
+    names = await _resolve_swimmer_names(supabase, swimmer_name)
+
+    bests = await (
+        _filter_swimmer_name(
+            supabase.table("swimmer_personal_bests").select("*"), swimmer_name, names
+        )
         .execute()
     )
+    events = group_by_event(bests.data or [])
 
-    # Group results by event and find best times
-    events: dict[str, dict[str, Any]] = {}
-    all_results = []
-
-    for result in response.data:
-        all_results.append(result)
-        event_key = f"{result['distance_m']}_{result['stroke']}"
-
-        if event_key not in events:
-            events[event_key] = {
-                "distance_m": result["distance_m"],
-                "stroke": result["stroke"],
-                "best_time_ms": result["final_time_ms"],
-                "best_result": result,
-                "count": 1,
-            }
-        else:
-            events[event_key]["count"] += 1
-            if result["final_time_ms"] < events[event_key]["best_time_ms"]:
-                events[event_key]["best_time_ms"] = result["final_time_ms"]
-                events[event_key]["best_result"] = result
+    response: dict[str, Any] = {
+        "swimmer_name": swimmer_name,
+        "total_results": sum(event["count"] for event in events),
+        "events": events,
+        "results": [],
+    }
+
+    if include_seasons:
+        seasons = await (
+            _filter_swimmer_name(
+                supabase.table("swimmer_season_bests").select("*"), swimmer_name, names
+            )
+            .order("year", desc=True)
+            .order("distance_m")
+            .order("stroke")
+            .execute()
+        )
+        response["season_bests"] = seasons.data or []
+
+    if include_history:
+        history = await (
+            _filter_swimmer_name(
+                supabase.table("swim_competition_results").select("*"), swimmer_name, names
+            )
+            .order("distance_m")
+            .order("stroke")
+            .order("final_time_ms")
+            .limit(limit)
+            .execute()
+        )
+        response["results"] = history.data or []
+
+    return response
+
+
+@router.get("/swimmers/search")
+async def search_swimmers(
+    q: str = Query(..., min_length=2, description="Swimmer name (fuzzy match)"),
+    limit: int = Query(default=20, ge=1, le=100, description="Max names to return"),
+    supabase: AsyncClient = Depends(get_supabase),
+) -> dict[str, Any]:
+    """Fuzzy search over distinct swimmer names.
+
+    Returns normalized names ranked by trigram similarity, tolerant of typos
+    and missing accents. Use swimmer_name_norm with /results/swimmer.
+    """
+    return await response_cache.get_or_compute(
+        "results:swimmers",
+        {"q": q, "limit": limit},
+        lambda: _search_swimmers(supabase, q, limit),
+        ttl=settings.cache_ttl_comparisons,
+        tags=[cache.TAG_RESULTS, cache.TAG_SEARCH],
+    )
 
+
+async def _search_swimmers(supabase: AsyncClient, q: str, limit: int) -> dict[str, Any]:
+    if await name_index.ensure_loaded(supabase):
+        swimmers: Any = name_index.search(q, limit=limit)
+    else:
+        response = await supabase.rpc(
+            "search_swimmer_names", {"p_query": q, "p_limit": limit}
+        ).execute()
+        swimmers = response.data or []
     return {
-        "swimmer_name": swimmer_name,
-        "total_results": len(all_results),
-        "events": list(events.values()),
-        "results": all_results,
+        "query": q,
+        "count": len(swimmers),
+        "swimmers": swimmers,
     }
 
 
@@ -125,52 +366,318 @@ async def get_rankings(
     age_min: int | None = Query(default=None, description="Minimum age"),
     age_max: int | None = Query(default=None, description="Maximum age"),
     limit: int = Query(default=50, ge=1, le=200, description="Max results to return"),
+    supabase: AsyncClient = Depends(get_supabase),
 ) -> dict[str, Any]:
     """Get rankings for a specific event.
 
     Returns the best time per swimmer, ranked from fastest to slowest.
     """
-    supabase = create_client(settings.supabase_url, settings.supabase_key)
-
-    query = (
-        supabase.table("swim_competition_results")
-        .select("*")
-        .eq("distance_m", distance)
-        .eq("stroke", stroke.upper())
-        .eq("gender", gender.upper())
+    params = {
+        "distance": distance,
+        "stroke": stroke,
+        "gender": gender,
+        "year": year,
+        "age_min": age_min,
+        "age_max": age_max,
+        "limit": limit,
+    }
+    return await response_cache.get_or_compute(
+        "results:rankings",
+        params,
+        lambda: _rankings(supabase, **params),
+        ttl=settings.cache_ttl_rankings,
+        tags=[cache.TAG_RESULTS, cache.event_tag(distance, stroke, gender)],
     )
 
-    if year:
-        query = query.eq("year", year)
 
-    if age_min:
-        query = query.gte("age", age_min)
+async def _rankings(
+    supabase: AsyncClient,
+    distance: int,
+    stroke: str,
+    gender: str,
+    year: int | None,
+    age_min: int | None,
+    age_max: int | None,
+    limit: int,
+) -> dict[str, Any]:
+    await rankings_engine.ensure_loaded(supabase)
+
+    rankings = rankings_engine.top(
+        distance,
+        stroke,
+        gender,
+        year=year,
+        age_min=age_min,
+        age_max=age_max,
+        limit=limit,
+    )
+
+    return {
+        "event": f"{distance}m {stroke} ({gender})",
+        "count": len(rankings),
+        "rankings": rankings,
+    }
+
+
+@router.post("/rankings/batch")
+async def get_rankings_batch(
+    request: BatchRankingsRequest,
+    supabase: AsyncClient = Depends(get_supabase),
+) -> dict[str, Any]:
+    """Get rankings for several events in one request.
+
+    Without events, ranks every official event (distances from the
+    packages/config catalogue, both genders). All rankings are computed
+    in one pass over the rankings engine and cached together.
+    """
+    if request.events is None:
+        events = OFFICIAL_EVENTS
+    else:
+        events = [
+            (event.distance, event.stroke.upper(), event.gender.upper())
+            for event in request.events
+        ]
+    params = {
+        "events": [list(event) for event in events] if request.events is not None else None,
+        "year": request.year,
+        "age_min": request.age_min,
+        "age_max": request.age_max,
+        "limit": request.limit,
+    }
+    return await response_cache.get_or_compute(
+        "results:rankings:batch",
+        params,
+        lambda: _rankings_batch(
+            supabase, events, request.year, request.age_min, request.age_max, request.limit
+        ),
+        ttl=settings.cache_ttl_rankings,
+        tags=[cache.TAG_RESULTS, *(cache.event_tag(*event) for event in events)],
+    )
+
+
+async def _rankings_batch(
+    supabase: AsyncClient,
+    events: list[tuple[int, str, str]],
+    year: int | None,
+    age_min: int | None,
+    age_max: int | None,
+    limit: int,
+) -> dict[str, Any]:
+    await rankings_engine.ensure_loaded(supabase)
+
+    tables = rankings_engine.top_many(
+        events, year=year, age_min=age_min, age_max=age_max, limit=limit
+    )
+
+    return {
+        "count": len(events),
+        "events": [
+            {
+                "event": f"{distance}m {stroke} ({gender})",
+                "distance": distance,
+                "stroke": stroke,
+                "gender": gender,
+                "count": len(rankings),
+                "rankings": rankings,
+            }
+            for (distance, stroke, gender), rankings in zip(events, tables)
+        ],
+    }
+
+
+@router.get("/placement")
+async def get_placement(
+    distance: int = Query(..., description="Distance in meters"),
+    stroke: str = Query(..., description="Stroke (FREE, BACK, BREAST, FLY, IM)"),
+    gender: str = Query(..., description="Gender (M or F)"),
+    time_ms: int = Query(..., gt=0, description="Time to place in milliseconds"),
+    age: int | None = Query(default=None, ge=0, description="Swimmer age"),
+    category: str | None = Query(
+        default=None, description="Age category (10-, 11-12, 13-14, 15-16, 17-18, OPEN)"
+    ),
+    neighbours: int = Query(default=2, ge=0, le=10, description="Nearest swimmers on each side"),
+    supabase: AsyncClient = Depends(get_supabase),
+) -> dict[str, Any]:
+    """Get the rank and percentile a time would have in competition.
+
+    Compares against each swimmer's best in the event and age category,
+    e.g. to place a training time. Served from the rankings engine's
+    sorted arrays, so it is cheap enough to call for every set.
+    """
+    spec = PlacementSpec(
+        distance=distance,
+        stroke=stroke,
+        gender=gender,
+        time_ms=time_ms,
+        age=age,
+        category=category,
+    )
+    _placement_category(spec)
+
+    await rankings_engine.ensure_loaded(supabase)
+    return _placement(spec, neighbours)
+
+
+@router.post("/placement/batch")
+async def get_placement_batch(
+    request: BatchPlacementRequest,
+    supabase: AsyncClient = Depends(get_supabase),
+) -> dict[str, Any]:
+    """Get rank and percentile for several times, e.g. every set in a session."""
+    for spec in request.items:
+        _placement_category(spec)
+
+    await rankings_engine.ensure_loaded(supabase)
+    return {
+        "count": len(request.items),
+        "placements": [_placement(spec, request.neighbours) for spec in request.items],
+    }
 
-    if age_max:
-        query = query.lte("age", age_max)
 
-    response = query.order("final_time_ms").limit(limit * 3).execute()
+def _placement_category(spec: PlacementSpec) -> str:
+    if spec.category is None and spec.age is None:
+        raise HTTPException(status_code=400, detail="Either age or category is required")
+    return spec.category or age_category(spec.age)
 
-    # Deduplicate by swimmer (keep best time)
-    seen_swimmers: set[str] = set()
-    rankings: list[dict[str, Any]] = []
 
-    for result in response.data:
-        swimmer_key = result["swimmer_name_norm"]
-        if swimmer_key not in seen_swimmers:
-            seen_swimmers.add(swimmer_key)
-            rankings.append(result)
-            if len(rankings) >= limit:
-                break
+def _placement(spec: PlacementSpec, neighbours: int) -> dict[str, Any]:
+    # Not response-cached: an in-process bisect is cheaper than a cache round trip
+    category = _placement_category(spec)
+    placement = rankings_engine.placement(
+        spec.distance,
+        spec.stroke,
+        spec.gender,
+        category,
+        spec.time_ms,
+        neighbours=neighbours,
+    )
 
-    # Add rank
-    for i, result in enumerate(rankings, 1):
-        result["rank"] = i
+    def neighbour(row: dict[str, Any]) -> dict[str, Any]:
+        return {
+            "swimmer_name": row["swimmer_name"],
+            "athlete_id": row.get("athlete_id"),
+            "team_code": row.get("team_code"),
+            "time_ms": row["final_time_ms"],
+            "time_diff_ms": row["final_time_ms"] - spec.time_ms,
+        }
+
+    return {
+        "event": f"{spec.distance}m {spec.stroke.upper()} ({spec.gender.upper()})",
+        "category": category,
+        "time_ms": spec.time_ms,
+        "rank": placement["rank"],
+        "total": placement["total"],
+        "faster": placement["faster"],
+        "ties": placement["ties"],
+        "percentile": placement["percentile"],
+        "nearest_faster": [neighbour(row) for row in placement["nearest_faster"]],
+        "nearest_slower": [neighbour(row) for row in placement["nearest_slower"]],
+    }
+
+
+@router.get("/competitors")
+async def get_direct_competitors(
+    distance: int = Query(..., description="Distance in meters"),
+    stroke: str = Query(..., description="Stroke (FREE, BACK, BREAST, FLY, IM)"),
+    gender: str = Query(..., description="Gender (M or F)"),
+    time_ms: int = Query(..., gt=0, description="Reference time in milliseconds"),
+    age: int | None = Query(default=None, ge=0, description="Swimmer age"),
+    category: str | None = Query(
+        default=None, description="Age category (10-, 11-12, 13-14, 15-16, 17-18, OPEN)"
+    ),
+    mode: str = Query(default="general", pattern="^(club|general)$", description="club or general"),
+    club_id: str | None = Query(default=None, description="Club ID (required in club mode)"),
+    exclude: str | None = Query(default=None, description="Swimmer name to leave out"),
+    count: int = Query(default=3, ge=1, le=10, description="Competitors on each side"),
+    supabase: AsyncClient = Depends(get_supabase),
+) -> dict[str, Any]:
+    """Get direct competitors around a time.
+
+    Returns the nearest faster and slower swimmers (by best time) in the
+    same event and age category, across all results or within a club's
+    linked team codes.
+    """
+    if category is None and age is None:
+        raise HTTPException(status_code=400, detail="Either age or category is required")
+    category = category or age_category(age)
+    if mode == "club" and not club_id:
+        raise HTTPException(status_code=400, detail="club_id is required in club mode")
+
+    params = {
+        "distance": distance,
+        "stroke": stroke,
+        "gender": gender,
+        "time_ms": time_ms,
+        "category": category,
+        "mode": mode,
+        "club_id": club_id if mode == "club" else None,
+        "exclude": exclude,
+        "count": count,
+    }
+    return await response_cache.get_or_compute(
+        "results:competitors",
+        params,
+        lambda: _competitors(supabase, **params),
+        ttl=settings.cache_ttl_comparisons,
+        tags=[
+            cache.TAG_RESULTS,
+            cache.TAG_CLUB_MATCHES,
+            cache.event_tag(distance, stroke, gender),
+        ],
+    )
+
+
+async def _competitors(
+    supabase: AsyncClient,
+    distance: int,
+    stroke: str,
+    gender: str,
+    time_ms: int,
+    category: str,
+    mode: str,
+    club_id: str | None,
+    exclude: str | None,
+    count: int,
+) -> dict[str, Any]:
+    await rankings_engine.ensure_loaded(supabase)
+
+    team_codes = None
+    if mode == "club":
+        response = await supabase.rpc("get_club_team_codes", {"p_club_id": club_id}).execute()
+        team_codes = [tc["external_code"] for tc in response.data or []]
+
+    neighbours = rankings_engine.competitors(
+        distance,
+        stroke,
+        gender,
+        category,
+        time_ms,
+        team_codes=team_codes,
+        exclude_swimmer=exclude.lower() if exclude else None,
+        count=count,
+    )
+
+    def competitor(row: dict[str, Any]) -> dict[str, Any]:
+        return {
+            "swimmer_name": row["swimmer_name"],
+            "swimmer_name_norm": row["swimmer_name_norm"],
+            "athlete_id": row.get("athlete_id"),
+            "team_code": row.get("team_code"),
+            "age": row.get("age"),
+            "time_ms": row["final_time_ms"],
+            "time_diff_ms": row["final_time_ms"] - time_ms,
+            "tournament_name": row.get("tournament_name"),
+            "event_date": row.get("event_date"),
+        }
 
     return {
         "event": f"{distance}m {stroke} ({gender})",
-        "count": len(rankings),
-        "rankings": rankings,
+        "category": category,
+        "mode": mode,
+        "time_ms": time_ms,
+        "team_codes": team_codes,
+        "faster": [competitor(row) for row in neighbours["faster"]],
+        "slower": [competitor(row) for row in neighbours["slower"]],
     }
 
 
@@ -178,38 +685,70 @@ async def get_rankings(
 async def get_tournaments(
     year: int | None = Query(default=None, description="Filter by year"),
     limit: int = Query(default=50, ge=1, le=200, description="Max tournaments to return"),
+    cursor: str | None = Query(default=None, description="next_cursor from the previous page"),
+    supabase: AsyncClient = Depends(get_supabase),
 ) -> dict[str, Any]:
-    """Get list of available tournaments."""
-    supabase = create_client(settings.supabase_url, settings.supabase_key)
+    """Get list of available tournaments.
 
-    # This is a simplified query - in production you'd want a view or aggregation
-    query = (
-        supabase.table("swim_competition_results")
-        .select("tournament_name, year, event_date")
+    Returns tournaments, most recent first, with their date range and
+    result and swimmer counts.
+    """
+    if cursor:
+        try:
+            decode_cursor(cursor, date)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    return await response_cache.get_or_compute(
+        "results:tournaments",
+        {"year": year, "limit": limit, "cursor": cursor},
+        lambda: _tournaments(supabase, year, limit, cursor),
+        ttl=settings.cache_ttl_rankings,
+        tags=[cache.TAG_RESULTS, cache.TAG_TOURNAMENTS],
     )
 
+
+async def _tournaments(
+    supabase: AsyncClient, year: int | None, limit: int, cursor: str | None
+) -> dict[str, Any]:
+    query = supabase.table("competition_tournaments").select("*")
     if year:
         query = query.eq("year", year)
 
-    response = query.order("event_date", desc=True).limit(1000).execute()
-
-    # Deduplicate tournaments
-    seen: set[str] = set()
-    tournaments: list[dict[str, Any]] = []
-
-    for result in response.data:
-        key = f"{result['tournament_name']}_{result['year']}"
-        if key not in seen:
-            seen.add(key)
-            tournaments.append({
-                "name": result["tournament_name"],
-                "year": result["year"],
-                "date": result["event_date"],
-            })
-            if len(tournaments) >= limit:
-                break
+    response = await keyset(
+        query, "start_date", cursor, limit, desc=True, value_type=date
+    ).execute()
+    rows, next_cursor = paginate(response.data or [], "start_date", limit)
+
+    tournaments = [
+        {
+            "id": row["id"],
+            "name": row["name"],
+            "year": row["year"],
+            "date": row["start_date"],
+            "start_date": row["start_date"],
+            "end_date": row["end_date"],
+            "result_count": row["result_count"],
+            "swimmer_count": row["swimmer_count"],
+        }
+        for row in rows
+    ]
 
     return {
         "count": len(tournaments),
         "tournaments": tournaments,
+        "next_cursor": next_cursor,
     }
+
+
+@router.post("/tournaments/refresh")
+async def refresh_tournament_list(
+    current_user: AuthUser = Depends(require_admin),
+    supabase: AsyncClient = Depends(get_supabase),
+) -> dict[str, Any]:
+    """Rebuild the tournaments dimension from all competition results.
+
+    Imports and syncs keep it current; use this after editing results
+    directly in the database. Admin only.
+    """
+    return {"refreshed": await refresh_tournaments(supabase)}
@@ -4,13 +4,14 @@ Endpoints de sincronización de resultados de competencias desde FECNA
 from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel
 from typing import List, Optional
-from datetime import datetime
+import asyncio
 import logging
 
-from ..services.fecna_sync import fecna_sync
+from ..services.auth import require_admin
+from ..services.fecna_sync import sync_athlete_results
 from ..services.fecna_lookup import find_swimmer_id, search_swimmers
-from supabase import create_client
-from ..core.config import settings
+from ..services.sync_scheduler import sync_scheduler
+from ..services.supabase_client import get_supabase
 
 logger = logging.getLogger(__name__)
 
@@ -46,127 +47,100 @@ async def sync_athlete(athlete_id: str, fecha_inicio: str = None, fecha_fin: str
         Dict con resultados de la sincronización
     """
     try:
-        supabase = create_client(settings.supabase_url, settings.supabase_key)
+        supabase = get_supabase()
+        return await sync_athlete_results(supabase, athlete_id, fecha_inicio, fecha_fin)
 
-        # 1. Obtener mapping del atleta para conseguir su ID de FECNA
-        mapping_resp = supabase.table('athlete_external_mappings')\
-            .select('*')\
-            .eq('athlete_id', athlete_id)\
-            .eq('source', 'FECNA')\
-            .eq('status', 'CONFIRMED')\
-            .execute()
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error sincronizando atleta {athlete_id}: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
 
-        if not mapping_resp.data:
-            raise HTTPException(
-                status_code=404,
-                detail=f"No hay mapping confirmado de FECNA para atleta {athlete_id}"
-            )
 
-        mapping = mapping_resp.data[0]
-        fecna_id = mapping.get('metadata', {}).get('fecna_id')
+@router.post("/replay/{athlete_id}")
+async def replay_athlete(
+    athlete_id: str,
+    fecha_inicio: str | None = None,
+    fecha_fin: str | None = None,
+    current_user = Depends(require_admin)
+):
+    """
+    Reconstruir los resultados de un atleta desde la caché de respuestas FECNA
 
-        if not fecna_id:
-            raise HTTPException(
-                status_code=400,
-                detail="El mapping no contiene fecna_id en metadata"
-            )
+    No consulta FECNA: vuelve a aplicar la transformación sobre los payloads
+    guardados. Sin ventana usa todas las ventanas en caché. Actualiza los
+    resultados FECNA_API existentes y borra solo los de pruebas y fechas
+    cubiertas por la caché que ya no aparecen. Requiere rol ADMIN.
 
-        # 2. Obtener nombre del atleta
-        athlete_resp = supabase.table('athletes')\
-            .select('first_name, last_name')\
-            .eq('id', athlete_id)\
-            .single()\
-            .execute()
+    Args:
+        athlete_id: UUID del atleta en Supabase
+        fecha_inicio: Ventana cacheada (YYYY-MM-DD), default: todas
+        fecha_fin: Ventana cacheada (YYYY-MM-DD), default: todas
+    """
+    try:
+        supabase = get_supabase()
+        return await sync_athlete_results(
+            supabase, athlete_id, fecha_inicio, fecha_fin, replay=True
+        )
 
-        athlete = athlete_resp.data
-        swimmer_name = f"{athlete['first_name']} {athlete['last_name']}"
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error reprocesando atleta {athlete_id}: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
 
-        # 3. Marcar sincronización como en progreso
-        supabase.table('athlete_external_mappings')\
-            .update({'sync_status': 'IN_PROGRESS'})\
-            .eq('id', mapping['id'])\
-            .execute()
 
-        # 4. Obtener resultados de FECNA
-        logger.info(f"Sincronizando atleta {swimmer_name} (FECNA ID: {fecna_id})")
+@router.post("/replay")
+async def replay_all_athletes(current_user = Depends(require_admin)):
+    """
+    Reconstruir desde la caché los resultados de todos los atletas con mapping confirmado
 
-        results = fecna_sync.get_athlete_results(
-            nadador_id=str(fecna_id),
-            fecha_inicio=fecha_inicio,
-            fecha_fin=fecha_fin
-        )
+    Atletas sin respuestas en caché se reportan como omitidos. Requiere rol ADMIN.
+    """
+    try:
+        supabase = get_supabase()
 
-        # 5. Transformar y preparar para inserción
-        new_results = []
-        for result in results:
-            transformed = fecna_sync.transform_to_competition_result(result, athlete_id)
-            transformed['swimmer_name'] = swimmer_name
-            transformed['swimmer_name_norm'] = swimmer_name.lower()
-            new_results.append(transformed)
-
-        # 6. Buscar resultados que ya existen (para evitar duplicados)
-        existing_count = 0
-        inserted_count = 0
-
-        if new_results:
-            for result in new_results:
-                # Verificar si ya existe (mismo atleta, torneo, prueba, tiempo)
-                existing = supabase.table('swim_competition_results')\
-                    .select('id')\
-                    .eq('athlete_id', athlete_id)\
-                    .eq('tournament_name', result['tournament_name'])\
-                    .eq('distance_m', result['distance_m'])\
-                    .eq('stroke', result['stroke'])\
-                    .eq('final_time_ms', result['final_time_ms'])\
-                    .execute()
-
-                if existing.data:
-                    existing_count += 1
-                else:
-                    # Insertar nuevo resultado
-                    supabase.table('swim_competition_results').insert(result).execute()
-                    inserted_count += 1
-
-        # 7. Actualizar mapping con estado de sincronización
-        supabase.table('athlete_external_mappings')\
-            .update({
-                'sync_status': 'SUCCESS',
-                'last_synced_at': datetime.utcnow().isoformat(),
-                'results_count': len(new_results),
-                'sync_error': None
-            })\
-            .eq('id', mapping['id'])\
+        mappings_resp = await supabase.table('athlete_external_mappings')\
+            .select('athlete_id, metadata')\
+            .eq('source', 'FECNA')\
+            .eq('status', 'CONFIRMED')\
             .execute()
 
+        athletes = mappings_resp.data
+        success = 0
+        skipped = 0
+        errors = []
+
+        for athlete_map in athletes:
+            athlete_id = athlete_map['athlete_id']
+
+            try:
+                await sync_athlete_results(supabase, athlete_id, replay=True)
+                success += 1
+            except (LookupError, ValueError):
+                skipped += 1
+            except Exception as e:
+                logger.error(f"Error reprocesando {athlete_id}: {e}")
+                errors.append({
+                    'athlete_id': athlete_id,
+                    'error': str(e)
+                })
+
         return {
             'success': True,
-            'athlete_id': athlete_id,
-            'athlete_name': swimmer_name,
-            'fecna_id': fecna_id,
-            'total_results': len(results),
-            'new_results': inserted_count,
-            'existing_results': existing_count,
-            'fecha_inicio': fecha_inicio,
-            'fecha_fin': fecha_fin
+            'total_athletes': len(athletes),
+            'successful': success,
+            'skipped': skipped,
+            'failed': len(errors),
+            'errors': errors
         }
 
-    except HTTPException:
-        raise
     except Exception as e:
-        logger.error(f"Error sincronizando atleta {athlete_id}: {e}", exc_info=True)
-
-        # Marcar error en mapping
-        try:
-            supabase.table('athlete_external_mappings')\
-                .update({
-                    'sync_status': 'ERROR',
-                    'sync_error': str(e)
-                })\
-                .eq('athlete_id', athlete_id)\
-                .execute()
-        except:
-            pass
-
+        logger.error(f"Error en reprocesamiento masivo: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -183,10 +157,10 @@ async def sync_all_athletes(fecha_inicio: str = None, fecha_fin: str = None):
         Dict con resumen de sincronización
     """
     try:
-        supabase = create_client(settings.supabase_url, settings.supabase_key)
+        supabase = get_supabase()
 
         # Obtener todos los mappings confirmados
-        mappings_resp = supabase.table('athlete_external_mappings')\
+        mappings_resp = await supabase.table('athlete_external_mappings')\
             .select('athlete_id, metadata')\
             .eq('source', 'FECNA')\
             .eq('status', 'CONFIRMED')\
@@ -228,9 +202,9 @@ async def sync_all_athletes(fecha_inicio: str = None, fecha_fin: str = None):
 async def get_sync_status(athlete_id: str):
     """Obtener estado de última sincronización de un atleta"""
     try:
-        supabase = create_client(settings.supabase_url, settings.supabase_key)
+        supabase = get_supabase()
 
-        mapping_resp = supabase.table('athlete_external_mappings')\
+        mapping_resp = await supabase.table('athlete_external_mappings')\
             .select('*')\
             .eq('athlete_id', athlete_id)\
             .eq('source', 'FECNA')\
@@ -260,14 +234,14 @@ async def get_sync_status(athlete_id: str):
 async def get_sync_stats():
     """Obtener estadísticas globales de sincronización"""
     try:
-        supabase = create_client(settings.supabase_url, settings.supabase_key)
+        supabase = get_supabase()
 
         # Total de atletas
-        athletes_resp = supabase.table('athletes').select('id', count='exact').execute()
+        athletes_resp = await supabase.table('athletes').select('id', count='exact').execute()
         total_athletes = athletes_resp.count or 0
 
         # Atletas con mapping confirmado
-        matched_resp = supabase.table('athlete_external_mappings')\
+        matched_resp = await supabase.table('athlete_external_mappings')\
             .select('athlete_id', count='exact')\
             .eq('source', 'FECNA')\
             .eq('status', 'CONFIRMED')\
@@ -275,7 +249,7 @@ async def get_sync_stats():
         matched = matched_resp.count or 0
 
         # Atletas pendientes de matching
-        pending_resp = supabase.table('athlete_external_mappings')\
+        pending_resp = await supabase.table('athlete_external_mappings')\
             .select('athlete_id', count='exact')\
             .eq('source', 'FECNA')\
             .eq('status', 'PENDING')\
@@ -283,7 +257,7 @@ async def get_sync_stats():
         pending = pending_resp.count or 0
 
         # Última sincronización
-        last_sync_resp = supabase.table('athlete_external_mappings')\
+        last_sync_resp = await supabase.table('athlete_external_mappings')\
             .select('last_synced_at, results_count')\
             .eq('source', 'FECNA')\
             .order('last_synced_at', desc=True)\
@@ -305,6 +279,25 @@ async def get_sync_stats():
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/scheduler")
+async def get_scheduler_status():
+    """Estado del planificador de sincronización en segundo plano"""
+    return sync_scheduler.status()
+
+
+@router.post("/scheduler/refresh")
+async def refresh_scheduler_queue(current_user = Depends(require_admin)):
+    """Recalcular la cola de prioridad del planificador. Requiere rol ADMIN."""
+    try:
+        supabase = get_supabase()
+        queued = await sync_scheduler.refresh_queue(supabase)
+        return {'success': True, 'queued': queued}
+
+    except Exception as e:
+        logger.error(f"Error recalculando cola de sync: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/lookup/{swimmer_name}")
 async def lookup_fecna_id(swimmer_name: str):
     """
@@ -317,7 +310,7 @@ async def lookup_fecna_id(swimmer_name: str):
         Dict con fecna_id y nombre encontrado
     """
     try:
-        fecna_id = find_swimmer_id(swimmer_name)
+        fecna_id = await asyncio.to_thread(find_swimmer_id, swimmer_name)
 
         if not fecna_id:
             raise HTTPException(
@@ -351,7 +344,7 @@ async def search_fecna_swimmers(q: str, limit: int = 20):
         Lista de nadadores encontrados
     """
     try:
-        results = search_swimmers(q, limit)
+        results = await asyncio.to_thread(search_swimmers, q, limit)
 
         return {
             'success': True,
@@ -377,10 +370,10 @@ async def update_athlete_fecna_id(athlete_id: str):
         Dict con resultado de la actualización
     """
     try:
-        supabase = create_client(settings.supabase_url, settings.supabase_key)
+        supabase = get_supabase()
 
         # Obtener mapping y nombre del atleta
-        athlete_resp = supabase.table('athletes')\
+        athlete_resp = await supabase.table('athletes')\
             .select('first_name, last_name')\
             .eq('id', athlete_id)\
             .single()\
@@ -391,7 +384,7 @@ async def update_athlete_fecna_id(athlete_id: str):
 
         # Buscar ID en FECNA
         logger.info(f"Buscando ID de FECNA para {swimmer_name}...")
-        fecna_id = find_swimmer_id(swimmer_name)
+        fecna_id = await asyncio.to_thread(find_swimmer_id, swimmer_name)
 
         if not fecna_id:
             raise HTTPException(
@@ -400,7 +393,7 @@ async def update_athlete_fecna_id(athlete_id: str):
             )
 
         # Actualizar mapping
-        mapping_resp = supabase.table('athlete_external_mappings')\
+        mapping_resp = await supabase.table('athlete_external_mappings')\
             .select('id')\
             .eq('athlete_id', athlete_id)\
             .eq('source', 'FECNA')\
@@ -416,7 +409,7 @@ async def update_athlete_fecna_id(athlete_id: str):
         mapping_id = mapping_resp.data[0]['id']
 
         # Actualizar metadata con fecna_id
-        supabase.table('athlete_external_mappings')\
+        await supabase.table('athlete_external_mappings')\
             .update({'metadata': {'fecna_id': fecna_id}})\
             .eq('id', mapping_id)\
             .execute()
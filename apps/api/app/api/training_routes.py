@@ -0,0 +1,181 @@
+"""API routes for training load, stroke metrics and pacing."""
+
+from datetime import date
+from typing import Any, cast
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import BaseModel, Field
+from supabase import AsyncClient
+
+from app.services import pacing, training_access
+from app.services.auth import AuthUser, get_current_user
+from app.services.supabase_client import get_supabase
+from app.services.swimming_metrics import swimming_metrics
+from app.services.training_load import publish_sessions_changed, training_load_cache
+
+router = APIRouter(prefix="/training", tags=["training"])
+
+
+class SetMetricsRequest(BaseModel):
+    """Training sets to compute stroke metrics or pacing for."""
+
+    set_ids: list[str] = Field(min_length=1, max_length=1000)
+
+
+@router.get("/athletes/{athlete_id}/load")
+async def get_athlete_load(
+    athlete_id: str,
+    days: int = Query(default=42, ge=1, le=365, description="Days in the series"),
+    as_of: date | None = Query(default=None, description="Last day (default: today)"),
+    include_series: bool = Query(default=True, description="Include the daily series"),
+    current_user: AuthUser = Depends(get_current_user),
+    supabase: AsyncClient = Depends(get_supabase),
+) -> dict[str, Any]:
+    """Get an athlete's training load up to as_of.
+
+    Returns acute (7-day) and chronic (28-day) load, ACWR and its zone,
+    monotony and strain, plus the daily series for the last `days` days.
+    """
+    await training_access.require_athlete_access(supabase, current_user, athlete_id)
+    report = await training_load_cache.compute(
+        supabase, [athlete_id], as_of or date.today(), days, include_series
+    )
+    return report[athlete_id]
+
+
+@router.get("/clubs/{club_id}/load")
+async def get_club_load(
+    club_id: str,
+    days: int = Query(default=28, ge=1, le=365, description="Days in the series"),
+    as_of: date | None = Query(default=None, description="Last day (default: today)"),
+    include_series: bool = Query(default=False, description="Include daily series"),
+    current_user: AuthUser = Depends(get_current_user),
+    supabase: AsyncClient = Depends(get_supabase),
+) -> dict[str, Any]:
+    """Get the training load of the active athletes in a club.
+
+    Club admins get every athlete, coaches the ones they coach. All
+    athletes are computed in one batch, for squad dashboards. Clubs the
+    user has no access to and clubs that don't exist both get 403.
+    """
+    athlete_ids = await training_access.require_club_access(supabase, current_user, club_id)
+    query = (
+        supabase.table("athletes")
+        .select("id, first_name, last_name")
+        .eq("club_id", club_id)
+        .eq("active", True)
+    )
+    if athlete_ids is not None:
+        query = query.in_("id", athlete_ids)
+    response = await query.order("last_name").execute()
+    athletes = cast(list[dict[str, Any]], response.data or [])
+
+    report = await training_load_cache.compute(
+        supabase,
+        [athlete["id"] for athlete in athletes],
+        as_of or date.today(),
+        days,
+        include_series,
+    )
+    return {
+        "club_id": club_id,
+        "athletes": [
+            {
+                "first_name": athlete["first_name"],
+                "last_name": athlete["last_name"],
+                **report[athlete["id"]],
+            }
+            for athlete in athletes
+        ],
+    }
+
+
+@router.post("/athletes/{athlete_id}/sessions-changed")
+async def sessions_changed(
+    athlete_id: str,
+    current_user: AuthUser = Depends(get_current_user),
+    supabase: AsyncClient = Depends(get_supabase),
+) -> dict[str, str]:
+    """Drop an athlete's cached sessions after a session is edited or deleted.
+
+    New and updated sessions are picked up from updated_at on the next
+    request; deletes are only seen after this call or the periodic reload.
+    Every worker reloads the athlete's load and stroke metrics.
+    """
+    await training_access.require_athlete_access(supabase, current_user, athlete_id)
+    training_load_cache.invalidate(athlete_id)
+    swimming_metrics.invalidate_athlete(athlete_id)
+    await publish_sessions_changed(athlete_id)
+    return {"status": "ok"}
+
+
+@router.post("/sets/metrics")
+async def get_sets_metrics(
+    request: SetMetricsRequest,
+    current_user: AuthUser = Depends(get_current_user),
+    supabase: AsyncClient = Depends(get_supabase),
+) -> dict[str, Any]:
+    """Get DPS, stroke frequency, velocity and swim index for many sets.
+
+    Same values as calculate_swimming_metrics(), in one call. Unknown set
+    ids and sets of athletes the user can't see are left out.
+    """
+    set_ids = await training_access.visible_sets(supabase, current_user, request.set_ids)
+    sets = await swimming_metrics.for_sets(supabase, set_ids)
+    return {"sets": sets}
+
+
+@router.get("/athletes/{athlete_id}/metrics")
+async def get_athlete_metrics(
+    athlete_id: str,
+    date_from: date | None = Query(default=None, description="First session date"),
+    date_to: date | None = Query(default=None, description="Last session date"),
+    current_user: AuthUser = Depends(get_current_user),
+    supabase: AsyncClient = Depends(get_supabase),
+) -> dict[str, Any]:
+    """Get stroke metrics for every set of an athlete's sessions, by date."""
+    if date_from and date_to and date_from > date_to:
+        raise HTTPException(status_code=400, detail="date_from is after date_to")
+    await training_access.require_athlete_access(supabase, current_user, athlete_id)
+    sets = await swimming_metrics.for_athlete(supabase, athlete_id, date_from, date_to)
+    return {"athlete_id": athlete_id, "sets": sets}
+
+
+@router.post("/sets/pacing")
+async def get_sets_pacing(
+    request: SetMetricsRequest,
+    current_user: AuthUser = Depends(get_current_user),
+    supabase: AsyncClient = Depends(get_supabase),
+) -> dict[str, Any]:
+    """Get the pacing profile of many sets from their splits.
+
+    Per set: time of each half, split type (even, negative, positive),
+    fade and lap-to-lap variation of the pace per 100 m. Sets with fewer
+    than two splits have no profile. Sets of athletes the user can't see
+    are left out.
+    """
+    set_ids = await training_access.visible_sets(supabase, current_user, request.set_ids)
+    sets = await pacing.pacing_for_sets(supabase, set_ids)
+    return {"sets": sets}
+
+
+@router.get("/athletes/{athlete_id}/pacing")
+async def get_athlete_pacing(
+    athlete_id: str,
+    date_from: date | None = Query(default=None, description="First session date"),
+    date_to: date | None = Query(default=None, description="Last session date"),
+    test_id: str | None = Query(default=None, description="Only sets of this test"),
+    current_user: AuthUser = Depends(get_current_user),
+    supabase: AsyncClient = Depends(get_supabase),
+) -> dict[str, Any]:
+    """Compare an athlete's pacing across a season.
+
+    Sets are grouped by test and pool length, each group with a summary
+    (split types, mean split difference, fade and variation) and its sets
+    by date.
+    """
+    if date_from and date_to and date_from > date_to:
+        raise HTTPException(status_code=400, detail="date_from is after date_to")
+    await training_access.require_athlete_access(supabase, current_user, athlete_id)
+    groups = await pacing.athlete_pacing(supabase, athlete_id, date_from, date_to, test_id)
+    return {"athlete_id": athlete_id, "tests": groups}
@@ -11,13 +11,75 @@ class Settings(BaseSettings):
     supabase_url: str
     supabase_key: str
 
+    # Shared PostgREST connection pool (per worker)
+    supabase_max_connections: int = 50
+    supabase_max_keepalive: int = 20
+    supabase_keepalive_expiry: float = 30.0
+    supabase_timeout: float = 30.0
+
+    # Local JWT verification; without a secret HS256 tokens are checked remotely
+    supabase_jwt_secret: str = ""
+    supabase_jwt_audience: str = "authenticated"
+    auth_jwks_ttl: int = 600  # 10 min
+    auth_role_cache_ttl: int = 60  # 1 min
+
     # DragonflyDB/Redis cache
     redis_url: str = "redis://localhost:6379"
 
+    # How often in-process state checks the shared versions other workers bump
+    shared_state_check_seconds: float = 5.0
+
     # Cache TTL (seconds)
     cache_ttl_rankings: int = 600  # 10 min
     cache_ttl_comparisons: int = 300  # 5 min
 
+    # Stale-while-revalidate: expired entries are still served (and refreshed
+    # in the background) for this long, unless the endpoint sets its own
+    cache_stale_ttl: int = 3600  # 1 h
+    # Last good response per key, kept in memory for upstream failures
+    cache_snapshot_entries: int = 512
+
+    # Circuit breaker for Supabase reads
+    breaker_window: int = 20
+    breaker_min_calls: int = 10
+    breaker_failure_rate: float = 0.5
+    breaker_slow_call_seconds: float = 5.0
+    breaker_open_seconds: float = 30.0
+
+    # In-process swimmer name index, fully reloaded after this long
+    name_index_refresh_seconds: int = 3600  # 1 h
+
+    # In-process rankings engine, fully reloaded after this long
+    rankings_reload_seconds: int = 3600  # 1 h
+
+    # Local SQLite snapshot of competition results for analytics endpoints
+    analytics_snapshot_path: str = ".analytics/results.db"
+    analytics_refresh_seconds: float = 60.0
+    analytics_rebuild_hours: float = 24.0
+
+    # Per-athlete training session cache, fully reloaded after this long
+    training_load_reload_seconds: int = 3600  # 1 h
+
+    # Training sets whose stroke metrics are kept in memory (validated sets only)
+    swimming_metrics_cache_sets: int = 50000
+
+    # FECNA
+    fecna_base_url: str = "https://ecoapplet.co/fecna/reportes"
+
+    # FECNA raw response cache (content-addressed, used for replay)
+    fecna_cache_dir: str = ".fecna_cache"
+
+    # Background FECNA sync scheduler
+    sync_scheduler_enabled: bool = False
+    sync_requests_per_hour: int = 600
+    sync_min_interval_hours: int = 24
+    sync_activity_window_days: int = 90
+    sync_season_months: list[int] = [2, 3, 4, 5, 6, 7, 8, 9, 10, 11]
+    # IN_PROGRESS older than this was left by a crash and is synced again
+    sync_in_progress_timeout_minutes: int = 60
+    # Shared lease: only the worker holding it runs the scheduler
+    sync_lease_seconds: int = 600  # 10 min
+
     class Config:
         env_file = ".env"
 
@@ -0,0 +1,268 @@
+"""Request and upstream-call instrumentation.
+
+Every HTTP request is timed per route template, and every call to an
+upstream (Supabase/PostgREST through the shared httpx pool, FECNA through
+requests sessions) is counted and timed against the request that made it.
+Totals are exposed in Prometheus text format at /metrics and per request
+in a Server-Timing header, so N+1 call patterns show up as high
+upstream-calls-per-request.
+
+Metrics are per process: with several uvicorn workers, scrape each one or
+aggregate in Prometheus.
+"""
+
+import threading
+import time
+from collections.abc import Awaitable, Callable, Iterable
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+from urllib.parse import urlsplit
+
+import httpx
+from fastapi import Request, Response
+
+# Prometheus default buckets (seconds)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+CALL_COUNT_BUCKETS = (0, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+UPSTREAMS = ("supabase", "fecna")
+
+# Paths served without instrumentation
+SKIP_PATHS = {"/metrics", "/health"}
+
+
+class Histogram:
+    """Cumulative-bucket histogram keyed by a tuple of label values."""
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...], buckets: Iterable[float]):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = tuple(buckets)
+        self._series: dict[tuple[str, ...], list[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values: str) -> None:
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                # One slot per bucket, then +Inf, sum
+                series = self._series[label_values] = [0.0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += 1
+            series[-1] += value
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted(self._series.items())
+        for label_values, series in items:
+            labels = _format_labels(self.labels, label_values)
+            for bound, count in zip(self.buckets, series):
+                lines.append(f'{self.name}_bucket{{{labels},le="{bound:g}"}} {count:g}')
+            lines.append(f'{self.name}_bucket{{{labels},le="+Inf"}} {series[-2]:g}')
+            lines.append(f"{self.name}_count{{{labels}}} {series[-2]:g}")
+            lines.append(f"{self.name}_sum{{{labels}}} {series[-1]:.6f}")
+        return lines
+
+
+class Counter:
+    """Monotonic counter keyed by a tuple of label values."""
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...]):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._series: dict[tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values: str, amount: float = 1) -> None:
+        with self._lock:
+            self._series[label_values] = self._series.get(label_values, 0) + amount
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._series.items())
+        for label_values, value in items:
+            lines.append(f"{self.name}{{{_format_labels(self.labels, label_values)}}} {value:g}")
+        return lines
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...]) -> str:
+    escaped = (
+        str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for v in values
+    )
+    return ",".join(f'{n}="{v}"' for n, v in zip(names, escaped))
+
+
+http_requests = Counter(
+    "sportia_http_requests_total",
+    "HTTP requests by route and status code",
+    ("method", "route", "status"),
+)
+http_latency = Histogram(
+    "sportia_http_request_duration_seconds",
+    "HTTP request latency until response headers, by route",
+    ("method", "route"),
+    LATENCY_BUCKETS,
+)
+upstream_latency = Histogram(
+    "sportia_upstream_request_duration_seconds",
+    "Latency of calls to Supabase and FECNA, by operation",
+    ("upstream", "operation"),
+    LATENCY_BUCKETS,
+)
+upstream_calls = Histogram(
+    "sportia_upstream_calls_per_request",
+    "Upstream calls made while serving one HTTP request",
+    ("route", "upstream"),
+    CALL_COUNT_BUCKETS,
+)
+
+cache_fallbacks = Counter(
+    "sportia_cache_fallbacks_total",
+    "Responses served stale or from the last good snapshot instead of fresh",
+    ("namespace", "source"),
+)
+breaker_transitions = Counter(
+    "sportia_circuit_breaker_transitions_total",
+    "Circuit breaker state changes",
+    ("breaker", "state"),
+)
+
+REGISTRY = (
+    http_requests,
+    http_latency,
+    upstream_latency,
+    upstream_calls,
+    cache_fallbacks,
+    breaker_transitions,
+)
+
+
+@dataclass
+class RequestTimings:
+    """Upstream calls made while serving the current request."""
+
+    calls: dict[str, int] = field(default_factory=lambda: dict.fromkeys(UPSTREAMS, 0))
+    seconds: dict[str, float] = field(default_factory=lambda: dict.fromkeys(UPSTREAMS, 0.0))
+
+    def add(self, upstream: str, elapsed: float) -> None:
+        self.calls[upstream] = self.calls.get(upstream, 0) + 1
+        self.seconds[upstream] = self.seconds.get(upstream, 0.0) + elapsed
+
+    def server_timing(self, total: float) -> str:
+        parts = [f"app;dur={total * 1000:.1f}"]
+        for upstream, count in self.calls.items():
+            if count:
+                ms = self.seconds[upstream] * 1000
+                parts.append(f'{upstream};desc="{count} calls";dur={ms:.1f}')
+        return ", ".join(parts)
+
+
+# Set by the middleware for the duration of each request. Tasks and
+# asyncio.to_thread copy the context, so they share the same object.
+_current: ContextVar[RequestTimings | None] = ContextVar("request_timings", default=None)
+
+
+def current_timings() -> RequestTimings | None:
+    return _current.get()
+
+
+def record_upstream(upstream: str, operation: str, elapsed: float) -> None:
+    """Record one upstream call, globally and against the current request."""
+    upstream_latency.observe(elapsed, upstream, operation)
+    timings = _current.get()
+    if timings is not None:
+        timings.add(upstream, elapsed)
+
+
+def _postgrest_operation(request: httpx.Request) -> str:
+    """Method and PostgREST path, e.g. "POST rpc/get_all_team_codes"."""
+    path = request.url.path
+    for prefix in ("/rest/v1/", "/auth/v1/", "/storage/v1/"):
+        if prefix in path:
+            path = path.split(prefix, 1)[1]
+            break
+    return f"{request.method} {path.strip('/')}"
+
+
+async def _on_supabase_request(request: httpx.Request) -> None:
+    request.extensions["sportia_started"] = time.perf_counter()
+
+
+async def _on_supabase_response(response: httpx.Response) -> None:
+    started = response.request.extensions.get("sportia_started")
+    if started is not None:
+        record_upstream(
+            "supabase", _postgrest_operation(response.request), time.perf_counter() - started
+        )
+
+
+def supabase_event_hooks() -> dict[str, list[Callable[..., Awaitable[None]]]]:
+    """httpx event hooks that time every call of the shared Supabase pool."""
+    return {"request": [_on_supabase_request], "response": [_on_supabase_response]}
+
+
+def instrument_session(session: Any, upstream: str = "fecna") -> Any:
+    """Time every call of a requests session (time to response headers)."""
+
+    def hook(response: Any, *args: Any, **kwargs: Any) -> None:
+        operation = f"{response.request.method} {urlsplit(response.url).path.rsplit('/', 1)[-1]}"
+        record_upstream(upstream, operation, response.elapsed.total_seconds())
+
+    session.hooks["response"].append(hook)
+    return session
+
+
+def _route_label(request: Request) -> str:
+    """Route template ("/api/results/swimmers/{swimmer_name}"), bounded cardinality."""
+    template = getattr(request.scope.get("route"), "path", None)
+    if not template:
+        return "unmatched"
+    # Routes of routers included with a prefix report only their own path;
+    # path parameters span one segment, so the prefix is the extra segments
+    path = request.scope["path"].rstrip("/")
+    extra = path.count("/") - template.rstrip("/").count("/")
+    if extra > 0:
+        template = "/".join(path.split("/")[: extra + 1]) + template
+    return template
+
+
+async def metrics_middleware(
+    request: Request, call_next: Callable[[Request], Awaitable[Response]]
+) -> Response:
+    """Time the request, attach Server-Timing and record route metrics."""
+    if request.url.path in SKIP_PATHS:
+        return await call_next(request)
+
+    timings = RequestTimings()
+    token = _current.set(timings)
+    started = time.perf_counter()
+    status = "500"
+    try:
+        response = await call_next(request)
+        status = str(response.status_code)
+    finally:
+        elapsed = time.perf_counter() - started
+        _current.reset(token)
+        route_path = _route_label(request)
+        http_requests.inc(request.method, route_path, status)
+        http_latency.observe(elapsed, request.method, route_path)
+        for upstream, count in timings.calls.items():
+            upstream_calls.observe(count, route_path, upstream)
+
+    response.headers["Server-Timing"] = timings.server_timing(elapsed)
+    return response
+
+
+def render_metrics() -> str:
+    """All metrics in Prometheus text exposition format."""
+    lines: list[str] = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
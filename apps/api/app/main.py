@@ -1,14 +1,27 @@
 import logging
+import math
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
 
 from app.api.admin_routes import router as admin_router
+from app.api.analytics_routes import router as analytics_router
 from app.api.import_routes import router as import_router
 from app.api.matching_routes import router as matching_router
 from app.api.results_routes import router as results_router
 from app.api.sync_routes import router as sync_router
+from app.api.training_routes import router as training_router
 from app.core.config import settings
+from app.core.metrics import metrics_middleware, render_metrics
+from app.services.auth import role_cache
+from app.services.cache import response_cache
+from app.services.circuit_breaker import CircuitOpenError
+from app.services.shared_state import shared_state
+from app.services.supabase_client import close_supabase, get_supabase
+from app.services.sync_scheduler import sync_scheduler
 
 # Configure logging
 logging.basicConfig(
@@ -16,10 +29,27 @@ logging.basicConfig(
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
 )
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Start and stop background services."""
+    # Open the shared connection pool before the first request
+    get_supabase()
+    if settings.sync_scheduler_enabled:
+        sync_scheduler.start()
+    yield
+    await sync_scheduler.stop()
+    await response_cache.close()
+    await shared_state.close()
+    await role_cache.close()
+    await close_supabase()
+
+
 app = FastAPI(
     title=settings.app_name,
     description="API para rankings, comparaciones y cálculos deportivos",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -28,14 +58,28 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing"],
 )
+app.middleware("http")(metrics_middleware)
 
 # Include routers
 app.include_router(admin_router)
+app.include_router(analytics_router, prefix="/api")
 app.include_router(import_router, prefix="/api")
 app.include_router(matching_router, prefix="/api")
 app.include_router(results_router, prefix="/api")
 app.include_router(sync_router, prefix="/api")
+app.include_router(training_router, prefix="/api")
+
+
+@app.exception_handler(CircuitOpenError)
+async def circuit_open_handler(request: Request, exc: CircuitOpenError) -> JSONResponse:
+    """Upstream failing and nothing cached: fail fast instead of timing out."""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(math.ceil(exc.retry_after))},
+    )
 
 
 @app.get("/health")
@@ -44,6 +88,12 @@ async def health_check() -> dict[str, str]:
     return {"status": "ok"}
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics() -> PlainTextResponse:
+    """Prometheus metrics for this worker."""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+
 @app.get("/")
 async def root() -> dict[str, str]:
     """Root endpoint."""
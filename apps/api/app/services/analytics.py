@@ -0,0 +1,150 @@
+"""Analytic queries over the local results snapshot.
+
+Each function answers one dashboard question with a single SQL query on
+analytics_snapshot (refreshing it first if due), instead of paging through
+swim_competition_results over PostgREST.
+"""
+
+import asyncio
+from typing import Any
+
+from supabase import AsyncClient
+
+from app.services.analytics_snapshot import analytics_snapshot
+
+PROGRESSION_SQL = """
+WITH seasons AS (
+    SELECT distance_m, stroke, year, MIN(final_time_ms) AS best_ms, COUNT(*) AS results
+    FROM results
+    WHERE swimmer_name_norm = ? AND final_time_ms > 0 {filters}
+    GROUP BY distance_m, stroke, year
+)
+SELECT distance_m, stroke, year, best_ms, results,
+       LAG(best_ms) OVER w - best_ms AS improvement_ms
+FROM seasons
+WINDOW w AS (PARTITION BY distance_m, stroke ORDER BY year)
+ORDER BY distance_m, stroke, year
+"""
+
+EVENT_TREND_SQL = """
+WITH best AS (
+    SELECT year, swimmer_name_norm, MIN(final_time_ms) AS best_ms
+    FROM results
+    WHERE distance_m = ? AND stroke = ? AND gender = ? AND final_time_ms > 0 {filters}
+    GROUP BY year, swimmer_name_norm
+),
+ranked AS (
+    SELECT year, best_ms,
+           ROW_NUMBER() OVER (PARTITION BY year ORDER BY best_ms) AS place,
+           COUNT(*) OVER (PARTITION BY year) AS swimmers
+    FROM best
+)
+SELECT year,
+       MAX(swimmers) AS swimmers,
+       MIN(best_ms) AS winning_ms,
+       CAST(AVG(CASE WHEN place <= ? THEN best_ms END) AS INTEGER) AS top_avg_ms,
+       MAX(CASE WHEN place = (swimmers + 1) / 2 THEN best_ms END) AS median_ms
+FROM ranked
+GROUP BY year
+ORDER BY year
+"""
+
+TEAM_COMPARISON_SQL = """
+WITH best AS (
+    SELECT team_code, distance_m, stroke, gender, swimmer_name_norm,
+           MIN(final_time_ms) AS best_ms
+    FROM results
+    WHERE team_code IN ({teams}) AND final_time_ms > 0 {filters}
+    GROUP BY team_code, distance_m, stroke, gender, swimmer_name_norm
+),
+ranked AS (
+    SELECT *, ROW_NUMBER() OVER (
+        PARTITION BY team_code, distance_m, stroke, gender ORDER BY best_ms
+    ) AS place
+    FROM best
+)
+SELECT team_code, distance_m, stroke, gender,
+       COUNT(*) AS swimmers,
+       MIN(best_ms) AS best_ms,
+       CAST(AVG(CASE WHEN place <= ? THEN best_ms END) AS INTEGER) AS top_avg_ms
+FROM ranked
+GROUP BY team_code, distance_m, stroke, gender
+ORDER BY distance_m, stroke, gender, top_avg_ms
+"""
+
+
+def _where(filters: dict[tuple[str, str], Any]) -> tuple[str, list[Any]]:
+    """Extra "AND column op ?" clauses for the non-None filters, keyed by (column, op)."""
+    clauses: list[str] = []
+    params: list[Any] = []
+    for (column, op), value in filters.items():
+        if value is not None:
+            clauses.append(f"AND {column} {op} ?")
+            params.append(value)
+    return " ".join(clauses), params
+
+
+async def _query(supabase: AsyncClient, sql: str, params: list[Any]) -> list[dict[str, Any]]:
+    await analytics_snapshot.ensure_fresh(supabase)
+    return await asyncio.to_thread(analytics_snapshot.query, sql, params)
+
+
+async def swimmer_progression(
+    supabase: AsyncClient,
+    swimmer_name_norm: str,
+    distance: int | None = None,
+    stroke: str | None = None,
+) -> list[dict[str, Any]]:
+    """Best time per season and event, with the improvement over the previous season."""
+    filters, params = _where({
+        ("distance_m", "="): distance,
+        ("stroke", "="): stroke.upper() if stroke else None,
+    })
+    return await _query(
+        supabase, PROGRESSION_SQL.format(filters=filters), [swimmer_name_norm, *params]
+    )
+
+
+async def event_trend(
+    supabase: AsyncClient,
+    distance: int,
+    stroke: str,
+    gender: str,
+    top: int = 8,
+    age_min: int | None = None,
+    age_max: int | None = None,
+) -> list[dict[str, Any]]:
+    """Per year: field size, winning time, mean of the top N and median best time."""
+    filters, params = _where({("age", ">="): age_min, ("age", "<="): age_max})
+    return await _query(
+        supabase,
+        EVENT_TREND_SQL.format(filters=filters),
+        [distance, stroke.upper(), gender.upper(), *params, top],
+    )
+
+
+async def team_comparison(
+    supabase: AsyncClient,
+    team_codes: list[str],
+    gender: str | None = None,
+    year: int | None = None,
+    top: int = 5,
+) -> list[dict[str, Any]]:
+    """Per event, each team's depth: swimmers, best time and mean of its top N."""
+    filters, params = _where({
+        ("gender", "="): gender.upper() if gender else None,
+        ("year", "="): year,
+    })
+    sql = TEAM_COMPARISON_SQL.format(
+        teams=", ".join("?" for _ in team_codes), filters=filters
+    )
+    rows = await _query(supabase, sql, [*team_codes, *params, top])
+
+    events: dict[tuple[int, str, str], list[dict[str, Any]]] = {}
+    for row in rows:
+        key = (row.pop("distance_m"), row.pop("stroke"), row.pop("gender"))
+        events.setdefault(key, []).append(row)
+    return [
+        {"distance_m": distance, "stroke": stroke, "gender": gender, "teams": teams}
+        for (distance, stroke, gender), teams in events.items()
+    ]
@@ -0,0 +1,308 @@
+"""Local SQLite snapshot of swim_competition_results for analytic queries.
+
+Aggregations over every year (progression curves, team comparisons, event
+trends) need whole-table scans that take many PostgREST round trips. The
+snapshot keeps a copy of the analytic columns in a local SQLite file, with
+composite indexes for each query shape, and answers them with one SQL query.
+
+The copy is refreshed incrementally: rows with an id past the stored cursor
+are pulled in keyset pages. Results linked to an athlete are patched in place
+from result_events; bulk rewrites, and every analytics_rebuild_hours, trigger
+a full rebuild to pick up updates and deletes the id cursor can't see. The
+file survives restarts, so a new worker only pulls what it missed.
+"""
+
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+from supabase import AsyncClient
+
+from app.core.config import settings
+from app.services import result_events
+from app.services.pagination import iter_pages
+
+logger = logging.getLogger(__name__)
+
+COLUMNS = [
+    "id",
+    "year",
+    "event_date",
+    "tournament_name",
+    "gender",
+    "distance_m",
+    "stroke",
+    "age",
+    "swimmer_name",
+    "swimmer_name_norm",
+    "team_code",
+    "final_time_ms",
+    "athlete_id",
+]
+
+TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS {table} (
+        id INTEGER PRIMARY KEY,
+        year INTEGER,
+        event_date TEXT,
+        tournament_name TEXT,
+        gender TEXT,
+        distance_m INTEGER,
+        stroke TEXT,
+        age INTEGER,
+        swimmer_name TEXT,
+        swimmer_name_norm TEXT,
+        team_code TEXT,
+        final_time_ms INTEGER,
+        athlete_id TEXT
+    )
+"""
+
+INDEXES = [
+    # Event trends and per-swimmer bests within an event
+    """
+    CREATE INDEX IF NOT EXISTS idx_results_event
+    ON results (distance_m, stroke, gender, year, swimmer_name_norm, final_time_ms)
+    """,
+    # Progression of one swimmer
+    """
+    CREATE INDEX IF NOT EXISTS idx_results_swimmer
+    ON results (swimmer_name_norm, distance_m, stroke, year, final_time_ms)
+    """,
+    # Team comparisons
+    """
+    CREATE INDEX IF NOT EXISTS idx_results_team
+    ON results (team_code, distance_m, stroke, gender, swimmer_name_norm, final_time_ms)
+    """,
+]
+
+
+class AnalyticsSnapshot:
+    """SQLite copy of competition results, refreshed from an id cursor."""
+
+    def __init__(
+        self,
+        path: str | Path,
+        refresh_seconds: float,
+        rebuild_hours: float,
+        page_size: int = 1000,
+    ):
+        self.path = Path(path)
+        self.refresh_seconds = refresh_seconds
+        self.rebuild_hours = rebuild_hours
+        self.page_size = page_size
+        self._writer: sqlite3.Connection | None = None
+        self._reader: sqlite3.Connection | None = None
+        self._write_lock = threading.Lock()
+        self._read_lock = threading.Lock()
+        self._refresh_lock = asyncio.Lock()
+        self._checked_at = 0.0
+        self._stale = False
+        self._rebuild = False
+        self._rebuild_task: asyncio.Task[None] | None = None
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30.0)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-65536")  # 64 MB
+        conn.execute("PRAGMA mmap_size=268435456")  # 256 MB
+        return conn
+
+    def _write_conn(self) -> sqlite3.Connection:
+        if self._writer is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = self._connect()
+            conn.execute(TABLE_SQL.format(table="results"))
+            for statement in INDEXES:
+                conn.execute(statement)
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            conn.commit()
+            self._writer = conn
+        return self._writer
+
+    def _read_conn(self) -> sqlite3.Connection:
+        if self._reader is None:
+            self._write_conn()
+            self._reader = self._connect()
+        return self._reader
+
+    def _meta(self, key: str) -> str | None:
+        conn = self._write_conn()
+        row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row["value"] if row else None
+
+    def _set_meta(self, conn: sqlite3.Connection, key: str, value: Any) -> None:
+        conn.execute(
+            "INSERT INTO meta (key, value) VALUES (?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (key, str(value)),
+        )
+
+    def cursor(self) -> int:
+        """Highest result id copied so far."""
+        with self._write_lock:
+            return int(self._meta("last_id") or 0)
+
+    def _needs_rebuild(self) -> bool:
+        with self._write_lock:
+            built_at = float(self._meta("built_at") or 0)
+        return self._rebuild or time.time() - built_at > self.rebuild_hours * 3600
+
+    def _write_page(self, table: str, rows: list[dict[str, Any]]) -> None:
+        placeholders = ", ".join("?" for _ in COLUMNS)
+        with self._write_lock:
+            conn = self._write_conn()
+            with conn:
+                conn.execute(TABLE_SQL.format(table=table))
+                conn.executemany(
+                    f"INSERT OR REPLACE INTO {table} ({', '.join(COLUMNS)}) "
+                    f"VALUES ({placeholders})",
+                    ([row.get(column) for column in COLUMNS] for row in rows),
+                )
+                if rows and table == "results":
+                    self._set_meta(conn, "last_id", rows[-1]["id"])
+
+    def _swap_build(self, table: str, last_id: int) -> None:
+        """Replace results with the rebuilt table in one transaction."""
+        with self._write_lock:
+            conn = self._write_conn()
+            with conn:
+                # sqlite3 doesn't open transactions for DDL on its own
+                conn.execute("BEGIN IMMEDIATE")
+                conn.execute(TABLE_SQL.format(table=table))
+                conn.execute("DROP TABLE results")
+                conn.execute(f"ALTER TABLE {table} RENAME TO results")
+                for statement in INDEXES:
+                    conn.execute(statement)
+                self._set_meta(conn, "last_id", last_id)
+                self._set_meta(conn, "built_at", time.time())
+            # Fresh statistics for the query planner after a full load
+            conn.execute("ANALYZE")
+
+    async def refresh(self, supabase: AsyncClient, rebuild: bool = False) -> int:
+        """Copy rows past the cursor; returns rows copied.
+
+        A rebuild copies every row into a side table and swaps it in at the
+        end, so queries keep reading the previous copy meanwhile.
+        """
+        after = 0 if rebuild else await asyncio.to_thread(self.cursor)
+        # Workers share the file: each builds in its own table
+        table = f"results_build_{os.getpid()}" if rebuild else "results"
+        if rebuild:
+            await asyncio.to_thread(self.query_write, f"DROP TABLE IF EXISTS {table}")
+
+        copied = 0
+        last_id = after
+        pages = iter_pages(
+            lambda: supabase.table("swim_competition_results")
+            .select(", ".join(COLUMNS))
+            .gt("id", after),
+            page_size=self.page_size,
+        )
+        async for page in pages:
+            await asyncio.to_thread(self._write_page, table, page)
+            copied += len(page)
+            last_id = page[-1]["id"]
+        if rebuild:
+            await asyncio.to_thread(self._swap_build, table, last_id)
+        return copied
+
+    async def ensure_fresh(self, supabase: AsyncClient) -> None:
+        """Pull new rows if the last check is older than refresh_seconds (single flight)."""
+        if not self._stale and time.monotonic() - self._checked_at < self.refresh_seconds:
+            return
+        async with self._refresh_lock:
+            if not self._stale and time.monotonic() - self._checked_at < self.refresh_seconds:
+                return
+            self._stale = False
+            rebuild = await asyncio.to_thread(self._needs_rebuild)
+            self._rebuild = False
+            if rebuild and await asyncio.to_thread(self.cursor) > 0:
+                # Keep serving the current copy while the new one is built
+                if self._rebuild_task is None or self._rebuild_task.done():
+                    self._rebuild_task = asyncio.create_task(self._logged_refresh(supabase, True))
+                rebuild = False
+            await self._logged_refresh(supabase, rebuild)
+            self._checked_at = time.monotonic()
+
+    async def _logged_refresh(self, supabase: AsyncClient, rebuild: bool) -> None:
+        started = time.perf_counter()
+        try:
+            copied = await self.refresh(supabase, rebuild=rebuild)
+        except Exception:
+            if not rebuild:
+                raise
+            logger.exception("Analytics snapshot rebuild failed")
+            self._rebuild = True
+            return
+        if copied or rebuild:
+            logger.info(
+                "Analytics snapshot %s: %d rows in %.1fs",
+                "rebuilt" if rebuild else "refreshed", copied, time.perf_counter() - started,
+            )
+
+    def mark_stale(self, rebuild: bool = False) -> None:
+        """Refresh on the next query instead of waiting for refresh_seconds."""
+        self._stale = True
+        self._rebuild = self._rebuild or rebuild
+
+    def query_write(self, sql: str, params: Iterable[Any] = ()) -> None:
+        """Run one write statement in its own transaction."""
+        with self._write_lock:
+            conn = self._write_conn()
+            with conn:
+                conn.execute(sql, tuple(params))
+
+    def link(self, swimmer_name_norm: str, athlete_id: str) -> None:
+        self.query_write(
+            "UPDATE results SET athlete_id = ? WHERE swimmer_name_norm = ?",
+            (athlete_id, swimmer_name_norm),
+        )
+
+    def query(self, sql: str, params: Iterable[Any] = ()) -> list[dict[str, Any]]:
+        """Run a read-only query; rows as dicts."""
+        with self._read_lock:
+            rows = self._read_conn().execute(sql, tuple(params)).fetchall()
+        return [dict(row) for row in rows]
+
+    def stats(self) -> dict[str, Any]:
+        with self._write_lock:
+            conn = self._write_conn()
+            count = conn.execute("SELECT COUNT(*) AS n FROM results").fetchone()["n"]
+            return {
+                "rows": count,
+                "last_id": int(self._meta("last_id") or 0),
+                "built_at": float(self._meta("built_at") or 0) or None,
+            }
+
+
+analytics_snapshot = AnalyticsSnapshot(
+    settings.analytics_snapshot_path,
+    refresh_seconds=settings.analytics_refresh_seconds,
+    rebuild_hours=settings.analytics_rebuild_hours,
+)
+
+
+@result_events.on_results_added
+def _pull_new_results(supabase: AsyncClient, rows: list[dict[str, Any]]) -> None:
+    # Imported rows carry no id yet; the cursor picks them up
+    analytics_snapshot.mark_stale()
+
+
+@result_events.on_results_linked
+async def _link_results(supabase: AsyncClient, swimmer_name_norm: str, athlete_id: str) -> None:
+    await asyncio.to_thread(analytics_snapshot.link, swimmer_name_norm, athlete_id)
+
+
+@result_events.on_results_invalidated
+def _rebuild_snapshot(supabase: AsyncClient) -> None:
+    analytics_snapshot.mark_stale(rebuild=True)
@@ -1,13 +1,234 @@
 """
 Authentication and authorization utilities for FastAPI endpoints.
+
+Supabase JWTs are verified locally: HS256 tokens with the project's JWT
+secret, asymmetric tokens (RS256/ES256) with the project's JWKS, cached in
+memory. Only when neither is available does verification fall back to a
+GoTrue round trip. Profile roles are cached per user for a short TTL in
+Redis, shared by every worker so a role change applies everywhere at once.
 """
 
-from fastapi import HTTPException, Header, status
-from app.services.supabase_client import get_supabase_admin
-from typing import Optional
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+import httpx
+import jwt
+import redis.asyncio as aioredis
+from fastapi import Header, HTTPException, status
+
+from app.core.config import settings
+from app.services.supabase_client import get_supabase
+
+logger = logging.getLogger(__name__)
+
+ASYMMETRIC_ALGORITHMS = ("RS256", "ES256")
 
+# Minimum seconds between JWKS fetches triggered by unknown key ids
+JWKS_MIN_REFRESH_INTERVAL = 30
 
-async def get_current_user(authorization: str = Header(None)):
+
+@dataclass
+class AuthUser:
+    """Authenticated user, built from verified token claims."""
+    id: str
+    email: str | None = None
+    claims: dict[str, Any] = field(default_factory=dict)
+
+
+class JWKSCache:
+    """
+    Signing keys of the Supabase project, fetched from its JWKS endpoint.
+    Keys are refetched when the TTL expires or an unknown kid shows up
+    (key rotation), at most once every JWKS_MIN_REFRESH_INTERVAL seconds.
+    """
+
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+        # Keys without a kid are stored under None
+        self._keys: dict[str | None, Any] = {}
+        self._fetched_at = 0.0
+        self._lock = asyncio.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"{settings.supabase_url.rstrip('/')}/auth/v1/.well-known/jwks.json"
+
+    def _fresh(self) -> bool:
+        return time.monotonic() - self._fetched_at < self.ttl
+
+    async def _refresh(self) -> None:
+        async with httpx.AsyncClient(timeout=5.0) as client:
+            response = await client.get(self.url)
+            response.raise_for_status()
+        jwk_set = jwt.PyJWKSet.from_dict(response.json())
+        self._keys = {key.key_id: key.key for key in jwk_set.keys}
+        self._fetched_at = time.monotonic()
+
+    async def get_key(self, kid: str | None) -> Any:
+        """Public key for kid, or None if the project doesn't publish it."""
+        if kid in self._keys and self._fresh():
+            return self._keys[kid]
+
+        async with self._lock:
+            recently = (
+                self._fetched_at > 0
+                and time.monotonic() - self._fetched_at < JWKS_MIN_REFRESH_INTERVAL
+            )
+            if not (kid in self._keys and self._fresh()) and not recently:
+                await self._refresh()
+        return self._keys.get(kid)
+
+    def clear(self) -> None:
+        self._keys = {}
+        self._fetched_at = 0.0
+
+
+class RoleCache:
+    """
+    Cache of user id -> profile role with a short TTL, shared by every
+    worker through Redis. Entries carry a tag, so invalidating one user or
+    all of them takes effect in every worker. While Redis is unreachable
+    roles are not cached: each check reads the profile.
+    """
+
+    def __init__(
+        self, url: str, ttl: int, prefix: str = "sportia:role:", retry_after: float = 30.0
+    ):
+        self.url = url
+        self.ttl = ttl
+        self.prefix = prefix
+        self.retry_after = retry_after
+        self._client: aioredis.Redis | None = None
+        self._down_until = 0.0
+
+    def _redis(self) -> aioredis.Redis | None:
+        if time.monotonic() < self._down_until:
+            return None
+        if self._client is None:
+            self._client = aioredis.from_url(
+                self.url,
+                socket_timeout=0.5,
+                socket_connect_timeout=0.5,
+            )
+        return self._client
+
+    def _mark_down(self, error: Exception) -> None:
+        logger.warning(
+            "Role cache unavailable, bypassing for %.0fs: %s", self.retry_after, error
+        )
+        self._down_until = time.monotonic() + self.retry_after
+
+    @property
+    def _tag_key(self) -> str:
+        return f"{self.prefix}tag"
+
+    async def get(self, user_id: str) -> str | None:
+        """Cached role ("" for profiles without one), or None on miss."""
+        client = self._redis()
+        if client is None:
+            return None
+        try:
+            role = await client.get(f"{self.prefix}{user_id}")
+        except Exception as e:
+            self._mark_down(e)
+            return None
+        return role.decode() if isinstance(role, bytes) else role
+
+    async def set(self, user_id: str, role: str | None) -> None:
+        client = self._redis()
+        if client is None:
+            return
+        key = f"{self.prefix}{user_id}"
+        try:
+            async with client.pipeline(transaction=False) as pipe:
+                pipe.set(key, role or "", ex=self.ttl)
+                pipe.sadd(self._tag_key, key)
+                pipe.expire(self._tag_key, self.ttl)
+                await pipe.execute()
+        except Exception as e:
+            self._mark_down(e)
+
+    async def invalidate(self, user_id: str | None = None) -> None:
+        """Forget one user's role, or every cached role if user_id is None."""
+        client = self._redis()
+        if client is None:
+            return
+        try:
+            if user_id is not None:
+                key = f"{self.prefix}{user_id}"
+                await client.delete(key)
+                await client.srem(self._tag_key, key)
+                return
+            keys = await client.smembers(self._tag_key)
+            await client.delete(self._tag_key, *keys)
+        except Exception as e:
+            self._mark_down(e)
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+jwks_cache = JWKSCache(settings.auth_jwks_ttl)
+role_cache = RoleCache(settings.redis_url, settings.auth_role_cache_ttl)
+
+
+async def invalidate_role(user_id: str | None = None) -> None:
+    """Drop cached roles after a role change so the next request rereads it."""
+    await role_cache.invalidate(user_id)
+
+
+async def verify_token(token: str) -> dict[str, Any] | None:
+    """
+    Verify a Supabase access token locally and return its claims.
+    Returns None when it can't be verified locally (no JWT secret for an
+    HS256 token, or the JWKS endpoint is unreachable).
+    Raises jwt.PyJWTError if the token is invalid or expired.
+    """
+    header = jwt.get_unverified_header(token)
+    algorithm = header.get("alg")
+
+    if algorithm == "HS256":
+        if not settings.supabase_jwt_secret:
+            return None
+        key = settings.supabase_jwt_secret
+    elif algorithm in ASYMMETRIC_ALGORITHMS:
+        try:
+            key = await jwks_cache.get_key(header.get("kid"))
+        except (httpx.HTTPError, jwt.PyJWTError, ValueError):
+            return None
+        if key is None:
+            raise jwt.InvalidKeyError("Clave de firma desconocida")
+    else:
+        raise jwt.InvalidAlgorithmError(f"Algoritmo no soportado: {algorithm}")
+
+    return jwt.decode(
+        token,
+        key,
+        algorithms=[algorithm],
+        audience=settings.supabase_jwt_audience,
+        options={"require": ["exp", "sub"]},
+    )
+
+
+async def _remote_user(token: str) -> AuthUser:
+    """Verify the token with GoTrue (one network round trip)."""
+    user_response = await get_supabase().auth.get_user(token)
+
+    if user_response is None or not user_response.user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token inválido o expirado"
+        )
+
+    return AuthUser(id=user_response.user.id, email=user_response.user.email)
+
+
+async def get_current_user(authorization: str = Header(None)) -> AuthUser:
     """
     Get current authenticated user from JWT token.
     Raises HTTPException if token is invalid or missing.
@@ -32,21 +253,27 @@ async def get_current_user(authorization: str = Header(None)):
             detail="Formato de autenticación inválido"
         )
 
-    # Verify token with Supabase
-    supabase = get_supabase_admin()
-
     try:
-        # Get user from token
-        user_response = supabase.auth.get_user(token)
-
-        if not user_response.user:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Token inválido o expirado"
-            )
+        claims = await verify_token(token)
+    except jwt.ExpiredSignatureError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token inválido o expirado"
+        )
+    except jwt.PyJWTError as e:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=f"Error al verificar token: {str(e)}"
+        )
 
-        return user_response.user
+    if claims is not None:
+        return AuthUser(id=claims["sub"], email=claims.get("email"), claims=claims)
 
+    # Not verifiable locally: ask Supabase
+    try:
+        return await _remote_user(token)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -54,31 +281,36 @@ async def get_current_user(authorization: str = Header(None)):
         )
 
 
-async def require_admin(authorization: str = Header(None)):
+async def require_admin(authorization: str = Header(None)) -> AuthUser:
     """
     Require that the current user has ADMIN role.
     Raises HTTPException if user is not authenticated or not an admin.
     """
     user = await get_current_user(authorization)
 
-    # Get user profile to check role
-    supabase = get_supabase_admin()
+    role = await role_cache.get(user.id)
+    if role is None:
+        # Get user profile to check role
+        supabase = get_supabase()
 
-    try:
-        result = supabase.table("profiles").select("role").eq("id", user.id).single().execute()
-
-        if not result.data or result.data.get("role") != "ADMIN":
+        try:
+            result = await (
+                supabase.table("profiles").select("role").eq("id", user.id).single().execute()
+            )
+        except Exception as e:
             raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Acceso denegado. Se requiere rol de administrador."
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error al verificar permisos: {str(e)}"
             )
 
-        return user
+        profile = result.data if isinstance(result.data, dict) else {}
+        role = profile.get("role") or ""
+        await role_cache.set(user.id, role)
 
-    except HTTPException:
-        raise
-    except Exception as e:
+    if role != "ADMIN":
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error al verificar permisos: {str(e)}"
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Acceso denegado. Se requiere rol de administrador."
         )
+
+    return user
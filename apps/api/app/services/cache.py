@@ -0,0 +1,367 @@
+"""Response cache for read endpoints, backed by DragonflyDB/Redis.
+
+Entries are keyed on the endpoint namespace plus its normalized query params,
+expire after the configured TTL and carry tags. Write paths invalidate
+precisely by tag: result changes arrive through result_events, and mapping
+changes are invalidated by the matching routes.
+
+Concurrent misses for the same key are coalesced (single flight) so only one
+request per worker recomputes. If the cache server is unreachable, requests
+fall through to the upstream query.
+
+Expired entries are kept for stale_ttl more seconds (cache_stale_ttl unless
+the endpoint passes its own) and served while a background task refreshes
+them (stale-while-revalidate). Recomputes go through the Supabase circuit
+breaker; when it is open or Supabase fails, the last good response for the
+key kept in memory is served instead. Slow responses are waited for, not
+replaced by a snapshot.
+
+Tag invalidation removes entries and snapshots in every worker: each
+worker drops its own snapshots, and a value read before a tag's last
+invalidation (recorded in Redis) is neither kept in Redis nor served from
+a snapshot.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Iterable
+from typing import Any
+
+import redis.asyncio as aioredis
+from supabase import AsyncClient
+
+from app.core.config import settings
+from app.core.metrics import cache_fallbacks
+from app.services import result_events
+from app.services.circuit_breaker import (
+    CircuitBreaker,
+    CircuitOpenError,
+    is_upstream_error,
+    supabase_breaker,
+)
+
+logger = logging.getLogger(__name__)
+
+# Tags for results-derived responses
+TAG_RESULTS = "results"
+TAG_SEARCH = "results:search"
+TAG_SWIMMER = "results:swimmer"
+TAG_TOURNAMENTS = "results:tournaments"
+TAG_LINKS = "results:links"
+
+# Tags for mapping-derived responses
+TAG_ATHLETE_MATCHES = "matching:athletes"
+TAG_CLUB_MATCHES = "matching:clubs"
+
+
+def event_tag(distance: int, stroke: str, gender: str) -> str:
+    """Tag for responses derived from a single event."""
+    return f"results:event:{distance}:{stroke.upper()}:{gender.upper()}"
+
+
+# Free-text params matched case-insensitively; cursors, ids and the rest
+# are keyed exactly as sent
+TEXT_PARAMS = frozenset({"swimmer_name", "team_code", "tournament", "q", "exclude"})
+
+
+def _normalize(value: Any, fold: bool = False) -> Any:
+    if isinstance(value, str):
+        return value.strip().casefold() if fold else value
+    if isinstance(value, (list, tuple)):
+        return [_normalize(item, fold) for item in value]
+    if isinstance(value, dict):
+        return {key: _normalize(item, fold) for key, item in sorted(value.items())}
+    return value
+
+
+class ResponseCache:
+    """Tagged JSON response cache with single-flight misses."""
+
+    def __init__(
+        self,
+        url: str,
+        breaker: CircuitBreaker,
+        prefix: str = "sportia:cache:",
+        retry_after: float = 30.0,
+        stale_ttl: int = 0,
+        snapshot_entries: int = 0,
+    ):
+        self.url = url
+        self.breaker = breaker
+        self.prefix = prefix
+        self.retry_after = retry_after
+        self.stale_ttl = stale_ttl
+        self.snapshot_entries = snapshot_entries
+        self._client: aioredis.Redis | None = None
+        self._inflight: dict[str, asyncio.Task[Any]] = {}
+        # key -> (stored at, tags, value)
+        self._snapshots: OrderedDict[str, tuple[float, list[str], Any]] = OrderedDict()
+        self._snapshot_keys: dict[str, set[str]] = {}
+        self._down_until = 0.0
+
+    def _redis(self) -> aioredis.Redis | None:
+        if time.monotonic() < self._down_until:
+            return None
+        if self._client is None:
+            self._client = aioredis.from_url(
+                self.url,
+                socket_timeout=0.5,
+                socket_connect_timeout=0.5,
+            )
+        return self._client
+
+    def _mark_down(self, error: Exception) -> None:
+        logger.warning("Cache unavailable, bypassing for %.0fs: %s", self.retry_after, error)
+        self._down_until = time.monotonic() + self.retry_after
+
+    def make_key(self, namespace: str, params: dict[str, Any]) -> str:
+        """Build a cache key from a namespace and its normalized params."""
+        normalized = {
+            key: _normalize(value, key in TEXT_PARAMS)
+            for key, value in sorted(params.items())
+            if value is not None
+        }
+        digest = hashlib.sha1(
+            json.dumps(normalized, sort_keys=True, default=str).encode()
+        ).hexdigest()
+        return f"{self.prefix}{namespace}:{digest}"
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.prefix}tag:{tag}"
+
+    def _invalidated_key(self, tag: str) -> str:
+        return f"{self.prefix}invalidated:{tag}"
+
+    async def _get(self, key: str) -> Any | None:
+        client = self._redis()
+        if client is None:
+            return None
+        try:
+            raw = await client.get(key)
+        except Exception as e:
+            self._mark_down(e)
+            return None
+        return json.loads(raw) if raw is not None else None
+
+    async def _set(
+        self, key: str, value: Any, ttl: int, tags: list[str], started: float | None = None
+    ) -> None:
+        """Store an entry under its tags.
+
+        With started (when the value was read), the entry is removed again if
+        one of its tags was invalidated since: the value predates the change.
+        """
+        client = self._redis()
+        if client is None:
+            return
+        try:
+            payload = json.dumps(value, default=str)
+            async with client.pipeline(transaction=False) as pipe:
+                pipe.set(key, payload, ex=ttl)
+                # Tag sets must outlive every entry they reference
+                tag_ttl = max(ttl, settings.cache_ttl_rankings, settings.cache_ttl_comparisons)
+                for tag in tags:
+                    pipe.sadd(self._tag_key(tag), key)
+                    pipe.expire(self._tag_key(tag), tag_ttl)
+                await pipe.execute()
+            if started is None or not tags:
+                return
+            invalidated = await client.mget([self._invalidated_key(tag) for tag in tags])
+            if any(at is not None and float(at) >= started for at in invalidated):
+                await client.delete(key)
+        except Exception as e:
+            self._mark_down(e)
+
+    def _remember(self, key: str, value: Any, tags: list[str], stored_at: float) -> None:
+        if not self.snapshot_entries:
+            return
+        self._forget(key)
+        self._snapshots[key] = (stored_at, tags, value)
+        for tag in tags:
+            self._snapshot_keys.setdefault(tag, set()).add(key)
+        while len(self._snapshots) > self.snapshot_entries:
+            self._forget(next(iter(self._snapshots)))
+
+    def _forget(self, key: str) -> None:
+        snapshot = self._snapshots.pop(key, None)
+        if snapshot is None:
+            return
+        for tag in snapshot[1]:
+            keys = self._snapshot_keys.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._snapshot_keys[tag]
+
+    async def _snapshot(self, key: str) -> Any | None:
+        """Last good value for key, unless a tag of it was invalidated since."""
+        snapshot = self._snapshots.get(key)
+        if snapshot is None:
+            return None
+        stored_at, tags, value = snapshot
+        client = self._redis()
+        if client is not None and tags:
+            try:
+                invalidated = await client.mget([self._invalidated_key(tag) for tag in tags])
+            except Exception as e:
+                self._mark_down(e)
+            else:
+                if any(at is not None and float(at) >= stored_at for at in invalidated):
+                    self._forget(key)
+                    return None
+        return value
+
+    async def _compute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        ttl: int,
+        stale_ttl: int,
+        tags: list[str],
+    ) -> Any:
+        # Taken before the read: an invalidation during it makes the value stale
+        started = time.time()
+        value = await self.breaker.call(compute)
+        entry = {"fresh_until": time.time() + ttl, "value": value}
+        await self._set(key, entry, ttl + stale_ttl, tags, started)
+        self._remember(key, value, tags, started)
+        return value
+
+    def _start_compute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        ttl: int,
+        stale_ttl: int,
+        tags: list[str],
+    ) -> asyncio.Task[Any]:
+        """Recompute key in its own task, shared by every waiter (single flight).
+
+        The task outlives callers that stop waiting (snapshot fallback, client
+        disconnect), so the result still reaches the cache.
+        """
+        task = self._inflight.get(key)
+        if task is not None:
+            return task
+
+        task = asyncio.create_task(self._compute(key, compute, ttl, stale_ttl, tags))
+        self._inflight[key] = task
+
+        def done(finished: asyncio.Task[Any]) -> None:
+            if self._inflight.get(key) is finished:
+                del self._inflight[key]
+            if finished.cancelled():
+                return
+            # Retrieve so an unobserved failure doesn't log a warning
+            error = finished.exception()
+            if error is not None and not isinstance(error, CircuitOpenError):
+                logger.debug("Recompute of %s failed: %s", key, error)
+
+        task.add_done_callback(done)
+        return task
+
+    async def get_or_compute(
+        self,
+        namespace: str,
+        params: dict[str, Any],
+        compute: Callable[[], Awaitable[Any]],
+        ttl: int,
+        tags: Iterable[str] = (),
+        stale_ttl: int | None = None,
+    ) -> Any:
+        """Return the cached response or compute, store and return it.
+
+        Stale entries are returned at once and refreshed in the background,
+        for stale_ttl seconds past ttl (the cache default if None; 0 never
+        serves stale entries). Raises CircuitOpenError if Supabase is
+        failing and there is nothing cached to fall back on.
+        """
+        key = self.make_key(namespace, params)
+        tags = list(tags)
+        if stale_ttl is None:
+            stale_ttl = self.stale_ttl
+
+        entry = await self._get(key)
+        if isinstance(entry, dict) and "fresh_until" in entry:
+            if entry["fresh_until"] > time.time():
+                return entry["value"]
+            self._start_compute(key, compute, ttl, stale_ttl, tags)
+            cache_fallbacks.inc(namespace, "stale")
+            return entry["value"]
+
+        task = self._start_compute(key, compute, ttl, stale_ttl, tags)
+        try:
+            return await asyncio.shield(task)
+        except Exception as e:
+            # Only upstream failures: bad input must surface as an error
+            if not (isinstance(e, CircuitOpenError) or is_upstream_error(e)):
+                raise
+            snapshot = await self._snapshot(key)
+            if snapshot is None:
+                raise
+            cache_fallbacks.inc(namespace, "snapshot")
+            return snapshot
+
+    async def invalidate_tags(self, tags: Iterable[str]) -> int:
+        """Delete every entry and snapshot carrying any of the tags; returns keys removed."""
+        tags = set(tags)
+        for tag in tags:
+            for key in list(self._snapshot_keys.get(tag, ())):
+                self._forget(key)
+
+        client = self._redis()
+        if client is None:
+            return 0
+        removed = 0
+        now = time.time()
+        try:
+            for tag in tags:
+                # Set first: a compute that writes after the members are read
+                # sees it and removes its own entry (see _set)
+                await client.set(self._invalidated_key(tag), now)
+                tag_key = self._tag_key(tag)
+                members = await client.smembers(tag_key)
+                if members:
+                    removed += await client.delete(*members)
+                await client.delete(tag_key)
+        except Exception as e:
+            self._mark_down(e)
+        return removed
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+response_cache = ResponseCache(
+    settings.redis_url,
+    supabase_breaker,
+    stale_ttl=settings.cache_stale_ttl,
+    snapshot_entries=settings.cache_snapshot_entries,
+)
+
+
+@result_events.on_results_added
+async def _invalidate_added(supabase: AsyncClient, rows: list[dict[str, Any]]) -> None:
+    tags = {TAG_SEARCH, TAG_SWIMMER, TAG_TOURNAMENTS, TAG_LINKS}
+    for row in rows:
+        if row.get("distance_m") and row.get("stroke") and row.get("gender"):
+            tags.add(event_tag(row["distance_m"], row["stroke"], row["gender"]))
+    await response_cache.invalidate_tags(tags)
+
+
+@result_events.on_results_linked
+async def _invalidate_linked(
+    supabase: AsyncClient, swimmer_name_norm: str, athlete_id: str
+) -> None:
+    await response_cache.invalidate_tags([TAG_SEARCH, TAG_SWIMMER, TAG_LINKS])
+
+
+@result_events.on_results_invalidated
+async def _invalidate_all_results(supabase: AsyncClient) -> None:
+    await response_cache.invalidate_tags([TAG_RESULTS])
@@ -0,0 +1,160 @@
+"""Circuit breaker for upstream reads.
+
+The breaker watches the outcome of the last `window` calls. Once at least
+`min_calls` were made and the share of failed or slow calls reaches
+`failure_rate`, it opens: calls fail fast with CircuitOpenError, and callers
+serve cached data instead of piling up on a struggling upstream. After
+`open_seconds` a single probe call is let through (half-open); its outcome
+closes or reopens the breaker.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from typing import TypeVar
+
+import httpx
+from postgrest.exceptions import APIError
+
+from app.core.config import settings
+from app.core.metrics import breaker_transitions
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Network failures and timeouts: the upstream is unreachable or too slow
+UPSTREAM_ERRORS: tuple[type[BaseException], ...] = (
+    httpx.TransportError,
+    OSError,
+    asyncio.TimeoutError,
+)
+
+# PostgREST codes for a failing database: PostgREST's own connection errors
+# and SQLSTATE classes 08 (connection), 53 (resources), 57 (operator
+# intervention, e.g. statement timeout), 58 (system) and XX (internal).
+# Everything else (bad filter, invalid uuid, constraint) is bad input.
+UPSTREAM_CODES = ("PGRST000", "PGRST001", "PGRST002", "PGRST003", "08", "53", "57", "58", "XX")
+
+
+def is_upstream_error(error: BaseException) -> bool:
+    """Whether error means the upstream is failing, as opposed to bad input."""
+    if isinstance(error, UPSTREAM_ERRORS):
+        return True
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code >= 500
+    if isinstance(error, APIError):
+        # Non-JSON error bodies (gateway errors) carry the HTTP status as code
+        if isinstance(error.code, int):
+            return error.code >= 500
+        return isinstance(error.code, str) and error.code.startswith(UPSTREAM_CODES)
+    return False
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the upstream while the breaker is open."""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"{name} no disponible temporalmente")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """Rolling-window breaker on error and slow-call rates."""
+
+    def __init__(
+        self,
+        name: str,
+        window: int,
+        min_calls: int,
+        failure_rate: float,
+        slow_call_seconds: float,
+        open_seconds: float,
+    ):
+        self.name = name
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.open_seconds = open_seconds
+        self.state = CLOSED
+        self._outcomes: deque[bool] = deque(maxlen=window)
+        self._opened_at = 0.0
+        self._probing = False
+
+    def _transition(self, state: str) -> None:
+        if state == self.state:
+            return
+        logger.warning("Circuit breaker %s: %s -> %s", self.name, self.state, state)
+        self.state = state
+        breaker_transitions.inc(self.name, state)
+        if state == OPEN:
+            self._opened_at = time.monotonic()
+        if state == CLOSED:
+            self._outcomes.clear()
+
+    def retry_after(self) -> float:
+        """Seconds until the next probe is allowed (0 if calls go through)."""
+        if self.state == CLOSED:
+            return 0.0
+        return max(self._opened_at + self.open_seconds - time.monotonic(), 0.0)
+
+    def _acquire(self) -> bool:
+        """Whether a call may go through; True means it is the half-open probe."""
+        if self.state == OPEN and self.retry_after() == 0:
+            self._transition(HALF_OPEN)
+        if self.state == CLOSED:
+            return False
+        if self.state == HALF_OPEN and not self._probing:
+            self._probing = True
+            return True
+        raise CircuitOpenError(self.name, self.retry_after() or self.open_seconds)
+
+    def _record(self, ok: bool, probe: bool) -> None:
+        if probe:
+            self._transition(CLOSED if ok else OPEN)
+            return
+        if self.state != CLOSED:
+            return
+        self._outcomes.append(ok)
+        failures = self._outcomes.count(False)
+        if (
+            len(self._outcomes) >= self.min_calls
+            and failures / len(self._outcomes) >= self.failure_rate
+        ):
+            self._transition(OPEN)
+
+    async def call(self, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run fn through the breaker, raising CircuitOpenError while open."""
+        probe = self._acquire()
+        started = time.monotonic()
+        try:
+            result = await fn()
+        except Exception as e:
+            if is_upstream_error(e):
+                self._record(False, probe)
+            raise
+        else:
+            self._record(time.monotonic() - started < self.slow_call_seconds, probe)
+            return result
+        finally:
+            # Other errors (bad input, cancellation) say nothing about the
+            # upstream: the next call probes again
+            if probe:
+                self._probing = False
+
+
+supabase_breaker = CircuitBreaker(
+    "supabase",
+    window=settings.breaker_window,
+    min_calls=settings.breaker_min_calls,
+    failure_rate=settings.breaker_failure_rate,
+    slow_call_seconds=settings.breaker_slow_call_seconds,
+    open_seconds=settings.breaker_open_seconds,
+)
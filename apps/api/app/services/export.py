@@ -0,0 +1,176 @@
+"""Streaming export of competition results as NDJSON, CSV or Parquet.
+
+Rows are read in keyset pages on id and encoded page by page, so memory
+stays at one page regardless of how many rows match.
+
+Parquet needs pyarrow, installed with the optional "export" extra. It is
+imported on the first Parquet export rather than at startup.
+"""
+
+import csv
+import importlib.util
+import io
+import json
+from collections.abc import AsyncIterable, AsyncIterator
+from datetime import date
+from typing import Any
+
+from supabase import AsyncClient
+
+from app.services.pagination import iter_pages
+
+EXPORT_COLUMNS = [
+    "id",
+    "year",
+    "tournament_name",
+    "event_date",
+    "gender",
+    "distance_m",
+    "stroke",
+    "round",
+    "age",
+    "swimmer_name",
+    "swimmer_name_norm",
+    "team_code",
+    "rank",
+    "final_time_ms",
+    "seed_time_ms",
+    "athlete_id",
+    "source",
+]
+
+FORMATS = {
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "csv": ("text/csv; charset=utf-8", "csv"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+# Rows per page; also the Parquet row group size
+EXPORT_PAGE_SIZE = 1000
+
+
+def parquet_available() -> bool:
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def iter_result_pages(
+    supabase: AsyncClient,
+    filters: dict[str, Any],
+    page_size: int = EXPORT_PAGE_SIZE,
+    swimmer_name_like: str | None = None,
+) -> AsyncIterator[list[dict[str, Any]]]:
+    """Pages of swim_competition_results matching equality filters.
+
+    filters maps column to value; list values become IN filters and None
+    values are skipped. swimmer_name_like adds an ILIKE substring match on
+    swimmer_name_norm.
+    """
+
+    def make_query() -> Any:
+        query = supabase.table("swim_competition_results").select(",".join(EXPORT_COLUMNS))
+        for column, value in filters.items():
+            if value is None:
+                continue
+            if isinstance(value, list):
+                query = query.in_(column, value)
+            else:
+                query = query.eq(column, value)
+        if swimmer_name_like:
+            query = query.ilike("swimmer_name_norm", f"%{swimmer_name_like.lower()}%")
+        return query
+
+    return iter_pages(make_query, page_size)
+
+
+async def ndjson_chunks(pages: AsyncIterable[list[dict[str, Any]]]) -> AsyncIterator[bytes]:
+    async for page in pages:
+        yield "".join(json.dumps(row, default=str) + "\n" for row in page).encode()
+
+
+async def csv_chunks(pages: AsyncIterable[list[dict[str, Any]]]) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS, extrasaction="ignore")
+    writer.writeheader()
+    async for page in pages:
+        writer.writerows(page)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands out whatever was written since last drain."""
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: Any) -> int:
+        chunk = bytes(data)
+        self._chunks.append(chunk)
+        self._position += len(chunk)
+        return len(chunk)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _parquet_schema(pa: Any) -> Any:
+    return pa.schema([
+        ("id", pa.int64()),
+        ("year", pa.int16()),
+        ("tournament_name", pa.string()),
+        ("event_date", pa.date32()),
+        ("gender", pa.string()),
+        ("distance_m", pa.int16()),
+        ("stroke", pa.string()),
+        ("round", pa.string()),
+        ("age", pa.int16()),
+        ("swimmer_name", pa.string()),
+        ("swimmer_name_norm", pa.string()),
+        ("team_code", pa.string()),
+        ("rank", pa.int16()),
+        ("final_time_ms", pa.int32()),
+        ("seed_time_ms", pa.int32()),
+        ("athlete_id", pa.string()),
+        ("source", pa.string()),
+    ])
+
+
+async def parquet_chunks(pages: AsyncIterable[list[dict[str, Any]]]) -> AsyncIterator[bytes]:
+    """Encode each page as a Parquet row group and stream it as written."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Parquet export requires pyarrow (install the 'export' extra)")
+
+    schema = _parquet_schema(pa)
+    sink = _ChunkSink()
+    with pq.ParquetWriter(sink, schema, compression="zstd") as writer:
+        async for page in pages:
+            columns = {name: [row.get(name) for row in page] for name in schema.names}
+            columns["event_date"] = [
+                date.fromisoformat(value) if value else None for value in columns["event_date"]
+            ]
+            writer.write_table(pa.Table.from_pydict(columns, schema=schema))
+            yield sink.drain()
+    # Footer is written on close
+    yield sink.drain()
+
+
+ENCODERS = {
+    "ndjson": ndjson_chunks,
+    "csv": csv_chunks,
+    "parquet": parquet_chunks,
+}
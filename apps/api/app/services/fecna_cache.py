@@ -0,0 +1,190 @@
+"""
+Caché en disco de respuestas crudas de FECNA
+Guarda cada payload de getHistorial direccionado por contenido para
+poder reprocesar resultados sin volver a consultar la API
+"""
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class FECNAResponseCache:
+    """
+    Almacén content-addressed de respuestas de FECNA
+
+    Los payloads se guardan en `objects/<sha256[:2]>/<sha256[2:]>` y un
+    índice SQLite relaciona (nadador, prueba, ventana) con el digest.
+    Payloads idénticos se guardan una sola vez.
+    """
+
+    def __init__(self, root_dir: str | Path):
+        self.root = Path(root_dir)
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Abrir (y crear si no existe) el índice de respuestas"""
+        if self._conn is None:
+            (self.root / 'objects').mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.root / 'index.db', check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    nadador_id TEXT NOT NULL,
+                    prueba_id INTEGER NOT NULL,
+                    fecha_inicio TEXT NOT NULL,
+                    fecha_fin TEXT NOT NULL,
+                    digest TEXT NOT NULL,
+                    fetched_at TEXT NOT NULL,
+                    PRIMARY KEY (nadador_id, prueba_id, fecha_inicio, fecha_fin)
+                )
+            """)
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_responses_latest
+                ON responses (nadador_id, prueba_id, fetched_at DESC)
+            """)
+            self._conn = conn
+        return self._conn
+
+    def _object_path(self, digest: str) -> Path:
+        return self.root / 'objects' / digest[:2] / digest[2:]
+
+    def store(
+        self,
+        nadador_id: str,
+        prueba_id: int,
+        fecha_inicio: str,
+        fecha_fin: str,
+        payload: bytes
+    ) -> str:
+        """
+        Guardar una respuesta cruda de getHistorial
+
+        Args:
+            nadador_id: ID del nadador en FECNA
+            prueba_id: ID de la prueba en FECNA
+            fecha_inicio: Inicio de la ventana consultada (YYYY-MM-DD)
+            fecha_fin: Fin de la ventana consultada (YYYY-MM-DD)
+            payload: Cuerpo de la respuesta tal cual llegó
+
+        Returns:
+            Digest SHA-256 del payload
+        """
+        digest = hashlib.sha256(payload).hexdigest()
+        path = self._object_path(digest)
+
+        with self._lock:
+            if not path.exists():
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = path.with_suffix('.tmp')
+                tmp_path.write_bytes(payload)
+                os.replace(tmp_path, path)
+
+            conn = self._connect()
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO responses
+                    (nadador_id, prueba_id, fecha_inicio, fecha_fin, digest, fetched_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    str(nadador_id), prueba_id, fecha_inicio, fecha_fin,
+                    digest, datetime.utcnow().isoformat()
+                )
+            )
+            conn.commit()
+
+        return digest
+
+    def load_athlete(
+        self,
+        nadador_id: str,
+        fecha_inicio: str | None = None,
+        fecha_fin: str | None = None
+    ) -> list[tuple[int, Any]]:
+        """
+        Cargar los payloads en caché de un nadador
+
+        Si no se indica ventana se devuelven todas las ventanas guardadas,
+        para reconstruir el historial completo y no solo la última consulta.
+
+        Returns:
+            Lista de (prueba_id, payload JSON decodificado)
+        """
+        with self._lock:
+            conn = self._connect()
+            if fecha_inicio and fecha_fin:
+                rows = conn.execute(
+                    """
+                    SELECT prueba_id, digest FROM responses
+                    WHERE nadador_id = ? AND fecha_inicio = ? AND fecha_fin = ?
+                    """,
+                    (str(nadador_id), fecha_inicio, fecha_fin)
+                ).fetchall()
+            else:
+                rows = conn.execute(
+                    """
+                    SELECT prueba_id, digest FROM responses
+                    WHERE nadador_id = ?
+                    ORDER BY prueba_id, fecha_inicio, fecha_fin
+                    """,
+                    (str(nadador_id),)
+                ).fetchall()
+
+        payloads: list[tuple[int, Any]] = []
+        # Ventanas distintas con la misma respuesta comparten digest
+        for prueba_id, digest in dict.fromkeys(rows):
+            try:
+                payloads.append((prueba_id, json.loads(self._object_path(digest).read_bytes())))
+            except (OSError, ValueError) as e:
+                logger.warning(f"Payload en caché inválido {digest} (prueba {prueba_id}): {e}")
+
+        return payloads
+
+    def windows(
+        self,
+        nadador_id: str,
+        fecha_inicio: str | None = None,
+        fecha_fin: str | None = None
+    ) -> list[tuple[int, str, str]]:
+        """
+        Ventanas en caché de un nadador, con los mismos filtros que load_athlete
+
+        Returns:
+            Lista de (prueba_id, fecha_inicio, fecha_fin)
+        """
+        with self._lock:
+            conn = self._connect()
+            if fecha_inicio and fecha_fin:
+                rows = conn.execute(
+                    """
+                    SELECT prueba_id, fecha_inicio, fecha_fin FROM responses
+                    WHERE nadador_id = ? AND fecha_inicio = ? AND fecha_fin = ?
+                    """,
+                    (str(nadador_id), fecha_inicio, fecha_fin)
+                ).fetchall()
+            else:
+                rows = conn.execute(
+                    """
+                    SELECT prueba_id, fecha_inicio, fecha_fin FROM responses
+                    WHERE nadador_id = ?
+                    """,
+                    (str(nadador_id),)
+                ).fetchall()
+        return [(prueba_id, inicio, fin) for prueba_id, inicio, fin in rows]
+
+    def nadadores(self) -> list[str]:
+        """IDs de FECNA que tienen al menos una respuesta en caché"""
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT DISTINCT nadador_id FROM responses"
+            ).fetchall()
+        return [row[0] for row in rows]
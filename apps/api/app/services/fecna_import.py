@@ -7,7 +7,9 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any
 
-from supabase import Client
+from supabase import AsyncClient
+
+from app.services import result_events
 
 # Mapping from FECNA styles to Supabase swim_stroke enum
 STYLE_MAP: dict[str, str] = {
@@ -334,7 +336,7 @@ def get_fecna_stats(db_path: str | Path) -> dict[str, Any]:
 
 
 async def import_to_supabase(
-    supabase: Client,
+    supabase: AsyncClient,
     results: list[dict[str, Any]],
     batch_size: int = 500,
 ) -> dict[str, int]:
@@ -354,11 +356,12 @@ async def import_to_supabase(
     for i in range(0, len(results), batch_size):
         batch = results[i:i + batch_size]
         try:
-            response = supabase.table("swim_competition_results").upsert(
+            response = await supabase.table("swim_competition_results").upsert(
                 batch,
                 on_conflict="year,tournament_name,swimmer_name,distance_m,stroke,final_time_ms",
             ).execute()
             imported += len(batch)
+            await result_events.results_added(supabase, batch)
         except Exception as e:
             errors += len(batch)
             print(f"Error importing batch {i}: {e}")
@@ -1,11 +1,12 @@
 """
 Helper para buscar ID de nadadores en FECNA
 """
-import requests
-from bs4 import BeautifulSoup
 from typing import Optional, List, Dict
 import logging
 
+from ..core.config import settings
+from ..core.metrics import instrument_session
+
 logger = logging.getLogger(__name__)
 
 
@@ -24,14 +25,18 @@ def find_swimmer_id(swimmer_name: str) -> Optional[str]:
     Returns:
         ID del nadador en FECNA o None si no se encuentra
     """
+    # requests y bs4 tardan en importar: solo cuando se busca en FECNA
+    import requests
+    from bs4 import BeautifulSoup
+
     try:
-        session = requests.Session()
+        session = instrument_session(requests.Session())
         session.headers.update({
             'User-Agent': 'Mozilla/5.0'
         })
 
         # Cargar página de historial que tiene el select de nadadores
-        url = 'https://ecoapplet.co/fecna/reportes/historial'
+        url = f'{settings.fecna_base_url}/historial'
         resp = session.get(url, timeout=30)
 
         if resp.status_code != 200:
@@ -104,13 +109,16 @@ def search_swimmers(query: str, limit: int = 20) -> List[Dict[str, str]]:
     Returns:
         Lista de diccionarios con {id, name}
     """
+    import requests
+    from bs4 import BeautifulSoup
+
     try:
-        session = requests.Session()
+        session = instrument_session(requests.Session())
         session.headers.update({
             'User-Agent': 'Mozilla/5.0'
         })
 
-        url = 'https://ecoapplet.co/fecna/reportes/historial'
+        url = f'{settings.fecna_base_url}/historial'
         resp = session.get(url, timeout=30)
 
         if resp.status_code != 200:
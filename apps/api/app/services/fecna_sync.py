@@ -2,12 +2,21 @@
 Servicio de sincronización selectiva con API de FECNA
 Obtiene resultados de competencias solo para atletas vinculados
 """
-import requests
-from bs4 import BeautifulSoup
+import asyncio
+import logging
+import threading
 import time
-from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
-import logging
+from functools import lru_cache
+from typing import Any
+
+from supabase import AsyncClient
+
+from ..core.config import settings
+from ..core.metrics import instrument_session
+from . import result_events
+from .fecna_cache import FECNAResponseCache
+from .pagination import iter_pages
 
 logger = logging.getLogger(__name__)
 
@@ -18,8 +27,6 @@ class FECNASyncService:
     solo para atletas específicos
     """
 
-    BASE_URL = "https://ecoapplet.co/fecna/reportes"
-
     # Mapeo de pruebas (ID -> distancia, estilo)
     PRUEBAS = {
         2: (50, 'FREE', 'SCM'),
@@ -41,16 +48,53 @@ class FECNASyncService:
         22: (400, 'IM', 'SCM'),
     }
 
-    def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-        })
+    def __init__(
+        self,
+        cache: FECNAResponseCache | None = None,
+        base_url: str | None = None
+    ):
+        self.base_url = (base_url or settings.fecna_base_url).rstrip('/')
+        # FECNA guarda el nadador consultado en la sesión: una consulta a la vez
+        self._lock = threading.Lock()
+        self._session = None
+        self.cache = cache
+
+    @property
+    def session(self):
+        """Sesión HTTP con FECNA, creada en el primer uso (requests tarda en importar)"""
+        if self._session is None:
+            import requests
+
+            session = instrument_session(requests.Session())
+            session.headers.update({
+                'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
+            })
+            self._session = session
+        return self._session
+
+    @staticmethod
+    def resolve_window(
+        fecha_inicio: str | None = None,
+        fecha_fin: str | None = None
+    ) -> tuple[str, str]:
+        """
+        Resolver la ventana de búsqueda, aplicando los valores por defecto
+
+        Returns:
+            Tupla (fecha_inicio, fecha_fin) en formato YYYY-MM-DD
+        """
+        # Usar rango amplio por defecto para obtener todos los resultados
+        if not fecha_fin:
+            fecha_fin = datetime.now().strftime('%Y-%m-%d')
+        if not fecha_inicio:
+            # 3 años hacia atrás
+            fecha_inicio = (datetime.now() - timedelta(days=1095)).strftime('%Y-%m-%d')
+        return fecha_inicio, fecha_fin
 
     def _initialize_session(self):
         """Obtener cookies de sesión inicial"""
         try:
-            self.session.get(f"{self.BASE_URL}/index")
+            self.session.get(f"{self.base_url}/index")
             logger.info("Sesión FECNA inicializada")
         except Exception as e:
             logger.error(f"Error inicializando sesión: {e}")
@@ -59,8 +103,8 @@ class FECNASyncService:
     def _submit_search_form(
         self,
         nadador_id: str,
-        fecha_inicio: str = None,
-        fecha_fin: str = None
+        fecha_inicio: str | None = None,
+        fecha_fin: str | None = None
     ) -> bool:
         """
         Enviar formulario de búsqueda para establecer contexto de sesión
@@ -73,12 +117,7 @@ class FECNASyncService:
         Returns:
             True si exitoso
         """
-        # Usar rango amplio por defecto para obtener todos los resultados
-        if not fecha_fin:
-            fecha_fin = datetime.now().strftime('%Y-%m-%d')
-        if not fecha_inicio:
-            # 3 años hacia atrás
-            fecha_inicio = (datetime.now() - timedelta(days=1095)).strftime('%Y-%m-%d')
+        fecha_inicio, fecha_fin = self.resolve_window(fecha_inicio, fecha_fin)
 
         payload = (
             f"inicio={fecha_inicio}&"
@@ -92,12 +131,12 @@ class FECNASyncService:
             'Content-Type': 'application/x-www-form-urlencoded',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36',
-            'Referer': f'{self.BASE_URL}/index'
+            'Referer': f'{self.base_url}/index'
         }
 
         try:
             resp = self.session.post(
-                f"{self.BASE_URL}/historialFilter",
+                f"{self.base_url}/historialFilter",
                 data=payload,
                 headers=headers,
                 timeout=30
@@ -119,9 +158,9 @@ class FECNASyncService:
     def get_athlete_results(
         self,
         nadador_id: str,
-        fecha_inicio: str = None,
-        fecha_fin: str = None
-    ) -> List[Dict[str, Any]]:
+        fecha_inicio: str | None = None,
+        fecha_fin: str | None = None
+    ) -> list[dict[str, Any]]:
         """
         Obtener todos los resultados de un nadador
 
@@ -133,6 +172,17 @@ class FECNASyncService:
         Returns:
             Lista de resultados con todas las pruebas
         """
+        with self._lock:
+            return self._fetch_athlete_results(nadador_id, fecha_inicio, fecha_fin)
+
+    def _fetch_athlete_results(
+        self,
+        nadador_id: str,
+        fecha_inicio: str | None = None,
+        fecha_fin: str | None = None
+    ) -> list[dict[str, Any]]:
+        fecha_inicio, fecha_fin = self.resolve_window(fecha_inicio, fecha_fin)
+
         self._initialize_session()
 
         # Enviar formulario para establecer contexto de nadador en sesión
@@ -147,7 +197,7 @@ class FECNASyncService:
             'Cache-Control': 'no-cache',
             'Pragma': 'no-cache',
             'X-Requested-With': 'XMLHttpRequest',
-            'Referer': f'{self.BASE_URL}/historialFilter',
+            'Referer': f'{self.base_url}/historialFilter',
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/144.0.0.0 Safari/537.36'
         })
 
@@ -157,20 +207,24 @@ class FECNASyncService:
         for prueba_id, (distancia, estilo, piscina) in self.PRUEBAS.items():
             try:
                 timestamp = int(time.time() * 1000)
-                url = f"{self.BASE_URL}/{prueba_id}/getHistorial?_={timestamp}"
+                url = f"{self.base_url}/{prueba_id}/getHistorial?_={timestamp}"
 
                 resp = self.session.get(url, timeout=15)
 
                 if resp.status_code == 200:
+                    # Guardar payload crudo para poder reprocesarlo sin red
+                    if self.cache:
+                        try:
+                            self.cache.store(
+                                nadador_id, prueba_id, fecha_inicio, fecha_fin, resp.content
+                            )
+                        except Exception as e:
+                            logger.warning(f"No se pudo guardar prueba {prueba_id} en caché: {e}")
+
                     data = resp.json()
 
                     if isinstance(data, list) and data:
-                        # Agregar info de la prueba a cada resultado
-                        for result in data:
-                            result['distance_m'] = distancia
-                            result['stroke'] = estilo
-                            result['pool_type'] = piscina
-                            all_results.append(result)
+                        all_results.extend(self._tag_results(data, prueba_id))
 
                         logger.info(
                             f"Prueba {prueba_id} ({distancia}m {estilo}): "
@@ -192,11 +246,79 @@ class FECNASyncService:
         logger.info(f"Total resultados para nadador {nadador_id}: {len(all_results)}")
         return all_results
 
+    def _tag_results(self, data: list[dict[str, Any]], prueba_id: int) -> list[dict[str, Any]]:
+        """Agregar info de la prueba (distancia, estilo, piscina) a cada resultado"""
+        distancia, estilo, piscina = self.PRUEBAS[prueba_id]
+        for result in data:
+            result['distance_m'] = distancia
+            result['stroke'] = estilo
+            result['pool_type'] = piscina
+        return data
+
+    def replay_athlete_results(
+        self,
+        nadador_id: str,
+        fecha_inicio: str | None = None,
+        fecha_fin: str | None = None
+    ) -> list[dict[str, Any]]:
+        """
+        Reconstruir los resultados de un nadador desde la caché en disco
+
+        No realiza ninguna petición a FECNA. Sin ventana explícita usa todas
+        las ventanas en caché (los resultados repetidos entre ventanas se
+        descartan al guardar).
+
+        Args:
+            nadador_id: ID del nadador en FECNA
+            fecha_inicio: Fecha inicio de la ventana cacheada
+            fecha_fin: Fecha fin de la ventana cacheada
+
+        Returns:
+            Lista de resultados con el mismo formato que get_athlete_results
+        """
+        if not self.cache:
+            return []
+
+        all_results = []
+        payloads = self.cache.load_athlete(nadador_id, fecha_inicio, fecha_fin)
+
+        for prueba_id, data in payloads:
+            if prueba_id not in self.PRUEBAS or not isinstance(data, list):
+                continue
+            all_results.extend(self._tag_results(data, prueba_id))
+
+        return all_results
+
+    def replay_coverage(
+        self,
+        nadador_id: str,
+        fecha_inicio: str | None = None,
+        fecha_fin: str | None = None
+    ) -> list[tuple[int, str, str, str]]:
+        """
+        Pruebas y ventanas que cubre un replay, para saber qué resultados reemplaza
+
+        Un resultado guardado solo puede darse por eliminado en FECNA si su
+        prueba y su fecha caen en una ventana consultada y guardada en caché.
+
+        Returns:
+            Lista de (distancia, estilo, fecha_inicio, fecha_fin)
+        """
+        if not self.cache:
+            return []
+
+        coverage = []
+        for prueba_id, inicio, fin in self.cache.windows(nadador_id, fecha_inicio, fecha_fin):
+            if prueba_id in self.PRUEBAS:
+                distancia, estilo, _ = self.PRUEBAS[prueba_id]
+                coverage.append((distancia, estilo, inicio, fin))
+        return coverage
+
     def transform_to_competition_result(
         self,
-        fecna_result: Dict[str, Any],
+        fecna_result: dict[str, Any],
         athlete_id: str
-    ) -> Dict[str, Any]:
+    ) -> dict[str, Any]:
         """
         Transformar resultado de FECNA al formato de swim_competition_results
 
@@ -255,5 +377,276 @@ class FECNASyncService:
         }
 
 
-# Instancia global
-fecna_sync = FECNASyncService()
+@lru_cache
+def get_fecna_sync() -> FECNASyncService:
+    """Instancia compartida, creada en la primera sincronización y no al arrancar"""
+    return FECNASyncService(cache=FECNAResponseCache(settings.fecna_cache_dir))
+
+
+# IDs por DELETE ... WHERE id IN (...), para no exceder el largo de URL
+DELETE_BATCH = 100
+
+
+def _result_key(result: dict[str, Any]) -> tuple[Any, ...]:
+    """Clave de deduplicación: mismo torneo, prueba y tiempo"""
+    return (
+        result['tournament_name'],
+        result['distance_m'],
+        result['stroke'],
+        result['final_time_ms'],
+    )
+
+
+def _is_covered(row: dict[str, Any], coverage: list[tuple[int, str, str, str]]) -> bool:
+    """Si la prueba y la fecha del resultado caen en alguna ventana de coverage"""
+    event_date = (row.get('event_date') or '')[:10]
+    if not event_date:
+        return False
+    return any(
+        row['distance_m'] == distancia and row['stroke'] == estilo
+        and inicio <= event_date <= fin
+        for distancia, estilo, inicio, fin in coverage
+    )
+
+
+async def _persist_results(
+    supabase: AsyncClient,
+    athlete_id: str,
+    new_results: list[dict[str, Any]],
+    coverage: list[tuple[int, str, str, str]] | None = None
+) -> tuple[int, int, int]:
+    """
+    Guardar resultados transformados de un atleta evitando duplicados
+
+    Carga una sola vez los resultados existentes del atleta e inserta los
+    nuevos en un único lote, en lugar de un SELECT/INSERT por resultado.
+    Los FECNA_API que ya existen se actualizan si cambió alguna columna
+    (por ejemplo tras corregir transform_to_competition_result).
+
+    Con `coverage`, new_results es todo lo que FECNA devolvió para esas
+    pruebas y ventanas: se borran los FECNA_API de esas pruebas con fecha
+    dentro de ellas que ya no aparecen. Los resultados de pruebas o fechas
+    fuera de coverage no se tocan. Se inserta antes de borrar para que un
+    fallo a mitad de camino deje resultados de más, nunca de menos.
+
+    Args:
+        supabase: Cliente de Supabase
+        athlete_id: UUID del atleta
+        new_results: Resultados en formato swim_competition_results
+        coverage: (distancia, estilo, fecha_inicio, fecha_fin) consultados
+
+    Returns:
+        Tupla (insertados, actualizados, existentes sin cambios)
+    """
+    existing_keys: set[tuple[Any, ...]] = set()
+    fecna_rows: dict[tuple[Any, ...], dict[str, Any]] = {}
+    stale_candidates: list[dict[str, Any]] = []
+    async for page in iter_pages(
+        lambda: supabase.table('swim_competition_results')
+        .select('*')
+        .eq('athlete_id', athlete_id)
+    ):
+        for row in page:
+            key = _result_key(row)
+            existing_keys.add(key)
+            if row['source'] == 'FECNA_API':
+                fecna_rows.setdefault(key, row)
+                stale_candidates.append(row)
+
+    to_insert: list[dict[str, Any]] = []
+    to_update: list[dict[str, Any]] = []
+    existing_count = 0
+
+    for result in new_results:
+        key = _result_key(result)
+        current = fecna_rows.pop(key, None)
+        if current is not None:
+            if any(current.get(column) != value for column, value in result.items()):
+                to_update.append({**result, 'id': current['id']})
+            else:
+                existing_count += 1
+        elif key in existing_keys:
+            existing_count += 1
+        else:
+            existing_keys.add(key)
+            to_insert.append(result)
+
+    if to_insert:
+        await supabase.table('swim_competition_results').insert(to_insert).execute()
+    if to_update:
+        # Upsert por id: un solo request para todas las filas modificadas
+        await supabase.table('swim_competition_results').upsert(to_update).execute()
+
+    stale_ids = []
+    if coverage:
+        new_keys = {_result_key(result) for result in new_results}
+        stale_ids = [
+            row['id'] for row in stale_candidates
+            if _result_key(row) not in new_keys and _is_covered(row, coverage)
+        ]
+        for i in range(0, len(stale_ids), DELETE_BATCH):
+            await supabase.table('swim_competition_results')\
+                .delete()\
+                .in_('id', stale_ids[i:i + DELETE_BATCH])\
+                .execute()
+
+    if stale_ids or to_update:
+        await result_events.results_invalidated(supabase)
+    else:
+        await result_events.results_added(supabase, to_insert)
+
+    return len(to_insert), len(to_update), existing_count
+
+
+async def sync_athlete_results(
+    supabase: AsyncClient,
+    athlete_id: str,
+    fecha_inicio: str | None = None,
+    fecha_fin: str | None = None,
+    replay: bool = False
+) -> dict[str, Any]:
+    """
+    Sincronizar los resultados de un atleta con mapping FECNA confirmado
+
+    Con `replay=True` los resultados se reconstruyen desde la caché en
+    disco (sin red). Sin ventana explícita el replay cubre todas las
+    ventanas en caché. Los FECNA_API existentes se actualizan, y se borran
+    solo los de pruebas y fechas cubiertas por la caché que ya no aparecen.
+
+    Args:
+        supabase: Cliente de Supabase
+        athlete_id: UUID del atleta
+        fecha_inicio: Fecha inicio (YYYY-MM-DD)
+        fecha_fin: Fecha fin (YYYY-MM-DD)
+        replay: Reprocesar desde caché en lugar de consultar FECNA
+
+    Returns:
+        Dict con resultados de la sincronización
+
+    Raises:
+        LookupError: Si no hay mapping confirmado o no hay datos en caché
+        ValueError: Si el mapping no contiene fecna_id
+    """
+    # 1. Obtener mapping del atleta para conseguir su ID de FECNA
+    mapping_resp = await supabase.table('athlete_external_mappings')\
+        .select('*')\
+        .eq('athlete_id', athlete_id)\
+        .eq('source', 'FECNA')\
+        .eq('status', 'CONFIRMED')\
+        .execute()
+
+    if not mapping_resp.data:
+        raise LookupError(f"No hay mapping confirmado de FECNA para atleta {athlete_id}")
+
+    mapping = mapping_resp.data[0]
+    fecna_id = (mapping.get('metadata') or {}).get('fecna_id')
+
+    if not fecna_id:
+        raise ValueError("El mapping no contiene fecna_id en metadata")
+
+    # 2. Obtener nombre del atleta
+    athlete_resp = await supabase.table('athletes')\
+        .select('first_name, last_name')\
+        .eq('id', athlete_id)\
+        .single()\
+        .execute()
+
+    athlete = athlete_resp.data
+    swimmer_name = f"{athlete['first_name']} {athlete['last_name']}"
+
+    fecna_sync = get_fecna_sync()
+    # Pruebas y ventanas que el replay puede reemplazar (None: solo agregar)
+    coverage: list[tuple[int, str, str, str]] | None = None
+    try:
+        if replay:
+            # 3. Reconstruir desde la caché en disco (sin red); SQLite y
+            # archivos son bloqueantes: no detener el event loop
+            results = await asyncio.to_thread(
+                fecna_sync.replay_athlete_results,
+                nadador_id=str(fecna_id),
+                fecha_inicio=fecha_inicio,
+                fecha_fin=fecha_fin
+            )
+            coverage = await asyncio.to_thread(
+                fecna_sync.replay_coverage, str(fecna_id), fecha_inicio, fecha_fin
+            )
+            if not results:
+                raise LookupError(f"No hay respuestas en caché para FECNA ID {fecna_id}")
+        else:
+            # 3. Marcar sincronización como en progreso
+            await supabase.table('athlete_external_mappings')\
+                .update({
+                    'sync_status': 'IN_PROGRESS',
+                    'sync_started_at': datetime.utcnow().isoformat()
+                })\
+                .eq('id', mapping['id'])\
+                .execute()
+
+            # 4. Obtener resultados de FECNA
+            logger.info(f"Sincronizando atleta {swimmer_name} (FECNA ID: {fecna_id})")
+
+            # El scraping es bloqueante: no detener el event loop
+            results = await asyncio.to_thread(
+                fecna_sync.get_athlete_results,
+                nadador_id=str(fecna_id),
+                fecha_inicio=fecha_inicio,
+                fecha_fin=fecha_fin
+            )
+
+        # 5. Transformar y preparar para inserción
+        new_results = []
+        for result in results:
+            transformed = fecna_sync.transform_to_competition_result(result, athlete_id)
+            transformed['swimmer_name'] = swimmer_name
+            transformed['swimmer_name_norm'] = swimmer_name.lower()
+            new_results.append(transformed)
+
+        # 6. Guardar evitando duplicados
+        inserted_count, updated_count, existing_count = await _persist_results(
+            supabase, athlete_id, new_results,
+            coverage=coverage
+        )
+
+        # 7. Actualizar mapping con estado de sincronización
+        # (el replay no consulta FECNA, así que no cuenta como sincronización)
+        if not replay:
+            await supabase.table('athlete_external_mappings')\
+                .update({
+                    'sync_status': 'SUCCESS',
+                    'last_synced_at': datetime.utcnow().isoformat(),
+                    'results_count': len(new_results),
+                    'sync_error': None
+                })\
+                .eq('id', mapping['id'])\
+                .execute()
+
+    except LookupError:
+        raise
+    except Exception as e:
+        if not replay:
+            # Marcar error en mapping
+            try:
+                await supabase.table('athlete_external_mappings')\
+                    .update({
+                        'sync_status': 'ERROR',
+                        'sync_error': str(e)
+                    })\
+                    .eq('id', mapping['id'])\
+                    .execute()
+            except Exception:
+                pass
+        raise
+
+    return {
+        'success': True,
+        'athlete_id': athlete_id,
+        'athlete_name': swimmer_name,
+        'fecna_id': fecna_id,
+        'total_results': len(results),
+        'new_results': inserted_count,
+        'updated_results': updated_count,
+        'existing_results': existing_count,
+        'fecha_inicio': fecha_inicio,
+        'fecha_fin': fecha_fin,
+        'replay': replay
+    }
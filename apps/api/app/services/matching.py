@@ -2,11 +2,14 @@
 
 from typing import Any
 
-from supabase import Client
+from supabase import AsyncClient
+
+from app.services import result_events
+from app.services.pagination import fetch_all, keyset, paginate
 
 
 async def find_athlete_matches(
-    supabase: Client,
+    supabase: AsyncClient,
     external_name: str,
     club_id: str | None = None,
     min_similarity: float = 0.6,
@@ -66,7 +69,7 @@ async def find_athlete_matches(
     if club_id:
         query = query.eq("club_id", club_id)
 
-    response = query.limit(limit * 3).execute()
+    response = await query.limit(limit * 3).execute()
 
     if not response.data:
         return []
@@ -93,10 +96,11 @@ async def find_athlete_matches(
 
 
 async def get_pending_matches(
-    supabase: Client,
+    supabase: AsyncClient,
     match_type: str = "athlete",
     limit: int = 50,
     offset: int = 0,
+    cursor: str | None = None,
 ) -> dict[str, Any]:
     """Get pending matches for review.
 
@@ -104,40 +108,49 @@ async def get_pending_matches(
         supabase: Supabase client instance
         match_type: Type of match ('athlete' or 'club')
         limit: Maximum records to return
-        offset: Records to skip
+        offset: Records to skip (ignored when cursor is given)
+        cursor: next_cursor from the previous page
 
     Returns:
-        Dictionary with matches and total count
+        Dictionary with matches, total count and next_cursor
     """
     table = f"{match_type}_external_mappings"
 
-    # Get total count
-    count_response = (
+    # Get total count (head request, no rows transferred)
+    count_response = await (
         supabase.table(table)
-        .select("*", count="exact")
+        .select("id", count="exact", head=True)
         .eq("status", "PENDING")
         .execute()
     )
     total = count_response.count or 0
 
     # Get paginated results
-    response = (
-        supabase.table(table)
-        .select("*")
-        .eq("status", "PENDING")
-        .order("confidence_score", desc=True)
-        .range(offset, offset + limit - 1)
-        .execute()
-    )
+    query = supabase.table(table).select("*").eq("status", "PENDING")
+    if offset and not cursor:
+        # Legacy offset paging, kept for existing clients
+        response = await (
+            query.order("confidence_score", desc=True)
+            .order("id")
+            .range(offset, offset + limit - 1)
+            .execute()
+        )
+        matches, next_cursor = response.data or [], None
+    else:
+        response = await keyset(
+            query, "confidence_score", cursor, limit, desc=True, value_type=float
+        ).execute()
+        matches, next_cursor = paginate(response.data or [], "confidence_score", limit)
 
     return {
         "total": total,
-        "matches": response.data or [],
+        "matches": matches,
+        "next_cursor": next_cursor,
     }
 
 
 async def get_unmatched_external_names(
-    supabase: Client,
+    supabase: AsyncClient,
     limit: int = 100,
     group_by: str = "team",
     team_code: str | None = None,
@@ -170,27 +183,12 @@ async def get_unmatched_external_names(
             return "M"
 
         # Fetch all results for this team with pagination
-        all_data = []
-        page_size = 1000
-        offset = 0
-
-        while True:
-            response = (
-                supabase.table("swim_competition_results")
-                .select("swimmer_name, swimmer_name_norm, gender, team_code")
-                .eq("team_code", team_code)
-                .is_("athlete_id", "null")
-                .range(offset, offset + page_size - 1)
-                .execute()
-            )
-
-            if not response.data:
-                break
-
-            all_data.extend(response.data)
-            if len(response.data) < page_size:
-                break
-            offset += page_size
+        all_data = await fetch_all(
+            lambda: supabase.table("swim_competition_results")
+            .select("id, swimmer_name, swimmer_name_norm, gender, team_code")
+            .eq("team_code", team_code)
+            .is_("athlete_id", "null")
+        )
 
         # Group and count swimmers
         swimmers_dict: dict[str, dict] = {}
@@ -212,7 +210,7 @@ async def get_unmatched_external_names(
         )[:limit]
     else:
         # Get unique swimmer names from results without athlete_id
-        response = supabase.rpc(
+        response = await supabase.rpc(
             "get_unmatched_swimmers_grouped",
             {"p_limit": limit, "p_group_by": group_by},
         ).execute()
@@ -270,7 +268,7 @@ def _group_by_team_and_gender(data: list[dict]) -> dict[str, dict[str, list[dict
 
 
 async def suggest_matches_batch(
-    supabase: Client,
+    supabase: AsyncClient,
     external_names: list[str],
     min_similarity: float = 0.6,
 ) -> list[dict[str, Any]]:
@@ -304,7 +302,7 @@ async def suggest_matches_batch(
 
 
 async def create_match_suggestion(
-    supabase: Client,
+    supabase: AsyncClient,
     match_type: str,
     external_name: str,
     internal_id: str | None,
@@ -330,7 +328,7 @@ async def create_match_suggestion(
     id_field = f"{match_type}_id"
 
     # Normalize the name
-    norm_response = supabase.rpc(
+    norm_response = await supabase.rpc(
         "normalize_name",
         {"name": external_name},
     ).execute()
@@ -348,13 +346,13 @@ async def create_match_suggestion(
     if internal_id:
         data[id_field] = internal_id
 
-    response = supabase.table(table).insert(data).execute()
+    response = await supabase.table(table).insert(data).execute()
 
     return response.data[0] if response.data else {}
 
 
 async def confirm_match(
-    supabase: Client,
+    supabase: AsyncClient,
     match_type: str,
     mapping_id: str,
     internal_id: str,
@@ -384,7 +382,7 @@ async def confirm_match(
     if reviewed_by:
         update_data["confirmed_by"] = reviewed_by
 
-    response = (
+    response = await (
         supabase.table(table)
         .update(update_data)
         .eq("id", mapping_id)
@@ -404,7 +402,7 @@ async def confirm_match(
 
 
 async def reject_match(
-    supabase: Client,
+    supabase: AsyncClient,
     match_type: str,
     mapping_id: str,
     reviewed_by: str | None = None,
@@ -430,7 +428,7 @@ async def reject_match(
     if reviewed_by:
         update_data["confirmed_by"] = reviewed_by
 
-    response = (
+    response = await (
         supabase.table(table)
         .update(update_data)
         .eq("id", mapping_id)
@@ -441,7 +439,7 @@ async def reject_match(
 
 
 async def link_results_to_athlete(
-    supabase: Client,
+    supabase: AsyncClient,
     external_name_norm: str,
     athlete_id: str,
 ) -> int:
@@ -458,7 +456,7 @@ async def link_results_to_athlete(
     Returns:
         Number of records updated
     """
-    response = (
+    response = await (
         supabase.table("swim_competition_results")
         .update({"athlete_id": athlete_id})
         .eq("swimmer_name_norm", external_name_norm)
@@ -466,11 +464,14 @@ async def link_results_to_athlete(
         .execute()
     )
 
+    if response.data:
+        await result_events.results_linked(supabase, external_name_norm, athlete_id)
+
     return len(response.data) if response.data else 0
 
 
 async def get_match_stats(
-    supabase: Client,
+    supabase: AsyncClient,
 ) -> dict[str, Any]:
     """Get statistics about the matching process.
 
@@ -478,28 +479,28 @@ async def get_match_stats(
         Dictionary with matching statistics
     """
     # Athlete mappings stats
-    athlete_stats = (
+    athlete_stats = await (
         supabase.table("athlete_external_mappings")
         .select("status", count="exact")
         .execute()
     )
 
     # Count by status
-    athlete_pending = (
+    athlete_pending = await (
         supabase.table("athlete_external_mappings")
         .select("*", count="exact")
         .eq("status", "PENDING")
         .execute()
     )
 
-    athlete_confirmed = (
+    athlete_confirmed = await (
         supabase.table("athlete_external_mappings")
         .select("*", count="exact")
         .eq("status", "CONFIRMED")
         .execute()
     )
 
-    athlete_rejected = (
+    athlete_rejected = await (
         supabase.table("athlete_external_mappings")
         .select("*", count="exact")
         .eq("status", "REJECTED")
@@ -507,14 +508,14 @@ async def get_match_stats(
     )
 
     # Results with/without athlete_id
-    results_linked = (
+    results_linked = await (
         supabase.table("swim_competition_results")
         .select("*", count="exact")
         .not_.is_("athlete_id", "null")
         .execute()
     )
 
-    results_unlinked = (
+    results_unlinked = await (
         supabase.table("swim_competition_results")
         .select("*", count="exact")
         .is_("athlete_id", "null")
@@ -535,7 +536,7 @@ async def get_match_stats(
 
 
 async def auto_match_high_confidence(
-    supabase: Client,
+    supabase: AsyncClient,
     min_confidence: float = 0.8,
     dry_run: bool = True,
 ) -> dict[str, Any]:
@@ -550,7 +551,7 @@ async def auto_match_high_confidence(
         Dictionary with auto-match results
     """
     # Get pending matches with high confidence
-    response = (
+    response = await (
         supabase.table("athlete_external_mappings")
         .select("*")
         .eq("status", "PENDING")
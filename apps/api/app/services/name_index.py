@@ -0,0 +1,265 @@
+"""In-process trigram index over distinct swimmer names.
+
+Name searches resolve to exact swimmer_name_norm values here first, so the
+results query becomes an indexed equality/IN filter instead of a
+sequential ILIKE '%name%' scan.
+
+Names are loaded page by page from get_swimmer_names and reloaded when
+another worker publishes new names (shared version) or after
+name_index_refresh_seconds. Until a load has read every page, the index
+reports itself incomplete and callers query the database instead.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, cast
+
+from supabase import AsyncClient
+
+from app.core.config import settings
+from app.services import result_events
+from app.services.fecna_import import normalize_name
+from app.services.shared_state import VersionWatch, shared_state
+
+logger = logging.getLogger(__name__)
+
+# After a failed load, wait this long before trying again
+RETRY_SECONDS = 30.0
+
+
+def trigrams(text: str) -> set[str]:
+    """Trigrams of each word, padded like pg_trgm."""
+    grams: set[str] = set()
+    for word in text.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class NameIndex:
+    """Trigram posting lists over distinct normalized swimmer names."""
+
+    def __init__(
+        self,
+        page_size: int = 1000,
+        refresh_seconds: float | None = None,
+        check_seconds: float | None = None,
+    ) -> None:
+        # PostgREST returns at most max-rows (1000 by default) per call
+        self.page_size = page_size
+        self.refresh_seconds = refresh_seconds or settings.name_index_refresh_seconds
+        self._version = VersionWatch(
+            shared_state, "swimmer-names", check_seconds or settings.shared_state_check_seconds
+        )
+        self._names: list[str] = []
+        self._folded: list[str] = []
+        self._display: list[str] = []
+        self._counts: list[int] = []
+        self._ids: dict[str, int] = {}
+        self._postings: dict[str, set[int]] = {}
+        self._lock = threading.RLock()
+        self._load_lock = asyncio.Lock()
+        self._complete = False
+        self._loaded_at = 0.0
+        self._attempted_at = -RETRY_SECONDS
+        # Names published while a load is in flight, added once it finishes
+        self._pending: list[dict[str, Any]] = []
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    @property
+    def complete(self) -> bool:
+        """Whether the index held every name when it was last loaded."""
+        return self._complete
+
+    async def _stale(self) -> bool:
+        if time.monotonic() - self._loaded_at > self.refresh_seconds:
+            return True
+        return await self._version.changed()
+
+    async def ensure_loaded(self, supabase: AsyncClient) -> bool:
+        """Load every name on first use, and again once stale (single flight).
+
+        Returns whether the index is complete; if not (the load failed),
+        callers should match names in the database instead.
+        """
+        if self._complete and not await self._stale():
+            return True
+        if time.monotonic() - self._attempted_at < RETRY_SECONDS:
+            return self._complete
+        requested = time.monotonic()
+        async with self._load_lock:
+            if not self._complete or self._loaded_at < requested:
+                await self._load(supabase)
+        return self._complete
+
+    async def _load(self, supabase: AsyncClient) -> None:
+        self._attempted_at = time.monotonic()
+        # Read before the names, so a bump during the load triggers another one
+        version = await self._version.current()
+        rows: list[dict[str, Any]] = []
+        after = None
+        try:
+            # Keyset pages on swimmer_name_norm until a short page
+            while True:
+                response = await supabase.rpc(
+                    "get_swimmer_names", {"p_after": after, "p_limit": self.page_size}
+                ).execute()
+                page = cast(list[dict[str, Any]], response.data or [])
+                rows.extend(page)
+                if len(page) < self.page_size:
+                    break
+                after = page[-1]["swimmer_name_norm"]
+        except Exception:
+            logger.exception("Could not load swimmer names, matching in the database")
+            with self._lock:
+                self._complete = False
+                self._pending = []
+            return
+
+        with self._lock:
+            self._clear()
+            self._add(rows)
+            self._add(self._pending)
+            self._pending = []
+            self._complete = True
+            self._loaded_at = time.monotonic()
+            self._version.mark_loaded(version)
+
+    def add_names(self, rows: list[dict[str, Any]]) -> None:
+        """Add names from rows with swimmer_name_norm (and optionally swimmer_name)."""
+        with self._lock:
+            if self._load_lock.locked():
+                self._pending.extend(rows)
+            self._add(rows)
+
+    def _add(self, rows: list[dict[str, Any]]) -> None:
+        with self._lock:
+            for row in rows:
+                name = row.get("swimmer_name_norm")
+                if not name:
+                    continue
+                name_id = self._ids.get(name)
+                if name_id is not None:
+                    self._counts[name_id] += row.get("result_count", 1)
+                    continue
+                name_id = len(self._names)
+                self._ids[name] = name_id
+                # Synced rows are only lowercased, so fold accents for matching
+                folded = normalize_name(name)
+                self._names.append(name)
+                self._folded.append(folded)
+                self._display.append(row.get("swimmer_name") or name)
+                self._counts.append(row.get("result_count", 1))
+                for gram in trigrams(folded):
+                    self._postings.setdefault(gram, set()).add(name_id)
+
+    def clear(self) -> None:
+        """Drop all names; the next ensure_loaded rebuilds from the database."""
+        with self._lock:
+            self._clear()
+            self._pending = []
+            self._complete = False
+            self._attempted_at = -RETRY_SECONDS
+
+    def _clear(self) -> None:
+        self._names.clear()
+        self._folded.clear()
+        self._display.clear()
+        self._counts.clear()
+        self._ids.clear()
+        self._postings.clear()
+
+    async def publish(self, applied: bool = False) -> None:
+        """Make the other workers reload (applied: this index is up to date)."""
+        await self._version.bump(applied=applied)
+
+    def _candidates(self, query_grams: set[str]) -> set[int] | None:
+        """Name ids containing every trigram, or None if the query has none."""
+        postings = sorted(
+            (self._postings.get(gram, set()) for gram in query_grams), key=len
+        )
+        if not postings:
+            return None
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates &= posting
+            if not candidates:
+                break
+        return candidates
+
+    def match(self, query: str, limit: int | None = None) -> list[str]:
+        """Names containing query as a substring (ILIKE '%query%' semantics)."""
+        query = normalize_name(query)
+        if not query:
+            return []
+
+        with self._lock:
+            # Unpadded trigrams of each word: padded edges would anchor the
+            # query to word boundaries, which substring search doesn't
+            grams = {
+                word[i:i + 3] for word in query.split() for i in range(len(word) - 2)
+            }
+            candidates = self._candidates(grams) if grams else None
+            ids = range(len(self._names)) if candidates is None else sorted(candidates)
+
+            matches = []
+            for name_id in ids:
+                if query in self._folded[name_id]:
+                    matches.append(self._names[name_id])
+                    if limit is not None and len(matches) >= limit:
+                        break
+        return matches
+
+    def search(
+        self, query: str, limit: int = 20, min_similarity: float = 0.3
+    ) -> list[dict[str, Any]]:
+        """Fuzzy search ranked by trigram similarity to the query."""
+        query = normalize_name(query)
+        query_grams = trigrams(query)
+        if not query_grams:
+            return []
+
+        with self._lock:
+            shared: dict[int, int] = {}
+            for gram in query_grams:
+                for name_id in self._postings.get(gram, ()):
+                    shared[name_id] = shared.get(name_id, 0) + 1
+
+            scored = []
+            for name_id, hits in shared.items():
+                # Share of the query's trigrams found in the name (word_similarity-like)
+                score = hits / len(query_grams)
+                if query in self._folded[name_id]:
+                    score = max(score, 0.9)
+                if score >= min_similarity:
+                    scored.append((score, self._counts[name_id], name_id))
+
+            scored.sort(key=lambda item: (-item[0], -item[1]))
+            return [
+                {
+                    "swimmer_name_norm": self._names[name_id],
+                    "swimmer_name": self._display[name_id],
+                    "similarity": round(score, 3),
+                    "result_count": count,
+                }
+                for score, count, name_id in scored[:limit]
+            ]
+
+
+name_index = NameIndex()
+
+
+@result_events.on_results_added
+async def _index_new_names(supabase: AsyncClient, rows: list[dict[str, Any]]) -> None:
+    name_index.add_names(rows)
+    await name_index.publish(applied=True)
+
+
+@result_events.on_results_invalidated
+async def _reset_names(supabase: AsyncClient) -> None:
+    name_index.clear()
+    await name_index.publish()
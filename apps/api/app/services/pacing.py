@@ -0,0 +1,222 @@
+"""Pacing profiles from training_splits.
+
+Each split is turned into a pace (ms per 100 m) so sets swum with 25 m and
+50 m splits, or in short and long course, compare on the same scale. Per
+set:
+
+- first_half_ms / second_half_ms: time for each half of the distance
+  (a split crossing the midpoint is shared pro rata)
+- split_diff_pct: second half vs first half; within EVEN_SPLIT_PCT it is an
+  even split, otherwise negative (faster finish) or positive
+- fade_pct: last split's pace vs the fastest split's pace
+- pace_cv_pct: lap-to-lap variation, standard deviation of the split paces
+  over their mean
+
+Splits of many sets are laid out as one (sets x splits) matrix padded with
+NaN, so every profile comes out of the same array operations.
+
+Queries run with the caller's client and no access filter: with the
+service-role client, check the sets or athlete with training_access first.
+"""
+
+from datetime import date
+from typing import Any
+
+import numpy as np
+from supabase import AsyncClient
+
+from app.services.pagination import fetch_all, fetch_in
+from app.services.swimming_metrics import SESSION_COLUMNS, SET_COLUMNS
+
+# Halves within this many percent of each other count as an even split
+EVEN_SPLIT_PCT = 1.0
+
+
+def _round(values: np.ndarray, digits: int = 2) -> list[float | None]:
+    return [None if np.isnan(x) else round(float(x), digits) for x in values]
+
+
+def pacing_profiles(times: np.ndarray, distances: np.ndarray) -> dict[str, np.ndarray]:
+    """Pacing metrics for (sets x splits) matrices of split times and distances.
+
+    Missing splits are NaN. Sets with fewer than two splits get NaN metrics.
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pace = times / distances * 100.0
+        total_ms = np.nansum(times, axis=1)
+        total_m = np.nansum(distances, axis=1)
+
+        # Share of each split that falls in the first half of the distance
+        end = np.nancumsum(distances, axis=1)
+        start = end - distances
+        half = (total_m / 2.0)[:, None]
+        first_share = np.clip((half - start) / distances, 0.0, 1.0)
+        first_half = np.nansum(times * first_share, axis=1)
+        second_half = total_ms - first_half
+        split_diff = (second_half - first_half) / first_half * 100.0
+
+        counts = np.sum(~np.isnan(times), axis=1)
+        last = pace[np.arange(len(pace)), np.maximum(counts - 1, 0)]
+        best = np.nanmin(np.where(np.isnan(pace), np.inf, pace), axis=1)
+        fade = (last - best) / best * 100.0
+        # nanmean/nanstd warn on sets without splits
+        mean_pace = np.nansum(pace, axis=1) / counts
+        deviation = np.sqrt(np.nansum((pace - mean_pace[:, None]) ** 2, axis=1) / counts)
+        cv = deviation / mean_pace * 100.0
+
+    enough = counts >= 2
+    nan = np.full(len(times), np.nan)
+    return {
+        "splits": counts,
+        "mean_pace_ms": np.where(enough, mean_pace, nan),
+        "first_half_ms": np.where(enough, first_half, nan),
+        "second_half_ms": np.where(enough, second_half, nan),
+        "split_diff_pct": np.where(enough, split_diff, nan),
+        "fade_pct": np.where(enough, fade, nan),
+        "pace_cv_pct": np.where(enough, cv, nan),
+    }
+
+
+def pacing_type(split_diff_pct: float | None) -> str | None:
+    if split_diff_pct is None:
+        return None
+    if abs(split_diff_pct) <= EVEN_SPLIT_PCT:
+        return "even"
+    return "negative" if split_diff_pct < 0 else "positive"
+
+
+async def _profiles(
+    supabase: AsyncClient,
+    sets: list[dict[str, Any]],
+    sessions: dict[str, dict[str, Any]],
+) -> list[dict[str, Any]]:
+    """Pacing profile of each set row, with its session date."""
+    if not sets:
+        return []
+    split_rows = await fetch_in(
+        lambda chunk: supabase.table("training_splits")
+        .select("id, training_set_id, split_index, split_distance_m, split_time_ms")
+        .in_("training_set_id", chunk),
+        [row["id"] for row in sets],
+    )
+    by_set: dict[str, list[dict[str, Any]]] = {}
+    for row in split_rows:
+        by_set.setdefault(row["training_set_id"], []).append(row)
+
+    width = max((len(rows) for rows in by_set.values()), default=1)
+    times = np.full((len(sets), width), np.nan)
+    distances = np.full((len(sets), width), np.nan)
+    for i, row in enumerate(sets):
+        splits = sorted(by_set.get(row["id"], []), key=lambda split: split["split_index"])
+        times[i, :len(splits)] = [split["split_time_ms"] for split in splits]
+        distances[i, :len(splits)] = [split["split_distance_m"] for split in splits]
+
+    profiles = pacing_profiles(times, distances)
+    columns = {
+        "mean_pace_ms": _round(profiles["mean_pace_ms"], 0),
+        "first_half_ms": _round(profiles["first_half_ms"], 0),
+        "second_half_ms": _round(profiles["second_half_ms"], 0),
+        "split_diff_pct": _round(profiles["split_diff_pct"]),
+        "fade_pct": _round(profiles["fade_pct"]),
+        "pace_cv_pct": _round(profiles["pace_cv_pct"]),
+    }
+
+    report = []
+    for i, row in enumerate(sets):
+        split_diff = columns["split_diff_pct"][i]
+        report.append({
+            "set_id": row["id"],
+            "session_id": row["session_id"],
+            "session_date": sessions.get(row["session_id"], {}).get("session_date"),
+            "test_id": row["test_id"],
+            "pool_length_m": row["pool_length_m"],
+            "total_time_ms": row["total_time_ms"],
+            "splits": int(profiles["splits"][i]),
+            "pacing": pacing_type(split_diff),
+            **{name: values[i] for name, values in columns.items()},
+        })
+    return report
+
+
+async def pacing_for_sets(supabase: AsyncClient, set_ids: list[str]) -> list[dict[str, Any]]:
+    """Pacing profiles for the given sets, in request order; unknown ids are skipped."""
+    set_ids = list(dict.fromkeys(set_ids))
+    sets = await fetch_in(
+        lambda chunk: supabase.table("training_sets").select(SET_COLUMNS).in_("id", chunk),
+        set_ids,
+    )
+    sessions = await fetch_in(
+        lambda chunk: supabase.table("training_sessions")
+        .select(SESSION_COLUMNS)
+        .in_("id", chunk),
+        list({row["session_id"] for row in sets}),
+    )
+    profiles = {
+        profile["set_id"]: profile
+        for profile in await _profiles(supabase, sets, {row["id"]: row for row in sessions})
+    }
+    return [profiles[set_id] for set_id in set_ids if set_id in profiles]
+
+
+def _summary(profiles: list[dict[str, Any]]) -> dict[str, Any]:
+    """Counts per pacing type and mean metrics over a group of profiles."""
+    analysed = [profile for profile in profiles if profile["pacing"]]
+    summary: dict[str, Any] = {
+        "sets": len(profiles),
+        "analysed": len(analysed),
+        "even": sum(profile["pacing"] == "even" for profile in analysed),
+        "negative": sum(profile["pacing"] == "negative" for profile in analysed),
+        "positive": sum(profile["pacing"] == "positive" for profile in analysed),
+    }
+    for name in ("split_diff_pct", "fade_pct", "pace_cv_pct"):
+        values = [profile[name] for profile in analysed]
+        summary[f"mean_{name}"] = round(float(np.mean(values)), 2) if values else None
+    return summary
+
+
+async def athlete_pacing(
+    supabase: AsyncClient,
+    athlete_id: str,
+    date_from: date | None = None,
+    date_to: date | None = None,
+    test_id: str | None = None,
+) -> list[dict[str, Any]]:
+    """An athlete's pacing across a period, per test and pool length.
+
+    Each group has a summary plus its profiles by date, to compare pacing
+    over a season.
+    """
+
+    def sessions_query() -> Any:
+        query = (
+            supabase.table("training_sessions")
+            .select(SESSION_COLUMNS)
+            .eq("athlete_id", athlete_id)
+        )
+        if date_from:
+            query = query.gte("session_date", date_from.isoformat())
+        if date_to:
+            query = query.lte("session_date", date_to.isoformat())
+        return query
+
+    def sets_query(chunk: list[str]) -> Any:
+        query = supabase.table("training_sets").select(SET_COLUMNS).in_("session_id", chunk)
+        return query.eq("test_id", test_id) if test_id else query
+
+    sessions = {row["id"]: row for row in await fetch_all(sessions_query)}
+    sets = await fetch_in(sets_query, list(sessions))
+    profiles = await _profiles(supabase, sets, sessions)
+    profiles.sort(key=lambda profile: (profile["session_date"] or "", profile["set_id"]))
+
+    groups: dict[tuple[str, int], list[dict[str, Any]]] = {}
+    for profile in profiles:
+        groups.setdefault((profile["test_id"], profile["pool_length_m"]), []).append(profile)
+    return [
+        {
+            "test_id": group_test_id,
+            "pool_length_m": pool_length_m,
+            "summary": _summary(group),
+            "sets": group,
+        }
+        for (group_test_id, pool_length_m), group in groups.items()
+    ]
@@ -0,0 +1,166 @@
+"""Keyset (cursor) pagination helpers for PostgREST queries.
+
+Pages are selected with a WHERE on the last row's sort key instead of
+OFFSET, so every page costs the same as the first and rows don't shift
+between pages when new results land. Sort keys are always (column, id),
+with id as the tiebreaker, and need a composite index to be cheap.
+
+Cursors are opaque to clients: base64url-encoded JSON of the last row's
+sort key. They come back from clients, so decode_cursor() checks the value
+against the sort column's type and the id before keyset() writes them into
+a filter.
+"""
+
+import base64
+import binascii
+import json
+import uuid
+from collections.abc import AsyncIterator, Callable
+from datetime import date
+from typing import Any
+
+
+def encode_cursor(row: dict[str, Any], column: str) -> str:
+    """Cursor pointing just after row in (column, id) order."""
+    payload = json.dumps([row.get(column), row["id"]], separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def _check_value(value: Any, value_type: type) -> Any:
+    """value as a value_type sort key; dates travel as ISO strings."""
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        raise ValueError("Invalid cursor")
+    if value_type is float and isinstance(value, (int, float)):
+        return value
+    if value_type is date and isinstance(value, str):
+        return date.fromisoformat(value).isoformat()
+    if value_type in (int, str) and isinstance(value, value_type):
+        return value
+    raise ValueError("Invalid cursor")
+
+
+def _check_id(last_id: Any) -> int | str:
+    """Row ids are bigints or UUIDs."""
+    if isinstance(last_id, int) and not isinstance(last_id, bool):
+        return last_id
+    if isinstance(last_id, str):
+        return str(uuid.UUID(last_id))
+    raise ValueError("Invalid cursor")
+
+
+def decode_cursor(cursor: str, value_type: type = int) -> tuple[Any, int | str]:
+    """Decode a cursor into (value, id); raises ValueError if malformed.
+
+    value_type is the sort column's type: int, float, str or date.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        value, last_id = json.loads(base64.urlsafe_b64decode(padded))
+        return _check_value(value, value_type), _check_id(last_id)
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def _literal(value: int | float | str) -> str:
+    """A value for an or_() filter.
+
+    Strings are quoted, so commas, dots or parentheses in them can't
+    change the filter.
+    """
+    if isinstance(value, str):
+        escaped = value.replace("\\", "\\\\").replace('"', '\\"')
+        return f'"{escaped}"'
+    return str(value)
+
+
+def keyset(
+    query: Any,
+    column: str,
+    cursor: str | None,
+    limit: int,
+    desc: bool = False,
+    value_type: type = int,
+) -> Any:
+    """Order query by (column, id), start after cursor and fetch limit + 1 rows.
+
+    Rows with NULL in column sort last in both directions. The extra row
+    tells paginate() whether there is a next page.
+    """
+    if cursor:
+        value, last_id = decode_cursor(cursor, value_type)
+        if value is None:
+            query = query.is_(column, "null").gt("id", last_id)
+        else:
+            past = "lt" if desc else "gt"
+            value, last_id = _literal(value), _literal(last_id)
+            query = query.or_(
+                f"{column}.{past}.{value},"
+                f"and({column}.eq.{value},id.gt.{last_id}),"
+                f"{column}.is.null"
+            )
+    return (
+        query.order(column, desc=desc, nullsfirst=False)
+        .order("id")
+        .limit(limit + 1)
+    )
+
+
+def paginate(
+    rows: list[dict[str, Any]], column: str, limit: int
+) -> tuple[list[dict[str, Any]], str | None]:
+    """Trim a keyset() response to limit rows and build the next cursor."""
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1], column)
+
+
+async def iter_pages(
+    make_query: Callable[[], Any],
+    page_size: int = 1000,
+) -> AsyncIterator[list[dict[str, Any]]]:
+    """Yield every page of a query, keyset-paged on id.
+
+    make_query must return a fresh builder (with id selected) on each call,
+    since PostgREST builders are mutated as filters are added.
+    """
+    last_id = None
+    while True:
+        query = make_query()
+        if last_id is not None:
+            query = query.gt("id", last_id)
+        response = await query.order("id").limit(page_size).execute()
+
+        rows = response.data or []
+        if rows:
+            yield rows
+        if len(rows) < page_size:
+            break
+        last_id = rows[-1]["id"]
+
+
+async def fetch_all(
+    make_query: Callable[[], Any], page_size: int = 1000
+) -> list[dict[str, Any]]:
+    """Every row of a query, fetched in keyset pages on id."""
+    return [row async for page in iter_pages(make_query, page_size) for row in page]
+
+
+async def fetch_in(
+    make_query: Callable[[list[Any]], Any],
+    values: list[Any],
+    chunk_size: int = 100,
+    page_size: int = 1000,
+) -> list[dict[str, Any]]:
+    """Every row of a query filtered on a list of values, chunk_size values per request.
+
+    make_query receives one chunk and applies it (usually with in_), which
+    keeps PostgREST URLs short for long id lists.
+    """
+    rows: list[dict[str, Any]] = []
+    for i in range(0, len(values), chunk_size):
+        chunk = values[i:i + chunk_size]
+        rows.extend(await fetch_all(lambda: make_query(chunk), page_size))
+    return rows
@@ -0,0 +1,88 @@
+"""Personal and season bests per swimmer, kept current from result events.
+
+The swimmer_personal_bests and swimmer_season_bests tables hold one row per
+(swimmer, event) and (swimmer, year, event). The refresh_personal_bests RPC
+recomputes them for the swimmers touched by each import, sync or link, so
+swimmer profiles read a few indexed rows instead of raw results.
+"""
+
+from typing import Any, cast
+
+from supabase import AsyncClient
+
+from app.services import result_events
+from app.services.cache import TAG_SWIMMER, response_cache
+
+# Names per RPC call, to keep the request body small
+REFRESH_BATCH_SIZE = 500
+
+
+async def refresh_personal_bests(
+    supabase: AsyncClient, swimmer_names: list[str] | None = None
+) -> int:
+    """Recompute bests for the given normalized names (all swimmers if None).
+
+    Returns the number of personal-best rows written.
+    """
+    if swimmer_names is None:
+        batches: list[list[str] | None] = [None]
+    else:
+        names = sorted(set(swimmer_names))
+        batches = [
+            names[i:i + REFRESH_BATCH_SIZE] for i in range(0, len(names), REFRESH_BATCH_SIZE)
+        ]
+
+    written = 0
+    for batch in batches:
+        response = await supabase.rpc(
+            "refresh_personal_bests", {"p_swimmer_names": batch}
+        ).execute()
+        # The RPC returns the row count as a bare integer
+        written += cast(int, response.data or 0)
+
+    # Profiles cached before the refresh would otherwise outlive it
+    await response_cache.invalidate_tags([TAG_SWIMMER])
+    return written
+
+
+def group_by_event(bests: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Collapse best rows of one or more swimmers into one entry per event.
+
+    Entries keep the profile shape: distance_m, stroke, best_time_ms,
+    best_result and count (results swum in that event).
+    """
+    events: dict[tuple[int, str], dict[str, Any]] = {}
+    for best in bests:
+        key = (best["distance_m"], best["stroke"])
+        event = events.get(key)
+        if event is None:
+            events[key] = {
+                "distance_m": best["distance_m"],
+                "stroke": best["stroke"],
+                "best_time_ms": best["best_time_ms"],
+                "best_result": best,
+                "count": best["result_count"],
+            }
+            continue
+        event["count"] += best["result_count"]
+        if best["best_time_ms"] < event["best_time_ms"]:
+            event["best_time_ms"] = best["best_time_ms"]
+            event["best_result"] = best
+    return sorted(events.values(), key=lambda e: (e["distance_m"], e["stroke"]))
+
+
+@result_events.on_results_added
+async def _refresh_added(supabase: AsyncClient, rows: list[dict[str, Any]]) -> None:
+    names = [row["swimmer_name_norm"] for row in rows if row.get("swimmer_name_norm")]
+    if names:
+        await refresh_personal_bests(supabase, names)
+
+
+@result_events.on_results_linked
+async def _refresh_linked(supabase: AsyncClient, swimmer_name_norm: str, athlete_id: str) -> None:
+    await refresh_personal_bests(supabase, [swimmer_name_norm])
+
+
+@result_events.on_results_invalidated
+async def _refresh_all(supabase: AsyncClient) -> None:
+    await refresh_personal_bests(supabase)
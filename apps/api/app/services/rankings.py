@@ -0,0 +1,524 @@
+"""In-process rankings engine over swim_competition_results.
+
+Keeps, per (distance, stroke, gender, year, age), each swimmer's best time in
+a compact sorted array. Top-N, rank lookups and age/year filters are served
+with bisect and slicing instead of a Supabase round trip per request.
+
+The same load also maintains per age category arrays (overall and per team
+code), used for direct-competitor lookups around a given time.
+
+Each worker keeps its own engine. Results written in one worker are
+applied there and bump a shared version, so the other workers reload on
+their next request; every engine also reloads after rankings_reload_seconds.
+"""
+
+import asyncio
+import heapq
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterator
+from typing import Any
+
+from supabase import AsyncClient
+
+from app.core.config import settings
+from app.services import result_events
+from app.services.pagination import iter_pages
+from app.services.shared_state import VersionWatch, shared_state
+
+# (distance_m, stroke, gender, year, age)
+BucketKey = tuple[int, str, str, int | None, int | None]
+EventKey = tuple[int, str, str]
+# (distance_m, stroke, gender, age_category)
+CategoryKey = tuple[int, str, str, str]
+
+# Columns kept per result: every column ranking rows showed when they were
+# read with select("*") ("rank" is replaced by the ranking position)
+RESULT_COLUMNS = (
+    "id",
+    "year",
+    "tournament_name",
+    "event_date",
+    "gender",
+    "distance_m",
+    "stroke",
+    "round",
+    "age",
+    "swimmer_name",
+    "swimmer_name_norm",
+    "team_code",
+    "athlete_id",
+    "final_time_ms",
+    "seed_time_ms",
+    "source",
+    "created_at",
+)
+
+
+# Mirrors OFFICIAL_DISTANCES in packages/config (src/swimming.ts)
+OFFICIAL_DISTANCES: dict[str, list[int]] = {
+    "FREE": [50, 100, 200, 400, 800, 1500],
+    "BACK": [50, 100, 200],
+    "BREAST": [50, 100, 200],
+    "FLY": [50, 100, 200],
+    "IM": [200, 400],
+}
+
+OFFICIAL_EVENTS: list[EventKey] = [
+    (distance, stroke, gender)
+    for gender in ("F", "M")
+    for stroke, distances in OFFICIAL_DISTANCES.items()
+    for distance in distances
+]
+
+
+def age_category(age: int | None) -> str:
+    """Swimming age category, matching the get_age_category SQL function.
+
+    Results without an age rank in OPEN, as NULL falls through to it in SQL.
+    """
+    if age is None:
+        return "OPEN"
+    if age <= 10:
+        return "10-"
+    if age <= 12:
+        return "11-12"
+    if age <= 14:
+        return "13-14"
+    if age <= 16:
+        return "15-16"
+    if age <= 18:
+        return "17-18"
+    return "OPEN"
+
+
+class BestTimes:
+    """Best time per swimmer for one bucket, kept sorted by time."""
+
+    __slots__ = ("times", "swimmers", "best")
+
+    def __init__(self) -> None:
+        self.times = array("i")
+        self.swimmers: list[str] = []
+        self.best: dict[str, dict[str, Any]] = {}
+
+    @classmethod
+    def from_best(cls, best: dict[str, dict[str, Any]]) -> "BestTimes":
+        bucket = cls()
+        ordered = sorted(best.items(), key=lambda item: item[1]["final_time_ms"])
+        bucket.times = array("i", (row["final_time_ms"] for _, row in ordered))
+        bucket.swimmers = [swimmer for swimmer, _ in ordered]
+        bucket.best = best
+        return bucket
+
+    def offer(self, row: dict[str, Any]) -> bool:
+        """Record a result; returns True if it is the swimmer's new best."""
+        swimmer = row["swimmer_name_norm"]
+        time_ms = row["final_time_ms"]
+        current = self.best.get(swimmer)
+
+        if current is not None:
+            if current["final_time_ms"] <= time_ms:
+                return False
+            i = bisect_left(self.times, current["final_time_ms"])
+            while self.swimmers[i] != swimmer:
+                i += 1
+            del self.times[i]
+            del self.swimmers[i]
+
+        i = bisect_right(self.times, time_ms)
+        self.times.insert(i, time_ms)
+        self.swimmers.insert(i, swimmer)
+        self.best[swimmer] = row
+        return True
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def faster_than(self, time_ms: int) -> Iterator[dict[str, Any]]:
+        """Rows strictly faster than time_ms, nearest first."""
+        for i in range(bisect_left(self.times, time_ms) - 1, -1, -1):
+            yield self.best[self.swimmers[i]]
+
+    def slower_than(self, time_ms: int) -> Iterator[dict[str, Any]]:
+        """Rows strictly slower than time_ms, nearest first."""
+        for i in range(bisect_right(self.times, time_ms), len(self.times)):
+            yield self.best[self.swimmers[i]]
+
+
+def _bucket_key(row: dict[str, Any]) -> BucketKey:
+    return (row["distance_m"], row["stroke"], row["gender"], row.get("year"), row.get("age"))
+
+
+def _category_key(row: dict[str, Any]) -> CategoryKey:
+    return (row["distance_m"], row["stroke"], row["gender"], age_category(row.get("age")))
+
+
+def _offer_best(best: dict[Any, dict[str, dict[str, Any]]], key: Any, row: dict[str, Any]) -> None:
+    swimmers = best.setdefault(key, {})
+    current = swimmers.get(row["swimmer_name_norm"])
+    if current is None or row["final_time_ms"] < current["final_time_ms"]:
+        swimmers[row["swimmer_name_norm"]] = row
+
+
+def _is_rankable(row: dict[str, Any]) -> bool:
+    return bool(
+        row.get("swimmer_name_norm")
+        and row.get("final_time_ms")
+        and row.get("distance_m")
+        and row.get("stroke")
+        and row.get("gender")
+    )
+
+
+class RankingsEngine:
+    """Sorted best-time arrays per event bucket, loaded once and updated incrementally."""
+
+    def __init__(
+        self,
+        page_size: int = 1000,
+        reload_seconds: float | None = None,
+        check_seconds: float | None = None,
+    ) -> None:
+        self.page_size = page_size
+        self.reload_seconds = reload_seconds or settings.rankings_reload_seconds
+        self._version = VersionWatch(
+            shared_state, "rankings", check_seconds or settings.shared_state_check_seconds
+        )
+        self._loaded_at = 0.0
+        self._buckets: dict[BucketKey, BestTimes] = {}
+        self._events: dict[EventKey, set[BucketKey]] = {}
+        self._categories: dict[CategoryKey, BestTimes] = {}
+        self._team_categories: dict[tuple[CategoryKey, str], BestTimes] = {}
+        self._lock = threading.RLock()
+        self._load_lock = asyncio.Lock()
+        self._loaded = False
+        # Results published while a load is in flight, applied once it finishes
+        self._pending: list[dict[str, Any]] = []
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    async def _stale(self) -> bool:
+        if time.monotonic() - self._loaded_at > self.reload_seconds:
+            return True
+        return await self._version.changed()
+
+    async def ensure_loaded(self, supabase: AsyncClient) -> None:
+        """Build the engine from Supabase on first use, and again once stale.
+
+        Single flight: concurrent callers wait for one load. While a reload
+        runs, requests that already had data keep reading the old arrays.
+        """
+        if self._loaded and not await self._stale():
+            return
+        requested = time.monotonic()
+        async with self._load_lock:
+            if not self._loaded or self._loaded_at < requested:
+                await self._load(supabase)
+
+    async def _load(self, supabase: AsyncClient) -> None:
+        best: dict[BucketKey, dict[str, dict[str, Any]]] = {}
+        category_best: dict[CategoryKey, dict[str, dict[str, Any]]] = {}
+        team_best: dict[tuple[CategoryKey, str], dict[str, dict[str, Any]]] = {}
+        # Read before the rows, so a bump during the load triggers another one
+        version = await self._version.current()
+
+        pages = iter_pages(
+            lambda: supabase.table("swim_competition_results").select(",".join(RESULT_COLUMNS)),
+            self.page_size,
+        )
+        async for rows in pages:
+            for row in rows:
+                if not _is_rankable(row):
+                    continue
+                _offer_best(best, _bucket_key(row), row)
+                category = _category_key(row)
+                _offer_best(category_best, category, row)
+                if row.get("team_code"):
+                    _offer_best(team_best, (category, row["team_code"]), row)
+
+        buckets = {key: BestTimes.from_best(swimmers) for key, swimmers in best.items()}
+        events: dict[EventKey, set[BucketKey]] = {}
+        for key in buckets:
+            events.setdefault(key[:3], set()).add(key)
+
+        with self._lock:
+            self._buckets = buckets
+            self._events = events
+            self._categories = {
+                key: BestTimes.from_best(swimmers) for key, swimmers in category_best.items()
+            }
+            self._team_categories = {
+                key: BestTimes.from_best(swimmers) for key, swimmers in team_best.items()
+            }
+            self._loaded = True
+            self._loaded_at = time.monotonic()
+            self._version.mark_loaded(version)
+            pending, self._pending = self._pending, []
+        self.add_results(pending)
+
+    def invalidate(self) -> None:
+        """Drop all data; the next request reloads from Supabase."""
+        with self._lock:
+            self._buckets = {}
+            self._events = {}
+            self._categories = {}
+            self._team_categories = {}
+            self._pending = []
+            self._loaded = False
+
+    def add_results(self, rows: list[dict[str, Any]]) -> int:
+        """Apply new results; returns how many improved a swimmer's best."""
+        improved = 0
+        with self._lock:
+            if self._load_lock.locked():
+                # Also applied to the arrays the running load is building
+                self._pending.extend(rows)
+            if not self._loaded:
+                return 0
+            for row in rows:
+                if not _is_rankable(row):
+                    continue
+                key = _bucket_key(row)
+                bucket = self._buckets.get(key)
+                if bucket is None:
+                    bucket = self._buckets[key] = BestTimes()
+                    self._events.setdefault(key[:3], set()).add(key)
+                row = {column: row.get(column) for column in RESULT_COLUMNS}
+                if bucket.offer(row):
+                    improved += 1
+
+                category = _category_key(row)
+                self._categories.setdefault(category, BestTimes()).offer(row)
+                if row.get("team_code"):
+                    team_key = (category, row["team_code"])
+                    self._team_categories.setdefault(team_key, BestTimes()).offer(row)
+        return improved
+
+    def _matching_buckets(
+        self,
+        distance: int,
+        stroke: str,
+        gender: str,
+        year: int | None = None,
+        age_min: int | None = None,
+        age_max: int | None = None,
+    ) -> list[BestTimes]:
+        keys = self._events.get((distance, stroke.upper(), gender.upper()), set())
+        buckets = []
+        for key in keys:
+            key_year, key_age = key[3], key[4]
+            if year is not None and key_year != year:
+                continue
+            if age_min is not None or age_max is not None:
+                if key_age is None:
+                    continue
+                if age_min is not None and key_age < age_min:
+                    continue
+                if age_max is not None and key_age > age_max:
+                    continue
+            buckets.append(self._buckets[key])
+        return buckets
+
+    @staticmethod
+    def _iter_best(buckets: list[BestTimes]) -> Iterator[dict[str, Any]]:
+        """Yield each swimmer's overall best row across buckets, fastest first."""
+        if len(buckets) == 1:
+            bucket = buckets[0]
+            for swimmer in bucket.swimmers:
+                yield bucket.best[swimmer]
+            return
+
+        seen: set[str] = set()
+        merged = heapq.merge(
+            *(zip(bucket.times, bucket.swimmers, [bucket] * len(bucket)) for bucket in buckets),
+            key=lambda item: item[0],
+        )
+        for _, swimmer, bucket in merged:
+            if swimmer not in seen:
+                seen.add(swimmer)
+                yield bucket.best[swimmer]
+
+    def top(
+        self,
+        distance: int,
+        stroke: str,
+        gender: str,
+        year: int | None = None,
+        age_min: int | None = None,
+        age_max: int | None = None,
+        limit: int = 50,
+    ) -> list[dict[str, Any]]:
+        """Best result per swimmer, fastest first, with rank assigned."""
+        with self._lock:
+            buckets = self._matching_buckets(distance, stroke, gender, year, age_min, age_max)
+            rankings = []
+            for i, row in enumerate(self._iter_best(buckets), 1):
+                rankings.append({**row, "rank": i})
+                if i >= limit:
+                    break
+        return rankings
+
+    def top_many(
+        self,
+        events: list[EventKey],
+        year: int | None = None,
+        age_min: int | None = None,
+        age_max: int | None = None,
+        limit: int = 50,
+    ) -> list[list[dict[str, Any]]]:
+        """top() for several events under one lock, so all rankings are consistent."""
+        with self._lock:
+            return [
+                self.top(distance, stroke, gender, year, age_min, age_max, limit)
+                for distance, stroke, gender in events
+            ]
+
+    def rank_for_time(
+        self,
+        distance: int,
+        stroke: str,
+        gender: str,
+        time_ms: int,
+        year: int | None = None,
+        age_min: int | None = None,
+        age_max: int | None = None,
+    ) -> dict[str, int]:
+        """Rank a time would take (1-based) and the size of the field."""
+        with self._lock:
+            buckets = self._matching_buckets(distance, stroke, gender, year, age_min, age_max)
+            if len(buckets) == 1:
+                bucket = buckets[0]
+                return {"rank": bisect_left(bucket.times, time_ms) + 1, "total": len(bucket)}
+
+            faster = 0
+            total = 0
+            for row in self._iter_best(buckets):
+                total += 1
+                if row["final_time_ms"] < time_ms:
+                    faster += 1
+        return {"rank": faster + 1, "total": total}
+
+    def competitors(
+        self,
+        distance: int,
+        stroke: str,
+        gender: str,
+        category: str,
+        time_ms: int,
+        team_codes: list[str] | None = None,
+        exclude_swimmer: str | None = None,
+        count: int = 3,
+    ) -> dict[str, list[dict[str, Any]]]:
+        """Nearest swimmers faster and slower than time_ms in an age category.
+
+        With team_codes, only swimmers from those teams are considered (club mode).
+        """
+        key = (distance, stroke.upper(), gender.upper(), category)
+        with self._lock:
+            if team_codes is None:
+                found = [self._categories.get(key)]
+            else:
+                found = [self._team_categories.get((key, code)) for code in team_codes]
+            indexes = [index for index in found if index is not None]
+
+            faster = self._nearest(
+                [index.faster_than(time_ms) for index in indexes],
+                time_ms, exclude_swimmer, count,
+            )
+            slower = self._nearest(
+                [index.slower_than(time_ms) for index in indexes],
+                time_ms, exclude_swimmer, count,
+            )
+        return {"faster": faster, "slower": slower}
+
+    def placement(
+        self,
+        distance: int,
+        stroke: str,
+        gender: str,
+        category: str,
+        time_ms: int,
+        neighbours: int = 2,
+    ) -> dict[str, Any]:
+        """Where time_ms would place among swimmers' bests in an age category.
+
+        rank is 1-based (ties share the better rank); percentile is the share
+        of the field the time matches or beats.
+        """
+        key = (distance, stroke.upper(), gender.upper(), category)
+        with self._lock:
+            index = self._categories.get(key)
+            if index is None:
+                faster = ties = total = 0
+            else:
+                faster = bisect_left(index.times, time_ms)
+                ties = bisect_right(index.times, time_ms) - faster
+                total = len(index)
+            nearest: dict[str, list[dict[str, Any]]] = {"faster": [], "slower": []}
+            if neighbours:
+                nearest = self.competitors(
+                    distance, stroke, gender, category, time_ms, count=neighbours
+                )
+        return {
+            "rank": faster + 1,
+            "total": total,
+            "faster": faster,
+            "ties": ties,
+            "percentile": round(100 * (total - faster) / total, 1) if total else None,
+            "nearest_faster": nearest["faster"],
+            "nearest_slower": nearest["slower"],
+        }
+
+    @staticmethod
+    def _nearest(
+        streams: list[Iterator[dict[str, Any]]],
+        time_ms: int,
+        exclude_swimmer: str | None,
+        count: int,
+    ) -> list[dict[str, Any]]:
+        merged = heapq.merge(
+            *streams, key=lambda row: abs(row["final_time_ms"] - time_ms)
+        )
+        seen: set[str] = set()
+        nearest = []
+        for row in merged:
+            swimmer = row["swimmer_name_norm"]
+            if swimmer == exclude_swimmer or swimmer in seen:
+                continue
+            seen.add(swimmer)
+            nearest.append(row)
+            if len(nearest) >= count:
+                break
+        return nearest
+
+    async def publish(self, applied: bool = False) -> None:
+        """Make the other workers' engines reload (applied: this one is up to date)."""
+        await self._version.bump(applied=applied)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "buckets": len(self._buckets),
+                "entries": sum(len(bucket) for bucket in self._buckets.values()),
+                "categories": len(self._categories),
+            }
+
+
+rankings_engine = RankingsEngine()
+
+
+@result_events.on_results_added
+async def _apply_new_results(supabase: AsyncClient, rows: list[dict[str, Any]]) -> None:
+    rankings_engine.add_results(rows)
+    await rankings_engine.publish(applied=True)
+
+
+@result_events.on_results_invalidated
+async def _drop_rankings(supabase: AsyncClient) -> None:
+    rankings_engine.invalidate()
+    await rankings_engine.publish()
@@ -0,0 +1,67 @@
+"""In-process notifications for changes to competition results.
+
+Services that keep derived data (rankings, caches, indexes) subscribe here;
+write paths (import, sync, match confirmation) publish after they commit.
+"""
+
+import inspect
+import logging
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from supabase import AsyncClient
+
+logger = logging.getLogger(__name__)
+
+ResultsAddedHandler = Callable[[AsyncClient, list[dict[str, Any]]], Awaitable[None] | None]
+ResultsLinkedHandler = Callable[[AsyncClient, str, str], Awaitable[None] | None]
+ResultsInvalidatedHandler = Callable[[AsyncClient], Awaitable[None] | None]
+
+_added_handlers: list[ResultsAddedHandler] = []
+_linked_handlers: list[ResultsLinkedHandler] = []
+_invalidated_handlers: list[ResultsInvalidatedHandler] = []
+
+
+def on_results_added(handler: ResultsAddedHandler) -> ResultsAddedHandler:
+    """Register a handler for newly written competition results."""
+    _added_handlers.append(handler)
+    return handler
+
+
+def on_results_linked(handler: ResultsLinkedHandler) -> ResultsLinkedHandler:
+    """Register a handler for results linked to an internal athlete."""
+    _linked_handlers.append(handler)
+    return handler
+
+
+def on_results_invalidated(handler: ResultsInvalidatedHandler) -> ResultsInvalidatedHandler:
+    """Register a handler for bulk changes that can't be described row by row."""
+    _invalidated_handlers.append(handler)
+    return handler
+
+
+async def _dispatch(handlers: list[Callable[..., Any]], *args: Any) -> None:
+    for handler in handlers:
+        try:
+            outcome = handler(*args)
+            if inspect.isawaitable(outcome):
+                await outcome
+        except Exception:
+            # Derived data is best effort; never fail the write that triggered it
+            logger.exception("Error in results event handler %s", handler.__qualname__)
+
+
+async def results_added(supabase: AsyncClient, rows: list[dict[str, Any]]) -> None:
+    """Publish rows inserted or upserted into swim_competition_results."""
+    if rows:
+        await _dispatch(_added_handlers, supabase, rows)
+
+
+async def results_linked(supabase: AsyncClient, swimmer_name_norm: str, athlete_id: str) -> None:
+    """Publish that results for a normalized swimmer name now point to an athlete."""
+    await _dispatch(_linked_handlers, supabase, swimmer_name_norm, athlete_id)
+
+
+async def results_invalidated(supabase: AsyncClient) -> None:
+    """Publish that results were deleted or rewritten in bulk."""
+    await _dispatch(_invalidated_handlers, supabase)
@@ -0,0 +1,164 @@
+"""Cross-worker coordination over the DragonflyDB/Redis server.
+
+Every uvicorn worker keeps its own in-process state (rankings engine, name
+index, role and session caches). Workers coordinate through two primitives:
+
+- Versions: a writer bumps a named counter after changing the data behind
+  a piece of state; readers remember the version they loaded and reload
+  when it moves. VersionWatch checks at most every few seconds, so reads
+  stay local.
+- Leases: a key held by one worker for a TTL and renewed while it keeps
+  working, so a background job runs in a single worker at a time.
+
+If the server is unreachable, versions read as None (callers rely on their
+own reload interval) and leases are not granted.
+"""
+
+import logging
+import os
+import socket
+import time
+
+import redis.asyncio as aioredis
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Identifies this worker as a lease holder
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+
+class SharedState:
+    """Version counters and leases shared by every worker."""
+
+    def __init__(self, url: str, prefix: str = "sportia:state:", retry_after: float = 30.0):
+        self.url = url
+        self.prefix = prefix
+        self.retry_after = retry_after
+        self._client: aioredis.Redis | None = None
+        self._down_until = 0.0
+
+    def _redis(self) -> aioredis.Redis | None:
+        if time.monotonic() < self._down_until:
+            return None
+        if self._client is None:
+            self._client = aioredis.from_url(
+                self.url,
+                socket_timeout=0.5,
+                socket_connect_timeout=0.5,
+            )
+        return self._client
+
+    def _mark_down(self, error: Exception) -> None:
+        logger.warning(
+            "Shared state unavailable, retrying in %.0fs: %s", self.retry_after, error
+        )
+        self._down_until = time.monotonic() + self.retry_after
+
+    def _key(self, kind: str, name: str) -> str:
+        return f"{self.prefix}{kind}:{name}"
+
+    async def versions(self, names: list[str]) -> list[int] | None:
+        """Current version of each name (0 if never bumped), or None if unreachable."""
+        client = self._redis()
+        if client is None:
+            return None
+        if not names:
+            return []
+        try:
+            values = await client.mget([self._key("version", name) for name in names])
+        except Exception as e:
+            self._mark_down(e)
+            return None
+        return [int(value or 0) for value in values]
+
+    async def bump(self, names: list[str]) -> list[int] | None:
+        """Advance the versions of names, telling other workers to reload.
+
+        Returns the new versions, or None if unreachable.
+        """
+        client = self._redis()
+        if client is None:
+            return None
+        try:
+            async with client.pipeline(transaction=False) as pipe:
+                for name in names:
+                    pipe.incr(self._key("version", name))
+                return [int(value) for value in await pipe.execute()]
+        except Exception as e:
+            self._mark_down(e)
+            return None
+
+    async def acquire_lease(self, name: str, ttl: int, owner: str = WORKER_ID) -> bool:
+        """Take or renew the lease on name for ttl seconds; False if another worker holds it."""
+        client = self._redis()
+        if client is None:
+            return False
+        key = self._key("lease", name)
+        try:
+            if await client.set(key, owner, nx=True, ex=ttl):
+                return True
+            if await client.get(key) == owner.encode():
+                await client.expire(key, ttl)
+                return True
+        except Exception as e:
+            self._mark_down(e)
+        return False
+
+    async def release_lease(self, name: str, owner: str = WORKER_ID) -> None:
+        client = self._redis()
+        if client is None:
+            return
+        key = self._key("lease", name)
+        try:
+            if await client.get(key) == owner.encode():
+                await client.delete(key)
+        except Exception as e:
+            self._mark_down(e)
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+class VersionWatch:
+    """Tracks one shared version for a piece of in-process state."""
+
+    def __init__(self, state: SharedState, name: str, check_seconds: float):
+        self.state = state
+        self.name = name
+        self.check_seconds = check_seconds
+        self.loaded: int | None = None
+        self._checked_at = 0.0
+
+    async def current(self) -> int | None:
+        versions = await self.state.versions([self.name])
+        return versions[0] if versions else None
+
+    async def changed(self) -> bool:
+        """Whether the version moved since mark_loaded (checked every check_seconds)."""
+        if time.monotonic() - self._checked_at < self.check_seconds:
+            return False
+        self._checked_at = time.monotonic()
+        version = await self.current()
+        return version is not None and version != self.loaded
+
+    def mark_loaded(self, version: int | None) -> None:
+        """Record the version read before the state was (re)loaded."""
+        self.loaded = version
+        self._checked_at = time.monotonic()
+
+    async def bump(self, applied: bool = False) -> None:
+        """Tell other workers to reload.
+
+        With applied, this worker already holds the change: if nobody else
+        bumped since its load, it keeps its state instead of reloading.
+        """
+        versions = await self.state.bump([self.name])
+        if applied and versions and self.loaded == versions[0] - 1:
+            self.loaded = versions[0]
+
+
+shared_state = SharedState(settings.redis_url)
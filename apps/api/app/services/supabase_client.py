@@ -1,12 +1,17 @@
 """
 Supabase client configuration for FastAPI.
-Uses service role key for admin operations.
+Data routes share one async client per worker; admin operations use the
+service role key.
 """
 
 import os
-from supabase import create_client, Client
+import httpx
+from supabase import AsyncClient, AsyncClientOptions, create_client, Client
 from functools import lru_cache
 
+from app.core.config import settings
+from app.core.metrics import supabase_event_hooks
+
 # Get environment variables
 SUPABASE_URL = os.getenv("SUPABASE_URL", "https://dbnihrkysrjdvglsfavk.supabase.co")
 SUPABASE_SERVICE_KEY = os.getenv("SUPABASE_SERVICE_KEY", "")
@@ -22,3 +27,43 @@ def get_supabase_admin() -> Client:
         raise ValueError("SUPABASE_SERVICE_KEY environment variable is not set")
 
     return create_client(SUPABASE_URL, SUPABASE_SERVICE_KEY)
+
+
+_client: AsyncClient | None = None
+_http: httpx.AsyncClient | None = None
+
+
+def get_supabase() -> AsyncClient:
+    """
+    Shared async Supabase client (FastAPI dependency).
+    Every request reuses the same HTTP/2 connection pool; created on first
+    use and closed by close_supabase() at shutdown.
+    """
+    global _client, _http
+    if _client is None:
+        _http = httpx.AsyncClient(
+            http2=True,
+            follow_redirects=True,
+            event_hooks=supabase_event_hooks(),
+            timeout=httpx.Timeout(settings.supabase_timeout, connect=5.0),
+            limits=httpx.Limits(
+                max_connections=settings.supabase_max_connections,
+                max_keepalive_connections=settings.supabase_max_keepalive,
+                keepalive_expiry=settings.supabase_keepalive_expiry,
+            ),
+        )
+        _client = AsyncClient(
+            settings.supabase_url,
+            settings.supabase_key,
+            AsyncClientOptions(httpx_client=_http),
+        )
+    return _client
+
+
+async def close_supabase() -> None:
+    """Close the shared client's connection pool."""
+    global _client, _http
+    if _http is not None:
+        await _http.aclose()
+    _client = None
+    _http = None
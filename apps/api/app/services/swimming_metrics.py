@@ -0,0 +1,251 @@
+"""Stroke metrics for many training sets at once.
+
+Same formulas as the calculate_swimming_metrics() SQL function:
+
+- velocity: distance / time (m/s)
+- DPS (distance per stroke): distance / total strokes (m)
+- stroke frequency: strokes per minute
+- swim index: DPS x velocity
+
+The SQL function takes one set per RPC. Here sets, their sessions and
+stroke counts are fetched with one batched query per table and the metrics
+are computed over arrays. Sets of validated sessions rarely change, so
+their metrics are kept in a bounded per-set cache. Each entry remembers the
+athlete's shared sessions version (see training_load): when an edit is
+published through sessions-changed, every worker drops that athlete's sets
+on their next read.
+"""
+
+import threading
+from collections import OrderedDict
+from datetime import date
+from typing import Any
+
+import numpy as np
+from supabase import AsyncClient
+
+from app.core.config import settings
+from app.services.pagination import fetch_all, fetch_in
+from app.services.shared_state import shared_state
+from app.services.training_load import sessions_version
+
+SET_COLUMNS = "id, session_id, test_id, total_time_ms, pool_length_m, attempt_no, is_best"
+SESSION_COLUMNS = "id, athlete_id, session_date, validated_by"
+
+
+def compute_metrics(
+    distance_m: np.ndarray, time_ms: np.ndarray, strokes: np.ndarray
+) -> dict[str, np.ndarray]:
+    """Vectorized calculate_swimming_metrics(); sets without strokes or time get 0."""
+    distance = distance_m.astype(np.float64)
+    seconds = time_ms.astype(np.float64) / 1000.0
+    count = strokes.astype(np.float64)
+    valid = (count > 0) & (seconds > 0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        velocity = np.where(valid, distance / seconds, 0.0)
+        dps = np.where(valid, distance / count, 0.0)
+        frequency = np.where(valid, count / (seconds / 60.0), 0.0)
+    return {
+        "dps": np.round(dps, 2),
+        "stroke_frequency": np.round(frequency, 1),
+        "velocity": np.round(velocity, 2),
+        "swim_index": np.round(dps * velocity, 2),
+    }
+
+
+class SwimmingMetrics:
+    """Batch metrics for training sets, cached per validated set."""
+
+    def __init__(self, max_sets: int, page_size: int = 1000):
+        self.max_sets = max_sets
+        self.page_size = page_size
+        # set id -> (athlete id, athlete's sessions version, metrics)
+        self._sets: OrderedDict[str, tuple[str, int | None, dict[str, Any]]] = OrderedDict()
+        self._tests: dict[str, dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def invalidate(self, set_ids: list[str] | None = None) -> None:
+        """Forget cached metrics for set_ids, or for every set if None."""
+        with self._lock:
+            if set_ids is None:
+                self._sets.clear()
+            for set_id in set_ids or []:
+                self._sets.pop(set_id, None)
+
+    def invalidate_athlete(self, athlete_id: str) -> None:
+        """Forget cached metrics for every set of an athlete."""
+        with self._lock:
+            for set_id in [key for key, entry in self._sets.items() if entry[0] == athlete_id]:
+                del self._sets[set_id]
+
+    async def _versions(self, athlete_ids: list[str]) -> dict[str, int]:
+        """Shared sessions version per athlete, empty if Redis is unreachable."""
+        athlete_ids = list(dict.fromkeys(athlete_ids))
+        versions = await shared_state.versions([sessions_version(a) for a in athlete_ids])
+        return dict(zip(athlete_ids, versions)) if versions is not None else {}
+
+    async def _tests_by_id(self, supabase: AsyncClient) -> dict[str, dict[str, Any]]:
+        # Reference table seeded by the schema: loaded once
+        if not self._tests:
+            rows = await fetch_all(
+                lambda: supabase.table("tests").select("id, distance_m, stroke_id, pool_type"),
+                self.page_size,
+            )
+            self._tests = {row["id"]: row for row in rows}
+        return self._tests
+
+    async def _cached(self, set_ids: list[str]) -> dict[str, dict[str, Any]]:
+        """Cached metrics for set_ids, dropping sets whose athlete changed since."""
+        with self._lock:
+            entries = {set_id: self._sets[set_id] for set_id in set_ids if set_id in self._sets}
+        if not entries:
+            return {}
+        versions = await self._versions([entry[0] for entry in entries.values()])
+
+        hits = {}
+        with self._lock:
+            for set_id, (athlete_id, version, metrics) in entries.items():
+                if versions and versions[athlete_id] != version:
+                    self._sets.pop(set_id, None)
+                elif set_id in self._sets:
+                    self._sets.move_to_end(set_id)
+                    hits[set_id] = metrics
+        return hits
+
+    def _store(self, rows: list[tuple[str, int | None, dict[str, Any]]]) -> None:
+        with self._lock:
+            for entry in rows:
+                set_id = entry[2]["set_id"]
+                self._sets[set_id] = entry
+                self._sets.move_to_end(set_id)
+            while len(self._sets) > self.max_sets:
+                self._sets.popitem(last=False)
+
+    async def _compute(
+        self,
+        supabase: AsyncClient,
+        sets: list[dict[str, Any]],
+        sessions: dict[str, dict[str, Any]],
+        versions: dict[str, int],
+    ) -> dict[str, dict[str, Any]]:
+        """Metrics for set rows not in the cache, caching those of validated sessions.
+
+        versions are the athletes' sessions versions read before the rows.
+        """
+        if not sets:
+            return {}
+        tests = await self._tests_by_id(supabase)
+        stroke_rows = await fetch_in(
+            lambda chunk: supabase.table("training_strokes")
+            .select("id, training_set_id, stroke_count")
+            .in_("training_set_id", chunk),
+            [row["id"] for row in sets],
+            page_size=self.page_size,
+        )
+        totals: dict[str, int] = {}
+        for row in stroke_rows:
+            totals[row["training_set_id"]] = (
+                totals.get(row["training_set_id"], 0) + row["stroke_count"]
+            )
+
+        strokes = np.array([totals.get(row["id"], 0) for row in sets])
+        distance = np.array([tests.get(row["test_id"], {}).get("distance_m", 0) for row in sets])
+        time_ms = np.array([row["total_time_ms"] for row in sets])
+        metrics = compute_metrics(distance, time_ms, strokes)
+
+        computed: dict[str, dict[str, Any]] = {}
+        validated = []
+        for i, row in enumerate(sets):
+            session = sessions.get(row["session_id"], {})
+            result = {
+                "set_id": row["id"],
+                "session_id": row["session_id"],
+                "session_date": session.get("session_date"),
+                "test_id": row["test_id"],
+                "distance_m": int(distance[i]),
+                "total_time_ms": row["total_time_ms"],
+                "total_strokes": int(strokes[i]),
+                "pool_length_m": row["pool_length_m"],
+                "attempt_no": row["attempt_no"],
+                "is_best": row["is_best"],
+                **{name: float(values[i]) for name, values in metrics.items()},
+            }
+            computed[row["id"]] = result
+            if session.get("validated_by"):
+                athlete_id = session["athlete_id"]
+                validated.append((athlete_id, versions.get(athlete_id), result))
+        self._store(validated)
+        return computed
+
+    async def _sessions(
+        self, supabase: AsyncClient, session_ids: list[str]
+    ) -> dict[str, dict[str, Any]]:
+        rows = await fetch_in(
+            lambda chunk: supabase.table("training_sessions")
+            .select(SESSION_COLUMNS)
+            .in_("id", chunk),
+            list(set(session_ids)),
+            page_size=self.page_size,
+        )
+        return {row["id"]: row for row in rows}
+
+    async def for_sets(self, supabase: AsyncClient, set_ids: list[str]) -> list[dict[str, Any]]:
+        """Metrics for the given sets, in request order; unknown ids are skipped."""
+        hits = await self._cached(set_ids)
+        missing = [set_id for set_id in dict.fromkeys(set_ids) if set_id not in hits]
+        if missing:
+            sets = await fetch_in(
+                lambda chunk: supabase.table("training_sets").select(SET_COLUMNS).in_("id", chunk),
+                missing,
+                page_size=self.page_size,
+            )
+            sessions = await self._sessions(supabase, [row["session_id"] for row in sets])
+            # Athletes are only known from their sessions, so versions are read
+            # after them: only an edit published between the two reads is missed
+            versions = await self._versions([row["athlete_id"] for row in sessions.values()])
+            hits.update(await self._compute(supabase, sets, sessions, versions))
+        return [hits[set_id] for set_id in set_ids if set_id in hits]
+
+    async def for_athlete(
+        self,
+        supabase: AsyncClient,
+        athlete_id: str,
+        date_from: date | None = None,
+        date_to: date | None = None,
+    ) -> list[dict[str, Any]]:
+        """Metrics for every set of an athlete's sessions in a date range, by date."""
+
+        def sessions_query() -> Any:
+            query = (
+                supabase.table("training_sessions")
+                .select(SESSION_COLUMNS)
+                .eq("athlete_id", athlete_id)
+            )
+            if date_from:
+                query = query.gte("session_date", date_from.isoformat())
+            if date_to:
+                query = query.lte("session_date", date_to.isoformat())
+            return query
+
+        versions = await self._versions([athlete_id])
+        sessions = {
+            row["id"]: row for row in await fetch_all(sessions_query, self.page_size)
+        }
+        sets = await fetch_in(
+            lambda chunk: supabase.table("training_sets")
+            .select(SET_COLUMNS)
+            .in_("session_id", chunk),
+            list(sessions),
+            page_size=self.page_size,
+        )
+        hits = await self._cached([row["id"] for row in sets])
+        missing = [row for row in sets if row["id"] not in hits]
+        hits.update(await self._compute(supabase, missing, sessions, versions))
+        return sorted(
+            hits.values(),
+            key=lambda row: (row["session_date"] or "", row["session_id"], row["set_id"]),
+        )
+
+
+swimming_metrics = SwimmingMetrics(settings.swimming_metrics_cache_sets)
@@ -0,0 +1,283 @@
+"""
+Planificador de sincronización FECNA en segundo plano
+Mantiene una cola de prioridad de atletas según antigüedad de la última
+sincronización, actividad competitiva reciente y calendario de temporada,
+y sincroniza de a uno respetando un presupuesto de peticiones por hora
+
+Con varios workers solo corre en el que tiene la concesión compartida
+(shared_state), así el presupuesto es global y no por proceso
+"""
+import asyncio
+import heapq
+import logging
+import math
+import time
+from datetime import UTC, date, datetime, timedelta
+from typing import Any
+
+from supabase import AsyncClient
+
+from ..core.config import settings
+from .fecna_sync import FECNASyncService, sync_athlete_results
+from .pagination import fetch_all, iter_pages
+from .shared_state import shared_state
+from .supabase_client import get_supabase
+
+logger = logging.getLogger(__name__)
+
+# Peticiones a FECNA por atleta: /index + /historialFilter + una por prueba
+REQUESTS_PER_SYNC = 2 + len(FECNASyncService.PRUEBAS)
+
+# Prioridad para atletas nunca sincronizados (van primero)
+NEVER_SYNCED_HOURS = 24 * 365
+
+# Concesión compartida: un solo worker sincroniza a la vez
+LEASE_NAME = 'sync-scheduler'
+
+
+def _parse_timestamp(value: str | None) -> datetime | None:
+    """Timestamp ISO de PostgREST a datetime con zona (UTC si no trae)"""
+    if not value:
+        return None
+    parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=UTC)
+
+
+class RequestBudget:
+    """Token bucket de peticiones por hora"""
+
+    def __init__(self, requests_per_hour: int):
+        self.capacity = max(requests_per_hour, REQUESTS_PER_SYNC)
+        self.rate = requests_per_hour / 3600
+        self.tokens = float(REQUESTS_PER_SYNC)
+        self.updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, cost: int) -> float:
+        """Segundos hasta que haya presupuesto para `cost` peticiones"""
+        self._refill()
+        if self.tokens >= cost:
+            return 0.0
+        return (cost - self.tokens) / self.rate if self.rate > 0 else math.inf
+
+    def consume(self, cost: int) -> None:
+        self._refill()
+        self.tokens -= cost
+
+
+class SyncScheduler:
+    """
+    Cola de prioridad de sincronización de atletas
+
+    prioridad = horas desde la última sync
+                × (1 + log(1 + resultados recientes))
+
+    Un atleta entra en la cola cuando pasó el intervalo mínimo desde su
+    última sync; en temporada ese intervalo se divide por el factor de
+    temporada, así los datos se refrescan más seguido.
+    """
+
+    def __init__(
+        self,
+        requests_per_hour: int | None = None,
+        min_interval_hours: int | None = None,
+        activity_window_days: int | None = None,
+        season_months: list[int] | None = None,
+        in_progress_timeout_minutes: int | None = None,
+        lease_seconds: int | None = None
+    ):
+        self.budget = RequestBudget(requests_per_hour or settings.sync_requests_per_hour)
+        self.min_interval_hours = (
+            min_interval_hours if min_interval_hours is not None
+            else settings.sync_min_interval_hours
+        )
+        self.activity_window_days = activity_window_days or settings.sync_activity_window_days
+        self.season_months = set(season_months or settings.sync_season_months)
+        self.in_progress_timeout = timedelta(
+            minutes=in_progress_timeout_minutes or settings.sync_in_progress_timeout_minutes
+        )
+        self.lease_seconds = lease_seconds or settings.sync_lease_seconds
+        self.queue: list[tuple[float, str]] = []
+        self.synced = 0
+        self.failed = 0
+        self.last_error: str | None = None
+        self.leader = False
+        self._task: asyncio.Task[None] | None = None
+
+    def season_factor(self, today: date | None = None) -> float:
+        """En temporada de competencias los datos envejecen más rápido"""
+        today = today or date.today()
+        return 1.5 if today.month in self.season_months else 1.0
+
+    def priority(
+        self,
+        last_synced_at: str | None,
+        recent_results: int,
+        now: datetime | None = None
+    ) -> float:
+        """Calcular la prioridad de un atleta (mayor = sincronizar antes)"""
+        now = now or datetime.now(UTC)
+
+        synced = _parse_timestamp(last_synced_at)
+        if synced:
+            staleness_hours = max((now - synced).total_seconds() / 3600, 0.0)
+        else:
+            staleness_hours = NEVER_SYNCED_HOURS
+
+        if staleness_hours < self.min_interval_hours / self.season_factor(now.date()):
+            return 0.0
+
+        activity = 1 + math.log1p(recent_results)
+        return staleness_hours * activity
+
+    def is_stuck(self, mapping: dict[str, Any], now: datetime) -> bool:
+        """Un IN_PROGRESS más viejo que el timeout quedó así por una caída"""
+        started = _parse_timestamp(mapping.get('sync_started_at'))
+        return started is None or now - started > self.in_progress_timeout
+
+    async def _recent_activity(self, supabase: AsyncClient) -> dict[str, int]:
+        """Cantidad de resultados recientes por atleta vinculado"""
+        cutoff = (date.today() - timedelta(days=self.activity_window_days)).isoformat()
+        counts: dict[str, int] = {}
+
+        async for page in iter_pages(
+            lambda: supabase.table('swim_competition_results')
+            .select('id, athlete_id')
+            .not_.is_('athlete_id', 'null')
+            .gte('event_date', cutoff)
+        ):
+            for row in page:
+                counts[row['athlete_id']] = counts.get(row['athlete_id'], 0) + 1
+
+        return counts
+
+    async def refresh_queue(self, supabase: AsyncClient) -> int:
+        """Reconstruir la cola desde los mappings confirmados"""
+        # Paginado: un select simple se corta en el límite de filas de PostgREST
+        mappings = await fetch_all(
+            lambda: supabase.table('athlete_external_mappings')
+            .select('id, athlete_id, metadata, last_synced_at, sync_status, sync_started_at')
+            .eq('source', 'FECNA')
+            .eq('status', 'CONFIRMED')
+        )
+
+        activity = await self._recent_activity(supabase)
+        now = datetime.now(UTC)
+
+        queue = []
+        for mapping in mappings:
+            # Sin fecna_id la sincronización falla: no gastar cola ni presupuesto
+            if not (mapping.get('metadata') or {}).get('fecna_id'):
+                continue
+            if mapping.get('sync_status') == 'IN_PROGRESS' and not self.is_stuck(mapping, now):
+                continue
+            score = self.priority(
+                mapping.get('last_synced_at'),
+                activity.get(mapping['athlete_id'], 0),
+                now
+            )
+            if score > 0:
+                queue.append((-score, mapping['athlete_id']))
+
+        heapq.heapify(queue)
+        self.queue = queue
+        return len(queue)
+
+    async def run_once(self, supabase: AsyncClient) -> str | None:
+        """Sincronizar el atleta más prioritario, esperando presupuesto"""
+        if not self.queue:
+            await self.refresh_queue(supabase)
+        if not self.queue:
+            return None
+
+        wait = self.budget.wait_time(REQUESTS_PER_SYNC)
+        if wait > 0:
+            await asyncio.sleep(wait)
+            # Renovar la concesión tras la espera; otro worker pudo tomarla
+            if not await self.hold_lease():
+                return None
+
+        _, athlete_id = heapq.heappop(self.queue)
+        self.budget.consume(REQUESTS_PER_SYNC)
+
+        try:
+            await sync_athlete_results(supabase, athlete_id)
+            self.synced += 1
+        except Exception as e:
+            self.failed += 1
+            self.last_error = f"{athlete_id}: {e}"
+            logger.error(f"Error en sincronización programada de {athlete_id}: {e}")
+
+        return athlete_id
+
+    async def hold_lease(self) -> bool:
+        """Tomar o renovar la concesión compartida del planificador"""
+        leader = await shared_state.acquire_lease(LEASE_NAME, self.lease_seconds)
+        if leader != self.leader:
+            logger.info(
+                "Planificador de sync %s en este worker",
+                "activo" if leader else "en espera",
+            )
+            self.leader = leader
+            if not leader:
+                self.queue = []
+        return leader
+
+    async def run_forever(self, idle_seconds: float = 600) -> None:
+        """Bucle continuo; duerme `idle_seconds` cuando no hay atletas pendientes"""
+        supabase = get_supabase()
+        logger.info(
+            f"Planificador de sync iniciado "
+            f"({self.budget.rate * 3600:.0f} peticiones/hora)"
+        )
+
+        while True:
+            try:
+                if not await self.hold_lease():
+                    await asyncio.sleep(self.lease_seconds / 2)
+                    continue
+                if await self.run_once(supabase) is None:
+                    await asyncio.sleep(min(idle_seconds, self.lease_seconds / 2))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.last_error = str(e)
+                logger.error(f"Error en planificador de sync: {e}", exc_info=True)
+                await asyncio.sleep(idle_seconds)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run_forever())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self.leader:
+            await shared_state.release_lease(LEASE_NAME)
+            self.leader = False
+
+    def status(self) -> dict[str, Any]:
+        return {
+            'running': self._task is not None and not self._task.done(),
+            'leader': self.leader,
+            'queued': len(self.queue),
+            'next': [athlete_id for _, athlete_id in heapq.nsmallest(5, self.queue)],
+            'requests_per_hour': round(self.budget.rate * 3600),
+            'available_requests': round(self.budget.tokens, 1),
+            'synced': self.synced,
+            'failed': self.failed,
+            'last_error': self.last_error,
+        }
+
+
+# Instancia global
+sync_scheduler = SyncScheduler()
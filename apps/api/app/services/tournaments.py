@@ -0,0 +1,48 @@
+"""Tournaments dimension, kept current from result events.
+
+competition_tournaments holds one row per (tournament name, year) with its
+date range and result/swimmer counts. The refresh_tournaments RPC
+recomputes the tournaments touched by each import or sync.
+"""
+
+from typing import Any, cast
+
+from supabase import AsyncClient
+
+from app.services import result_events
+from app.services.cache import TAG_TOURNAMENTS, response_cache
+
+# Tournament names per RPC call, to keep the request body small
+REFRESH_BATCH_SIZE = 200
+
+
+async def refresh_tournaments(supabase: AsyncClient, names: list[str] | None = None) -> int:
+    """Recompute the given tournaments (all if None); returns rows written."""
+    if names is None:
+        batches: list[list[str] | None] = [None]
+    else:
+        unique = sorted(set(names))
+        batches = [
+            unique[i:i + REFRESH_BATCH_SIZE] for i in range(0, len(unique), REFRESH_BATCH_SIZE)
+        ]
+
+    written = 0
+    for batch in batches:
+        response = await supabase.rpc("refresh_tournaments", {"p_names": batch}).execute()
+        # The RPC returns the row count as a bare integer
+        written += cast(int, response.data or 0)
+
+    await response_cache.invalidate_tags([TAG_TOURNAMENTS])
+    return written
+
+
+@result_events.on_results_added
+async def _refresh_added(supabase: AsyncClient, rows: list[dict[str, Any]]) -> None:
+    names = [row["tournament_name"] for row in rows if row.get("tournament_name")]
+    if names:
+        await refresh_tournaments(supabase, names)
+
+
+@result_events.on_results_invalidated
+async def _refresh_all(supabase: AsyncClient) -> None:
+    await refresh_tournaments(supabase)
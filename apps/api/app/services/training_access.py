@@ -0,0 +1,148 @@
+"""Access checks for training data read with the service-role client.
+
+The API reads training tables with the service role, which bypasses RLS,
+so the training routes apply the training_sessions policies of migration
+002 themselves: a user sees an athlete's sessions, sets and splits if they
+are that athlete, one of the athlete's coaches or an admin of the
+athlete's club.
+"""
+
+from typing import Any, cast
+
+from fastapi import HTTPException, status
+from supabase import AsyncClient
+
+from app.services.auth import AuthUser
+from app.services.pagination import fetch_in
+
+# Athlete ids per coach_athlete request, as fetch_in chunks them
+CHUNK_SIZE = 100
+
+
+async def _rows(query: Any) -> list[dict[str, Any]]:
+    response = await query.execute()
+    return cast(list[dict[str, Any]], response.data or [])
+
+
+async def admin_club_ids(supabase: AsyncClient, user_id: str) -> set[str]:
+    """Clubs where the user is an admin (is_club_admin)."""
+    rows = await _rows(
+        supabase.table("club_members")
+        .select("club_id")
+        .eq("user_id", user_id)
+        .eq("role_in_club", "ADMIN")
+    )
+    return {row["club_id"] for row in rows}
+
+
+async def visible_athletes(
+    supabase: AsyncClient, user: AuthUser, athlete_ids: list[str]
+) -> set[str]:
+    """The athlete_ids whose training data the user may read."""
+    athlete_ids = list(dict.fromkeys(athlete_ids))
+    if not athlete_ids:
+        return set()
+
+    athletes = await fetch_in(
+        lambda chunk: supabase.table("athletes")
+        .select("id, user_id, club_id")
+        .in_("id", chunk),
+        athlete_ids,
+    )
+    club_ids = await admin_club_ids(supabase, user.id)
+    visible = {
+        row["id"]
+        for row in athletes
+        if row["user_id"] == user.id or row["club_id"] in club_ids
+    }
+
+    # is_coach_of_athlete, for the rest
+    remaining = [athlete_id for athlete_id in athlete_ids if athlete_id not in visible]
+    if not remaining:
+        return visible
+    coach_ids = [
+        row["id"]
+        for row in await _rows(supabase.table("coaches").select("id").eq("user_id", user.id))
+    ]
+    if not coach_ids:
+        return visible
+    # coach_athlete has no id to page on; a chunk of athletes never has
+    # more assignments to one user than a response holds
+    for i in range(0, len(remaining), CHUNK_SIZE):
+        rows = await _rows(
+            supabase.table("coach_athlete")
+            .select("athlete_id")
+            .in_("coach_id", coach_ids)
+            .in_("athlete_id", remaining[i:i + CHUNK_SIZE])
+        )
+        visible.update(row["athlete_id"] for row in rows)
+    return visible
+
+
+async def require_athlete_access(supabase: AsyncClient, user: AuthUser, athlete_id: str) -> None:
+    """Raise 403 unless the user may read the athlete's training data."""
+    if athlete_id not in await visible_athletes(supabase, user, [athlete_id]):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="No access to this athlete's training data",
+        )
+
+
+async def require_club_access(
+    supabase: AsyncClient, user: AuthUser, club_id: str
+) -> list[str] | None:
+    """The club's athletes whose training data the user may read.
+
+    None means all of them, for an admin of the club; otherwise the ids of
+    the club's athletes the user coaches. Raises 403 when there are none,
+    before anything else about the club is read, so a club that doesn't
+    exist looks the same as one the user can't see.
+    """
+    if club_id in await admin_club_ids(supabase, user.id):
+        return None
+
+    athlete_ids: list[str] = []
+    coach_ids = [
+        row["id"]
+        for row in await _rows(supabase.table("coaches").select("id").eq("user_id", user.id))
+    ]
+    if coach_ids:
+        # A coach's assignments always fit in one response
+        coached = await _rows(
+            supabase.table("coach_athlete").select("athlete_id").in_("coach_id", coach_ids)
+        )
+        athletes = await fetch_in(
+            lambda chunk: supabase.table("athletes")
+            .select("id")
+            .eq("club_id", club_id)
+            .in_("id", chunk),
+            list(dict.fromkeys(row["athlete_id"] for row in coached)),
+        )
+        athlete_ids = [row["id"] for row in athletes]
+    if not athlete_ids:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="No access to this club's training data",
+        )
+    return athlete_ids
+
+
+async def visible_sets(supabase: AsyncClient, user: AuthUser, set_ids: list[str]) -> list[str]:
+    """The set_ids the user may read, in request order.
+
+    Sets of other athletes are left out, as RLS would hide them.
+    """
+    sets = await fetch_in(
+        lambda chunk: supabase.table("training_sets").select("id, session_id").in_("id", chunk),
+        list(dict.fromkeys(set_ids)),
+    )
+    sessions = await fetch_in(
+        lambda chunk: supabase.table("training_sessions")
+        .select("id, athlete_id")
+        .in_("id", chunk),
+        list({row["session_id"] for row in sets}),
+    )
+    athlete_of = {row["id"]: row["athlete_id"] for row in sessions}
+    visible = await visible_athletes(supabase, user, list(athlete_of.values()))
+    allowed = {row["id"] for row in sets if athlete_of.get(row["session_id"]) in visible}
+    return [set_id for set_id in set_ids if set_id in allowed]
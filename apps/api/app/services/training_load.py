@@ -0,0 +1,255 @@
+"""Training load metrics over training_sessions.
+
+Session load is RPE x duration (calculate_training_load). Per athlete and
+day the API reports:
+
+- acute load: mean daily load over the last 7 days
+- chronic load: mean daily load over the last 28 days
+- ACWR: acute / chronic (rolling averages)
+- monotony: mean / standard deviation of daily load over the last 7 days
+- strain: weekly load x monotony
+
+Athletes are laid out as rows of one (athletes x days) matrix and every
+window is computed with cumulative sums along the day axis, so a whole squad
+costs about the same as one athlete.
+
+Sessions are cached per athlete. Each request pulls only sessions updated
+since the cached watermark, in one query for the whole batch. Deletes are
+invisible to that query, so write paths call publish_sessions_changed(),
+which bumps a shared version per athlete: every worker compares it with the
+version its entry was loaded at (one Redis read per request) and reloads
+that athlete. Without Redis the cache is reloaded every
+training_load_reload_seconds.
+"""
+
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Any
+
+import numpy as np
+from supabase import AsyncClient
+
+from app.core.config import settings
+from app.services.pagination import fetch_in
+from app.services.shared_state import shared_state
+
+ACUTE_DAYS = 7
+CHRONIC_DAYS = 28
+
+# ACWR bands commonly used for injury-risk monitoring
+ACWR_ZONES = ((0.8, "low"), (1.3, "optimal"), (1.5, "caution"))
+
+SESSION_COLUMNS = "id, athlete_id, session_date, duration_min, session_rpe, updated_at"
+
+
+def sessions_version(athlete_id: str) -> str:
+    """Shared version bumped when an athlete's sessions are edited or deleted."""
+    return f"training-sessions:{athlete_id}"
+
+
+async def publish_sessions_changed(athlete_id: str) -> None:
+    """Tell every worker to reload the athlete's sessions."""
+    await shared_state.bump([sessions_version(athlete_id)])
+
+
+def acwr_zone(acwr: float | None) -> str | None:
+    if acwr is None:
+        return None
+    for upper, zone in ACWR_ZONES:
+        if acwr < upper:
+            return zone
+    return "high"
+
+
+@dataclass
+class AthleteSessions:
+    """One athlete's sessions as (day ordinal, load), plus the sync watermark."""
+
+    loads: dict[str, tuple[int, int]] = field(default_factory=dict)
+    watermark: str = ""
+    loaded_at: float = field(default_factory=time.monotonic)
+    # Shared version read before the load (None if Redis was unreachable)
+    version: int | None = None
+    _days: np.ndarray | None = None
+    _values: np.ndarray | None = None
+
+    def apply(self, rows: list[dict[str, Any]]) -> None:
+        for row in rows:
+            day = date.fromisoformat(row["session_date"][:10]).toordinal()
+            self.loads[row["id"]] = (day, row["session_rpe"] * row["duration_min"])
+            if row["updated_at"] > self.watermark:
+                self.watermark = row["updated_at"]
+        if rows:
+            self._days = self._values = None
+
+    def arrays(self) -> tuple[np.ndarray, np.ndarray]:
+        """Day ordinals and loads as arrays, rebuilt only after changes."""
+        if self._days is None or self._values is None:
+            pairs = np.array(list(self.loads.values()), dtype=np.int64).reshape(-1, 2)
+            self._days = pairs[:, 0]
+            self._values = pairs[:, 1].astype(np.float64)
+        return self._days, self._values
+
+
+def rolling_sum(matrix: np.ndarray, window: int) -> np.ndarray:
+    """Trailing sum over `window` days along axis 1 (days before column 0 count as 0)."""
+    padded = np.concatenate(
+        [np.zeros((matrix.shape[0], 1)), np.cumsum(matrix, axis=1)], axis=1
+    )
+    sums = padded[:, window:] - padded[:, :-window]
+    # The first window - 1 days only have a partial window
+    head = padded[:, 1:window]
+    return np.concatenate([head, sums], axis=1)
+
+
+def load_metrics(matrix: np.ndarray) -> dict[str, np.ndarray]:
+    """Rolling metrics for a (athletes x days) daily load matrix.
+
+    Undefined values (no chronic load, no variation in the week) are NaN.
+    """
+    acute_sum = rolling_sum(matrix, ACUTE_DAYS)
+    acute = acute_sum / ACUTE_DAYS
+    chronic = rolling_sum(matrix, CHRONIC_DAYS) / CHRONIC_DAYS
+    squares = rolling_sum(matrix * matrix, ACUTE_DAYS) / ACUTE_DAYS
+    # Population standard deviation; clip rounding noise below zero
+    std = np.sqrt(np.clip(squares - acute * acute, 0.0, None))
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        acwr = np.where(chronic > 0, acute / chronic, np.nan)
+        monotony = np.where(std > 1e-9, acute / std, np.nan)
+    return {
+        "load": matrix,
+        "acute": acute,
+        "chronic": chronic,
+        "acwr": acwr,
+        "monotony": monotony,
+        "strain": acute_sum * monotony,
+    }
+
+
+def _value(x: float) -> float | None:
+    return None if np.isnan(x) else round(float(x), 2)
+
+
+class TrainingLoadCache:
+    """Per-athlete session cache with incremental sync from updated_at."""
+
+    def __init__(self, reload_seconds: float, page_size: int = 1000):
+        self.reload_seconds = reload_seconds
+        self.page_size = page_size
+        self._athletes: dict[str, AthleteSessions] = {}
+        self._lock = threading.Lock()
+
+    def invalidate(self, athlete_id: str | None = None) -> None:
+        """Forget one athlete's sessions, or every athlete's if athlete_id is None."""
+        with self._lock:
+            if athlete_id is None:
+                self._athletes.clear()
+            else:
+                self._athletes.pop(athlete_id, None)
+
+    async def _fetch(
+        self, supabase: AsyncClient, athlete_ids: list[str], since: str | None = None
+    ) -> dict[str, list[dict[str, Any]]]:
+        def make_query(chunk: list[str]) -> Any:
+            query = (
+                supabase.table("training_sessions")
+                .select(SESSION_COLUMNS)
+                .in_("athlete_id", chunk)
+            )
+            return query.gt("updated_at", since) if since else query
+
+        by_athlete: dict[str, list[dict[str, Any]]] = {}
+        for row in await fetch_in(make_query, athlete_ids, page_size=self.page_size):
+            by_athlete.setdefault(row["athlete_id"], []).append(row)
+        return by_athlete
+
+    async def sessions(
+        self, supabase: AsyncClient, athlete_ids: list[str]
+    ) -> dict[str, AthleteSessions]:
+        """Up-to-date sessions per athlete: at most one full and one delta query."""
+        shared = await shared_state.versions([sessions_version(a) for a in athlete_ids])
+        versions = dict(zip(athlete_ids, shared)) if shared is not None else {}
+        now = time.monotonic()
+        with self._lock:
+            cached = {
+                athlete_id: entry
+                for athlete_id in athlete_ids
+                if (entry := self._athletes.get(athlete_id)) is not None
+                and now - entry.loaded_at < self.reload_seconds
+                and (shared is None or entry.version == versions[athlete_id])
+            }
+        missing = [athlete_id for athlete_id in athlete_ids if athlete_id not in cached]
+
+        if cached:
+            # Athletes without sessions have no watermark; any new session of
+            # theirs is newer than the oldest watermark anyway
+            since = min((e.watermark for e in cached.values() if e.watermark), default=None)
+            changed = await self._fetch(supabase, list(cached), since)
+            for athlete_id, rows in changed.items():
+                cached[athlete_id].apply(rows)
+
+        if missing:
+            loaded = await self._fetch(supabase, missing)
+            fresh = {
+                athlete_id: AthleteSessions(version=versions.get(athlete_id))
+                for athlete_id in missing
+            }
+            for athlete_id, rows in loaded.items():
+                fresh[athlete_id].apply(rows)
+            with self._lock:
+                self._athletes.update(fresh)
+            cached.update(fresh)
+        return cached
+
+    async def compute(
+        self,
+        supabase: AsyncClient,
+        athlete_ids: list[str],
+        as_of: date,
+        days: int,
+        include_series: bool = True,
+    ) -> dict[str, dict[str, Any]]:
+        """Latest metrics (and optionally the daily series) per athlete up to as_of."""
+        sessions = await self.sessions(supabase, athlete_ids)
+
+        # The chronic window needs 27 days of history before the first reported day
+        width = days + CHRONIC_DAYS - 1
+        first_day = as_of.toordinal() - width + 1
+        matrix = np.zeros((len(athlete_ids), width))
+        for row, athlete_id in enumerate(athlete_ids):
+            athlete = sessions.get(athlete_id)
+            if athlete is None or not athlete.loads:
+                continue
+            day_ordinals, values = athlete.arrays()
+            offsets = day_ordinals - first_day
+            inside = (offsets >= 0) & (offsets < width)
+            np.add.at(matrix[row], offsets[inside], values[inside])
+
+        metrics = {name: series[:, -days:] for name, series in load_metrics(matrix).items()}
+        dates = [(as_of - timedelta(days=days - 1 - i)).isoformat() for i in range(days)]
+
+        report: dict[str, dict[str, Any]] = {}
+        for row, athlete_id in enumerate(athlete_ids):
+            latest = {name: _value(series[row, -1]) for name, series in metrics.items()}
+            latest["weekly_load"] = round(float(metrics["load"][row, -ACUTE_DAYS:].sum()), 2)
+            result: dict[str, Any] = {
+                "athlete_id": athlete_id,
+                "as_of": as_of.isoformat(),
+                **latest,
+                "zone": acwr_zone(latest["acwr"]),
+            }
+            if include_series:
+                result["series"] = [
+                    {"date": dates[i], **{
+                        name: _value(series[row, i]) for name, series in metrics.items()
+                    }}
+                    for i in range(days)
+                ]
+            report[athlete_id] = result
+        return report
+
+
+training_load_cache = TrainingLoadCache(settings.training_load_reload_seconds)
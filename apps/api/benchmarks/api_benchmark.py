@@ -0,0 +1,212 @@
+"""
+Benchmark de endpoints de resultados, matching e importación sobre FakeSupabase
+
+Carga un dataset sintético en el Supabase en memoria, monta la app FastAPI
+con `get_supabase` apuntando al fake y mide, por endpoint, latencia
+(p50/p95/max) y llamadas a Supabase por request (para ver patrones N+1).
+La caché de respuestas queda desactivada: se mide el cálculo, no Redis.
+
+La importación se mide a nivel de servicio (`import_to_supabase`), incluidos
+los handlers de result_events (name index, mejores marcas, torneos).
+
+Termina con código 1 si algún endpoint supera --max-p95-ms.
+
+Uso:
+    python -m benchmarks.api_benchmark --results 50000 --latency-ms 2 --requests 30
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+from collections.abc import Callable
+from typing import Any
+
+import httpx
+
+from app.main import app
+from app.services.cache import response_cache
+from app.services.fecna_import import import_to_supabase
+from app.services.supabase_client import get_supabase
+
+from .fake_supabase import FakeSupabase
+from .synthetic_data import seed_fake, synthetic_dataset
+
+Request = tuple[str, str, dict[str, Any] | None]
+
+
+def _percentiles(samples: list[float]) -> dict[str, float]:
+    samples = sorted(samples)
+    return {
+        'p50': statistics.median(samples),
+        'p95': samples[min(int(len(samples) * 0.95), len(samples) - 1)],
+        'max': samples[-1],
+    }
+
+
+def endpoint_requests(
+    dataset: dict[str, list[dict[str, Any]]], seed: int
+) -> dict[str, Callable[[], Request]]:
+    """Generadores de requests por endpoint, con parámetros tomados del dataset"""
+    rng = random.Random(seed)
+    rows = dataset['swim_competition_results']
+    names = sorted({r['swimmer_name'] for r in rows})
+    clubs = [m['club_id'] for m in dataset['club_external_mappings']] or [None]
+
+    def event() -> dict[str, Any]:
+        row = rng.choice(rows)
+        return {'distance': row['distance_m'], 'stroke': row['stroke'], 'gender': row['gender']}
+
+    def fragment() -> str:
+        return rng.choice(names).split(',')[0].split()[0].lower()
+
+    return {
+        'results/search': lambda: ('GET', '/api/results/search', {**event(), 'limit': 50}),
+        'results/search?name': lambda: (
+            'GET', '/api/results/search', {'swimmer_name': fragment(), 'limit': 50}
+        ),
+        'results/swimmer': lambda: (
+            'GET', f"/api/results/swimmer/{rng.choice(names)}", {'include_seasons': 'true'}
+        ),
+        'results/swimmers/search': lambda: (
+            'GET', '/api/results/swimmers/search', {'q': fragment()}
+        ),
+        'results/rankings': lambda: ('GET', '/api/results/rankings', event()),
+        'results/tournaments': lambda: ('GET', '/api/results/tournaments', {'limit': 50}),
+        'matching/stats': lambda: ('GET', '/api/matching/stats', None),
+        'matching/unmatched': lambda: (
+            'GET', '/api/matching/athletes/unmatched', {'group_by': 'team'}
+        ),
+        'matching/unmatched-summary': lambda: (
+            'GET', '/api/matching/athletes/unmatched-summary', None
+        ),
+        'matching/pending': lambda: ('GET', '/api/matching/athletes/pending', {'limit': 50}),
+        'matching/search': lambda: (
+            'GET', '/api/matching/athletes/search', {'name': rng.choice(names)}
+        ),
+        'matching/club-unmatched': lambda: (
+            'GET', f"/api/matching/clubs/{rng.choice(clubs)}/unmatched-swimmers", None
+        ),
+    }
+
+
+async def bench_endpoints(
+    fake: FakeSupabase,
+    generators: dict[str, Callable[[], Request]],
+    requests_per_endpoint: int,
+) -> dict[str, dict[str, Any]]:
+    report: dict[str, dict[str, Any]] = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url='http://bench') as client:
+        for name, make_request in generators.items():
+            # Primera llamada aparte: carga índices en memoria (rankings, nombres)
+            method, url, params = make_request()
+            started = time.perf_counter()
+            response = await client.request(method, url, params=params)
+            warmup_ms = (time.perf_counter() - started) * 1000
+            if response.status_code >= 400:
+                report[name] = {'error': f"{response.status_code}: {response.text[:200]}"}
+                continue
+
+            samples: list[float] = []
+            calls: list[int] = []
+            for _ in range(requests_per_endpoint):
+                method, url, params = make_request()
+                fake.reset_calls()
+                started = time.perf_counter()
+                response = await client.request(method, url, params=params)
+                samples.append((time.perf_counter() - started) * 1000)
+                calls.append(fake.total_calls)
+                response.raise_for_status()
+
+            report[name] = {
+                **_percentiles(samples),
+                'warmup': warmup_ms,
+                'calls': statistics.mean(calls),
+            }
+    return report
+
+
+async def bench_import(fake: FakeSupabase, dataset: dict[str, list[dict[str, Any]]], rows: int):
+    """Reimportar `rows` resultados existentes (upsert) con sus eventos"""
+    batch = [
+        {k: v for k, v in r.items() if k not in ('id', 'athlete_id')}
+        for r in dataset['swim_competition_results'][:rows]
+    ]
+    fake.reset_calls()
+    started = time.perf_counter()
+    stats = await import_to_supabase(fake, batch)
+    elapsed = time.perf_counter() - started
+    return {
+        'rows': rows,
+        'seconds': elapsed,
+        'rows_per_s': rows / elapsed if elapsed else float('inf'),
+        'calls': dict(fake.calls),
+        'errors': stats['errors'],
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--results', type=int, default=50_000, help='Resultados sintéticos')
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='Latencia por llamada')
+    parser.add_argument('--jitter-ms', type=float, default=0.0)
+    parser.add_argument('--requests', type=int, default=30, help='Requests por endpoint')
+    parser.add_argument('--import-rows', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--only', nargs='*', help='Medir solo estos endpoints')
+    parser.add_argument('--max-p95-ms', type=float, default=None)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    dataset = synthetic_dataset(args.results, args.seed)
+    fake = FakeSupabase(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, seed=args.seed)
+    seed_fake(fake, dataset)
+    print(
+        f"Dataset: {len(dataset['swim_competition_results'])} resultados, "
+        f"{len(dataset['athletes'])} atletas, {len(dataset['clubs'])} clubes "
+        f"({time.perf_counter() - started:.1f}s)"
+    )
+
+    app.dependency_overrides[get_supabase] = lambda: fake
+    # Sin Redis: cada request calcula su respuesta
+    response_cache._down_until = float('inf')
+
+    generators = endpoint_requests(dataset, args.seed)
+    if args.only:
+        generators = {k: v for k, v in generators.items() if k in args.only}
+
+    report = asyncio.run(bench_endpoints(fake, generators, args.requests))
+
+    columns = ['p50 ms', 'p95 ms', 'max ms', '1ra ms', 'llamadas']
+    print(f"\n{'endpoint':30} " + ' '.join(f"{c:>9}" for c in columns))
+    failed = False
+    for name, stats in report.items():
+        if 'error' in stats:
+            print(f"{name:30} ERROR {stats['error']}")
+            failed = True
+            continue
+        print(
+            f"{name:30} {stats['p50']:9.2f} {stats['p95']:9.2f} {stats['max']:9.2f} "
+            f"{stats['warmup']:9.1f} {stats['calls']:9.1f}"
+        )
+        if args.max_p95_ms is not None and stats['p95'] > args.max_p95_ms:
+            failed = True
+
+    if args.import_rows:
+        result = asyncio.run(bench_import(fake, dataset, args.import_rows))
+        calls = ', '.join(f"{op}={n}" for op, n in sorted(result['calls'].items()))
+        print(
+            f"\nImportación: {result['rows']} filas en {result['seconds']:.2f}s "
+            f"({result['rows_per_s']:.0f} filas/s, {result['errors']} errores)\n  {calls}"
+        )
+        failed = failed or result['errors'] > 0
+
+    if args.max_p95_ms is not None and failed:
+        print(f"\nFALLA: p95 por encima de {args.max_p95_ms} ms o errores", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,47 @@
+"""
+App FastAPI sobre FakeSupabase, para servir con uvicorn
+
+Cada worker genera el mismo dataset sintético (misma semilla) y reemplaza
+`get_supabase` por el fake. Configuración por variables de entorno, porque
+uvicorn importa la factory en cada proceso:
+
+    BENCH_RESULTS     resultados sintéticos (50000)
+    BENCH_LATENCY_MS  latencia por llamada a Supabase (2)
+    BENCH_JITTER_MS   variación de la latencia (0)
+    BENCH_SEED        semilla del dataset (0)
+    BENCH_CACHE       1 para usar la caché de respuestas (Redis) (0)
+
+Uso:
+    BENCH_RESULTS=50000 uvicorn benchmarks.fake_app:create_app --factory --workers 4
+"""
+import os
+
+# Antes de importar la app: Settings exige credenciales de Supabase
+os.environ.setdefault('SUPABASE_URL', 'http://fake-supabase.local')
+os.environ.setdefault('SUPABASE_KEY', 'fake-key')
+os.environ.setdefault('SYNC_SCHEDULER_ENABLED', 'false')
+
+from fastapi import FastAPI  # noqa: E402
+
+from app.main import app  # noqa: E402
+from app.services.cache import response_cache  # noqa: E402
+from app.services.supabase_client import get_supabase  # noqa: E402
+
+from .fake_supabase import FakeSupabase  # noqa: E402
+from .synthetic_data import seed_fake, synthetic_dataset  # noqa: E402
+
+
+def create_app() -> FastAPI:
+    seed = int(os.environ.get('BENCH_SEED', '0'))
+    fake = FakeSupabase(
+        latency_ms=float(os.environ.get('BENCH_LATENCY_MS', '2')),
+        jitter_ms=float(os.environ.get('BENCH_JITTER_MS', '0')),
+        seed=seed,
+    )
+    seed_fake(fake, synthetic_dataset(int(os.environ.get('BENCH_RESULTS', '50000')), seed))
+
+    app.dependency_overrides[get_supabase] = lambda: fake
+    if os.environ.get('BENCH_CACHE', '0') != '1':
+        # Sin Redis: cada request calcula su respuesta
+        response_cache._down_until = float('inf')
+    return app
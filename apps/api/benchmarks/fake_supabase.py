@@ -0,0 +1,731 @@
+"""
+Supabase en memoria para benchmarks
+
+Implementa el subconjunto del AsyncClient de supabase-py que usa la API
+(`table().select/eq/neq/gt/gte/lt/lte/is_/not_/in_/ilike/like/match/or_/
+order/range/limit/single/insert/upsert/update/delete`, `count="exact"`,
+`head=True` y `rpc`) sobre tablas guardadas como listas de dicts, con
+latencia opcional por llamada para simular el viaje a PostgREST.
+
+Las funciones RPC que usa la API vienen registradas con implementaciones en
+Python que imitan las de las migraciones; las que no están en las
+migraciones (get_all_team_codes, get_club_team_codes,
+get_unmatched_swimmers_grouped, normalize_name) devuelven la forma que
+consumen los servicios.
+
+Uso:
+    fake = FakeSupabase(latency_ms=2)
+    fake.seed('swim_competition_results', filas)
+    app.dependency_overrides[get_supabase] = lambda: fake
+
+Los filtros recorren la tabla completa: mide el costo de la API (llamadas,
+serialización, N+1), no planes de consulta de Postgres.
+"""
+import asyncio
+import random
+import re
+from collections import Counter
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Any
+
+from app.services.fecna_import import normalize_name
+
+Row = dict[str, Any]
+Predicate = Callable[[Row], bool]
+
+
+class FakeAPIError(Exception):
+    """Error equivalente a postgrest.APIError"""
+
+    def __init__(self, message: str, code: str = 'PGRST000'):
+        super().__init__(message)
+        self.message = message
+        self.code = code
+
+
+@dataclass
+class FakeResponse:
+    data: Any
+    count: int | None = None
+
+
+def _coerce(value: Any, sample: Any) -> Any:
+    """Convertir el valor de un filtro al tipo de la columna (PostgREST manda texto)"""
+    if value is None or sample is None or isinstance(value, type(sample)):
+        return value
+    if isinstance(sample, bool):
+        return str(value).lower() in ('true', 't', '1')
+    if isinstance(sample, (int, float)):
+        try:
+            return type(sample)(value)
+        except (TypeError, ValueError):
+            return value
+    return str(value)
+
+
+def _equal(a: Any, b: Any) -> bool:
+    if a is None or b is None:
+        return False
+    return a == _coerce(b, a)
+
+
+def _compare(op: str, a: Any, b: Any) -> bool:
+    if a is None or b is None:
+        return False
+    b = _coerce(b, a)
+    try:
+        if op == 'gt':
+            return a > b
+        if op == 'gte':
+            return a >= b
+        if op == 'lt':
+            return a < b
+        return a <= b
+    except TypeError:
+        return False
+
+
+def _like(pattern: str, flags: int = 0) -> 're.Pattern[str]':
+    regex = ''.join(
+        '.*' if ch == '%' else '.' if ch == '_' else re.escape(ch) for ch in pattern
+    )
+    return re.compile(f'^{regex}$', flags | re.DOTALL)
+
+
+def _is(value: Any, target: Any) -> bool:
+    if target in (None, 'null'):
+        return value is None
+    if target in (True, 'true'):
+        return value is True
+    if target in (False, 'false'):
+        return value is False
+    return False
+
+
+def _predicate(column: str, op: str, value: Any) -> Predicate:
+    """Predicado para un operador de PostgREST"""
+    if op == 'eq':
+        return lambda row: _equal(row.get(column), value)
+    if op == 'neq':
+        return lambda row: row.get(column) is not None and not _equal(row.get(column), value)
+    if op in ('gt', 'gte', 'lt', 'lte'):
+        return lambda row: _compare(op, row.get(column), value)
+    if op == 'is':
+        return lambda row: _is(row.get(column), value)
+    if op == 'in':
+        values = list(value)
+        return lambda row: any(_equal(row.get(column), v) for v in values)
+    if op in ('like', 'ilike'):
+        regex = _like(str(value), re.IGNORECASE if op == 'ilike' else 0)
+        return lambda row: row.get(column) is not None and bool(regex.match(str(row[column])))
+    raise FakeAPIError(f'Operador no soportado en el fake: {op}')
+
+
+def _split_top_level(expr: str) -> list[str]:
+    """Separar por comas fuera de paréntesis y de comillas"""
+    parts, depth, current = [], 0, []
+    quoted = escaped = False
+    for ch in expr:
+        if quoted:
+            quoted = escaped or ch != '"'
+            escaped = not escaped and ch == '\\'
+            current.append(ch)
+            continue
+        if ch == ',' and depth == 0:
+            parts.append(''.join(current))
+            current = []
+            continue
+        quoted = ch == '"'
+        depth += ch == '('
+        depth -= ch == ')'
+        current.append(ch)
+    if current:
+        parts.append(''.join(current))
+    return [p.strip() for p in parts if p.strip()]
+
+
+def _parse_logic(expr: str) -> Predicate:
+    """Interpretar la sintaxis de or_(): `col.op.valor,and(...),or(...)`"""
+    terms = []
+    for term in _split_top_level(expr):
+        if term.startswith(('and(', 'or(')) and term.endswith(')'):
+            kind, inner = term.split('(', 1)
+            sub = [_parse_logic(t) for t in _split_top_level(inner[:-1])]
+            terms.append(
+                (lambda preds: lambda row: all(p(row) for p in preds))(sub) if kind == 'and'
+                else (lambda preds: lambda row: any(p(row) for p in preds))(sub)
+            )
+            continue
+        column, op, value = term.split('.', 2)
+        negate = op == 'not'
+        if negate:
+            op, value = value.split('.', 1)
+        if op == 'in':
+            value = [v.strip().strip('"') for v in value.strip('()').split(',')]
+        elif len(value) > 1 and value[0] == value[-1] == '"':
+            value = re.sub(r'\\(.)', r'\1', value[1:-1])
+        predicate = _predicate(column, op, value)
+        terms.append((lambda p: lambda row: not p(row))(predicate) if negate else predicate)
+    return lambda row: any(t(row) for t in terms)
+
+
+def _parse_columns(columns: str) -> tuple[list[str] | None, dict[str, list[str]]]:
+    """Columnas simples y recursos embebidos (`clubs(name)`) de un select"""
+    if columns.strip() in ('', '*'):
+        return None, {}
+    plain: list[str] = []
+    embedded: dict[str, list[str]] = {}
+    for part in _split_top_level(columns):
+        if '(' in part:
+            table, inner = part.split('(', 1)
+            embedded[table.strip()] = [c.strip() for c in inner.rstrip(')').split(',')]
+        elif part == '*':
+            return None, embedded
+        else:
+            plain.append(part)
+    return plain, embedded
+
+
+class _Negation:
+    """`query.not_.is_(...)`: el siguiente filtro se niega"""
+
+    def __init__(self, query: 'FakeQuery'):
+        self._query = query
+
+    def __getattr__(self, name: str) -> Callable[..., 'FakeQuery']:
+        method = getattr(self._query, name)
+
+        def negated(*args: Any, **kwargs: Any) -> 'FakeQuery':
+            self._query._negate_next = True
+            return method(*args, **kwargs)
+        return negated
+
+
+class FakeQuery:
+    """Builder de consultas sobre una tabla en memoria"""
+
+    def __init__(self, backend: 'FakeSupabase', table: str):
+        self._backend = backend
+        self._table = table
+        self._action = 'select'
+        self._columns = '*'
+        self._count: str | None = None
+        self._head = False
+        self._filters: list[Predicate] = []
+        self._orders: list[tuple[str, bool, bool | None]] = []
+        self._offset = 0
+        self._limit: int | None = None
+        self._single = False
+        self._maybe_single = False
+        self._payload: Any = None
+        self._on_conflict: str | None = None
+        self._ignore_duplicates = False
+        self._negate_next = False
+
+    # Acciones
+
+    def select(self, *columns: str, count: str | None = None, head: bool = False) -> 'FakeQuery':
+        self._columns = ','.join(columns) if columns else '*'
+        self._count = count
+        self._head = head
+        return self
+
+    def insert(self, rows: Any, count: str | None = None, **kwargs: Any) -> 'FakeQuery':
+        self._action = 'insert'
+        self._payload = rows
+        self._count = count
+        return self
+
+    def upsert(
+        self,
+        rows: Any,
+        on_conflict: str = '',
+        ignore_duplicates: bool = False,
+        count: str | None = None,
+        **kwargs: Any
+    ) -> 'FakeQuery':
+        self._action = 'upsert'
+        self._payload = rows
+        self._on_conflict = on_conflict or None
+        self._ignore_duplicates = ignore_duplicates
+        self._count = count
+        return self
+
+    def update(self, values: Row, count: str | None = None) -> 'FakeQuery':
+        self._action = 'update'
+        self._payload = values
+        self._count = count
+        return self
+
+    def delete(self, count: str | None = None) -> 'FakeQuery':
+        self._action = 'delete'
+        self._count = count
+        return self
+
+    # Filtros
+
+    def _filter(self, predicate: Predicate) -> 'FakeQuery':
+        if self._negate_next:
+            self._negate_next = False
+            self._filters.append(lambda row: not predicate(row))
+        else:
+            self._filters.append(predicate)
+        return self
+
+    @property
+    def not_(self) -> _Negation:
+        return _Negation(self)
+
+    def eq(self, column: str, value: Any) -> 'FakeQuery':
+        return self._filter(_predicate(column, 'eq', value))
+
+    def neq(self, column: str, value: Any) -> 'FakeQuery':
+        return self._filter(_predicate(column, 'neq', value))
+
+    def gt(self, column: str, value: Any) -> 'FakeQuery':
+        return self._filter(_predicate(column, 'gt', value))
+
+    def gte(self, column: str, value: Any) -> 'FakeQuery':
+        return self._filter(_predicate(column, 'gte', value))
+
+    def lt(self, column: str, value: Any) -> 'FakeQuery':
+        return self._filter(_predicate(column, 'lt', value))
+
+    def lte(self, column: str, value: Any) -> 'FakeQuery':
+        return self._filter(_predicate(column, 'lte', value))
+
+    def is_(self, column: str, value: Any) -> 'FakeQuery':
+        return self._filter(_predicate(column, 'is', value))
+
+    def in_(self, column: str, values: Iterable[Any]) -> 'FakeQuery':
+        return self._filter(_predicate(column, 'in', list(values)))
+
+    def like(self, column: str, pattern: str) -> 'FakeQuery':
+        return self._filter(_predicate(column, 'like', pattern))
+
+    def ilike(self, column: str, pattern: str) -> 'FakeQuery':
+        return self._filter(_predicate(column, 'ilike', pattern))
+
+    def match(self, query: Row) -> 'FakeQuery':
+        for column, value in query.items():
+            self.eq(column, value)
+        return self
+
+    def or_(self, filters: str, reference_table: str | None = None) -> 'FakeQuery':
+        return self._filter(_parse_logic(filters))
+
+    # Modificadores
+
+    def order(
+        self, column: str, desc: bool = False, nullsfirst: bool | None = None, **kwargs: Any
+    ) -> 'FakeQuery':
+        self._orders.append((column, desc, nullsfirst))
+        return self
+
+    def limit(self, size: int, **kwargs: Any) -> 'FakeQuery':
+        self._limit = size
+        return self
+
+    def range(self, start: int, end: int, **kwargs: Any) -> 'FakeQuery':
+        self._offset = start
+        self._limit = end - start + 1
+        return self
+
+    def single(self) -> 'FakeQuery':
+        self._single = True
+        return self
+
+    def maybe_single(self) -> 'FakeQuery':
+        self._maybe_single = True
+        return self
+
+    # Ejecución
+
+    def _matches(self, row: Row) -> bool:
+        return all(f(row) for f in self._filters)
+
+    def _sorted(self, rows: list[Row]) -> list[Row]:
+        # Orden estable: aplicar las claves de la menos a la más significativa
+        for column, desc, nullsfirst in reversed(self._orders):
+            # Postgres: NULLS LAST en ASC y NULLS FIRST en DESC por defecto
+            nulls_first = desc if nullsfirst is None else nullsfirst
+            present = [r for r in rows if r.get(column) is not None]
+            missing = [r for r in rows if r.get(column) is None]
+            present.sort(key=lambda r: r[column], reverse=desc)
+            rows = missing + present if nulls_first else present + missing
+        return rows
+
+    def _project(self, rows: list[Row]) -> list[Row]:
+        plain, embedded = _parse_columns(self._columns)
+        projected = []
+        for row in rows:
+            out = dict(row) if plain is None else {c: row.get(c) for c in plain}
+            for table, columns in embedded.items():
+                # Relación muchos-a-uno por convención: clubs -> club_id
+                fk = row.get(f"{table.rstrip('s')}_id")
+                target = self._backend.find(table, fk) if fk is not None else None
+                out[table] = (
+                    None if target is None
+                    else dict(target) if columns == ['*']
+                    else {c: target.get(c) for c in columns}
+                )
+            projected.append(out)
+        return projected
+
+    def _select(self) -> FakeResponse:
+        rows = [r for r in self._backend.tables.get(self._table, []) if self._matches(r)]
+        count = len(rows) if self._count else None
+        rows = self._sorted(rows)
+        end = None if self._limit is None else self._offset + self._limit
+        rows = rows[self._offset:end]
+        if self._head:
+            return FakeResponse(data=[], count=count)
+        return self._finish(self._project(rows), count)
+
+    def _finish(self, rows: list[Row], count: int | None) -> FakeResponse:
+        if self._single:
+            if len(rows) != 1:
+                raise FakeAPIError(
+                    'JSON object requested, multiple (or no) rows returned', 'PGRST116'
+                )
+            return FakeResponse(data=rows[0], count=count)
+        if self._maybe_single:
+            return FakeResponse(data=rows[0] if rows else None, count=count)
+        return FakeResponse(data=rows, count=count)
+
+    def _write(self) -> FakeResponse:
+        table = self._backend.tables.setdefault(self._table, [])
+        if self._action in ('insert', 'upsert'):
+            rows = self._payload if isinstance(self._payload, list) else [self._payload]
+            if self._action == 'upsert':
+                written = self._backend.upsert_rows(
+                    self._table, rows, self._on_conflict, self._ignore_duplicates
+                )
+            else:
+                written = [self._backend.insert_row(self._table, row) for row in rows]
+        elif self._action == 'update':
+            written = [r for r in table if self._matches(r)]
+            for row in written:
+                row.update(self._payload)
+        else:
+            written = [r for r in table if self._matches(r)]
+            remaining = [r for r in table if not self._matches(r)]
+            self._backend.tables[self._table] = remaining
+            self._backend.reindex(self._table)
+        return self._finish(
+            [dict(r) for r in written], len(written) if self._count else None
+        )
+
+    async def execute(self) -> FakeResponse:
+        await self._backend.round_trip(f'{self._action} {self._table}')
+        if self._action == 'select':
+            return self._select()
+        return self._write()
+
+
+class FakeRPC:
+    """Llamada a función (supabase.rpc)"""
+
+    def __init__(self, backend: 'FakeSupabase', name: str, params: Row | None):
+        self._backend = backend
+        self._name = name
+        self._params = params or {}
+
+    async def execute(self) -> FakeResponse:
+        await self._backend.round_trip(f'rpc {self._name}')
+        handler = self._backend.rpcs.get(self._name)
+        if handler is None:
+            raise FakeAPIError(f'Función no registrada en el fake: {self._name}', 'PGRST202')
+        return FakeResponse(data=handler(self._backend, self._params))
+
+
+class FakeSupabase:
+    """
+    Cliente Supabase en memoria, intercambiable con AsyncClient
+
+    Args:
+        latency_ms: Latencia por llamada (viaje de red a PostgREST)
+        jitter_ms: Variación uniforme adicional de la latencia
+        seed: Semilla del jitter
+    """
+
+    def __init__(self, latency_ms: float = 0.0, jitter_ms: float = 0.0, seed: int = 0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.tables: dict[str, list[Row]] = {}
+        self.rpcs: dict[str, Callable[[FakeSupabase, Row], Any]] = dict(DEFAULT_RPCS)
+        self.calls: Counter = Counter()
+        self._by_id: dict[str, dict[str, Row]] = {}
+        self._next_id: dict[str, int] = {}
+        self._rng = random.Random(seed)
+
+    # Interfaz de supabase-py
+
+    def table(self, name: str) -> FakeQuery:
+        return FakeQuery(self, name)
+
+    def from_(self, name: str) -> FakeQuery:
+        return self.table(name)
+
+    def rpc(self, name: str, params: Row | None = None) -> FakeRPC:
+        return FakeRPC(self, name, params)
+
+    # Datos
+
+    def seed(self, table: str, rows: Iterable[Row]) -> None:
+        """Cargar filas (se asigna id a las que no lo traen)"""
+        for row in rows:
+            self.insert_row(table, row)
+
+    def register_rpc(self, name: str, handler: Callable[['FakeSupabase', Row], Any]) -> None:
+        self.rpcs[name] = handler
+
+    def find(self, table: str, row_id: Any) -> Row | None:
+        return self._by_id.get(table, {}).get(str(row_id))
+
+    def reindex(self, table: str) -> None:
+        self._by_id[table] = {str(r['id']): r for r in self.tables.get(table, []) if 'id' in r}
+
+    def insert_row(self, table: str, row: Row) -> Row:
+        row = dict(row)
+        if row.get('id') is None:
+            row['id'] = self._next_id.get(table, 1)
+        if self.find(table, row['id']) is not None:
+            raise FakeAPIError(f'duplicate key value violates unique constraint ({table})', '23505')
+        self.tables.setdefault(table, []).append(row)
+        self._by_id.setdefault(table, {})[str(row['id'])] = row
+        if isinstance(row['id'], int):
+            self._next_id[table] = max(self._next_id.get(table, 1), row['id'] + 1)
+        return row
+
+    def upsert_rows(
+        self, table: str, rows: list[Row], on_conflict: str | None, ignore_duplicates: bool
+    ) -> list[Row]:
+        """Insertar o actualizar por la clave de conflicto (id si no se indica)"""
+        keys = on_conflict.split(',') if on_conflict else ['id']
+
+        def key(row: Row) -> tuple:
+            return tuple(str(row.get(k)) for k in keys)
+
+        existing = {key(r): r for r in self.tables.get(table, [])}
+        written = []
+        for row in rows:
+            current = existing.get(key(row)) if all(row.get(k) is not None for k in keys) else None
+            if current is None:
+                current = existing[key(row)] = self.insert_row(table, row)
+            elif ignore_duplicates:
+                continue
+            else:
+                current.update({k: v for k, v in row.items() if k != 'id'})
+            written.append(current)
+        return written
+
+    # Métricas
+
+    async def round_trip(self, operation: str) -> None:
+        self.calls[operation] += 1
+        delay = self.latency_ms + (self._rng.uniform(0, self.jitter_ms) if self.jitter_ms else 0)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+        else:
+            await asyncio.sleep(0)
+
+    def reset_calls(self) -> None:
+        self.calls.clear()
+
+    @property
+    def total_calls(self) -> int:
+        return sum(self.calls.values())
+
+
+# RPCs por defecto
+
+
+def _results(backend: FakeSupabase) -> list[Row]:
+    return backend.tables.get('swim_competition_results', [])
+
+
+def _rpc_get_swimmer_names(backend: FakeSupabase, params: Row) -> list[Row]:
+    names: dict[str, Row] = {}
+    for row in _results(backend):
+        norm = row.get('swimmer_name_norm')
+        if not norm:
+            continue
+        entry = names.setdefault(norm, {
+            'swimmer_name_norm': norm,
+            'swimmer_name': row.get('swimmer_name'),
+            'result_count': 0,
+        })
+        entry['result_count'] += 1
+    # Keyset por swimmer_name_norm, como la función en 013
+    after = params.get('p_after') or ''
+    ordered = sorted((n for n in names.values() if n['swimmer_name_norm'] > after),
+                     key=lambda n: n['swimmer_name_norm'])
+    return ordered[:params.get('p_limit') or 1000]
+
+
+def _rpc_normalize_name(backend: FakeSupabase, params: Row) -> str:
+    return normalize_name(params.get('name') or '')
+
+
+def _linked_team_codes(backend: FakeSupabase) -> dict[str, Row]:
+    return {
+        m['external_code']: m
+        for m in backend.tables.get('club_external_mappings', [])
+        if m.get('status') == 'CONFIRMED' and m.get('external_code')
+    }
+
+
+def _rpc_get_all_team_codes(backend: FakeSupabase, params: Row) -> list[Row]:
+    counts: Counter = Counter(r.get('team_code') for r in _results(backend) if r.get('team_code'))
+    linked = _linked_team_codes(backend)
+    return [
+        {
+            'team_code': code,
+            'result_count': count,
+            'is_linked': code in linked,
+            'club_id': linked[code].get('club_id') if code in linked else None,
+        }
+        for code, count in sorted(counts.items())
+    ]
+
+
+def _rpc_get_club_team_codes(backend: FakeSupabase, params: Row) -> list[Row]:
+    club_id = params.get('p_club_id')
+    return [
+        {'id': m['id'], 'external_code': m['external_code'], 'created_at': m.get('created_at')}
+        for m in _linked_team_codes(backend).values()
+        if _equal(m.get('club_id'), club_id)
+    ]
+
+
+def _rpc_get_unmatched_swimmers_grouped(backend: FakeSupabase, params: Row) -> list[Row]:
+    swimmers: dict[str, Row] = {}
+    for row in _results(backend):
+        if row.get('athlete_id') is not None or not row.get('swimmer_name_norm'):
+            continue
+        entry = swimmers.setdefault(row['swimmer_name_norm'], {
+            'swimmer_name': row.get('swimmer_name'),
+            'swimmer_name_norm': row['swimmer_name_norm'],
+            'gender': row.get('gender'),
+            'team_code': row.get('team_code'),
+            'result_count': 0,
+        })
+        entry['result_count'] += 1
+    ordered = sorted(swimmers.values(), key=lambda s: (-s['result_count'], s['swimmer_name'] or ''))
+    return ordered[:params.get('p_limit') or len(ordered)]
+
+
+def _best_rows(rows: Iterable[Row], key: Callable[[Row], tuple]) -> dict[tuple, tuple[Row, int]]:
+    best: dict[tuple, tuple[Row, int]] = {}
+    for row in rows:
+        if row.get('final_time_ms') is None or not row.get('swimmer_name_norm'):
+            continue
+        k = key(row)
+        current = best.get(k)
+        count = current[1] + 1 if current else 1
+        order = (row['final_time_ms'], str(row.get('event_date') or ''), row['id'])
+        if current is None or order < (
+            current[0]['final_time_ms'], str(current[0].get('event_date') or ''), current[0]['id']
+        ):
+            best[k] = (row, count)
+        else:
+            best[k] = (current[0], count)
+    return best
+
+
+def _best_entry(row: Row, count: int) -> Row:
+    return {
+        'swimmer_name_norm': row['swimmer_name_norm'],
+        'distance_m': row.get('distance_m'),
+        'stroke': row.get('stroke'),
+        'swimmer_name': row.get('swimmer_name'),
+        'athlete_id': row.get('athlete_id'),
+        'gender': row.get('gender'),
+        'best_time_ms': row['final_time_ms'],
+        'result_id': row['id'],
+        'tournament_name': row.get('tournament_name'),
+        'event_date': row.get('event_date'),
+        'year': row.get('year'),
+        'age': row.get('age'),
+        'team_code': row.get('team_code'),
+        'result_count': count,
+        'updated_at': datetime.now(UTC).isoformat(),
+    }
+
+
+def _rpc_refresh_personal_bests(backend: FakeSupabase, params: Row) -> int:
+    names = params.get('p_swimmer_names')
+    wanted = None if names is None else set(names)
+
+    def keep(row: Row) -> bool:
+        return wanted is None or row.get('swimmer_name_norm') in wanted
+
+    rows = [r for r in _results(backend) if keep(r)]
+    written = 0
+    for table, with_year in (('swimmer_personal_bests', False), ('swimmer_season_bests', True)):
+        backend.tables[table] = [r for r in backend.tables.get(table, []) if not keep(r)]
+        backend.reindex(table)
+        columns = ('year', 'distance_m', 'stroke') if with_year else ('distance_m', 'stroke')
+
+        def key(r: Row, columns: tuple[str, ...] = columns) -> tuple:
+            return (r['swimmer_name_norm'],) + tuple(r.get(c) for c in columns)
+
+        for row, count in _best_rows(rows, key).values():
+            backend.insert_row(table, _best_entry(row, count))
+            if not with_year:
+                written += 1
+    return written
+
+
+def _rpc_refresh_tournaments(backend: FakeSupabase, params: Row) -> int:
+    names = params.get('p_names')
+    wanted = None if names is None else set(names)
+    groups: dict[tuple[str, Any], list[Row]] = {}
+    for row in _results(backend):
+        if wanted is None or row.get('tournament_name') in wanted:
+            groups.setdefault((row.get('tournament_name'), row.get('year')), []).append(row)
+
+    table = backend.tables.setdefault('competition_tournaments', [])
+    backend.tables['competition_tournaments'] = [
+        t for t in table
+        if not (wanted is None or t['name'] in wanted) or (t['name'], t['year']) in groups
+    ]
+    backend.reindex('competition_tournaments')
+    tournaments = []
+    for (name, year), rows in groups.items():
+        dates = [r['event_date'] for r in rows if r.get('event_date')]
+        tournaments.append({
+            'name': name,
+            'year': year,
+            'start_date': min(dates) if dates else None,
+            'end_date': max(dates) if dates else None,
+            'result_count': len(rows),
+            'swimmer_count': len({r.get('swimmer_name_norm') for r in rows}),
+            'updated_at': datetime.now(UTC).isoformat(),
+        })
+    backend.upsert_rows('competition_tournaments', tournaments, 'name,year', False)
+    return len(groups)
+
+
+def _rpc_search_swimmer_names(backend: FakeSupabase, params: Row) -> list[Row]:
+    query = normalize_name(params.get('p_query') or '')
+    matches = [
+        n for n in _rpc_get_swimmer_names(backend, {'p_limit': len(_results(backend)) + 1})
+        if query in n['swimmer_name_norm']
+    ]
+    return matches[:params.get('p_limit') or 20]
+
+
+DEFAULT_RPCS: dict[str, Callable[[FakeSupabase, Row], Any]] = {
+    'get_swimmer_names': _rpc_get_swimmer_names,
+    'search_swimmer_names': _rpc_search_swimmer_names,
+    'normalize_name': _rpc_normalize_name,
+    'get_all_team_codes': _rpc_get_all_team_codes,
+    'get_club_team_codes': _rpc_get_club_team_codes,
+    'get_unmatched_swimmers_grouped': _rpc_get_unmatched_swimmers_grouped,
+    'refresh_personal_bests': _rpc_refresh_personal_bests,
+    'refresh_tournaments': _rpc_refresh_tournaments,
+}
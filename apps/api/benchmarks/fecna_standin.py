@@ -0,0 +1,247 @@
+"""
+Servidor local que imita los endpoints de FECNA (ecoapplet.co)
+
+Sirve payloads grabados (desde la caché de respuestas de FECNA) o sintéticos,
+con latencia y errores configurables, para ejercitar FECNASyncService y
+fecna_lookup sin salir a internet.
+
+Uso:
+    python -m benchmarks.fecna_standin --port 8765 --latency-ms 80 --error-rate 0.02
+
+y apuntar la API con FECNA_BASE_URL=http://127.0.0.1:8765
+"""
+import argparse
+import asyncio
+import random
+import threading
+import time
+import uuid
+from collections import Counter, deque
+from dataclasses import dataclass
+from html import escape
+from typing import Any
+from urllib.parse import parse_qs
+
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import HTMLResponse, JSONResponse
+
+from app.services.fecna_cache import FECNAResponseCache
+from app.services.fecna_sync import FECNASyncService
+
+SESSION_COOKIE = 'standin_session'
+
+NOMBRES = ['SOFIA', 'VALENTINA', 'ISABELLA', 'MARIANA', 'SANTIAGO', 'MATEO', 'SAMUEL', 'NICOLAS']
+APELLIDOS = ['GOMEZ', 'RODRIGUEZ', 'MARTINEZ', 'LOPEZ', 'GARCIA', 'SERRANO', 'RAMIREZ', 'TORRES']
+
+# Tiempo base aproximado (segundos) por metro, por estilo
+SEGUNDOS_POR_METRO = {'FREE': 0.62, 'BACK': 0.70, 'BREAST': 0.80, 'FLY': 0.68, 'IM': 0.74}
+
+
+@dataclass
+class StandinConfig:
+    """Configuración del servidor stand-in"""
+    latency_ms: float = 0.0
+    latency_jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    swimmers: int = 500
+    recorded_dir: str | None = None
+    seed: int = 0
+
+
+def synthetic_swimmer_ids(config: StandinConfig) -> list[str]:
+    """IDs de nadadores sintéticos que sirve el stand-in"""
+    return [str(1000000 + i) for i in range(config.swimmers)]
+
+
+def synthetic_swimmer_name(nadador_id: str) -> str:
+    """Nombre determinístico para un ID sintético"""
+    rng = random.Random(f"nombre:{nadador_id}")
+    return f"{rng.choice(APELLIDOS)} {rng.choice(APELLIDOS)}, {rng.choice(NOMBRES)}"
+
+
+def synthetic_results(nadador_id: str, prueba_id: int, seed: int = 0) -> list[dict[str, Any]]:
+    """
+    Payload determinístico de getHistorial para (nadador, prueba)
+
+    El mismo (nadador, prueba, seed) siempre produce el mismo payload, así el
+    benchmark puede verificar que cada atleta recibió sus propios resultados.
+    """
+    rng = random.Random(f"{seed}:{nadador_id}:{prueba_id}")
+    distancia, estilo, _ = FECNASyncService.PRUEBAS[prueba_id]
+    count = rng.choice([0, 0, 1, 2, 3, 4, 6])
+    edad = rng.randint(9, 22)
+    genero = rng.choice(['F', 'M'])
+
+    results = []
+    base = distancia * SEGUNDOS_POR_METRO[estilo] * rng.uniform(1.0, 1.5)
+    for i in range(count):
+        segundos = round(base * rng.uniform(0.97, 1.06), 2)
+        minutos, resto = divmod(segundos, 60)
+        results.append({
+            'tiempo': f"00:{int(minutos):02d}:{resto:05.2f}",
+            'segundos': segundos,
+            'fecha_torneo': f"{2023 + i % 3}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            'torneo': f"Torneo Sintético {rng.randint(1, 40)}",
+            'genero': genero,
+            'edad': edad,
+        })
+    return results
+
+
+class StandinStats:
+    """Contadores de tráfico para verificar concurrencia y control de tasa"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.by_path: Counter = Counter()
+            self.errors_injected = 0
+            self.in_flight = 0
+            self.max_in_flight = 0
+            self.timestamps: deque = deque()
+
+    def start(self, path: str):
+        with self._lock:
+            self.by_path[path] += 1
+            self.timestamps.append(time.monotonic())
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+    def finish(self):
+        with self._lock:
+            self.in_flight -= 1
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            stamps = list(self.timestamps)
+            by_path = dict(self.by_path)
+            errors = self.errors_injected
+            max_in_flight = self.max_in_flight
+
+        # Máximo de peticiones en cualquier ventana deslizante de 1 s
+        peak_rps = 0
+        left = 0
+        for right, stamp in enumerate(stamps):
+            while stamp - stamps[left] > 1.0:
+                left += 1
+            peak_rps = max(peak_rps, right - left + 1)
+
+        return {
+            'requests': len(stamps),
+            'by_path': by_path,
+            'errors_injected': errors,
+            'max_in_flight': max_in_flight,
+            'peak_rps': peak_rps,
+        }
+
+
+def create_standin_app(config: StandinConfig) -> FastAPI:
+    """Crear la app FastAPI que imita ecoapplet.co/fecna/reportes"""
+    app = FastAPI(title="FECNA stand-in")
+    stats = StandinStats()
+    sessions: dict[str, str] = {}
+    recorded = FECNAResponseCache(config.recorded_dir) if config.recorded_dir else None
+    rng = random.Random(config.seed)
+
+    app.state.stats = stats
+    app.state.config = config
+
+    @app.middleware("http")
+    async def simulate_network(request: Request, call_next):
+        if request.url.path.startswith('/_'):
+            return await call_next(request)
+
+        stats.start(request.url.path)
+        try:
+            delay = config.latency_ms + rng.uniform(-1, 1) * config.latency_jitter_ms
+            if delay > 0:
+                await asyncio.sleep(delay / 1000)
+            if config.error_rate and rng.random() < config.error_rate:
+                stats.errors_injected += 1
+                return Response(status_code=503, content=b'Service Unavailable')
+            return await call_next(request)
+        finally:
+            stats.finish()
+
+    @app.get("/index")
+    async def index():
+        response = HTMLResponse("<html><body>FECNA reportes</body></html>")
+        response.set_cookie(SESSION_COOKIE, uuid.uuid4().hex)
+        return response
+
+    @app.post("/historialFilter")
+    async def historial_filter(request: Request):
+        form = parse_qs((await request.body()).decode())
+        session_id = request.cookies.get(SESSION_COOKIE)
+        if not session_id:
+            return Response(status_code=400, content=b'Sin sesion')
+        sessions[session_id] = form.get('nadador', [''])[0]
+        return HTMLResponse("<html><body>Historial</body></html>")
+
+    @app.get("/historial")
+    async def historial():
+        options = ''.join(
+            f'<option value="{nadador_id}">{escape(synthetic_swimmer_name(nadador_id))}</option>'
+            for nadador_id in synthetic_swimmer_ids(config)
+        )
+        return HTMLResponse(
+            f'<html><body><select name="nadador"><option value=""></option>'
+            f'{options}</select></body></html>'
+        )
+
+    @app.get("/{prueba_id}/getHistorial")
+    async def get_historial(prueba_id: int, request: Request):
+        nadador_id = sessions.get(request.cookies.get(SESSION_COOKIE, ''))
+        if not nadador_id or prueba_id not in FECNASyncService.PRUEBAS:
+            return JSONResponse([])
+
+        if recorded:
+            payload = recorded.load_athlete(nadador_id).get(prueba_id)
+            if payload is not None:
+                return JSONResponse(payload)
+
+        return JSONResponse(synthetic_results(nadador_id, prueba_id, config.seed))
+
+    @app.get("/_stats")
+    async def get_stats():
+        return stats.snapshot()
+
+    @app.post("/_stats/reset")
+    async def reset_stats():
+        stats.reset()
+        return {'reset': True}
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency-ms', type=float, default=0.0)
+    parser.add_argument('--latency-jitter-ms', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--swimmers', type=int, default=500)
+    parser.add_argument('--recorded-dir', default=None,
+                        help='Directorio de caché FECNA con payloads grabados')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    import uvicorn
+
+    config = StandinConfig(
+        latency_ms=args.latency_ms,
+        latency_jitter_ms=args.latency_jitter_ms,
+        error_rate=args.error_rate,
+        swimmers=args.swimmers,
+        recorded_dir=args.recorded_dir,
+        seed=args.seed,
+    )
+    uvicorn.run(create_standin_app(config), host=args.host, port=args.port, log_level='warning')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,269 @@
+"""
+Prueba de carga de la API con mezclas de tráfico de la web
+
+Levanta la app real con uvicorn y varios workers (sobre FakeSupabase, ver
+benchmarks.fake_app) o apunta a una API ya corriendo con --target (por
+ejemplo contra Postgres+PostgREST de `supabase start`). Usuarios virtuales
+en lazo cerrado eligen endpoints según el escenario; se reporta, por
+endpoint y en total, throughput y latencia p50/p95/p99. El período de
+calentamiento no se mide.
+
+Los parámetros de los requests salen del dataset sintético de
+benchmarks.synthetic_data: con --target, generar la base con la misma
+semilla y cantidad de resultados para que las búsquedas encuentren filas.
+
+Termina con código 1 si hay errores, si el p99 total supera --max-p99-ms o
+si el throughput baja de --min-rps.
+
+Uso:
+    python -m benchmarks.load_test --workers 4 --users 32 --duration 30 --scenario web
+    python -m benchmarks.load_test --target http://127.0.0.1:8000 --scenario mixto
+"""
+import argparse
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from collections.abc import Callable
+from typing import Any
+
+import httpx
+
+from .api_benchmark import Request, endpoint_requests
+from .sync_benchmark import _free_port
+from .synthetic_data import synthetic_dataset
+
+# Pesos por endpoint de api_benchmark.endpoint_requests
+ESCENARIOS: dict[str, dict[str, float]] = {
+    # Público: perfiles de nadadores, rankings por prueba y búsquedas
+    'web': {
+        'results/rankings': 30,
+        'results/swimmer': 25,
+        'results/swimmers/search': 15,
+        'results/search?name': 10,
+        'results/search': 10,
+        'results/tournaments': 10,
+    },
+    # Panel de administración: revisión de nadadores sin vincular
+    'matching': {
+        'matching/pending': 25,
+        'matching/search': 25,
+        'matching/club-unmatched': 20,
+        'matching/unmatched': 10,
+        'matching/stats': 10,
+        'matching/unmatched-summary': 10,
+    },
+    # Un admin por cada ~10 visitantes
+    'mixto': {
+        'results/rankings': 27,
+        'results/swimmer': 22,
+        'results/swimmers/search': 14,
+        'results/search?name': 9,
+        'results/search': 9,
+        'results/tournaments': 9,
+        'matching/pending': 3,
+        'matching/search': 3,
+        'matching/club-unmatched': 2,
+        'matching/stats': 1,
+        'matching/unmatched': 1,
+    },
+}
+
+
+def _percentile(samples: list[float], q: float) -> float:
+    """Percentil por rango más cercano (samples ordenadas)"""
+    return samples[min(int(len(samples) * q), len(samples) - 1)]
+
+
+def start_server(args: argparse.Namespace) -> tuple[subprocess.Popen, str]:
+    """Arrancar uvicorn con benchmarks.fake_app y esperar a que responda"""
+    port = _free_port()
+    env = {
+        **os.environ,
+        'BENCH_RESULTS': str(args.results),
+        'BENCH_LATENCY_MS': str(args.latency_ms),
+        'BENCH_JITTER_MS': str(args.jitter_ms),
+        'BENCH_SEED': str(args.seed),
+        'BENCH_CACHE': '1' if args.cache else '0',
+    }
+    process = subprocess.Popen(
+        [
+            sys.executable, '-m', 'uvicorn', 'benchmarks.fake_app:create_app', '--factory',
+            '--host', '127.0.0.1', '--port', str(port), '--workers', str(args.workers),
+            '--log-level', 'warning', '--no-access-log',
+        ],
+        env=env,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + args.startup_timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"uvicorn terminó con código {process.returncode}")
+        try:
+            if httpx.get(f"{base_url}/health", timeout=1.0).status_code == 200:
+                return process, base_url
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.25)
+    process.terminate()
+    raise RuntimeError(f"uvicorn no respondió en {args.startup_timeout}s")
+
+
+async def run_load(
+    base_url: str,
+    generators: dict[str, Callable[[], Request]],
+    weights: dict[str, float],
+    users: int,
+    duration: float,
+    warmup: float,
+    think_ms: float,
+    seed: int,
+) -> dict[str, Any]:
+    """Usuarios virtuales en lazo cerrado; devuelve latencias y errores por endpoint"""
+    names = [name for name in weights if name in generators]
+    cum_weights = [weights[name] for name in names]
+    latencies: dict[str, list[float]] = defaultdict(list)
+    errors: dict[str, int] = defaultdict(int)
+    error_samples: dict[str, str] = {}
+
+    started = time.monotonic()
+    measure_from = started + warmup
+    stop_at = measure_from + duration
+
+    async def user(client: httpx.AsyncClient, rng: random.Random) -> None:
+        while time.monotonic() < stop_at:
+            name = rng.choices(names, weights=cum_weights)[0]
+            method, url, params = generators[name]()
+            sent = time.monotonic()
+            try:
+                response = await client.request(method, url, params=params)
+                failed = response.status_code >= 400
+                detail = f"{response.status_code}: {response.text[:200]}"
+            except httpx.HTTPError as e:
+                failed, detail = True, f"{type(e).__name__}: {e}"
+            done = time.monotonic()
+            if sent >= measure_from and done <= stop_at:
+                if failed:
+                    errors[name] += 1
+                    error_samples.setdefault(name, detail)
+                else:
+                    latencies[name].append((done - sent) * 1000)
+            if think_ms:
+                await asyncio.sleep(rng.expovariate(1000 / think_ms))
+
+    limits = httpx.Limits(max_connections=users, max_keepalive_connections=users)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60.0) as client:
+        await asyncio.gather(*(
+            user(client, random.Random(seed * 1000 + i)) for i in range(users)
+        ))
+
+    return {
+        'latencies': dict(latencies),
+        'errors': dict(errors),
+        'error_samples': error_samples,
+        'seconds': duration,
+    }
+
+
+def summarize(result: dict[str, Any]) -> dict[str, dict[str, float]]:
+    """Throughput y percentiles por endpoint, más la fila 'total'"""
+    seconds = result['seconds']
+    endpoints = sorted(set(result['latencies']) | set(result['errors']))
+    everything: list[float] = []
+    summary: dict[str, dict[str, float]] = {}
+    for name in endpoints + ['total']:
+        if name == 'total':
+            samples = sorted(everything)
+            errors = sum(result['errors'].values())
+        else:
+            samples = sorted(result['latencies'].get(name, []))
+            errors = result['errors'].get(name, 0)
+            everything.extend(samples)
+        row = {'requests': len(samples), 'errors': errors, 'rps': len(samples) / seconds}
+        if samples:
+            row.update({
+                'p50': _percentile(samples, 0.50),
+                'p95': _percentile(samples, 0.95),
+                'p99': _percentile(samples, 0.99),
+            })
+        summary[name] = row
+    return summary
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--scenario', choices=sorted(ESCENARIOS), default='web')
+    parser.add_argument('--target', help='URL de una API ya corriendo (no levanta uvicorn)')
+    parser.add_argument('--workers', type=int, default=4, help='Workers de uvicorn')
+    parser.add_argument('--users', type=int, default=32, help='Usuarios virtuales concurrentes')
+    parser.add_argument('--duration', type=float, default=30.0, help='Segundos medidos')
+    parser.add_argument('--warmup', type=float, default=5.0, help='Segundos sin medir')
+    parser.add_argument('--think-ms', type=float, default=0.0,
+                        help='Pausa media entre requests de un usuario')
+    parser.add_argument('--results', type=int, default=50_000, help='Resultados sintéticos')
+    parser.add_argument('--latency-ms', type=float, default=2.0,
+                        help='Latencia por llamada a FakeSupabase')
+    parser.add_argument('--jitter-ms', type=float, default=0.0)
+    parser.add_argument('--cache', action='store_true', help='Usar la caché de respuestas')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--startup-timeout', type=float, default=120.0)
+    parser.add_argument('--max-p99-ms', type=float, default=None)
+    parser.add_argument('--min-rps', type=float, default=None)
+    args = parser.parse_args()
+
+    dataset = synthetic_dataset(args.results, args.seed)
+    generators = endpoint_requests(dataset, args.seed)
+    weights = ESCENARIOS[args.scenario]
+
+    process: subprocess.Popen | None = None
+    if args.target:
+        base_url = args.target.rstrip('/')
+    else:
+        print(f"Levantando uvicorn con {args.workers} workers y {args.results} resultados...")
+        process, base_url = start_server(args)
+
+    try:
+        print(
+            f"Escenario '{args.scenario}': {args.users} usuarios, "
+            f"{args.warmup:.0f}s de calentamiento + {args.duration:.0f}s medidos"
+        )
+        result = asyncio.run(run_load(
+            base_url, generators, weights, args.users, args.duration, args.warmup,
+            args.think_ms, args.seed,
+        ))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=30)
+
+    summary = summarize(result)
+    columns = ['req', 'err', 'req/s', 'p50 ms', 'p95 ms', 'p99 ms']
+    print(f"\n{'endpoint':30} " + ' '.join(f"{c:>9}" for c in columns))
+    for name, row in summary.items():
+        if name == 'total':
+            print('-' * 90)
+        latency = ' '.join(
+            f"{row[p]:9.1f}" if p in row else f"{'-':>9}" for p in ('p50', 'p95', 'p99')
+        )
+        print(
+            f"{name:30} {row['requests']:9d} {row['errors']:9d} {row['rps']:9.1f} {latency}"
+        )
+    for name, detail in result['error_samples'].items():
+        print(f"  {name}: {detail}", file=sys.stderr)
+
+    total = summary['total']
+    failed = total['errors'] > 0
+    if args.max_p99_ms is not None and total.get('p99', 0.0) > args.max_p99_ms:
+        print(f"\nFALLA: p99 total por encima de {args.max_p99_ms} ms", file=sys.stderr)
+        failed = True
+    if args.min_rps is not None and total['rps'] < args.min_rps:
+        print(f"\nFALLA: throughput por debajo de {args.min_rps} req/s", file=sys.stderr)
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,158 @@
+"""
+Benchmark de búsqueda de nadadores por nombre según tamaño de la tabla
+
+Genera tablas sintéticas de resultados y compara, para cada tamaño:
+
+- scan: filtrar todas las filas con `'%nombre%'` (equivalente en memoria al
+  escaneo secuencial de ILIKE sin índice),
+- índice: resolver nombres exactos con app.services.name_index y luego
+  traer sus filas por igualdad (lo que hace el índice btree),
+- difusa: NameIndex.search ordenada por similitud.
+
+Termina con código 1 si el p95 de la búsqueda con índice supera --max-p95-ms
+en el tamaño más grande.
+
+Uso:
+    python -m benchmarks.name_search_benchmark --sizes 10000 100000 1000000
+"""
+import argparse
+import random
+import statistics
+import sys
+import time
+from collections.abc import Callable
+from typing import Any
+
+from app.services.fecna_import import normalize_name
+from app.services.name_index import NameIndex
+
+SILABAS = ['ba', 'ca', 'da', 'fe', 'ga', 'la', 'ma', 'na', 'ra', 'sa', 'ta', 'va',
+           'ro', 'lo', 'mo', 'ri', 'ti', 'ne', 'que', 'güe', 'ño', 'zu', 'es', 'án']
+NOMBRES = ['SOFIA', 'VALENTINA', 'ISABELLA', 'MARIANA', 'SANTIAGO', 'MATEO', 'SAMUEL',
+           'NICOLAS', 'JULIÁN', 'MARÍA JOSÉ', 'ANDRÉS', 'LUCÍA', 'TOMÁS', 'SEBASTIÁN']
+RESULTADOS_POR_NADADOR = 12
+
+
+def _apellido(rng: random.Random) -> str:
+    return ''.join(rng.choice(SILABAS) for _ in range(rng.randint(2, 4))).upper()
+
+
+def synthetic_table(rows: int, seed: int) -> list[dict[str, Any]]:
+    """Filas mínimas de swim_competition_results con ~12 resultados por nadador"""
+    rng = random.Random(seed)
+    nadadores = max(rows // RESULTADOS_POR_NADADOR, 1)
+    nombres = [
+        f"{_apellido(rng)} {_apellido(rng)}, {rng.choice(NOMBRES)}"
+        for _ in range(nadadores)
+    ]
+    return [
+        {
+            'id': i,
+            'swimmer_name': nombres[i % nadadores],
+            'swimmer_name_norm': normalize_name(nombres[i % nadadores]),
+            'final_time_ms': rng.randint(25_000, 600_000),
+        }
+        for i in range(rows)
+    ]
+
+
+def _percentiles(samples: list[float]) -> dict[str, float]:
+    samples = sorted(samples)
+    return {
+        'p50': round(statistics.median(samples), 3),
+        'p95': round(samples[int(len(samples) * 0.95) - 1], 3),
+    }
+
+
+def _time_ms(fn: Callable[[str], Any], queries: list[str]) -> dict[str, float]:
+    samples = []
+    for query in queries:
+        start = time.perf_counter()
+        fn(query)
+        samples.append((time.perf_counter() - start) * 1000)
+    return _percentiles(samples)
+
+
+def bench_size(rows: int, queries: int, seed: int) -> dict[str, Any]:
+    table = synthetic_table(rows, seed)
+
+    # Lo que devolvería get_swimmer_names()
+    conteos: dict[str, dict[str, Any]] = {}
+    por_nombre: dict[str, list[dict[str, Any]]] = {}
+    for row in table:
+        nombre = row['swimmer_name_norm']
+        conteo = conteos.setdefault(nombre, {**row, 'result_count': 0})
+        conteo['result_count'] += 1
+        por_nombre.setdefault(nombre, []).append(row)
+
+    start = time.perf_counter()
+    index = NameIndex()
+    index.add_names(list(conteos.values()))
+    build_ms = (time.perf_counter() - start) * 1000
+
+    # Consultas: un apellido completo o un fragmento de nombre de 4-8 letras
+    rng = random.Random(seed + 1)
+    nombres = list(conteos)
+    consultas = []
+    for _ in range(queries):
+        nombre = rng.choice(nombres)
+        if rng.random() < 0.5:
+            consultas.append(nombre.split()[0])
+        else:
+            inicio = rng.randrange(0, max(len(nombre) - 8, 1))
+            consultas.append(nombre[inicio:inicio + rng.randint(4, 8)].strip())
+
+    def scan(query: str) -> list[dict[str, Any]]:
+        query = normalize_name(query)
+        return [row for row in table if query in row['swimmer_name_norm']]
+
+    def indexed(query: str) -> list[dict[str, Any]]:
+        return [row for nombre in index.match(query) for row in por_nombre[nombre]]
+
+    # Verificar que ambos caminos devuelven las mismas filas
+    for query in consultas[:20]:
+        if len(scan(query)) != len(indexed(query)):
+            raise AssertionError(f"resultados distintos para {query!r}")
+
+    return {
+        'rows': rows,
+        'names': len(index),
+        'build_ms': round(build_ms, 1),
+        'scan': _time_ms(scan, consultas[:max(queries // 10, 5)]),
+        'index': _time_ms(indexed, consultas),
+        'fuzzy': _time_ms(lambda q: index.search(q, limit=20), consultas),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Benchmark de búsqueda por nombre')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 500_000],
+                        help='Filas de resultados a generar por corrida')
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--max-p95-ms', type=float, default=0.0,
+                        help='Falla si el p95 con índice supera este valor en el tamaño mayor')
+    args = parser.parse_args()
+
+    print(f"{'filas':>10} {'nombres':>8} {'build ms':>9} "
+          f"{'scan p50':>9} {'scan p95':>9} {'idx p50':>8} {'idx p95':>8} "
+          f"{'fuzzy p50':>10} {'fuzzy p95':>10}")
+    reports = []
+    for rows in sorted(args.sizes):
+        report = bench_size(rows, args.queries, args.seed)
+        reports.append(report)
+        print(f"{report['rows']:>10} {report['names']:>8} {report['build_ms']:>9} "
+              f"{report['scan']['p50']:>9} {report['scan']['p95']:>9} "
+              f"{report['index']['p50']:>8} {report['index']['p95']:>8} "
+              f"{report['fuzzy']['p50']:>10} {report['fuzzy']['p95']:>10}")
+
+    largest = reports[-1]
+    if args.max_p95_ms and largest['index']['p95'] > args.max_p95_ms:
+        print(f"REGRESIÓN: p95 con índice {largest['index']['p95']} ms > {args.max_p95_ms} ms "
+              f"con {largest['rows']} filas", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,152 @@
+"""
+Perfil de arranque de la API
+
+Mide, en procesos nuevos (como un reinicio del contenedor):
+
+- el tiempo de `import app.main` con `python -X importtime`, y los módulos
+  que más aportan (acumulado, incluye sus dependencias),
+- el tiempo desde lanzar uvicorn hasta que /health responde 200.
+
+Termina con código 1 si se importa al arrancar alguna dependencia que debe
+cargarse bajo demanda (requests, bs4, pyarrow), si el import supera
+--max-import-ms o si /health tarda más de --max-ready-ms.
+
+Uso:
+    python -m benchmarks.startup_profile --repeat 5 --top 15
+"""
+import argparse
+import os
+import re
+import socket
+import subprocess
+import sys
+import time
+
+import httpx
+
+# Solo las usan la sincronización con FECNA y la exportación Parquet
+LAZY_MODULES = ('requests', 'bs4', 'pyarrow')
+
+IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+CHECK_LAZY = (
+    'import sys, app.main; '
+    f"print(','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))"
+)
+
+
+def _free_port() -> int:
+    # Sin importar otros benchmarks: este proceso no debe cargar la app
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def _env() -> dict[str, str]:
+    env = dict(os.environ)
+    # Settings exige credenciales; el arranque no se conecta a Supabase
+    env.setdefault('SUPABASE_URL', 'http://127.0.0.1:54321')
+    env.setdefault('SUPABASE_KEY', 'startup-profile')
+    env['SYNC_SCHEDULER_ENABLED'] = 'false'
+    return env
+
+
+def import_profile() -> tuple[float, list[tuple[str, int, int, int]]]:
+    """(ms totales de import app.main, [(módulo, µs propios, µs acumulados, nivel)])"""
+    started = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import app.main'],
+        env=_env(), capture_output=True, text=True, check=True,
+    )
+    total_ms = (time.perf_counter() - started) * 1000
+    modules = []
+    for line in completed.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            own, cumulative, indent, name = match.groups()
+            modules.append((name, int(own), int(cumulative), len(indent) // 2))
+    return total_ms, modules
+
+
+def eager_lazy_modules() -> list[str]:
+    """Dependencias de LAZY_MODULES importadas por app.main"""
+    completed = subprocess.run(
+        [sys.executable, '-c', CHECK_LAZY],
+        env=_env(), capture_output=True, text=True, check=True,
+    )
+    return [m for m in completed.stdout.strip().split(',') if m]
+
+
+def time_to_ready(timeout: float) -> float:
+    """ms desde lanzar uvicorn hasta el primer 200 de /health"""
+    port = _free_port()
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [
+            sys.executable, '-m', 'uvicorn', 'app.main:app',
+            '--host', '127.0.0.1', '--port', str(port), '--log-level', 'warning',
+        ],
+        env=_env(),
+    )
+    try:
+        with httpx.Client(timeout=1.0) as client:
+            while time.perf_counter() - started < timeout:
+                if process.poll() is not None:
+                    raise RuntimeError(f"uvicorn terminó con código {process.returncode}")
+                try:
+                    if client.get(f"http://127.0.0.1:{port}/health").status_code == 200:
+                        return (time.perf_counter() - started) * 1000
+                except httpx.HTTPError:
+                    pass
+                time.sleep(0.005)
+        raise RuntimeError(f"/health no respondió en {timeout}s")
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--repeat', type=int, default=5, help='Arranques medidos (mínimo)')
+    parser.add_argument('--top', type=int, default=15, help='Módulos a listar')
+    parser.add_argument('--max-import-ms', type=float, default=None)
+    parser.add_argument('--max-ready-ms', type=float, default=None)
+    args = parser.parse_args()
+
+    # El mínimo de varias corridas filtra el ruido del disco y del sistema
+    runs = [import_profile() for _ in range(args.repeat)]
+    import_ms, modules = min(runs, key=lambda run: run[0])
+    ready_ms = min(time_to_ready(60.0) for _ in range(args.repeat))
+
+    app_total = next(
+        (cumulative for name, _, cumulative, _ in modules if name == 'app.main'), 0
+    )
+    print(f"import app.main: {app_total / 1000:.0f} ms "
+          f"(proceso completo {import_ms:.0f} ms, mínimo de {args.repeat})")
+    print(f"uvicorn hasta /health 200: {ready_ms:.0f} ms")
+
+    # Primer nivel bajo app.main y los paquetes de terceros más pesados
+    print(f"\n{'módulo':45} {'acum. ms':>9} {'propio ms':>9}")
+    heaviest = sorted(
+        (m for m in modules if m[3] <= 2 and m[0] != 'app.main'),
+        key=lambda m: m[2], reverse=True,
+    )
+    for name, own, cumulative, level in heaviest[:args.top]:
+        print(f"{'  ' * level + name:45} {cumulative / 1000:9.1f} {own / 1000:9.1f}")
+
+    failed = False
+    eager = eager_lazy_modules()
+    if eager:
+        print(f"\nFALLA: se importan al arrancar: {', '.join(eager)}", file=sys.stderr)
+        failed = True
+    if args.max_import_ms is not None and app_total / 1000 > args.max_import_ms:
+        print(f"\nFALLA: import por encima de {args.max_import_ms} ms", file=sys.stderr)
+        failed = True
+    if args.max_ready_ms is not None and ready_ms > args.max_ready_ms:
+        print(f"\nFALLA: /health por encima de {args.max_ready_ms} ms", file=sys.stderr)
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,175 @@
+"""
+Benchmark de los caminos de sincronización FECNA contra el stand-in local
+
+Levanta benchmarks.fecna_standin en un hilo, ejecuta FECNASyncService y
+fecna_lookup contra él y reporta atletas/min. Termina con código 1 si se
+detecta una regresión:
+
+- resultados cruzados entre atletas (contexto de sesión compartido),
+- throughput por debajo de --min-athletes-per-min,
+- pico de peticiones por segundo por encima de --max-rps (control de tasa).
+
+Uso:
+    python -m benchmarks.sync_benchmark --athletes 20 --workers 4 --latency-ms 50
+"""
+import argparse
+import socket
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import httpx
+import uvicorn
+
+from app.core.config import settings
+from app.services import fecna_lookup
+from app.services.fecna_sync import FECNASyncService
+
+from .fecna_standin import (
+    StandinConfig,
+    create_standin_app,
+    synthetic_results,
+    synthetic_swimmer_ids,
+    synthetic_swimmer_name,
+)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_standin(config: StandinConfig) -> tuple[uvicorn.Server, str]:
+    """Arrancar el stand-in en un hilo y devolver (servidor, base_url)"""
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config(
+        create_standin_app(config), host='127.0.0.1', port=port, log_level='warning'
+    ))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+    return server, f"http://127.0.0.1:{port}"
+
+
+def expected_count(nadador_id: str, seed: int) -> int:
+    return sum(
+        len(synthetic_results(nadador_id, prueba_id, seed))
+        for prueba_id in FECNASyncService.PRUEBAS
+    )
+
+
+def bench_sync(base_url: str, nadador_ids: list[str], workers: int, seed: int) -> dict[str, Any]:
+    """Sincronizar nadadores con un FECNASyncService por worker"""
+    local = threading.local()
+
+    def sync_one(nadador_id: str) -> tuple[str, int]:
+        if not hasattr(local, 'service'):
+            local.service = FECNASyncService(base_url=base_url)
+        return nadador_id, len(local.service.get_athlete_results(nadador_id))
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        counts = list(pool.map(sync_one, nadador_ids))
+    elapsed = time.perf_counter() - started
+
+    mismatched = [
+        nadador_id for nadador_id, count in counts
+        if count != expected_count(nadador_id, seed)
+    ]
+
+    return {
+        'athletes': len(nadador_ids),
+        'elapsed_s': round(elapsed, 2),
+        'athletes_per_min': round(len(nadador_ids) / elapsed * 60, 1),
+        'mismatched': mismatched,
+    }
+
+
+def bench_lookup(nadador_ids: list[str], workers: int) -> dict[str, Any]:
+    """Resolver IDs de FECNA por nombre con fecna_lookup.find_swimmer_id"""
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        found = list(pool.map(
+            lambda nadador_id: fecna_lookup.find_swimmer_id(synthetic_swimmer_name(nadador_id)),
+            nadador_ids
+        ))
+    elapsed = time.perf_counter() - started
+
+    return {
+        'lookups': len(nadador_ids),
+        'elapsed_s': round(elapsed, 2),
+        'lookups_per_min': round(len(nadador_ids) / elapsed * 60, 1),
+        'not_found': sum(1 for fecna_id in found if not fecna_id),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Benchmark de sincronización FECNA')
+    parser.add_argument('--athletes', type=int, default=10)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--latency-ms', type=float, default=0.0)
+    parser.add_argument('--latency-jitter-ms', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--min-athletes-per-min', type=float, default=0.0,
+                        help='Falla si el throughput de sync queda por debajo')
+    parser.add_argument('--max-rps', type=float, default=0.0,
+                        help='Falla si el pico de peticiones/s supera este valor')
+    args = parser.parse_args()
+
+    config = StandinConfig(
+        latency_ms=args.latency_ms,
+        latency_jitter_ms=args.latency_jitter_ms,
+        error_rate=args.error_rate,
+        swimmers=max(args.athletes, 50),
+        seed=args.seed,
+    )
+    server, base_url = start_standin(config)
+    settings.fecna_base_url = base_url
+    nadador_ids = synthetic_swimmer_ids(config)[:args.athletes]
+
+    try:
+        sync_report = bench_sync(base_url, nadador_ids, args.workers, args.seed)
+        sync_traffic = httpx.get(f"{base_url}/_stats").json()
+        httpx.post(f"{base_url}/_stats/reset")
+
+        lookup_report = bench_lookup(nadador_ids, args.workers)
+        lookup_traffic = httpx.get(f"{base_url}/_stats").json()
+    finally:
+        server.should_exit = True
+
+    print(f"sync:   {sync_report['athletes']} atletas en {sync_report['elapsed_s']}s "
+          f"-> {sync_report['athletes_per_min']} atletas/min "
+          f"(workers={args.workers}, pico {sync_traffic['peak_rps']} req/s, "
+          f"max en vuelo {sync_traffic['max_in_flight']}, "
+          f"errores inyectados {sync_traffic['errors_injected']})")
+    print(f"lookup: {lookup_report['lookups']} búsquedas en {lookup_report['elapsed_s']}s "
+          f"-> {lookup_report['lookups_per_min']} búsquedas/min "
+          f"(no encontrados {lookup_report['not_found']}, "
+          f"pico {lookup_traffic['peak_rps']} req/s)")
+
+    failures = []
+    if sync_report['mismatched'] and not args.error_rate:
+        failures.append(
+            f"{len(sync_report['mismatched'])} atletas recibieron resultados incorrectos "
+            f"(p.ej. {sync_report['mismatched'][:3]})"
+        )
+    if args.min_athletes_per_min and sync_report['athletes_per_min'] < args.min_athletes_per_min:
+        failures.append(
+            f"throughput {sync_report['athletes_per_min']} < "
+            f"{args.min_athletes_per_min} atletas/min"
+        )
+    if args.max_rps and sync_traffic['peak_rps'] > args.max_rps:
+        failures.append(f"pico {sync_traffic['peak_rps']} req/s > {args.max_rps}")
+
+    for failure in failures:
+        print(f"REGRESIÓN: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,170 @@
+"""
+Datos sintéticos para FakeSupabase
+
+Genera clubes, atletas, mappings externos y resultados de competencias con
+proporciones parecidas a las de producción: ~12 resultados por nadador,
+~30% de nadadores vinculados a un atleta y códigos de equipo FECNA con
+clubes asociados. Misma semilla, mismos datos.
+"""
+import random
+import uuid
+from datetime import date, timedelta
+from typing import Any
+
+from app.services.fecna_import import normalize_name
+from app.services.fecna_sync import FECNASyncService
+
+from .fecna_standin import APELLIDOS, NOMBRES, SEGUNDOS_POR_METRO
+
+RESULTADOS_POR_NADADOR = 12
+NADADORES_POR_EQUIPO = 40
+PROPORCION_VINCULADOS = 0.3
+PROPORCION_PENDIENTES = 0.2
+
+RONDAS = ['PRELIMINAR', 'FINAL', 'FINAL B']
+TORNEOS = [
+    'CAMPEONATO NACIONAL INTERLIGAS', 'TORNEO DEPARTAMENTAL', 'COPA CIUDAD',
+    'FESTIVAL INFANTIL', 'CAMPEONATO REGIONAL', 'TORNEO INTERCLUBES',
+]
+PRUEBAS = [(d, e) for d, e, _ in FECNASyncService.PRUEBAS.values()]
+
+
+def _uuid(rng: random.Random) -> str:
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def _nombre(rng: random.Random) -> str:
+    nombre = rng.choice(NOMBRES)
+    if rng.random() < 0.5:
+        nombre = f"{nombre} {rng.choice(NOMBRES)}"
+    return f"{rng.choice(APELLIDOS)} {rng.choice(APELLIDOS)}, {nombre}"
+
+
+def synthetic_dataset(results: int, seed: int = 0) -> dict[str, list[dict[str, Any]]]:
+    """Tablas listas para FakeSupabase.seed con ~`results` resultados"""
+    rng = random.Random(seed)
+    swimmers = max(results // RESULTADOS_POR_NADADOR, 1)
+    teams = max(swimmers // NADADORES_POR_EQUIPO, 1)
+
+    team_codes = [f"EQ{i:03d}" for i in range(teams)]
+    clubs = [
+        {'id': _uuid(rng), 'name': f"Club {code}", 'country': 'CO', 'city': None}
+        for code in team_codes
+    ]
+    club_mappings = [
+        {
+            'id': _uuid(rng),
+            'club_id': club['id'],
+            'external_name': club['name'],
+            'external_code': code,
+            'source': 'FECNA',
+            'status': 'CONFIRMED',
+            'confidence_score': 1.0,
+            'metadata': {},
+        }
+        for club, code in zip(clubs, team_codes)
+        if rng.random() < 0.5
+    ]
+
+    # Nombres únicos: el apellido sintético se repite mucho
+    roster: dict[str, dict[str, Any]] = {}
+    while len(roster) < swimmers:
+        name = _nombre(rng)
+        if rng.random() < 0.5:
+            name = f"{name} {len(roster)}"
+        norm = normalize_name(name)
+        if norm in roster:
+            continue
+        team = rng.randrange(teams)
+        roster[norm] = {
+            'name': name,
+            'team': team,
+            'gender': rng.choice(['M', 'F']),
+            'birth_year': rng.randint(2004, 2016),
+            'events': rng.sample(PRUEBAS, k=rng.randint(2, 5)),
+            'level': rng.uniform(1.0, 1.5),
+        }
+
+    athletes: list[dict[str, Any]] = []
+    athlete_mappings: list[dict[str, Any]] = []
+    athlete_ids: dict[str, str] = {}
+    for norm, swimmer in roster.items():
+        roll = rng.random()
+        if roll >= PROPORCION_VINCULADOS + PROPORCION_PENDIENTES:
+            continue
+        apellidos, nombres = swimmer['name'].split(', ', 1)
+        birth_date = date(swimmer['birth_year'], rng.randint(1, 12), rng.randint(1, 28))
+        athlete = {
+            'id': _uuid(rng),
+            'club_id': clubs[swimmer['team']]['id'],
+            'first_name': nombres.title(),
+            'last_name': apellidos.title(),
+            'birth_date': birth_date.isoformat(),
+            'sex': swimmer['gender'],
+            'active': True,
+        }
+        athletes.append(athlete)
+        linked = roll < PROPORCION_VINCULADOS
+        if linked:
+            athlete_ids[norm] = athlete['id']
+        athlete_mappings.append({
+            'id': _uuid(rng),
+            'athlete_id': athlete['id'],
+            'external_name': swimmer['name'],
+            'external_name_norm': norm,
+            'source': 'FECNA',
+            'status': 'CONFIRMED' if linked else 'PENDING',
+            'confidence_score': 1.0 if linked else round(rng.uniform(0.5, 0.99), 2),
+            'metadata': {},
+            'sync_status': 'SUCCESS' if linked else 'PENDING',
+            'last_synced_at': None,
+            'results_count': 0,
+        })
+
+    tournaments = [
+        (year, name, date(year, rng.randint(1, 12), rng.randint(1, 25)))
+        for year in range(2019, 2026)
+        for name in TORNEOS
+    ]
+    norms = list(roster)
+    rows: list[dict[str, Any]] = []
+    for i in range(results):
+        norm = norms[i % swimmers]
+        swimmer = roster[norm]
+        year, tournament, start = rng.choice(tournaments)
+        distance, stroke = rng.choice(swimmer['events'])
+        base = distance * SEGUNDOS_POR_METRO[stroke] * swimmer['level']
+        final_ms = int(base * rng.uniform(0.97, 1.06) * 1000)
+        rows.append({
+            'id': i + 1,
+            'year': year,
+            'tournament_name': f"{tournament} {year}",
+            'event_date': (start + timedelta(days=rng.randint(0, 3))).isoformat(),
+            'gender': swimmer['gender'],
+            'distance_m': distance,
+            'stroke': stroke,
+            'round': rng.choice(RONDAS),
+            'age': max(year - swimmer['birth_year'], 8),
+            'swimmer_name': swimmer['name'],
+            'swimmer_name_norm': norm,
+            'team_code': team_codes[swimmer['team']],
+            'rank': rng.randint(1, 24),
+            'final_time_ms': final_ms,
+            'seed_time_ms': int(final_ms * rng.uniform(0.98, 1.05)),
+            'athlete_id': athlete_ids.get(norm),
+            'source': 'FECNA_API',
+        })
+
+    return {
+        'clubs': clubs,
+        'club_external_mappings': club_mappings,
+        'athletes': athletes,
+        'athlete_external_mappings': athlete_mappings,
+        'swim_competition_results': rows,
+    }
+
+
+def seed_fake(fake: Any, dataset: dict[str, list[dict[str, Any]]]) -> None:
+    """Cargar un dataset en un FakeSupabase"""
+    for table, rows in dataset.items():
+        fake.seed(table, rows)
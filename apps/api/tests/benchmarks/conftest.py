@@ -0,0 +1,30 @@
+import asyncio
+from collections.abc import Iterator
+
+import pytest
+
+from benchmarks.fake_supabase import FakeSupabase
+from benchmarks.synthetic_data import seed_fake, synthetic_dataset
+
+# Large enough for N+1 patterns to show, small enough for every test run
+RESULTS = 5000
+
+
+@pytest.fixture(scope="session")
+def dataset() -> dict[str, list[dict]]:
+    return synthetic_dataset(RESULTS, seed=0)
+
+
+@pytest.fixture(scope="session")
+def fake(dataset: dict[str, list[dict]]) -> FakeSupabase:
+    fake = FakeSupabase()
+    seed_fake(fake, dataset)
+    return fake
+
+
+@pytest.fixture(scope="session")
+def loop() -> Iterator[asyncio.AbstractEventLoop]:
+    # pytest-benchmark times sync callables: requests run on one shared loop
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
@@ -0,0 +1,67 @@
+"""Per-endpoint latency of the results and matching routes over FakeSupabase.
+
+Run with ``pytest tests/benchmarks --benchmark-only``; compare runs with
+``--benchmark-autosave`` / ``--benchmark-compare``. The response cache is
+bypassed so the computation is measured, not Redis. Supabase calls per
+request are recorded in extra_info to catch N+1 regressions.
+"""
+
+import asyncio
+from collections.abc import Callable, Iterator
+
+import httpx
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from app.main import app
+from app.services.cache import response_cache
+from app.services.supabase_client import get_supabase
+from benchmarks.api_benchmark import Request, endpoint_requests
+from benchmarks.fake_supabase import FakeSupabase
+from benchmarks.synthetic_data import synthetic_dataset
+
+ROUNDS = 10
+ENDPOINTS = list(endpoint_requests(synthetic_dataset(100), seed=0))
+
+
+@pytest.fixture(scope="module")
+def client(
+    fake: FakeSupabase, loop: asyncio.AbstractEventLoop
+) -> Iterator[httpx.AsyncClient]:
+    app.dependency_overrides[get_supabase] = lambda: fake
+    down_until = response_cache._down_until
+    response_cache._down_until = float("inf")
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench")
+    yield client
+    loop.run_until_complete(client.aclose())
+    response_cache._down_until = down_until
+    app.dependency_overrides.pop(get_supabase, None)
+
+
+@pytest.fixture(scope="module")
+def generators(dataset: dict[str, list[dict]]) -> dict[str, Callable[[], Request]]:
+    return endpoint_requests(dataset, seed=0)
+
+
+@pytest.mark.parametrize("endpoint", ENDPOINTS)
+def test_endpoint(
+    benchmark: BenchmarkFixture,
+    endpoint: str,
+    client: httpx.AsyncClient,
+    fake: FakeSupabase,
+    loop: asyncio.AbstractEventLoop,
+    generators: dict[str, Callable[[], Request]],
+) -> None:
+    make_request = generators[endpoint]
+
+    def send() -> httpx.Response:
+        method, url, params = make_request()
+        return loop.run_until_complete(client.request(method, url, params=params))
+
+    # First call loads the in-memory indexes (rankings, names)
+    send().raise_for_status()
+    fake.reset_calls()
+    response = benchmark.pedantic(send, rounds=ROUNDS, iterations=1)
+
+    response.raise_for_status()
+    benchmark.extra_info["supabase_calls"] = fake.total_calls / ROUNDS
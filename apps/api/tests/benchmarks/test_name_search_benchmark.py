@@ -0,0 +1,77 @@
+"""Swimmer name lookups: ILIKE-style scan vs the in-process trigram index."""
+
+import random
+from typing import Any
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from app.services.fecna_import import normalize_name
+from app.services.name_index import NameIndex
+from benchmarks.name_search_benchmark import synthetic_table
+
+ROWS = 20_000
+
+
+@pytest.fixture(scope="module")
+def table() -> list[dict[str, Any]]:
+    return synthetic_table(ROWS, seed=0)
+
+
+@pytest.fixture(scope="module")
+def index(table: list[dict[str, Any]]) -> NameIndex:
+    index = NameIndex()
+    index.add_names(table)
+    return index
+
+
+@pytest.fixture(scope="module")
+def queries(table: list[dict[str, Any]]) -> list[str]:
+    # A full surname or a 4-8 letter fragment, as typed in the search box
+    rng = random.Random(1)
+    names = sorted({row["swimmer_name_norm"] for row in table})
+    queries = []
+    for _ in range(50):
+        name = rng.choice(names)
+        if rng.random() < 0.5:
+            queries.append(name.split()[0])
+        else:
+            start = rng.randrange(0, max(len(name) - 8, 1))
+            queries.append(name[start:start + rng.randint(4, 8)].strip())
+    return queries
+
+
+def test_scan(
+    benchmark: BenchmarkFixture, table: list[dict[str, Any]], queries: list[str]
+) -> None:
+    def scan() -> int:
+        return sum(
+            query in row["swimmer_name_norm"]
+            for query in map(normalize_name, queries[:5])
+            for row in table
+        )
+
+    assert benchmark(scan) > 0
+
+
+def test_index_match(benchmark: BenchmarkFixture, index: NameIndex, queries: list[str]) -> None:
+    names = benchmark(lambda: [index.match(query) for query in queries[:5]])
+
+    assert all(names)
+
+
+def test_index_match_agrees_with_scan(
+    index: NameIndex, table: list[dict[str, Any]], queries: list[str]
+) -> None:
+    for query in queries[:10]:
+        folded = normalize_name(query)
+        expected = {
+            row["swimmer_name_norm"] for row in table if folded in row["swimmer_name_norm"]
+        }
+        assert set(index.match(query)) == expected
+
+
+def test_fuzzy_search(benchmark: BenchmarkFixture, index: NameIndex, queries: list[str]) -> None:
+    results = benchmark(lambda: [index.search(query, limit=20) for query in queries[:5]])
+
+    assert all(results)
@@ -0,0 +1,15 @@
+import os
+
+import pytest
+
+# Settings require Supabase credentials at import time; tests never reach them
+os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+os.environ.setdefault("SUPABASE_KEY", "test-service-role-key")
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _no_shared_state() -> None:
+    from app.services.shared_state import shared_state
+
+    # No Redis in tests: every worker-local cache stays authoritative
+    shared_state._down_until = float("inf")
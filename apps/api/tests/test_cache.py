@@ -0,0 +1,16 @@
+from app.services.cache import ResponseCache
+from app.services.circuit_breaker import supabase_breaker
+
+cache = ResponseCache("redis://localhost:6379/0", supabase_breaker)
+
+
+def test_free_text_params_share_a_key_across_case() -> None:
+    assert cache.make_key("results:search", {"swimmer_name": " Ana PÉREZ"}) == cache.make_key(
+        "results:search", {"swimmer_name": "ana pérez"}
+    )
+
+
+def test_cursors_keep_their_case() -> None:
+    assert cache.make_key("results:search", {"cursor": "WyJhIiwxXQ"}) != cache.make_key(
+        "results:search", {"cursor": "wyjhiiwxxq"}
+    )
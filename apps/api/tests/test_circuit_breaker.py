@@ -0,0 +1,189 @@
+import asyncio
+
+import httpx
+import pytest
+from postgrest.exceptions import APIError
+
+from app.services import circuit_breaker
+from app.services.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitOpenError,
+)
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(circuit_breaker.time, "monotonic", clock)
+    return clock
+
+
+def _breaker() -> CircuitBreaker:
+    return CircuitBreaker(
+        "test", window=4, min_calls=4, failure_rate=0.5, slow_call_seconds=1.0, open_seconds=30.0
+    )
+
+
+async def _ok() -> str:
+    return "ok"
+
+
+async def _fail() -> str:
+    raise httpx.ConnectError("down")
+
+
+async def _record(breaker: CircuitBreaker, outcomes: str) -> None:
+    for outcome in outcomes:
+        if outcome == "+":
+            await breaker.call(_ok)
+        else:
+            with pytest.raises(httpx.ConnectError):
+                await breaker.call(_fail)
+
+
+async def test_opens_at_failure_rate_after_min_calls(clock: Clock) -> None:
+    breaker = _breaker()
+
+    await _record(breaker, "--+")
+    assert breaker.state == CLOSED  # below min_calls
+    await _record(breaker, "+")
+    assert breaker.state == OPEN  # 2 of 4 failed
+
+    with pytest.raises(CircuitOpenError) as error:
+        await breaker.call(_ok)
+    assert error.value.retry_after == 30.0
+
+
+async def test_slow_calls_count_as_failures(clock: Clock) -> None:
+    breaker = _breaker()
+
+    async def slow() -> str:
+        clock.now += 2.0
+        return "slow"
+
+    await _record(breaker, "++")
+    await breaker.call(slow)
+    await breaker.call(slow)
+
+    assert breaker.state == OPEN
+
+
+async def test_bad_input_does_not_count(clock: Clock) -> None:
+    breaker = _breaker()
+
+    async def bad() -> str:
+        raise ValueError("bad input")
+
+    for _ in range(4):
+        with pytest.raises(ValueError):
+            await breaker.call(bad)
+
+    assert breaker.state == CLOSED
+
+
+async def test_client_api_errors_do_not_count(clock: Clock) -> None:
+    breaker = _breaker()
+
+    async def invalid_uuid() -> str:
+        # PostgREST answers 400 with the SQLSTATE of the failed cast
+        raise APIError({"message": "invalid input syntax for type uuid", "code": "22P02"})
+
+    for _ in range(4):
+        with pytest.raises(APIError):
+            await breaker.call(invalid_uuid)
+
+    assert breaker.state == CLOSED
+
+
+@pytest.mark.parametrize("code", ["PGRST000", "57014", 503])
+async def test_server_api_errors_count(clock: Clock, code: str | int) -> None:
+    breaker = _breaker()
+
+    async def failing() -> str:
+        raise APIError({"message": "unavailable", "code": code})
+
+    for _ in range(4):
+        with pytest.raises(APIError):
+            await breaker.call(failing)
+
+    assert breaker.state == OPEN
+
+
+async def _open(breaker: CircuitBreaker) -> None:
+    await _record(breaker, "----")
+    assert breaker.state == OPEN
+
+
+async def test_half_open_after_open_seconds_and_closes_on_success(clock: Clock) -> None:
+    breaker = _breaker()
+    await _open(breaker)
+
+    clock.now += 29.0
+    assert breaker.retry_after() == pytest.approx(1.0)
+    with pytest.raises(CircuitOpenError):
+        await breaker.call(_ok)
+
+    clock.now += 1.0
+    assert await breaker.call(_ok) == "ok"
+    assert breaker.state == CLOSED
+    # The window starts over once closed
+    await _record(breaker, "---")
+    assert breaker.state == CLOSED
+
+
+async def test_failed_probe_reopens(clock: Clock) -> None:
+    breaker = _breaker()
+    await _open(breaker)
+
+    clock.now += 30.0
+    await _record(breaker, "-")
+
+    assert breaker.state == OPEN
+    assert breaker.retry_after() == 30.0
+
+
+async def test_half_open_lets_a_single_probe_through(clock: Clock) -> None:
+    breaker = _breaker()
+    await _open(breaker)
+    clock.now += 30.0
+    release = asyncio.Event()
+
+    async def probe() -> str:
+        await release.wait()
+        return "probe"
+
+    task = asyncio.create_task(breaker.call(probe))
+    await asyncio.sleep(0)
+    assert breaker.state == HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        await breaker.call(_ok)
+
+    release.set()
+    assert await task == "probe"
+    assert breaker.state == CLOSED
+
+
+async def test_probe_with_bad_input_allows_another_probe(clock: Clock) -> None:
+    breaker = _breaker()
+    await _open(breaker)
+    clock.now += 30.0
+
+    async def bad() -> str:
+        raise ValueError("bad input")
+
+    with pytest.raises(ValueError):
+        await breaker.call(bad)
+    assert breaker.state == HALF_OPEN
+    assert await breaker.call(_ok) == "ok"
+    assert breaker.state == CLOSED
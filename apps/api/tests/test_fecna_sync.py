@@ -0,0 +1,57 @@
+from typing import Any
+
+from app.services.fecna_sync import _persist_results
+from benchmarks.fake_supabase import FakeSupabase
+
+# 100 m free over 2025, as replay_coverage reports it
+COVERAGE = [(100, "FREE", "2025-01-01", "2025-12-31")]
+
+
+def _result(tournament: str, distance: int, time_ms: int, event_date: str, **extra: Any) -> dict:
+    return {
+        "athlete_id": "a1",
+        "tournament_name": tournament,
+        "event_date": event_date,
+        "distance_m": distance,
+        "stroke": "FREE",
+        "final_time_ms": time_ms,
+        "age": 15,
+        "source": "FECNA_API",
+        **extra,
+    }
+
+
+async def test_replay_only_deletes_results_inside_the_cached_windows() -> None:
+    backend = FakeSupabase()
+    backend.seed("swim_competition_results", [
+        _result("Copa", 100, 60000, "2025-05-01"),
+        # Gone from the cached 100 m window: deleted
+        _result("Liga", 100, 61000, "2025-06-01"),
+        # Never fetched (other prueba, other window): kept
+        _result("Liga", 200, 130000, "2025-06-01"),
+        _result("Copa", 100, 62000, "2023-06-01"),
+        # Other sources are never replaced
+        _result("Liga", 100, 63000, "2025-06-01", source="PDF"),
+    ])
+
+    inserted, updated, existing = await _persist_results(
+        backend, "a1", [_result("Copa", 100, 60000, "2025-05-01")], coverage=COVERAGE
+    )
+
+    assert (inserted, updated, existing) == (0, 0, 1)
+    kept = {(row["distance_m"], row["final_time_ms"])
+            for row in backend.tables["swim_competition_results"]}
+    assert kept == {(100, 60000), (200, 130000), (100, 62000), (100, 63000)}
+
+
+async def test_existing_results_get_their_other_columns_updated() -> None:
+    backend = FakeSupabase()
+    backend.seed("swim_competition_results", [_result("Copa", 100, 60000, "2025-05-01")])
+
+    inserted, updated, existing = await _persist_results(
+        backend, "a1", [_result("Copa", 100, 60000, "2025-05-01", age=16)]
+    )
+
+    assert (inserted, updated, existing) == (0, 1, 0)
+    [row] = backend.tables["swim_competition_results"]
+    assert row["age"] == 16
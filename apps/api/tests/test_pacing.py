@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+from app.services.pacing import pacing_for_sets, pacing_profiles, pacing_type
+from benchmarks.fake_supabase import FakeSupabase
+
+NAN = np.nan
+
+
+def test_pacing_profiles_against_hand_computed_values() -> None:
+    times = np.array([
+        [15000, 16000, 16000, 17000],  # 4 x 25 m
+        [30000, 29000, NAN, NAN],  # 2 x 50 m
+        [40000, 42000, 44000, NAN],  # 3 x 50 m: the midpoint falls mid-split
+        [60000, NAN, NAN, NAN],  # a single split
+    ])
+    distances = np.array([
+        [25, 25, 25, 25],
+        [50, 50, NAN, NAN],
+        [50, 50, 50, NAN],
+        [100, NAN, NAN, NAN],
+    ])
+
+    profiles = pacing_profiles(times, distances)
+
+    assert profiles["splits"].tolist() == [4, 2, 3, 1]
+    # Paces per 100 m: 60/64/64/68 s, 60/58 s and 80/84/88 s
+    assert profiles["mean_pace_ms"][:3] == pytest.approx([64000, 59000, 84000])
+    # Half of the middle 50 m split goes to each half: 40 + 21 and 21 + 44 s
+    assert profiles["first_half_ms"][:3] == pytest.approx([31000, 30000, 61000])
+    assert profiles["second_half_ms"][:3] == pytest.approx([33000, 29000, 65000])
+    assert profiles["split_diff_pct"][:3] == pytest.approx(
+        [2000 / 31000 * 100, -1000 / 30000 * 100, 4000 / 61000 * 100]
+    )
+    # Last pace vs the fastest: 68 vs 60 s, the last is the fastest, 88 vs 80 s
+    assert profiles["fade_pct"][:3] == pytest.approx([40 / 3, 0.0, 10.0])
+    # Population standard deviation of the paces over their mean
+    assert profiles["pace_cv_pct"][:3] == pytest.approx(
+        [np.sqrt(8e6) / 64000 * 100, 1000 / 59000 * 100, np.sqrt(32e6 / 3) / 84000 * 100]
+    )
+    for name, values in profiles.items():
+        if name != "splits":
+            assert np.isnan(values[3])
+
+
+@pytest.mark.parametrize(
+    ("split_diff_pct", "pacing"),
+    [(None, None), (0.0, "even"), (1.0, "even"), (-1.0, "even"), (1.01, "positive"),
+     (6.45, "positive"), (-3.33, "negative")],
+)
+def test_pacing_type(split_diff_pct: float | None, pacing: str | None) -> None:
+    assert pacing_type(split_diff_pct) == pacing
+
+
+async def test_pacing_for_sets_orders_splits_by_index() -> None:
+    backend = FakeSupabase()
+    backend.seed("training_sessions", [
+        {"id": "s1", "athlete_id": "a1", "session_date": "2026-03-02", "validated_by": None},
+    ])
+    backend.seed("training_sets", [
+        {"id": "set1", "session_id": "s1", "test_id": "t100", "total_time_ms": 59000,
+         "pool_length_m": 50, "attempt_no": 1, "is_best": True},
+    ])
+    # Stored out of order: the 30 s split comes first
+    backend.seed("training_splits", [
+        {"id": "p2", "training_set_id": "set1", "split_index": 2,
+         "split_distance_m": 50, "split_time_ms": 29000},
+        {"id": "p1", "training_set_id": "set1", "split_index": 1,
+         "split_distance_m": 50, "split_time_ms": 30000},
+    ])
+
+    [profile] = await pacing_for_sets(backend, ["set1", "missing"])
+
+    assert profile["session_date"] == "2026-03-02"
+    assert (profile["first_half_ms"], profile["second_half_ms"]) == (30000, 29000)
+    assert profile["split_diff_pct"] == -3.33
+    assert profile["pacing"] == "negative"
+    assert profile["fade_pct"] == 0.0
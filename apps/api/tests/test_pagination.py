@@ -0,0 +1,122 @@
+import base64
+import json
+from datetime import date
+
+import pytest
+
+from app.services.pagination import decode_cursor, encode_cursor, keyset, paginate
+from benchmarks.fake_supabase import FakeSupabase
+
+
+@pytest.mark.parametrize(("value", "value_type"), [
+    (61234, int),
+    (0, int),
+    (None, int),
+    (1.5, float),
+    (2, float),
+    ("2026-03-01", date),
+    ("O'Brien, Ana", str),
+])
+def test_cursor_round_trip(value: object, value_type: type) -> None:
+    cursor = encode_cursor({"final_time_ms": value, "id": 42}, "final_time_ms")
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor, value_type) == (value, 42)
+
+
+def test_cursor_ids_can_be_uuids() -> None:
+    row = {"confidence_score": 0.9, "id": "0b6a1c1e-6a4c-4d0e-9a43-6f1c1d1e2f30"}
+    cursor = encode_cursor(row, "confidence_score")
+
+    assert decode_cursor(cursor, float) == (0.9, row["id"])
+
+
+@pytest.mark.parametrize("cursor", ["", "not-base64!", "bnVsbA", "WzEsbnVsbF0", "W3t9LDFd"])
+def test_decode_cursor_rejects_malformed(cursor: str) -> None:
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        decode_cursor(cursor)
+
+
+def _cursor(value: object, last_id: object) -> str:
+    return base64.urlsafe_b64encode(json.dumps([value, last_id]).encode()).decode()
+
+
+@pytest.mark.parametrize(("value", "last_id", "value_type"), [
+    # Filter syntax smuggled in through the value or the id
+    ("0,id.gt.0", 1, int),
+    (100, "1),final_time_ms.is.null", int),
+    ("2026-03-01,start_date.is.null", 1, date),
+    (True, 1, int),
+    (100, 1.5, int),
+    (100, True, int),
+    ("100", 1, int),
+])
+def test_decode_cursor_checks_value_and_id_types(
+    value: object, last_id: object, value_type: type
+) -> None:
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        decode_cursor(_cursor(value, last_id), value_type)
+
+
+async def test_keyset_quotes_text_values() -> None:
+    backend = FakeSupabase()
+    names = ["Ana", "O'Brien, Ana", "Perez (hija)", 'Ruiz "Bea"', "Zoe"]
+    backend.seed("results", [{"id": i, "name": name} for i, name in enumerate(names, 1)])
+
+    rows = []
+    cursor = None
+    while True:
+        query = keyset(backend.table("results").select("*"), "name", cursor, 1, value_type=str)
+        page, cursor = paginate((await query.execute()).data, "name", 1)
+        rows.extend(page)
+        if cursor is None:
+            break
+
+    assert [row["name"] for row in rows] == names
+
+
+def _backend() -> FakeSupabase:
+    backend = FakeSupabase()
+    # Ties on final_time_ms and NULLs, inserted out of order
+    times = [300, 100, None, 200, 100, None, 200, 100, 400, None, 300]
+    backend.seed("results", [{"id": i, "final_time_ms": t} for i, t in enumerate(times, 1)])
+    return backend
+
+
+async def _walk(backend: FakeSupabase, limit: int, desc: bool) -> list[dict[str, object]]:
+    rows: list[dict[str, object]] = []
+    cursor = None
+    while True:
+        query = keyset(backend.table("results").select("*"), "final_time_ms", cursor, limit, desc)
+        page, cursor = paginate((await query.execute()).data, "final_time_ms", limit)
+        rows.extend(page)
+        if cursor is None:
+            return rows
+
+
+@pytest.mark.parametrize("limit", [1, 2, 3, 11, 50])
+@pytest.mark.parametrize("desc", [False, True])
+async def test_keyset_pages_cover_ties_and_nulls_once(limit: int, desc: bool) -> None:
+    backend = _backend()
+    rows = await _walk(backend, limit, desc)
+
+    timed = sorted(
+        (row for row in backend.tables["results"] if row["final_time_ms"] is not None),
+        key=lambda row: row["id"],
+    )
+    timed.sort(key=lambda row: row["final_time_ms"], reverse=desc)
+    nulls = sorted(
+        (row for row in backend.tables["results"] if row["final_time_ms"] is None),
+        key=lambda row: row["id"],
+    )
+    # (time, id) order with ties broken by id and NULLs last in both directions
+    assert [row["id"] for row in rows] == [row["id"] for row in timed + nulls]
+
+
+def test_paginate_without_extra_row_has_no_next_page() -> None:
+    rows = [{"id": 1, "final_time_ms": 100}, {"id": 2, "final_time_ms": 100}]
+
+    assert paginate(rows, "final_time_ms", 2) == (rows, None)
+    page, cursor = paginate(rows, "final_time_ms", 1)
+    assert page == rows[:1]
+    assert cursor is not None and decode_cursor(cursor) == (100, 1)
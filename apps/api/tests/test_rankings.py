@@ -0,0 +1,118 @@
+import pytest
+
+from app.services.rankings import BestTimes, RankingsEngine, age_category
+
+
+def _row(
+    swimmer: str, time_ms: int, age: int | None = 15, team: str = "AAA", year: int = 2026
+) -> dict:
+    return {
+        "id": hash((swimmer, time_ms)) % 1_000_000,
+        "year": year,
+        "gender": "F",
+        "distance_m": 100,
+        "stroke": "FREE",
+        "age": age,
+        "swimmer_name": swimmer.upper(),
+        "swimmer_name_norm": swimmer,
+        "team_code": team,
+        "final_time_ms": time_ms,
+    }
+
+
+def _engine(rows: list[dict]) -> RankingsEngine:
+    engine = RankingsEngine()
+    engine._loaded = True
+    engine.add_results(rows)
+    return engine
+
+
+def test_best_times_keeps_one_sorted_entry_per_swimmer() -> None:
+    bucket = BestTimes()
+    assert bucket.offer(_row("ana", 61000))
+    assert bucket.offer(_row("bea", 60000))
+    assert not bucket.offer(_row("ana", 62000))
+    assert bucket.offer(_row("ana", 59000))
+
+    assert list(bucket.times) == [59000, 60000]
+    assert bucket.swimmers == ["ana", "bea"]
+
+
+def test_best_times_improvement_among_ties_removes_the_right_swimmer() -> None:
+    bucket = BestTimes()
+    for swimmer in ("ana", "bea", "cata"):
+        bucket.offer(_row(swimmer, 60000))
+
+    bucket.offer(_row("bea", 58000))
+
+    assert list(bucket.times) == [58000, 60000, 60000]
+    assert bucket.swimmers[0] == "bea"
+    assert sorted(bucket.swimmers[1:]) == ["ana", "cata"]
+
+
+@pytest.mark.parametrize(
+    ("time_ms", "rank"),
+    [(50000, 1), (59000, 1), (59500, 2), (60000, 2), (60001, 4), (99999, 5)],
+)
+def test_rank_for_time_bisects_before_ties(time_ms: int, rank: int) -> None:
+    engine = _engine([
+        _row("ana", 59000), _row("bea", 60000), _row("cata", 60000), _row("dora", 61000),
+    ])
+
+    assert engine.rank_for_time(100, "free", "f", time_ms) == {"rank": rank, "total": 4}
+
+
+def test_rank_for_time_across_buckets_counts_each_swimmer_once() -> None:
+    # Same swimmer in two age buckets: only her best counts
+    engine = _engine([
+        _row("ana", 59000, age=14), _row("ana", 58000, age=15), _row("bea", 60000, age=15),
+    ])
+
+    assert engine.rank_for_time(100, "FREE", "F", 59500) == {"rank": 2, "total": 2}
+    assert engine.rank_for_time(100, "FREE", "F", 59500, age_min=15) == {"rank": 2, "total": 2}
+
+
+def test_top_merges_buckets_fastest_first() -> None:
+    engine = _engine([
+        _row("ana", 61000, year=2025), _row("bea", 60000, year=2026), _row("ana", 59000, year=2026),
+    ])
+
+    top = engine.top(100, "FREE", "F")
+    assert [(row["swimmer_name_norm"], row["rank"]) for row in top] == [("ana", 1), ("bea", 2)]
+    assert [row["swimmer_name_norm"] for row in engine.top(100, "FREE", "F", year=2025)] == ["ana"]
+
+
+def test_placement_ties_share_the_better_rank() -> None:
+    engine = _engine([
+        _row("ana", 59000), _row("bea", 60000), _row("cata", 60000), _row("dora", 61000),
+    ])
+
+    placement = engine.placement(100, "FREE", "F", age_category(15), 60000, neighbours=1)
+
+    assert placement["rank"] == 2
+    assert placement["ties"] == 2
+    assert placement["percentile"] == 75.0
+    assert [row["swimmer_name_norm"] for row in placement["nearest_faster"]] == ["ana"]
+    assert [row["swimmer_name_norm"] for row in placement["nearest_slower"]] == ["dora"]
+
+
+def test_competitors_filter_by_team() -> None:
+    engine = _engine([
+        _row("ana", 59000, team="AAA"), _row("bea", 59500, team="BBB"),
+        _row("cata", 61000, team="AAA"), _row("dora", 60500, team="BBB"),
+    ])
+
+    nearest = engine.competitors(100, "FREE", "F", "15-16", 60000, team_codes=["AAA"], count=1)
+
+    assert [row["swimmer_name_norm"] for row in nearest["faster"]] == ["ana"]
+    assert [row["swimmer_name_norm"] for row in nearest["slower"]] == ["cata"]
+
+
+def test_results_without_age_compete_in_open() -> None:
+    engine = _engine([_row("ana", 59000, age=None), _row("bea", 61000, age=25)])
+
+    nearest = engine.competitors(100, "FREE", "F", "OPEN", 60000, count=1)
+
+    assert age_category(None) == "OPEN"
+    assert [row["swimmer_name_norm"] for row in nearest["faster"]] == ["ana"]
+    assert [row["swimmer_name_norm"] for row in nearest["slower"]] == ["bea"]
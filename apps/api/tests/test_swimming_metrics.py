@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from app.services.swimming_metrics import SwimmingMetrics, compute_metrics
+from benchmarks.fake_supabase import FakeSupabase
+
+
+def test_compute_metrics_against_hand_computed_values() -> None:
+    metrics = compute_metrics(
+        np.array([50, 100]), np.array([40000, 75000]), np.array([36, 60])
+    )
+
+    # 50 m in 40 s with 36 strokes: 1.25 m/s, 1.389 m/stroke, 54 strokes/min
+    # 100 m in 75 s with 60 strokes: 1.333 m/s, 1.667 m/stroke, 48 strokes/min
+    assert metrics["velocity"].tolist() == [1.25, 1.33]
+    assert metrics["dps"].tolist() == [1.39, 1.67]
+    assert metrics["stroke_frequency"].tolist() == [54.0, 48.0]
+    # Swim index uses the unrounded DPS: 1.3889 x 1.25 and 1.6667 x 1.3333
+    assert metrics["swim_index"].tolist() == [1.74, 2.22]
+
+
+def test_sets_without_strokes_or_time_get_zero() -> None:
+    metrics = compute_metrics(np.array([50, 50]), np.array([40000, 0]), np.array([0, 36]))
+
+    for values in metrics.values():
+        assert values.tolist() == [0.0, 0.0]
+
+
+@pytest.fixture
+def backend() -> FakeSupabase:
+    sb = FakeSupabase()
+    sb.seed("tests", [{"id": "t50", "distance_m": 50, "stroke_id": "FREE", "pool_type": "SCM"}])
+    sb.seed("training_sessions", [
+        {"id": "s1", "athlete_id": "a1", "session_date": "2026-03-02", "validated_by": "u1"},
+        {"id": "s2", "athlete_id": "a1", "session_date": "2026-03-01", "validated_by": None},
+    ])
+    sb.seed("training_sets", [
+        {"id": "set1", "session_id": "s1", "test_id": "t50", "total_time_ms": 40000,
+         "pool_length_m": 25, "attempt_no": 1, "is_best": True},
+        {"id": "set2", "session_id": "s2", "test_id": "t50", "total_time_ms": 32000,
+         "pool_length_m": 25, "attempt_no": 1, "is_best": False},
+    ])
+    # Stroke counts per length add up per set
+    sb.seed("training_strokes", [
+        {"id": "k1", "training_set_id": "set1", "stroke_count": 18},
+        {"id": "k2", "training_set_id": "set1", "stroke_count": 18},
+        {"id": "k3", "training_set_id": "set2", "stroke_count": 40},
+    ])
+    return sb
+
+
+async def test_for_sets_sums_strokes_and_caches_validated_sets(backend: FakeSupabase) -> None:
+    metrics = SwimmingMetrics(max_sets=10)
+
+    set1, set2 = await metrics.for_sets(backend, ["set1", "set2", "missing"])
+
+    assert (set1["total_strokes"], set1["velocity"], set1["dps"]) == (36, 1.25, 1.39)
+    # 50 m in 32 s with 40 strokes: 1.5625 m/s, 1.25 m/stroke, 75 strokes/min
+    assert set2["velocity"] == 1.56
+    assert set2["stroke_frequency"] == 75.0
+    assert set2["swim_index"] == 1.95
+    # Only the validated session's set is kept
+    assert list(metrics._sets) == ["set1"]
+
+    metrics.invalidate_athlete("a1")
+    assert not metrics._sets
+
+
+async def test_for_athlete_orders_sets_by_session_date(backend: FakeSupabase) -> None:
+    rows = await SwimmingMetrics(max_sets=10).for_athlete(backend, "a1")
+
+    assert [row["set_id"] for row in rows] == ["set2", "set1"]
@@ -0,0 +1,86 @@
+import pytest
+from fastapi import HTTPException
+
+from app.services.auth import AuthUser
+from app.services.training_access import (
+    require_athlete_access,
+    require_club_access,
+    visible_athletes,
+    visible_sets,
+)
+from benchmarks.fake_supabase import FakeSupabase
+
+
+@pytest.fixture
+def backend() -> FakeSupabase:
+    sb = FakeSupabase()
+    sb.seed("athletes", [
+        {"id": "a1", "user_id": "u-athlete", "club_id": "c1"},
+        {"id": "a2", "user_id": None, "club_id": "c1"},
+        {"id": "a3", "user_id": None, "club_id": "c2"},
+    ])
+    sb.seed("club_members", [
+        {"club_id": "c1", "user_id": "u-admin", "role_in_club": "ADMIN"},
+        {"club_id": "c2", "user_id": "u-admin", "role_in_club": "COACH"},
+    ])
+    sb.seed("coaches", [{"id": "co1", "user_id": "u-coach"}])
+    sb.seed("coach_athlete", [{"coach_id": "co1", "athlete_id": "a3"}])
+    sb.seed("training_sessions", [
+        {"id": "s1", "athlete_id": "a1"},
+        {"id": "s3", "athlete_id": "a3"},
+    ])
+    sb.seed("training_sets", [
+        {"id": "t1", "session_id": "s1"},
+        {"id": "t3", "session_id": "s3"},
+    ])
+    return sb
+
+
+@pytest.mark.parametrize(("user_id", "expected"), [
+    ("u-athlete", {"a1"}),
+    # Admin of c1 only: a plain membership in c2 gives no access
+    ("u-admin", {"a1", "a2"}),
+    ("u-coach", {"a3"}),
+    ("u-other", set()),
+])
+async def test_visible_athletes_follow_the_training_policies(
+    backend: FakeSupabase, user_id: str, expected: set[str]
+) -> None:
+    visible = await visible_athletes(backend, AuthUser(id=user_id), ["a1", "a2", "a3"])
+
+    assert visible == expected
+
+
+async def test_require_athlete_access_rejects_other_users(backend: FakeSupabase) -> None:
+    await require_athlete_access(backend, AuthUser(id="u-coach"), "a3")
+
+    with pytest.raises(HTTPException) as error:
+        await require_athlete_access(backend, AuthUser(id="u-coach"), "a1")
+    assert error.value.status_code == 403
+
+
+async def test_require_club_access_scopes_admins_and_coaches(backend: FakeSupabase) -> None:
+    assert await require_club_access(backend, AuthUser(id="u-admin"), "c1") is None
+    assert await require_club_access(backend, AuthUser(id="u-coach"), "c2") == ["a3"]
+
+
+@pytest.mark.parametrize(("user_id", "club_id"), [
+    # A plain member, a coach with no athletes in the club, a missing club
+    ("u-admin", "c2"),
+    ("u-coach", "c1"),
+    ("u-admin", "missing"),
+    ("u-coach", "missing"),
+])
+async def test_require_club_access_hides_whether_the_club_exists(
+    backend: FakeSupabase, user_id: str, club_id: str
+) -> None:
+    with pytest.raises(HTTPException) as error:
+        await require_club_access(backend, AuthUser(id=user_id), club_id)
+    assert error.value.status_code == 403
+    assert error.value.detail == "No access to this club's training data"
+
+
+async def test_visible_sets_leave_out_other_athletes_sets(backend: FakeSupabase) -> None:
+    sets = await visible_sets(backend, AuthUser(id="u-athlete"), ["t3", "t1", "missing"])
+
+    assert sets == ["t1"]
@@ -0,0 +1,93 @@
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from app.services.training_load import (
+    ACUTE_DAYS,
+    CHRONIC_DAYS,
+    TrainingLoadCache,
+    acwr_zone,
+    load_metrics,
+    rolling_sum,
+)
+from benchmarks.fake_supabase import FakeSupabase
+
+AS_OF = date(2026, 3, 31)
+
+
+def test_rolling_sum_counts_days_before_the_matrix_as_zero() -> None:
+    matrix = np.array([[1.0, 2.0, 3.0, 4.0, 5.0]])
+
+    assert rolling_sum(matrix, 3).tolist() == [[1.0, 3.0, 6.0, 9.0, 12.0]]
+
+
+def test_missing_days_count_as_zero_load() -> None:
+    # One 600 session every fourth day over the chronic window
+    matrix = np.zeros((1, CHRONIC_DAYS))
+    matrix[0, ::4] = 600.0
+
+    metrics = load_metrics(matrix)
+
+    acute = matrix[0, -ACUTE_DAYS:].sum() / ACUTE_DAYS
+    chronic = matrix[0].sum() / CHRONIC_DAYS
+    assert metrics["acute"][0, -1] == pytest.approx(acute)
+    assert metrics["chronic"][0, -1] == pytest.approx(chronic)
+    assert metrics["acwr"][0, -1] == pytest.approx(acute / chronic)
+    week = matrix[0, -ACUTE_DAYS:]
+    assert metrics["monotony"][0, -1] == pytest.approx(week.mean() / week.std())
+
+
+def test_undefined_acwr_and_monotony_are_nan() -> None:
+    metrics = load_metrics(np.zeros((1, CHRONIC_DAYS)))
+    assert np.isnan(metrics["acwr"][0, -1])
+    assert np.isnan(metrics["monotony"][0, -1])
+
+    # Same load every day: no variation, so monotony is undefined
+    flat = load_metrics(np.full((1, CHRONIC_DAYS), 300.0))
+    assert flat["acwr"][0, -1] == pytest.approx(1.0)
+    assert np.isnan(flat["monotony"][0, -1])
+
+
+@pytest.mark.parametrize(
+    ("acwr", "zone"),
+    [(None, None), (0.5, "low"), (0.8, "optimal"), (1.29, "optimal"), (1.3, "caution"),
+     (1.5, "high")],
+)
+def test_acwr_zone(acwr: float | None, zone: str | None) -> None:
+    assert acwr_zone(acwr) == zone
+
+
+def _session(athlete_id: str, days_ago: int, rpe: int, minutes: int) -> dict[str, object]:
+    day = (AS_OF - timedelta(days=days_ago)).isoformat()
+    return {
+        "athlete_id": athlete_id,
+        "session_date": day,
+        "session_rpe": rpe,
+        "duration_min": minutes,
+        "updated_at": f"{day}T12:00:00+00:00",
+    }
+
+
+async def test_compute_with_gaps_and_sessions_outside_the_window() -> None:
+    backend = FakeSupabase()
+    backend.seed("training_sessions", [
+        _session("a1", 0, 5, 60),   # 300, acute and chronic
+        _session("a1", 0, 4, 30),   # same day: loads add up
+        _session("a1", 10, 6, 100),  # 600, chronic only
+        _session("a1", 40, 8, 90),  # outside both windows
+        _session("a2", 3, 5, 40),
+    ])
+    cache = TrainingLoadCache(reload_seconds=3600)
+
+    report = await cache.compute(backend, ["a1", "a2", "a3"], AS_OF, days=7)
+
+    a1 = report["a1"]
+    assert a1["acute"] == round(420 / ACUTE_DAYS, 2)
+    assert a1["chronic"] == round(1020 / CHRONIC_DAYS, 2)
+    assert a1["acwr"] == round((420 / ACUTE_DAYS) / (1020 / CHRONIC_DAYS), 2)
+    assert a1["weekly_load"] == 420
+    assert [day["load"] for day in a1["series"]] == [0, 0, 0, 0, 0, 0, 420]
+    assert report["a2"]["acwr"] == 4.0 and report["a2"]["zone"] == "high"
+    # No sessions at all
+    assert report["a3"]["acwr"] is None and report["a3"]["zone"] is None
@@ -0,0 +1,62 @@
+-- Migration: Búsqueda de nadadores por trigramas
+-- Fecha: 2026-10-19
+-- Descripción: Índices GIN pg_trgm para búsquedas ILIKE '%nombre%' y RPCs
+-- para listar nombres distintos y búsqueda difusa ordenada por similitud
+
+-- 1. Extensión de trigramas
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- 2. Índices GIN (sirven ILIKE '%...%' sin escaneo secuencial)
+CREATE INDEX IF NOT EXISTS idx_competition_results_swimmer_trgm
+ON swim_competition_results USING GIN (swimmer_name_norm gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_competition_results_tournament_trgm
+ON swim_competition_results USING GIN (tournament_name gin_trgm_ops);
+
+-- 3. Nombres distintos de nadadores con cantidad de resultados
+CREATE OR REPLACE FUNCTION get_swimmer_names()
+RETURNS TABLE (
+    swimmer_name_norm TEXT,
+    swimmer_name TEXT,
+    result_count BIGINT
+) AS $$
+BEGIN
+    RETURN QUERY
+    SELECT
+        cr.swimmer_name_norm,
+        MIN(cr.swimmer_name) AS swimmer_name,
+        COUNT(*) AS result_count
+    FROM swim_competition_results cr
+    GROUP BY cr.swimmer_name_norm;
+END;
+$$ LANGUAGE plpgsql STABLE SECURITY DEFINER;
+
+COMMENT ON FUNCTION get_swimmer_names() IS 'Nombres normalizados distintos de nadadores, para el índice de búsqueda en memoria de la API';
+
+-- 4. Búsqueda difusa ordenada por similitud
+CREATE OR REPLACE FUNCTION search_swimmer_names(
+    p_query TEXT,
+    p_limit INTEGER DEFAULT 20
+)
+RETURNS TABLE (
+    swimmer_name_norm TEXT,
+    swimmer_name TEXT,
+    similarity REAL,
+    result_count BIGINT
+) AS $$
+BEGIN
+    RETURN QUERY
+    SELECT
+        cr.swimmer_name_norm,
+        MIN(cr.swimmer_name) AS swimmer_name,
+        MAX(word_similarity(lower(p_query), cr.swimmer_name_norm)) AS similarity,
+        COUNT(*) AS result_count
+    FROM swim_competition_results cr
+    WHERE lower(p_query) <% cr.swimmer_name_norm
+    GROUP BY cr.swimmer_name_norm
+    ORDER BY similarity DESC, result_count DESC
+    LIMIT p_limit;
+END;
+$$ LANGUAGE plpgsql STABLE SECURITY DEFINER;
+
+COMMENT ON FUNCTION search_swimmer_names(TEXT, INTEGER) IS 'Búsqueda difusa de nadadores por similitud de trigramas (usa idx_competition_results_swimmer_trgm)';
@@ -0,0 +1,31 @@
+-- Migration: Índices para paginación por cursor (keyset)
+-- Fecha: 2026-10-19
+-- Descripción: Índices compuestos (columna de orden, id) para que cada página
+-- cueste lo mismo que la primera, sin OFFSET
+
+-- 1. Búsqueda de resultados ordenada por tiempo
+CREATE INDEX IF NOT EXISTS idx_competition_results_time_id
+ON swim_competition_results(final_time_ms, id);
+
+CREATE INDEX IF NOT EXISTS idx_competition_results_event_time_id
+ON swim_competition_results(gender, distance_m, stroke, final_time_ms, id);
+
+-- 2. Recorridos internos por id (resultados sin vincular, por atleta)
+CREATE INDEX IF NOT EXISTS idx_competition_results_unlinked_team_id
+ON swim_competition_results(team_code, id)
+WHERE athlete_id IS NULL;
+
+CREATE INDEX IF NOT EXISTS idx_competition_results_athlete_id
+ON swim_competition_results(athlete_id, id);
+
+-- 3. Coincidencias pendientes ordenadas por confianza
+CREATE INDEX IF NOT EXISTS idx_athlete_external_mappings_pending_confidence
+ON athlete_external_mappings(confidence_score DESC NULLS LAST, id)
+WHERE status = 'PENDING';
+
+CREATE INDEX IF NOT EXISTS idx_club_external_mappings_pending_confidence
+ON club_external_mappings(confidence_score DESC NULLS LAST, id)
+WHERE status = 'PENDING';
+
+-- 4. El índice por atleta queda cubierto por el compuesto
+DROP INDEX IF EXISTS idx_competition_results_athlete;
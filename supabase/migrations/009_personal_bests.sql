@@ -0,0 +1,118 @@
+-- Migration: Mejores marcas personales y de temporada
+-- Fecha: 2026-10-19
+-- Descripción: Tablas mantenidas con la mejor marca por nadador y prueba
+-- (histórica y por año), actualizadas por la API al importar, sincronizar
+-- o vincular resultados. Los resultados no guardan tipo de piscina, así que
+-- la clave es (nadador, distancia, estilo)
+
+-- 1. Mejores marcas personales
+CREATE TABLE IF NOT EXISTS swimmer_personal_bests (
+    swimmer_name_norm TEXT NOT NULL,
+    distance_m SMALLINT NOT NULL,
+    stroke swim_stroke NOT NULL,
+    swimmer_name TEXT NOT NULL,
+    athlete_id UUID REFERENCES athletes(id) ON DELETE SET NULL,
+    gender sex NOT NULL,
+    best_time_ms INTEGER NOT NULL,
+    result_id BIGINT,
+    tournament_name TEXT,
+    event_date DATE,
+    year SMALLINT NOT NULL,
+    age SMALLINT,
+    team_code TEXT,
+    result_count INTEGER NOT NULL DEFAULT 1,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (swimmer_name_norm, distance_m, stroke)
+);
+
+-- 2. Mejores marcas por temporada (año)
+CREATE TABLE IF NOT EXISTS swimmer_season_bests (
+    swimmer_name_norm TEXT NOT NULL,
+    year SMALLINT NOT NULL,
+    distance_m SMALLINT NOT NULL,
+    stroke swim_stroke NOT NULL,
+    swimmer_name TEXT NOT NULL,
+    athlete_id UUID REFERENCES athletes(id) ON DELETE SET NULL,
+    gender sex NOT NULL,
+    best_time_ms INTEGER NOT NULL,
+    result_id BIGINT,
+    tournament_name TEXT,
+    event_date DATE,
+    age SMALLINT,
+    team_code TEXT,
+    result_count INTEGER NOT NULL DEFAULT 1,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (swimmer_name_norm, year, distance_m, stroke)
+);
+
+-- 3. Índices
+CREATE INDEX IF NOT EXISTS idx_personal_bests_athlete
+ON swimmer_personal_bests(athlete_id);
+
+CREATE INDEX IF NOT EXISTS idx_personal_bests_swimmer_trgm
+ON swimmer_personal_bests USING GIN (swimmer_name_norm gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_season_bests_athlete
+ON swimmer_season_bests(athlete_id);
+
+-- 4. Recalcular mejores marcas (de los nadadores indicados, o de todos con NULL)
+CREATE OR REPLACE FUNCTION refresh_personal_bests(p_swimmer_names TEXT[] DEFAULT NULL)
+RETURNS INTEGER AS $$
+DECLARE
+    v_count INTEGER;
+BEGIN
+    DELETE FROM swimmer_personal_bests pb
+    WHERE p_swimmer_names IS NULL OR pb.swimmer_name_norm = ANY(p_swimmer_names);
+
+    INSERT INTO swimmer_personal_bests (
+        swimmer_name_norm, distance_m, stroke, swimmer_name, athlete_id, gender,
+        best_time_ms, result_id, tournament_name, event_date, year, age,
+        team_code, result_count
+    )
+    SELECT DISTINCT ON (cr.swimmer_name_norm, cr.distance_m, cr.stroke)
+        cr.swimmer_name_norm, cr.distance_m, cr.stroke, cr.swimmer_name, cr.athlete_id, cr.gender,
+        cr.final_time_ms, cr.id, cr.tournament_name, cr.event_date, cr.year, cr.age,
+        cr.team_code,
+        COUNT(*) OVER (PARTITION BY cr.swimmer_name_norm, cr.distance_m, cr.stroke)
+    FROM swim_competition_results cr
+    WHERE p_swimmer_names IS NULL OR cr.swimmer_name_norm = ANY(p_swimmer_names)
+    ORDER BY cr.swimmer_name_norm, cr.distance_m, cr.stroke, cr.final_time_ms, cr.event_date, cr.id;
+
+    GET DIAGNOSTICS v_count = ROW_COUNT;
+
+    DELETE FROM swimmer_season_bests sb
+    WHERE p_swimmer_names IS NULL OR sb.swimmer_name_norm = ANY(p_swimmer_names);
+
+    INSERT INTO swimmer_season_bests (
+        swimmer_name_norm, year, distance_m, stroke, swimmer_name, athlete_id, gender,
+        best_time_ms, result_id, tournament_name, event_date, age, team_code,
+        result_count
+    )
+    SELECT DISTINCT ON (cr.swimmer_name_norm, cr.year, cr.distance_m, cr.stroke)
+        cr.swimmer_name_norm, cr.year, cr.distance_m, cr.stroke, cr.swimmer_name, cr.athlete_id, cr.gender,
+        cr.final_time_ms, cr.id, cr.tournament_name, cr.event_date, cr.age, cr.team_code,
+        COUNT(*) OVER (PARTITION BY cr.swimmer_name_norm, cr.year, cr.distance_m, cr.stroke)
+    FROM swim_competition_results cr
+    WHERE p_swimmer_names IS NULL OR cr.swimmer_name_norm = ANY(p_swimmer_names)
+    ORDER BY cr.swimmer_name_norm, cr.year, cr.distance_m, cr.stroke, cr.final_time_ms, cr.event_date, cr.id;
+
+    RETURN v_count;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+COMMENT ON FUNCTION refresh_personal_bests(TEXT[]) IS 'Recalcula mejores marcas personales y de temporada de los nadadores indicados (todos si es NULL); devuelve marcas personales escritas';
+
+-- 5. RLS: lectura pública como swim_competition_results
+ALTER TABLE swimmer_personal_bests ENABLE ROW LEVEL SECURITY;
+ALTER TABLE swimmer_season_bests ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Anyone can view personal bests"
+    ON swimmer_personal_bests FOR SELECT
+    USING (TRUE);
+
+CREATE POLICY "Anyone can view season bests"
+    ON swimmer_season_bests FOR SELECT
+    USING (TRUE);
+
+-- 6. Carga inicial
+SELECT refresh_personal_bests();
@@ -0,0 +1,81 @@
+-- Migration: Dimensión de torneos
+-- Fecha: 2026-10-19
+-- Descripción: Tabla de torneos con rango de fechas y conteos, mantenida por
+-- la API al importar o sincronizar resultados, para listar torneos completos
+-- y paginados sin recorrer swim_competition_results
+
+-- 1. Tabla de torneos
+CREATE TABLE IF NOT EXISTS competition_tournaments (
+    id BIGSERIAL PRIMARY KEY,
+    name TEXT NOT NULL,
+    year SMALLINT NOT NULL,
+    start_date DATE,
+    end_date DATE,
+    result_count INTEGER NOT NULL DEFAULT 0,
+    swimmer_count INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    UNIQUE (name, year)
+);
+
+-- 2. Índices para listados paginados por fecha
+CREATE INDEX IF NOT EXISTS idx_competition_tournaments_date
+ON competition_tournaments(start_date DESC NULLS LAST, id);
+
+CREATE INDEX IF NOT EXISTS idx_competition_tournaments_year_date
+ON competition_tournaments(year, start_date DESC NULLS LAST, id);
+
+CREATE INDEX IF NOT EXISTS idx_competition_results_tournament
+ON swim_competition_results(tournament_name, year);
+
+-- 3. Recalcular torneos (los indicados por nombre, o todos con NULL)
+CREATE OR REPLACE FUNCTION refresh_tournaments(p_names TEXT[] DEFAULT NULL)
+RETURNS INTEGER AS $$
+DECLARE
+    v_count INTEGER;
+BEGIN
+    INSERT INTO competition_tournaments (
+        name, year, start_date, end_date, result_count, swimmer_count, updated_at
+    )
+    SELECT
+        cr.tournament_name,
+        cr.year,
+        MIN(cr.event_date),
+        MAX(cr.event_date),
+        COUNT(*),
+        COUNT(DISTINCT cr.swimmer_name_norm),
+        NOW()
+    FROM swim_competition_results cr
+    WHERE p_names IS NULL OR cr.tournament_name = ANY(p_names)
+    GROUP BY cr.tournament_name, cr.year
+    ON CONFLICT (name, year) DO UPDATE SET
+        start_date = EXCLUDED.start_date,
+        end_date = EXCLUDED.end_date,
+        result_count = EXCLUDED.result_count,
+        swimmer_count = EXCLUDED.swimmer_count,
+        updated_at = EXCLUDED.updated_at;
+
+    GET DIAGNOSTICS v_count = ROW_COUNT;
+
+    -- Torneos que ya no tienen resultados
+    DELETE FROM competition_tournaments ct
+    WHERE (p_names IS NULL OR ct.name = ANY(p_names))
+      AND NOT EXISTS (
+          SELECT 1 FROM swim_competition_results cr
+          WHERE cr.tournament_name = ct.name AND cr.year = ct.year
+      );
+
+    RETURN v_count;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+COMMENT ON FUNCTION refresh_tournaments(TEXT[]) IS 'Recalcula fechas y conteos de los torneos indicados (todos si es NULL); devuelve torneos escritos';
+
+-- 4. RLS: lectura pública como swim_competition_results
+ALTER TABLE competition_tournaments ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Anyone can view tournaments"
+    ON competition_tournaments FOR SELECT
+    USING (TRUE);
+
+-- 5. Carga inicial
+SELECT refresh_tournaments();
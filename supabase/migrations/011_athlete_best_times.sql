@@ -0,0 +1,374 @@
+-- Migration: Mejores marcas de entrenamiento mantenidas
+-- Fecha: 2026-10-19
+-- Descripción: La vista athlete_best_times usaba DISTINCT ON (session_id,
+-- test_id) y devolvía una fila por sesión en lugar de una por atleta y
+-- prueba, recalculando cinco joins en cada lectura. Se sustituye por una
+-- tabla con la mejor marca por (atleta, prueba), mantenida por triggers al
+-- escribir series, sesiones o atletas. La vista conserva sus columnas sobre
+-- la tabla, y get_club_rankings / get_direct_competitors leen de la tabla
+-- con índice por (club, prueba, marca)
+
+-- 1. Mejor marca por atleta y prueba (series marcadas is_best, como la vista)
+CREATE TABLE IF NOT EXISTS athlete_test_bests (
+    athlete_id UUID NOT NULL REFERENCES athletes(id) ON DELETE CASCADE,
+    test_id UUID NOT NULL REFERENCES tests(id),
+    -- Copias de athletes para filtrar rankings por índice
+    club_id UUID NOT NULL,
+    sex sex NOT NULL,
+    best_time_ms INTEGER NOT NULL,
+    training_set_id UUID NOT NULL,
+    session_id UUID NOT NULL,
+    achieved_date DATE NOT NULL,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (athlete_id, test_id)
+);
+
+-- 2. Índices
+-- Rankings de club y competidores directos
+CREATE INDEX IF NOT EXISTS idx_athlete_test_bests_club_test
+ON athlete_test_bests(club_id, test_id, best_time_ms);
+
+-- Borrado de sesiones
+CREATE INDEX IF NOT EXISTS idx_athlete_test_bests_session
+ON athlete_test_bests(session_id);
+
+-- Recalcular una clave: las series de una prueba de un atleta
+CREATE INDEX IF NOT EXISTS idx_training_sets_session_test
+ON training_sets(session_id, test_id) WHERE is_best = TRUE;
+
+-- 3. Recalcular la mejor marca de un atleta en una prueba
+CREATE OR REPLACE FUNCTION refresh_athlete_best_time(p_athlete_id UUID, p_test_id UUID)
+RETURNS VOID AS $$
+BEGIN
+    DELETE FROM athlete_test_bests
+    WHERE athlete_id = p_athlete_id AND test_id = p_test_id;
+
+    INSERT INTO athlete_test_bests (
+        athlete_id, test_id, club_id, sex, best_time_ms, training_set_id,
+        session_id, achieved_date
+    )
+    SELECT a.id, tset.test_id, a.club_id, a.sex, tset.total_time_ms, tset.id,
+           ts.id, ts.session_date
+    FROM athletes a
+    JOIN training_sessions ts ON ts.athlete_id = a.id
+    JOIN training_sets tset ON tset.session_id = ts.id AND tset.is_best = TRUE
+    WHERE a.id = p_athlete_id AND tset.test_id = p_test_id
+    ORDER BY tset.total_time_ms, ts.session_date, tset.id
+    LIMIT 1;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+-- 4. Recalcular todas las mejores marcas (carga inicial y reparación)
+CREATE OR REPLACE FUNCTION refresh_athlete_best_times()
+RETURNS INTEGER AS $$
+DECLARE
+    v_count INTEGER;
+BEGIN
+    DELETE FROM athlete_test_bests;
+
+    INSERT INTO athlete_test_bests (
+        athlete_id, test_id, club_id, sex, best_time_ms, training_set_id,
+        session_id, achieved_date
+    )
+    SELECT DISTINCT ON (a.id, tset.test_id)
+        a.id, tset.test_id, a.club_id, a.sex, tset.total_time_ms, tset.id,
+        ts.id, ts.session_date
+    FROM athletes a
+    JOIN training_sessions ts ON ts.athlete_id = a.id
+    JOIN training_sets tset ON tset.session_id = ts.id AND tset.is_best = TRUE
+    ORDER BY a.id, tset.test_id, tset.total_time_ms, ts.session_date, tset.id;
+
+    GET DIAGNOSTICS v_count = ROW_COUNT;
+    RETURN v_count;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+COMMENT ON FUNCTION refresh_athlete_best_times() IS 'Recalcula todas las mejores marcas de entrenamiento; devuelve filas escritas';
+
+-- 5. Triggers
+-- Series: una serie nueva solo puede mejorar la marca; cambios y borrados
+-- recalculan la clave
+CREATE OR REPLACE FUNCTION sync_athlete_best_times_from_sets()
+RETURNS TRIGGER AS $$
+DECLARE
+    v_athlete_id UUID;
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        IF NOT NEW.is_best THEN
+            RETURN NULL;
+        END IF;
+
+        INSERT INTO athlete_test_bests (
+            athlete_id, test_id, club_id, sex, best_time_ms, training_set_id,
+            session_id, achieved_date
+        )
+        SELECT a.id, NEW.test_id, a.club_id, a.sex, NEW.total_time_ms, NEW.id,
+               ts.id, ts.session_date
+        FROM training_sessions ts
+        JOIN athletes a ON a.id = ts.athlete_id
+        WHERE ts.id = NEW.session_id
+        ON CONFLICT (athlete_id, test_id) DO UPDATE SET
+            best_time_ms = EXCLUDED.best_time_ms,
+            training_set_id = EXCLUDED.training_set_id,
+            session_id = EXCLUDED.session_id,
+            achieved_date = EXCLUDED.achieved_date,
+            updated_at = NOW()
+        WHERE EXCLUDED.best_time_ms < athlete_test_bests.best_time_ms;
+        RETURN NULL;
+    END IF;
+
+    -- UPDATE o DELETE: recalcular la clave anterior
+    SELECT athlete_id INTO v_athlete_id FROM training_sessions WHERE id = OLD.session_id;
+    IF v_athlete_id IS NOT NULL THEN
+        PERFORM refresh_athlete_best_time(v_athlete_id, OLD.test_id);
+    END IF;
+    -- Si la sesión ya no existe (borrado en cascada) su trigger recalcula
+
+    IF TG_OP = 'UPDATE'
+       AND (NEW.session_id, NEW.test_id) IS DISTINCT FROM (OLD.session_id, OLD.test_id) THEN
+        SELECT athlete_id INTO v_athlete_id FROM training_sessions WHERE id = NEW.session_id;
+        PERFORM refresh_athlete_best_time(v_athlete_id, NEW.test_id);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+DROP TRIGGER IF EXISTS sync_athlete_best_times_on_sets ON training_sets;
+CREATE TRIGGER sync_athlete_best_times_on_sets
+    AFTER INSERT OR DELETE OR UPDATE OF session_id, test_id, total_time_ms, is_best
+    ON training_sets
+    FOR EACH ROW EXECUTE FUNCTION sync_athlete_best_times_from_sets();
+
+-- Sesiones: al borrarlas, o al cambiar de atleta o fecha, recalcular las
+-- pruebas de sus series
+CREATE OR REPLACE FUNCTION sync_athlete_best_times_from_sessions()
+RETURNS TRIGGER AS $$
+DECLARE
+    v_test_id UUID;
+BEGIN
+    FOR v_test_id IN
+        SELECT test_id FROM athlete_test_bests WHERE session_id = OLD.id
+        UNION
+        SELECT test_id FROM training_sets WHERE session_id = OLD.id AND is_best = TRUE
+    LOOP
+        PERFORM refresh_athlete_best_time(OLD.athlete_id, v_test_id);
+        IF TG_OP = 'UPDATE' AND NEW.athlete_id <> OLD.athlete_id THEN
+            PERFORM refresh_athlete_best_time(NEW.athlete_id, v_test_id);
+        END IF;
+    END LOOP;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+DROP TRIGGER IF EXISTS sync_athlete_best_times_on_sessions ON training_sessions;
+CREATE TRIGGER sync_athlete_best_times_on_sessions
+    AFTER DELETE OR UPDATE OF athlete_id, session_date
+    ON training_sessions
+    FOR EACH ROW EXECUTE FUNCTION sync_athlete_best_times_from_sessions();
+
+-- Atletas: mantener las copias de club y sexo
+CREATE OR REPLACE FUNCTION sync_athlete_best_times_from_athletes()
+RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE athlete_test_bests
+    SET club_id = NEW.club_id, sex = NEW.sex, updated_at = NOW()
+    WHERE athlete_id = NEW.id;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+DROP TRIGGER IF EXISTS sync_athlete_best_times_on_athletes ON athletes;
+CREATE TRIGGER sync_athlete_best_times_on_athletes
+    AFTER UPDATE OF club_id, sex
+    ON athletes
+    FOR EACH ROW
+    WHEN ((NEW.club_id, NEW.sex) IS DISTINCT FROM (OLD.club_id, OLD.sex))
+    EXECUTE FUNCTION sync_athlete_best_times_from_athletes();
+
+-- 6. RLS: mismo acceso que las sesiones del atleta
+ALTER TABLE athlete_test_bests ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Users can view best times of accessible athletes"
+    ON athlete_test_bests FOR SELECT
+    USING (
+        athlete_id IN (SELECT id FROM athletes WHERE user_id = auth.uid())
+        OR is_coach_of_athlete(athlete_id)
+        OR is_club_admin(club_id)
+    );
+
+-- 7. Vista con las mismas columnas, ahora una fila por atleta y prueba
+DROP VIEW IF EXISTS athlete_best_times;
+
+CREATE VIEW athlete_best_times AS
+SELECT
+    a.id AS athlete_id,
+    a.first_name || ' ' || a.last_name AS athlete_name,
+    a.sex,
+    calculate_age(a.birth_date) AS age,
+    get_age_category(calculate_age(a.birth_date)) AS age_category,
+    t.id AS test_id,
+    t.distance_m,
+    ss.code AS stroke,
+    t.pool_type,
+    bt.best_time_ms,
+    ms_to_time_string(bt.best_time_ms) AS best_time_formatted,
+    bt.achieved_date
+FROM athlete_test_bests bt
+JOIN athletes a ON a.id = bt.athlete_id
+JOIN tests t ON t.id = bt.test_id
+JOIN swim_strokes ss ON ss.id = t.stroke_id
+WHERE a.active = TRUE;
+
+-- 8. Rankings de club desde la tabla
+CREATE OR REPLACE FUNCTION get_club_rankings(
+    p_club_id UUID,
+    p_test_id UUID,
+    p_sex sex DEFAULT NULL,
+    p_age_category TEXT DEFAULT NULL,
+    p_limit INTEGER DEFAULT 100
+)
+RETURNS TABLE (
+    rank BIGINT,
+    athlete_id UUID,
+    athlete_name TEXT,
+    age INTEGER,
+    age_category TEXT,
+    best_time_ms INTEGER,
+    best_time_formatted TEXT,
+    achieved_date DATE
+) AS $$
+BEGIN
+    RETURN QUERY
+    SELECT
+        ROW_NUMBER() OVER (ORDER BY bt.best_time_ms ASC) AS rank,
+        bt.athlete_id,
+        a.first_name || ' ' || a.last_name AS athlete_name,
+        calculate_age(a.birth_date) AS age,
+        get_age_category(calculate_age(a.birth_date)) AS age_category,
+        bt.best_time_ms,
+        ms_to_time_string(bt.best_time_ms) AS best_time_formatted,
+        bt.achieved_date
+    FROM athlete_test_bests bt
+    JOIN athletes a ON a.id = bt.athlete_id
+    WHERE bt.club_id = p_club_id
+    AND bt.test_id = p_test_id
+    AND a.active = TRUE
+    AND (p_sex IS NULL OR bt.sex = p_sex)
+    AND (p_age_category IS NULL OR get_age_category(calculate_age(a.birth_date)) = p_age_category)
+    ORDER BY bt.best_time_ms ASC
+    LIMIT p_limit;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+-- 9. Competidores directos desde la tabla (modo club)
+CREATE OR REPLACE FUNCTION get_direct_competitors(
+    p_athlete_id UUID,
+    p_test_id UUID,
+    p_time_ms INTEGER,
+    p_mode TEXT DEFAULT 'club' -- 'club' or 'general'
+)
+RETURNS TABLE (
+    position TEXT,
+    athlete_id UUID,
+    athlete_name TEXT,
+    time_ms INTEGER,
+    time_formatted TEXT,
+    time_diff_ms INTEGER
+) AS $$
+DECLARE
+    v_club_id UUID;
+    v_sex sex;
+    v_age_category TEXT;
+BEGIN
+    -- Get athlete info
+    SELECT a.club_id, a.sex, get_age_category(calculate_age(a.birth_date))
+    INTO v_club_id, v_sex, v_age_category
+    FROM athletes a WHERE a.id = p_athlete_id;
+
+    IF p_mode = 'club' THEN
+        -- Faster competitors from club
+        RETURN QUERY
+        SELECT
+            'faster'::TEXT AS position,
+            bt.athlete_id,
+            a.first_name || ' ' || a.last_name AS athlete_name,
+            bt.best_time_ms AS time_ms,
+            ms_to_time_string(bt.best_time_ms) AS time_formatted,
+            bt.best_time_ms - p_time_ms AS time_diff_ms
+        FROM athlete_test_bests bt
+        JOIN athletes a ON a.id = bt.athlete_id
+        WHERE bt.club_id = v_club_id
+        AND bt.test_id = p_test_id
+        AND bt.sex = v_sex
+        AND a.active = TRUE
+        AND get_age_category(calculate_age(a.birth_date)) = v_age_category
+        AND bt.best_time_ms < p_time_ms
+        AND bt.athlete_id != p_athlete_id
+        ORDER BY bt.best_time_ms DESC
+        LIMIT 3;
+
+        -- Slower competitors from club
+        RETURN QUERY
+        SELECT
+            'slower'::TEXT AS position,
+            bt.athlete_id,
+            a.first_name || ' ' || a.last_name AS athlete_name,
+            bt.best_time_ms AS time_ms,
+            ms_to_time_string(bt.best_time_ms) AS time_formatted,
+            bt.best_time_ms - p_time_ms AS time_diff_ms
+        FROM athlete_test_bests bt
+        JOIN athletes a ON a.id = bt.athlete_id
+        WHERE bt.club_id = v_club_id
+        AND bt.test_id = p_test_id
+        AND bt.sex = v_sex
+        AND a.active = TRUE
+        AND get_age_category(calculate_age(a.birth_date)) = v_age_category
+        AND bt.best_time_ms > p_time_ms
+        AND bt.athlete_id != p_athlete_id
+        ORDER BY bt.best_time_ms ASC
+        LIMIT 3;
+    ELSE
+        -- From competition results (general mode)
+        RETURN QUERY
+        SELECT
+            'faster'::TEXT AS position,
+            NULL::UUID AS athlete_id,
+            cr.swimmer_name AS athlete_name,
+            cr.final_time_ms AS time_ms,
+            ms_to_time_string(cr.final_time_ms) AS time_formatted,
+            cr.final_time_ms - p_time_ms AS time_diff_ms
+        FROM swim_competition_results cr
+        JOIN tests t ON t.id = p_test_id
+        JOIN swim_strokes ss ON ss.id = t.stroke_id
+        WHERE cr.gender = v_sex
+        AND cr.distance_m = t.distance_m
+        AND cr.stroke = ss.code
+        AND get_age_category(cr.age) = v_age_category
+        AND cr.final_time_ms < p_time_ms
+        ORDER BY cr.final_time_ms DESC
+        LIMIT 3;
+
+        RETURN QUERY
+        SELECT
+            'slower'::TEXT AS position,
+            NULL::UUID AS athlete_id,
+            cr.swimmer_name AS athlete_name,
+            cr.final_time_ms AS time_ms,
+            ms_to_time_string(cr.final_time_ms) AS time_formatted,
+            cr.final_time_ms - p_time_ms AS time_diff_ms
+        FROM swim_competition_results cr
+        JOIN tests t ON t.id = p_test_id
+        JOIN swim_strokes ss ON ss.id = t.stroke_id
+        WHERE cr.gender = v_sex
+        AND cr.distance_m = t.distance_m
+        AND cr.stroke = ss.code
+        AND get_age_category(cr.age) = v_age_category
+        AND cr.final_time_ms > p_time_ms
+        ORDER BY cr.final_time_ms ASC
+        LIMIT 3;
+    END IF;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+-- 10. Carga inicial
+SELECT refresh_athlete_best_times();
@@ -0,0 +1,26 @@
+-- Migration: Inicio de sincronización en athlete_external_mappings
+-- Fecha: 2026-10-19
+-- Descripción: Un IN_PROGRESS que quedó colgado por la caída de un worker
+-- se detectaba con last_synced_at, que es el fin de la sincronización
+-- anterior. Se registra cuándo empezó la sincronización en curso para que
+-- el planificador y reset_sync_status() la retomen pasado un timeout
+
+-- 1. Momento en que se marcó IN_PROGRESS
+ALTER TABLE athlete_external_mappings
+ADD COLUMN IF NOT EXISTS sync_started_at TIMESTAMPTZ;
+
+COMMENT ON COLUMN athlete_external_mappings.sync_started_at IS 'Inicio de la sincronización en curso o de la última';
+
+-- 2. Resetear sincronizaciones colgadas según su inicio
+CREATE OR REPLACE FUNCTION reset_sync_status()
+RETURNS void AS $$
+BEGIN
+  UPDATE athlete_external_mappings
+  SET sync_status = 'PENDING',
+      sync_error = NULL
+  WHERE sync_status = 'IN_PROGRESS'
+    AND COALESCE(sync_started_at, last_synced_at, '-infinity') < NOW() - INTERVAL '1 hour';
+END;
+$$ LANGUAGE plpgsql;
+
+COMMENT ON FUNCTION reset_sync_status() IS 'Resetea sincronizaciones que quedaron en IN_PROGRESS por más de 1 hora desde su inicio (probablemente fallaron)';
@@ -0,0 +1,34 @@
+-- Migration: Nombres de nadadores paginados
+-- Fecha: 2026-10-19
+-- Descripción: PostgREST corta cada respuesta en max-rows (1000), así que
+-- get_swimmer_names() devolvía solo parte de los nombres y el índice en
+-- memoria de la API quedaba incompleto. Se pagina por keyset sobre
+-- swimmer_name_norm, recorriendo idx_competition_results_swimmer
+
+-- 1. Reemplazar la versión sin parámetros
+DROP FUNCTION IF EXISTS get_swimmer_names();
+
+CREATE OR REPLACE FUNCTION get_swimmer_names(
+    p_after TEXT DEFAULT NULL,
+    p_limit INTEGER DEFAULT 1000
+)
+RETURNS TABLE (
+    swimmer_name_norm TEXT,
+    swimmer_name TEXT,
+    result_count BIGINT
+) AS $$
+BEGIN
+    RETURN QUERY
+    SELECT
+        cr.swimmer_name_norm,
+        MIN(cr.swimmer_name) AS swimmer_name,
+        COUNT(*) AS result_count
+    FROM swim_competition_results cr
+    WHERE cr.swimmer_name_norm > COALESCE(p_after, '')
+    GROUP BY cr.swimmer_name_norm
+    ORDER BY cr.swimmer_name_norm
+    LIMIT p_limit;
+END;
+$$ LANGUAGE plpgsql STABLE SECURITY DEFINER;
+
+COMMENT ON FUNCTION get_swimmer_names(TEXT, INTEGER) IS 'Nombres normalizados distintos de nadadores en orden, de a p_limit después de p_after, para el índice de búsqueda en memoria de la API';